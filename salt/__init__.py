@@ -2,13 +2,14 @@
 Salt package
 """
 
-import asyncio
 import importlib
 import os
 import sys
 import warnings
 
 if sys.platform.startswith("win"):
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 
@@ -12,8 +12,12 @@ so that any external authentication system can be used inside of Salt
 # 5. Cache auth token with relative data opts['token_dir']
 # 6. Interface to verify tokens
 
+import copy
 import getpass
+import hashlib
+import hmac
 import logging
+import os
 import random
 import time
 from collections.abc import Iterable, Mapping
@@ -24,6 +28,7 @@ import salt.exceptions
 import salt.loader
 import salt.payload
 import salt.utils.args
+import salt.utils.cache
 import salt.utils.dictupdate
 import salt.utils.files
 import salt.utils.minions
@@ -49,6 +54,16 @@ AUTH_INTERNAL_KEYWORDS = frozenset(
     ]
 )
 
+# The options the cached eauth results depend on, the caches are cleared when
+# one of them changes
+AUTH_CACHE_OPTS = (
+    "external_auth",
+    "eauth_acl_module",
+    "eauth_tokens",
+    "keep_acl_in_token",
+    "permissive_acl",
+)
+
 
 class LoadAuth:
     """
@@ -61,6 +76,59 @@ class LoadAuth:
         self.auth = salt.loader.auth(opts)
         self.tokens = salt.loader.eauth_tokens(opts)
         self.ckminions = ckminions or salt.utils.minions.CkMinions(opts)
+        self.cache_ttl = opts.get("eauth_cache_ttl", 0)
+        self._cache_config = None
+        self._cache_secret = os.urandom(32)
+        self._caches = {}
+        if self.cache_ttl > 0:
+            for name in ("auth", "acl", "groups", "auth_list", "tokens"):
+                self._caches[name] = salt.utils.cache.BoundedCacheDict(
+                    self.cache_ttl, opts.get("eauth_cache_size", 1000)
+                )
+
+    def _cache(self, name):
+        """
+        Return the cache of the given kind, or None when caching is disabled.
+        The caches are cleared when the eauth configuration changed.
+        """
+        if not self._caches:
+            return None
+        config = {key: self.opts.get(key) for key in AUTH_CACHE_OPTS}
+        if config != self._cache_config:
+            if self._cache_config is not None:
+                log.debug("The eauth configuration changed, clearing the caches")
+            for cache in self._caches.values():
+                cache.clear()
+            self._cache_config = copy.deepcopy(config)
+        return self._caches[name]
+
+    def _token_cache(self):
+        """
+        Return the cache of the tokens, or None when the token store cannot
+        tell whether a token still exists without reading it. The tokens are
+        removed from the store by the other processes of the master, the
+        cached tokens are only used while they are still in the store.
+        """
+        if "{}.token_exists".format(self.opts["eauth_tokens"]) not in self.tokens:
+            return None
+        return self._cache("tokens")
+
+    def _cache_key(self, load):
+        """
+        Return the key of the cached results for the credentials in the load.
+        The secrets are not kept in memory, only a keyed digest of them.
+        """
+        digest = hmac.new(self._cache_secret, digestmod=hashlib.sha256)
+        for key in ("password", "token"):
+            digest.update(salt.payload.dumps(load.get(key)))
+        return (load.get("eauth"), load.get("username"), digest.hexdigest())
+
+    @staticmethod
+    def _cache_get(cache, key):
+        try:
+            return copy.deepcopy(cache[key])
+        except KeyError:
+            return None
 
     def load_name(self, load):
         """
@@ -111,9 +179,16 @@ class LoadAuth:
         """
         Make sure that all failures happen in the same amount of time
         """
+        cache = self._cache("auth")
+        if cache is not None:
+            ret = self._cache_get(cache, self._cache_key(load))
+            if ret:
+                return ret
         start = time.time()
         ret = self.__auth_call(load)
         if ret:
+            if cache is not None:
+                cache[self._cache_key(load)] = copy.deepcopy(ret)
             return ret
         f_time = time.time() - start
         if f_time > self.max_fail:
@@ -140,14 +215,23 @@ class LoadAuth:
         fstr = f"{mod}.acl"
         if fstr not in self.auth:
             return None
+        cache = self._cache("acl")
+        if cache is not None:
+            key = (mod,) + self._cache_key(load)
+            ret = self._cache_get(cache, key)
+            if ret is not None:
+                return ret
         fcall = salt.utils.args.format_call(
             self.auth[fstr], load, expected_extra_kws=AUTH_INTERNAL_KEYWORDS
         )
         try:
-            return self.auth[fstr](*fcall["args"], **fcall["kwargs"])
+            ret = self.auth[fstr](*fcall["args"], **fcall["kwargs"])
         except Exception as e:  # pylint: disable=broad-except
             log.debug("Authentication module threw %s", e)
             return None
+        if cache is not None and ret is not None:
+            cache[key] = copy.deepcopy(ret)
+        return ret
 
     def __process_acl(self, load, auth_list):
         """
@@ -175,15 +259,24 @@ class LoadAuth:
         fstr = "{}.groups".format(load["eauth"])
         if fstr not in self.auth:
             return False
+        cache = self._cache("groups")
+        if cache is not None:
+            key = self._cache_key(load)
+            ret = self._cache_get(cache, key)
+            if ret is not None:
+                return ret
         fcall = salt.utils.args.format_call(
             self.auth[fstr], load, expected_extra_kws=AUTH_INTERNAL_KEYWORDS
         )
         try:
-            return self.auth[fstr](*fcall["args"], **fcall["kwargs"])
+            ret = self.auth[fstr](*fcall["args"], **fcall["kwargs"])
         except IndexError:
             return False
         except Exception:  # pylint: disable=broad-except
             return None
+        if cache is not None and ret is not None:
+            cache[key] = copy.deepcopy(ret)
+        return ret
 
     def _allow_custom_expire(self, load):
         """
@@ -230,27 +323,46 @@ class LoadAuth:
         if groups:
             tdata["groups"] = groups
 
-        return self.tokens["{}.mk_token".format(self.opts["eauth_tokens"])](
+        tdata = self.tokens["{}.mk_token".format(self.opts["eauth_tokens"])](
             self.opts, tdata
         )
+        cache = self._token_cache()
+        if cache is not None and tdata:
+            cache[tdata["token"]] = copy.deepcopy(tdata)
+        return tdata
 
     def get_tok(self, tok):
         """
         Return the name associated with the token, or False if the token is
         not valid
         """
-        tdata = {}
-        try:
-            tdata = self.tokens["{}.get_token".format(self.opts["eauth_tokens"])](
-                self.opts, tok
-            )
-        except salt.exceptions.SaltDeserializationError:
-            log.warning("Failed to load token %r - removing broken/empty file.", tok)
-            rm_tok = True
-        else:
-            if not tdata:
-                return {}
+        cache = self._token_cache()
+        tdata = self._cache_get(cache, tok) if cache is not None else None
+        if tdata and not self.tokens[
+            "{}.token_exists".format(self.opts["eauth_tokens"])
+        ](self.opts, tok):
+            # Removed by another process
+            cache.pop(tok, None)
+            return {}
+        if tdata:
             rm_tok = False
+        else:
+            try:
+                tdata = self.tokens["{}.get_token".format(self.opts["eauth_tokens"])](
+                    self.opts, tok
+                )
+            except salt.exceptions.SaltDeserializationError:
+                log.warning(
+                    "Failed to load token %r - removing broken/empty file.", tok
+                )
+                tdata = {}
+                rm_tok = True
+            else:
+                if not tdata:
+                    return {}
+                rm_tok = False
+                if cache is not None:
+                    cache[tok] = copy.deepcopy(tdata)
 
         if tdata.get("expire", 0) < time.time():
             # If expire isn't present in the token it's invalid and needs
@@ -277,6 +389,9 @@ class LoadAuth:
         """
         Remove the given token from token storage.
         """
+        cache = self._token_cache()
+        if cache is not None:
+            cache.pop(tok, None)
         self.tokens["{}.rm_token".format(self.opts["eauth_tokens"])](self.opts, tok)
 
     def authenticate_token(self, load):
@@ -414,6 +529,13 @@ class LoadAuth:
         if not groups:
             groups = []
 
+        cache = self._cache("auth_list")
+        if cache is not None:
+            key = (eauth, name, tuple(sorted(groups)))
+            auth_list = self._cache_get(cache, key)
+            if auth_list is not None:
+                return auth_list
+
         # We now have an authenticated session and it is time to determine
         # what the user has access to.
         auth_list = self.ckminions.fill_auth_list(eauth_config, name, groups)
@@ -422,6 +544,8 @@ class LoadAuth:
 
         log.trace("Compiled auth_list: %s", auth_list)
 
+        if cache is not None:
+            cache[key] = copy.deepcopy(auth_list)
         return auth_list
 
     def check_authentication(self, load, auth_type, key=None, show_username=False):
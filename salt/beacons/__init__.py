@@ -2,11 +2,15 @@
 This package contains the loader modules for the salt streams system
 """
 
+import asyncio
+import concurrent.futures
 import copy
 import logging
 import re
 import sys
+import time
 
+import salt.loader.lazy
 import salt.utils.event
 import salt.utils.minion
 
@@ -25,6 +29,31 @@ class Beacon:
         self.functions = functions
         self.beacons = salt.loader.beacons(opts, functions)
         self.interval_map = dict()
+        # Beacons run in a thread pool when beacons_worker_threads is set
+        self.executor = None
+        # Beacons which are still running: {mod: (future, beacon_name, runonce)}
+        self.running = {}
+        # Execution time and overruns of each beacon
+        self.stats = {}
+
+    def destroy(self):
+        """
+        Stop the worker threads of the beacons, the runs in progress are not
+        waited for
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        self.running = {}
+
+    # pylint: disable=W1701
+    def __del__(self):
+        try:
+            self.destroy()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    # pylint: enable=W1701
 
     def process(self, config, grains):
         """
@@ -39,10 +68,12 @@ class Beacon:
                     - /etc/fstab: {}
                     - /var/cache/foo: {}
         """
-        ret = []
+        # The runs started before the beacons were disabled still fire their
+        # events, no new run is started while they are disabled
+        ret = self._collect_beacons()
         b_config = copy.deepcopy(config)
         if "enabled" in b_config and not b_config["enabled"]:
-            return
+            return ret
         for mod in config:
             if mod == "enabled":
                 continue
@@ -109,6 +140,14 @@ class Beacon:
                     if not self._process_interval(mod, interval):
                         log.trace("Skipping beacon %s. Interval not reached.", mod)
                         continue
+                if mod in self.running:
+                    # The previous run of the beacon did not complete yet
+                    self._beacon_stats(mod)["skipped"] += 1
+                    log.warning(
+                        "Skipping beacon %s. The previous run is still in progress.",
+                        mod,
+                    )
+                    continue
                 if self._determine_beacon_config(
                     current_beacon_config, "disable_during_state_run"
                 ):
@@ -136,38 +175,145 @@ class Beacon:
                 self.beacons[fun_str].__globals__["__grains__"] = grains
 
                 # Fire the beacon!
-                error = None
-                try:
-                    raw = self.beacons[fun_str](b_config[mod])
-                except:  # pylint: disable=bare-except
-                    error = f"{sys.exc_info()[1]}"
-                    log.error("Unable to start %s beacon, %s", mod, error)
-                    # send beacon error event
-                    tag = "salt/beacon/{}/{}/".format(self.opts["id"], mod)
-                    ret.append(
-                        {
-                            "tag": tag,
-                            "error": error,
-                            "data": {},
-                            "beacon_name": beacon_name,
-                        }
+                func = self.beacons[fun_str]
+                if isinstance(func, salt.loader.lazy.LoadedCoro):
+                    try:
+                        loop = asyncio.get_running_loop()
+                    except RuntimeError:
+                        loop = None
+                    if loop is not None:
+                        # Async beacons run as tasks on the minion's loop
+                        self.running[mod] = (
+                            loop.create_task(
+                                self._run_async_beacon(mod, func, b_config[mod])
+                            ),
+                            beacon_name,
+                            runonce,
+                        )
+                        continue
+                    ret.extend(
+                        self._beacon_events(
+                            mod,
+                            beacon_name,
+                            runonce,
+                            asyncio.run(
+                                self._run_async_beacon(mod, func, b_config[mod])
+                            ),
+                        )
                     )
-                if not error:
-                    for data in raw:
-                        tag = "salt/beacon/{}/{}/".format(self.opts["id"], mod)
-                        if "tag" in data:
-                            tag += data.pop("tag")
-                        if "id" not in data:
-                            data["id"] = self.opts["id"]
-                        ret.append(
-                            {"tag": tag, "data": data, "beacon_name": beacon_name}
+                elif self.opts.get("beacons_worker_threads"):
+                    if self.executor is None:
+                        self.executor = concurrent.futures.ThreadPoolExecutor(
+                            max_workers=self.opts["beacons_worker_threads"],
+                            thread_name_prefix="beacon",
                         )
-                    if runonce:
-                        self.disable_beacon(mod)
+                    self.running[mod] = (
+                        self.executor.submit(
+                            self._run_beacon, mod, func, b_config[mod]
+                        ),
+                        beacon_name,
+                        runonce,
+                    )
+                else:
+                    ret.extend(
+                        self._beacon_events(
+                            mod,
+                            beacon_name,
+                            runonce,
+                            self._run_beacon(mod, func, b_config[mod]),
+                        )
+                    )
             else:
                 log.warning("Unable to process beacon %s", mod)
         return ret
 
+    def _run_beacon(self, mod, func, config):
+        """
+        Run a beacon function, return its data or the error it raised and how
+        long it ran
+        """
+        start = time.monotonic()
+        try:
+            return func(config), None, time.monotonic() - start
+        except:  # pylint: disable=bare-except
+            return None, f"{sys.exc_info()[1]}", time.monotonic() - start
+
+    async def _run_async_beacon(self, mod, func, config):
+        """
+        Run a coroutine beacon function, see _run_beacon
+        """
+        start = time.monotonic()
+        try:
+            return await func(config), None, time.monotonic() - start
+        except:  # pylint: disable=bare-except
+            return None, f"{sys.exc_info()[1]}", time.monotonic() - start
+
+    def _collect_beacons(self):
+        """
+        Return the events of the beacons which completed since the last loop
+        """
+        ret = []
+        for mod, (future, beacon_name, runonce) in list(self.running.items()):
+            if not future.done():
+                continue
+            del self.running[mod]
+            try:
+                result = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                result = None, str(exc), 0
+            ret.extend(self._beacon_events(mod, beacon_name, runonce, result))
+        return ret
+
+    def _beacon_stats(self, mod):
+        return self.stats.setdefault(
+            mod,
+            {"runs": 0, "last": 0, "mean": 0, "max": 0, "overruns": 0, "skipped": 0},
+        )
+
+    def _beacon_events(self, mod, beacon_name, runonce, result):
+        """
+        Record the execution time of a beacon and build the events it fires
+        """
+        raw, error, duration = result
+        stats = self._beacon_stats(mod)
+        stats["runs"] += 1
+        stats["last"] = duration
+        stats["max"] = max(stats["max"], duration)
+        stats["mean"] += (duration - stats["mean"]) / stats["runs"]
+        log.trace("Beacon %s ran in %.3f seconds", mod, duration)
+        if duration > self.opts["loop_interval"]:
+            stats["overruns"] += 1
+            log.warning(
+                "Beacon %s took %.3f seconds, longer than the loop_interval",
+                mod,
+                duration,
+            )
+
+        ret = []
+        tag = "salt/beacon/{}/{}/".format(self.opts["id"], mod)
+        if error:
+            log.error("Unable to start %s beacon, %s", mod, error)
+            # send beacon error event
+            ret.append(
+                {
+                    "tag": tag,
+                    "error": error,
+                    "data": {},
+                    "beacon_name": beacon_name,
+                }
+            )
+            return ret
+        for data in raw:
+            data_tag = tag
+            if "tag" in data:
+                data_tag += data.pop("tag")
+            if "id" not in data:
+                data["id"] = self.opts["id"]
+            ret.append({"tag": data_tag, "data": data, "beacon_name": beacon_name})
+        if runonce:
+            self.disable_beacon(mod)
+        return ret
+
     def _trim_config(self, b_config, mod, key):
         """
         Take a beacon configuration and strip out the interval bits
@@ -303,6 +449,19 @@ class Beacon:
 
         return True
 
+    def beacons_stats(self):
+        """
+        Report the execution time and overruns of each beacon
+        """
+        # Fire the complete event back along with the beacon stats
+        with salt.utils.event.get_event("minion", opts=self.opts) as evt:
+            evt.fire_event(
+                {"complete": True, "stats": self.stats},
+                tag="/salt/minion/minion_beacons_stats_complete",
+            )
+
+        return True
+
     def validate_beacon(self, name, beacon_data):
         """
         Return available beacon functions
@@ -152,6 +152,18 @@ class AsyncReqChannel:
     def ttype(self):
         return self.transport.ttype
 
+    @property
+    def compression(self):
+        """
+        The payload compression negotiated with the master during
+        authentication, ``None`` when payloads are sent uncompressed
+        """
+        if self.auth and self.auth.authenticated:
+            compression = self.auth.creds.get("compression")
+            if compression == "zlib":
+                return compression
+        return None
+
     def _package_load(self, load):
         ret = {
             "enc": self.crypt,
@@ -161,8 +173,14 @@ class AsyncReqChannel:
         if self.crypt == "aes":
             ret["enc_algo"] = self.opts["encryption_algorithm"]
             ret["sig_algo"] = self.opts["signing_algorithm"]
+            if self.compression:
+                # Let the master know it may compress its reply
+                ret["compression"] = self.compression
         return ret
 
+    def _dumps(self, load):
+        return self.auth.crypticle.dumps(load, compress=bool(self.compression))
+
     @tornado.gen.coroutine
     def _send_with_retry(self, load, tries, timeout):
         _try = 1
@@ -199,7 +217,7 @@ class AsyncReqChannel:
         if not self.auth.authenticated:
             yield self.auth.authenticate()
         ret = yield self._send_with_retry(
-            self._package_load(self.auth.crypticle.dumps(load)),
+            self._package_load(self._dumps(load)),
             tries,
             timeout,
         )
@@ -208,7 +226,7 @@ class AsyncReqChannel:
             # Reauth in the case our key is deleted on the master side.
             yield self.auth.authenticate()
             ret = yield self._send_with_retry(
-                self._package_load(self.auth.crypticle.dumps(load)),
+                self._package_load(self._dumps(load)),
                 tries,
                 timeout,
             )
@@ -261,7 +279,7 @@ class AsyncReqChannel:
         def _do_transfer():
             # Yield control to the caller. When send() completes, resume by populating data with the Future.result
             data = yield self.transport.send(
-                self._package_load(self.auth.crypticle.dumps(load)),
+                self._package_load(self._dumps(load)),
                 timeout=timeout,
             )
             # we may not have always data
@@ -11,7 +11,6 @@ import hashlib
 import logging
 import os
 import pathlib
-import shutil
 
 import tornado.gen
 
@@ -22,10 +21,13 @@ import salt.transport.frame
 import salt.utils.channel
 import salt.utils.event
 import salt.utils.files
+import salt.utils.keystore
 import salt.utils.minions
 import salt.utils.platform
+import salt.utils.presence
 import salt.utils.stringutils
 import salt.utils.verify
+from salt.defaults import DEFAULT_TARGET_DELIM
 from salt.exceptions import SaltDeserializationError, UnsupportedAlgorithm
 from salt.utils.cache import CacheCli
 
@@ -172,11 +174,19 @@ class ReqServerChannel:
             log.error("Some exception handling a payload from minion", exc_info=True)
             raise tornado.gen.Return("Some exception handling minion payload")
 
+        # Only compress replies for minions which negotiated it during _auth
+        compress = (
+            self.opts.get("payload_compression", False)
+            and payload.get("compression") == "zlib"
+        )
+
         req_fun = req_opts.get("fun", "send")
         if req_fun == "send_clear":
             raise tornado.gen.Return(ret)
         elif req_fun == "send":
-            raise tornado.gen.Return(self.crypticle.dumps(ret, nonce))
+            raise tornado.gen.Return(
+                self.crypticle.dumps(ret, nonce, compress=compress)
+            )
         elif req_fun == "send_private":
             raise tornado.gen.Return(
                 self._encrypt_private(
@@ -187,6 +197,7 @@ class ReqServerChannel:
                     sign_messages,
                     payload.get("enc_algo", salt.crypt.OAEP_SHA1),
                     payload.get("sig_algo", salt.crypt.PKCS1v15_SHA1),
+                    compress=compress,
                 ),
             )
         log.error("Unknown req_fun %s", req_fun)
@@ -202,19 +213,21 @@ class ReqServerChannel:
         sign_messages=True,
         encryption_algorithm=salt.crypt.OAEP_SHA1,
         signing_algorithm=salt.crypt.PKCS1v15_SHA1,
+        compress=False,
     ):
         """
         The server equivalent of ReqChannel.crypted_transfer_decode_dictentry
         """
         # encrypt with a specific AES key
         if self.master_key.cluster_key:
-            pubfn = os.path.join(self.opts["cluster_pki_dir"], "minions", target)
+            pki_dir = self.opts["cluster_pki_dir"]
         else:
-            pubfn = os.path.join(self.opts["pki_dir"], "minions", target)
+            pki_dir = self.opts["pki_dir"]
+        key_store = salt.utils.keystore.get_key_store(self.opts, pki_dir)
         key = salt.crypt.Crypticle.generate_key_string()
         pcrypt = salt.crypt.Crypticle(self.opts, key)
         try:
-            pub = salt.crypt.PublicKey(pubfn)
+            pub = key_store.public_key(salt.utils.keystore.ACC, target)
         except (ValueError, IndexError, TypeError):
             return self.crypticle.dumps({})
         except OSError:
@@ -236,9 +249,9 @@ class ReqServerChannel:
                     tosign, algorithm=signing_algorithm
                 ),
             }
-            pret[dictkey] = pcrypt.dumps(signed_msg)
+            pret[dictkey] = pcrypt.dumps(signed_msg, compress=compress)
         else:
-            pret[dictkey] = pcrypt.dumps(ret)
+            pret[dictkey] = pcrypt.dumps(ret, compress=compress)
         return pret
 
     def _clear_signed(self, load, algorithm):
@@ -375,6 +388,7 @@ class ReqServerChannel:
         if self.opts["cluster_id"]:
             if self.opts["cluster_pki_dir"]:
                 pki_dir = self.opts["cluster_pki_dir"]
+        key_store = salt.utils.keystore.get_key_store(self.opts, pki_dir)
 
         # Check if key is configured to be auto-rejected/signed
         auto_reject = self.auto_key.check_autoreject(load["id"])
@@ -382,15 +396,19 @@ class ReqServerChannel:
             load["id"], load.get("autosign_grains", None)
         )
 
-        pubfn = os.path.join(pki_dir, "minions", load["id"])
-        pubfn_pend = os.path.join(pki_dir, "minions_pre", load["id"])
-        pubfn_rejected = os.path.join(pki_dir, "minions_rejected", load["id"])
-        pubfn_denied = os.path.join(pki_dir, "minions_denied", load["id"])
+        acc = salt.utils.keystore.ACC
+        pend = salt.utils.keystore.PEND
+        rej = salt.utils.keystore.REJ
+        den = salt.utils.keystore.DEN
+        pubfn_pend = key_store.path(pend, load["id"])
+        # The keys are read through the key store, which can keep them in
+        # memory
+        disk_key = key_store.read(acc, load["id"])
         if self.opts["open_mode"]:
             # open mode is turned on, nuts to checks and overwrite whatever
             # is there
             pass
-        elif os.path.isfile(pubfn_rejected):
+        elif key_store.exists(rej, load["id"]):
             # The key has been rejected, don't place it in pending
             log.info(
                 "Public key rejected for %s. Key is present in rejection key dir.",
@@ -405,37 +423,33 @@ class ReqServerChannel:
                 )
             else:
                 return {"enc": "clear", "load": {"ret": False}}
-        elif os.path.isfile(pubfn):
+        elif disk_key is not None:
             # The key has been accepted, check it
-            with salt.utils.files.fopen(pubfn, "r") as pubfn_handle:
-                if not self.compare_keys(pubfn_handle.read(), load["pub"]):
-                    log.error(
-                        "Authentication attempt from %s failed, the public "
-                        "keys did not match. This may be an attempt to compromise "
-                        "the Salt cluster.",
-                        load["id"],
+            if not self.compare_keys(disk_key, load["pub"]):
+                log.error(
+                    "Authentication attempt from %s failed, the public "
+                    "keys did not match. This may be an attempt to compromise "
+                    "the Salt cluster.",
+                    load["id"],
+                )
+                # put denied minion key into minions_denied
+                key_store.write(den, load["id"], load["pub"])
+                eload = {
+                    "result": False,
+                    "id": load["id"],
+                    "act": "denied",
+                    "pub": load["pub"],
+                }
+                if self.opts.get("auth_events") is True:
+                    self.event.fire_event(eload, salt.utils.event.tagify(prefix="auth"))
+                if sign_messages:
+                    return self._clear_signed(
+                        {"ret": False, "nonce": load["nonce"]}, sig_algo
                     )
-                    # put denied minion key into minions_denied
-                    with salt.utils.files.fopen(pubfn_denied, "w+") as fp_:
-                        fp_.write(load["pub"])
-                    eload = {
-                        "result": False,
-                        "id": load["id"],
-                        "act": "denied",
-                        "pub": load["pub"],
-                    }
-                    if self.opts.get("auth_events") is True:
-                        self.event.fire_event(
-                            eload, salt.utils.event.tagify(prefix="auth")
-                        )
-                    if sign_messages:
-                        return self._clear_signed(
-                            {"ret": False, "nonce": load["nonce"]}, sig_algo
-                        )
-                    else:
-                        return {"enc": "clear", "load": {"ret": False}}
+                else:
+                    return {"enc": "clear", "load": {"ret": False}}
 
-        elif not os.path.isfile(pubfn_pend):
+        elif not key_store.exists(pend, load["id"]):
             # The key has not been accepted, this is a new minion
             if os.path.isdir(pubfn_pend):
                 # The key path is a directory, error out
@@ -451,26 +465,25 @@ class ReqServerChannel:
                     return {"enc": "clear", "load": {"ret": False}}
 
             if auto_reject:
-                key_path = pubfn_rejected
+                key_state = rej
                 log.info(
                     "New public key for %s rejected via autoreject_file", load["id"]
                 )
                 key_act = "reject"
                 key_result = False
             elif not auto_sign:
-                key_path = pubfn_pend
+                key_state = pend
                 log.info("New public key for %s placed in pending", load["id"])
                 key_act = "pend"
                 key_result = True
             else:
                 # The key is being automatically accepted, don't do anything
                 # here and let the auto accept logic below handle it.
-                key_path = None
+                key_state = None
 
-            if key_path is not None:
+            if key_state is not None:
                 # Write the key to the appropriate location
-                with salt.utils.files.fopen(key_path, "w+") as fp_:
-                    fp_.write(load["pub"])
+                key_store.write(key_state, load["id"], load["pub"])
                 eload = {
                     "result": key_result,
                     "act": key_act,
@@ -487,16 +500,13 @@ class ReqServerChannel:
                 else:
                     return {"enc": "clear", "load": {"ret": key_result}}
 
-        elif os.path.isfile(pubfn_pend):
+        elif key_store.exists(pend, load["id"]):
             # This key is in the pending dir and is awaiting acceptance
             if auto_reject:
                 # We don't care if the keys match, this minion is being
                 # auto-rejected. Move the key file from the pending dir to the
                 # rejected dir.
-                try:
-                    shutil.move(pubfn_pend, pubfn_rejected)
-                except OSError:
-                    pass
+                key_store.move([load["id"]], pend, rej)
                 log.info(
                     "Pending public key for %s rejected via autoreject_file",
                     load["id"],
@@ -521,86 +531,82 @@ class ReqServerChannel:
                 # Check if the keys are the same and error out if this is the
                 # case. Otherwise log the fact that the minion is still
                 # pending.
-                with salt.utils.files.fopen(pubfn_pend, "r") as pubfn_handle:
-                    if not self.compare_keys(pubfn_handle.read(), load["pub"]):
-                        log.error(
-                            "Authentication attempt from %s failed, the public "
-                            "key in pending did not match. This may be an "
-                            "attempt to compromise the Salt cluster.",
-                            load["id"],
+                if not self.compare_keys(key_store.read(pend, load["id"]), load["pub"]):
+                    log.error(
+                        "Authentication attempt from %s failed, the public "
+                        "key in pending did not match. This may be an "
+                        "attempt to compromise the Salt cluster.",
+                        load["id"],
+                    )
+                    # put denied minion key into minions_denied
+                    key_store.write(den, load["id"], load["pub"])
+                    eload = {
+                        "result": False,
+                        "id": load["id"],
+                        "act": "denied",
+                        "pub": load["pub"],
+                    }
+                    if self.opts.get("auth_events") is True:
+                        self.event.fire_event(
+                            eload, salt.utils.event.tagify(prefix="auth")
+                        )
+                    if sign_messages:
+                        return self._clear_signed(
+                            {"ret": False, "nonce": load["nonce"]}, sig_algo
                         )
-                        # put denied minion key into minions_denied
-                        with salt.utils.files.fopen(pubfn_denied, "w+") as fp_:
-                            fp_.write(load["pub"])
-                        eload = {
-                            "result": False,
-                            "id": load["id"],
-                            "act": "denied",
-                            "pub": load["pub"],
-                        }
-                        if self.opts.get("auth_events") is True:
-                            self.event.fire_event(
-                                eload, salt.utils.event.tagify(prefix="auth")
-                            )
-                        if sign_messages:
-                            return self._clear_signed(
-                                {"ret": False, "nonce": load["nonce"]}, sig_algo
-                            )
-                        else:
-                            return {"enc": "clear", "load": {"ret": False}}
                     else:
-                        log.info(
-                            "Authentication failed from host %s, the key is in "
-                            "pending and needs to be accepted with salt-key "
-                            "-a %s",
-                            load["id"],
-                            load["id"],
+                        return {"enc": "clear", "load": {"ret": False}}
+                else:
+                    log.info(
+                        "Authentication failed from host %s, the key is in "
+                        "pending and needs to be accepted with salt-key "
+                        "-a %s",
+                        load["id"],
+                        load["id"],
+                    )
+                    eload = {
+                        "result": True,
+                        "act": "pend",
+                        "id": load["id"],
+                        "pub": load["pub"],
+                    }
+                    if self.opts.get("auth_events") is True:
+                        self.event.fire_event(
+                            eload, salt.utils.event.tagify(prefix="auth")
                         )
-                        eload = {
-                            "result": True,
-                            "act": "pend",
-                            "id": load["id"],
-                            "pub": load["pub"],
-                        }
-                        if self.opts.get("auth_events") is True:
-                            self.event.fire_event(
-                                eload, salt.utils.event.tagify(prefix="auth")
-                            )
-                        if sign_messages:
-                            return self._clear_signed(
-                                {"ret": True, "nonce": load["nonce"]}, sig_algo
-                            )
-                        else:
-                            return {"enc": "clear", "load": {"ret": True}}
+                    if sign_messages:
+                        return self._clear_signed(
+                            {"ret": True, "nonce": load["nonce"]}, sig_algo
+                        )
+                    else:
+                        return {"enc": "clear", "load": {"ret": True}}
             else:
                 # This key is in pending and has been configured to be
                 # auto-signed. Check to see if it is the same key, and if
                 # so, pass on doing anything here, and let it get automatically
                 # accepted below.
-                with salt.utils.files.fopen(pubfn_pend, "r") as pubfn_handle:
-                    if not self.compare_keys(pubfn_handle.read(), load["pub"]):
-                        log.error(
-                            "Authentication attempt from %s failed, the public "
-                            "keys in pending did not match. This may be an "
-                            "attempt to compromise the Salt cluster.",
-                            load["id"],
+                if not self.compare_keys(key_store.read(pend, load["id"]), load["pub"]):
+                    log.error(
+                        "Authentication attempt from %s failed, the public "
+                        "keys in pending did not match. This may be an "
+                        "attempt to compromise the Salt cluster.",
+                        load["id"],
+                    )
+                    # put denied minion key into minions_denied
+                    key_store.write(den, load["id"], load["pub"])
+                    eload = {"result": False, "id": load["id"], "pub": load["pub"]}
+                    if self.opts.get("auth_events") is True:
+                        self.event.fire_event(
+                            eload, salt.utils.event.tagify(prefix="auth")
+                        )
+                    if sign_messages:
+                        return self._clear_signed(
+                            {"ret": False, "nonce": load["nonce"]}, sig_algo
                         )
-                        # put denied minion key into minions_denied
-                        with salt.utils.files.fopen(pubfn_denied, "w+") as fp_:
-                            fp_.write(load["pub"])
-                        eload = {"result": False, "id": load["id"], "pub": load["pub"]}
-                        if self.opts.get("auth_events") is True:
-                            self.event.fire_event(
-                                eload, salt.utils.event.tagify(prefix="auth")
-                            )
-                        if sign_messages:
-                            return self._clear_signed(
-                                {"ret": False, "nonce": load["nonce"]}, sig_algo
-                            )
-                        else:
-                            return {"enc": "clear", "load": {"ret": False}}
                     else:
-                        os.remove(pubfn_pend)
+                        return {"enc": "clear", "load": {"ret": False}}
+                else:
+                    key_store.delete(pend, [load["id"]])
 
         else:
             # Something happened that I have not accounted for, FAIL!
@@ -618,18 +624,12 @@ class ReqServerChannel:
         log.info("Authentication accepted from %s", load["id"])
         # only write to disk if you are adding the file, and in open mode,
         # which implies we accept any key from a minion.
-        if not os.path.isfile(pubfn) and not self.opts["open_mode"]:
-            with salt.utils.files.fopen(pubfn, "w+") as fp_:
-                fp_.write(load["pub"])
+        if disk_key is None and not self.opts["open_mode"]:
+            key_store.write(acc, load["id"], load["pub"])
         elif self.opts["open_mode"]:
-            disk_key = ""
-            if os.path.isfile(pubfn):
-                with salt.utils.files.fopen(pubfn, "r") as fp_:
-                    disk_key = fp_.read()
-            if load["pub"] and load["pub"] != disk_key:
+            if load["pub"] and load["pub"] != (disk_key or ""):
                 log.debug("Host key change detected in open mode.")
-                with salt.utils.files.fopen(pubfn, "w+") as fp_:
-                    fp_.write(load["pub"])
+                key_store.write(acc, load["id"], load["pub"])
             elif not load["pub"]:
                 log.error("Public key is empty: %s", load["id"])
                 if sign_messages:
@@ -648,9 +648,11 @@ class ReqServerChannel:
         # The key payload may sometimes be corrupt when using auto-accept
         # and an empty request comes in
         try:
-            pub = salt.crypt.PublicKey(pubfn)
+            pub = key_store.public_key(acc, load["id"])
         except salt.crypt.InvalidKeyError as err:
-            log.error('Corrupt public key "%s": %s', pubfn, err)
+            log.error(
+                'Corrupt public key "%s": %s', key_store.path(acc, load["id"]), err
+            )
             if sign_messages:
                 return self._clear_signed(
                     {"ret": False, "nonce": load["nonce"]}, sig_algo
@@ -664,6 +666,12 @@ class ReqServerChannel:
             "publish_port": self.opts["publish_port"],
         }
 
+        # Agree on payload compression when both ends have it enabled
+        if self.opts.get("payload_compression", False) and "zlib" in load.get(
+            "compression", ()
+        ):
+            ret["compression"] = "zlib"
+
         # sign the master's pubkey (if enabled) before it is
         # sent to the minion that was just authenticated
         if self.opts["master_sign_pubkey"]:
@@ -778,6 +786,7 @@ class PubServerChannel:
         self.aes_funcs = salt.master.AESFuncs(self.opts)
         self.present = {}
         self.presence_events = presence_events
+        self.registry = None
         self.event = salt.utils.event.get_event("master", opts=self.opts, listen=False)
 
     @property
@@ -800,6 +809,7 @@ class PubServerChannel:
         self.event = salt.utils.event.get_event("master", opts=self.opts, listen=False)
         self.ckminions = salt.utils.minions.CkMinions(self.opts)
         self.present = {}
+        self.registry = None
         self.master_key = salt.crypt.MasterKeys(self.opts)
 
     def close(self):
@@ -833,8 +843,16 @@ class PubServerChannel:
         if secrets is not None:
             salt.master.SMaster.secrets = secrets
         self.master_key = salt.crypt.MasterKeys(self.opts)
+        # The registry of the minions connected to this publish server, read by
+        # CkMinions.connected_ids
+        self.registry = salt.utils.presence.PresenceRegistry(
+            self.opts, self.opts.get("transport") or "zeromq"
+        )
         self.transport.publish_daemon(
-            self.publish_payload, self.presence_callback, self.remove_presence_callback
+            self.publish_payload,
+            self.presence_callback,
+            self.remove_presence_callback,
+            presence_registry=self.registry,
         )
 
     def presence_callback(self, subscriber, msg):
@@ -854,6 +872,11 @@ class PubServerChannel:
 
     def _add_client_present(self, client):
         id_ = client.id_
+        if self.registry is not None:
+            if client in self.present.get(id_, ()):
+                self.registry.seen(id_)
+            else:
+                self.registry.add(id_, getattr(client, "address", None))
         if id_ in self.present:
             clients = self.present[id_]
             clients.add(client)
@@ -885,6 +908,8 @@ class PubServerChannel:
             return
 
         clients.remove(client)
+        if self.registry is not None:
+            self.registry.remove(id_)
         if len(clients) == 0:
             del self.present[id_]
             if self.presence_events:
@@ -908,7 +933,11 @@ class PubServerChannel:
         payload = salt.payload.dumps(payload)
         if "topic_lst" in unpacked_package:
             topic_list = unpacked_package["topic_lst"]
-            ret = await self.transport.publish_payload(payload, topic_list)
+            if unpacked_package.get("syndic_topics"):
+                # The syndics which can match are part of the topics already
+                ret = await self.transport.publish_payload(payload, topic_list, False)
+            else:
+                ret = await self.transport.publish_payload(payload, topic_list)
         else:
             ret = await self.transport.publish_payload(payload)
         return ret
@@ -918,7 +947,9 @@ class PubServerChannel:
         if not self.opts.get("cluster_id", None):
             load["serial"] = salt.master.SMaster.get_serial()
         crypticle = salt.crypt.Crypticle(self.opts, self.aes_key)
-        payload["load"] = crypticle.dumps(load)
+        payload["load"] = crypticle.dumps(
+            load, compress=self.opts.get("publish_compression", False)
+        )
         if self.opts["sign_pub_messages"]:
             log.debug("Signing data packet")
             payload["sig_algo"] = self.opts["publish_signing_algorithm"]
@@ -930,6 +961,11 @@ class PubServerChannel:
 
         # If topics are upported, target matching has to happen master side
         match_targets = ["pcre", "glob", "list"]
+        syndic_routing = self.opts.get("order_masters", False) and self.opts.get(
+            "syndic_target_routing", False
+        )
+        if syndic_routing:
+            match_targets.extend(["grain", "grain_pcre"])
         if self.transport.topic_support and load["tgt_type"] in match_targets:
             # add some targeting stuff for lists only (for now)
             if load["tgt_type"] == "list":
@@ -945,6 +981,18 @@ class PubServerChannel:
                 int_payload["topic_lst"] = match_ids
             else:
                 int_payload["topic_lst"] = load["tgt"]
+            if syndic_routing:
+                # Only send to the syndics which can match, instead of every
+                # syndic, unless none of them can be left out
+                topics = self.ckminions.syndic_topics(
+                    load["tgt"],
+                    load["tgt_type"],
+                    load.get("delimiter", DEFAULT_TARGET_DELIM),
+                    int_payload["topic_lst"],
+                )
+                if topics is not None:
+                    int_payload["topic_lst"] = topics
+                    int_payload["syndic_topics"] = True
 
         return int_payload
 
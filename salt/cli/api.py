@@ -8,7 +8,6 @@
 
 import logging
 
-import salt.client.netapi
 import salt.utils.files
 import salt.utils.parsers as parsers
 from salt.utils.verify import check_user
@@ -29,6 +28,8 @@ class SaltAPI(parsers.SaltAPIParser):
 
             super(YourSubClass, self).prepare()
         """
+        import salt.client.netapi
+
         super().prepare()
         log.info("Setting up the Salt API")
         self.api = salt.client.netapi.NetapiClient(self.config)
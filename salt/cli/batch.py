@@ -5,17 +5,39 @@ Execute batch runs
 import copy
 import logging
 import math
+import os
 import time
 from datetime import datetime, timedelta
 
 import salt.client
 import salt.exceptions
 import salt.output
+import salt.utils.batch
+import salt.utils.event
+import salt.utils.jid
 import salt.utils.stringutils
+import salt.utils.user
 
 log = logging.getLogger(__name__)
 
 
+def get_batch(opts, eauth=None, quiet=False, _parser=None):
+    """
+    Return the batch run of the job in ``opts``, run by the batch server of
+    the master when it is enabled and running. The batches using external
+    authentication run in the client, the batch server publishes with the
+    authority of the master.
+    """
+    if (
+        opts.get("batch_server")
+        and not eauth
+        and salt.utils.batch.server_running(opts)
+        and os.access(salt.utils.batch.batch_dir(opts), os.W_OK)
+    ):
+        return MasterBatch(opts, quiet=quiet, _parser=_parser)
+    return Batch(opts, eauth=eauth, quiet=quiet, _parser=_parser)
+
+
 class Batch:
     """
     Manage the execution of batch runs
@@ -346,3 +368,94 @@ class Batch:
                             if bwait:
                                 wait.append(datetime.now() + timedelta(seconds=bwait))
         self.local.destroy()
+
+
+class MasterBatch:
+    """
+    Run a batch job on the batch server of the master and follow its progress
+    """
+
+    def __init__(self, opts, quiet=False, _parser=None):
+        """
+        :param dict opts: A config options dictionary.
+
+        :param bool quiet: Suppress printing to stdout
+
+                           The default is False.
+        """
+        self.opts = opts
+        self.quiet = quiet
+        self.options = _parser
+        self.bid = None
+
+    def _print(self, msg):
+        if not self.quiet:
+            salt.utils.stringutils.print_cli(msg)
+
+    def run(self):
+        """
+        Submit the batch run and yield the returns of the minions
+        """
+        self.bid = salt.utils.jid.gen_jid(self.opts)
+        show_jid = self.options.show_jid if self.options else False
+        with salt.utils.event.get_master_event(
+            self.opts, self.opts["sock_dir"], listen=True
+        ) as event:
+            salt.utils.batch.submit(
+                self.opts,
+                self.opts["tgt"],
+                self.opts["fun"],
+                self.opts["arg"],
+                tgt_type=self.opts.get("selected_target_option")
+                or self.opts.get("tgt_type", "glob"),
+                ret=self.opts.get("return", self.opts.get("ret", "")),
+                batch=self.opts["batch"],
+                batch_wait=self.opts.get("batch_wait", 0),
+                failhard=self.opts.get("failhard", False),
+                retries=self.opts.get("batch_retries", 0),
+                timeout=self.opts.get("timeout"),
+                gather_job_timeout=self.opts.get("gather_job_timeout"),
+                # The user running the client, as in the loads it publishes,
+                # not the user the master runs as
+                user=salt.utils.user.get_specific_user(),
+                bid=self.bid,
+            )
+            self._print(f"Batch {self.bid} submitted to the batch server")
+            for what, data in salt.utils.batch.follow(self.opts, self.bid, event):
+                if what == "start":
+                    if not data["minions"]:
+                        self._print("No minions matched the target.")
+                    for down_minion in data["down"]:
+                        self._print(
+                            f"Minion {down_minion} did not respond. "
+                            "No job will be sent."
+                        )
+                elif what == "wave":
+                    self._print(f"\nExecuting run on {sorted(data['minions'])}\n")
+                    if show_jid:
+                        self._print(f"jid: {data['jid']}")
+                elif what.startswith("ret/"):
+                    minion = data["id"]
+                    if data.get("failed"):
+                        log.debug(
+                            "Minion '%s' failed to respond to job sent, data '%s'",
+                            minion,
+                            data,
+                        )
+                        self._print(f"Minion '{minion}' failed to respond to job sent")
+                        continue
+                    if self.opts.get("raw"):
+                        yield {
+                            "tag": salt.utils.event.tagify(
+                                [data["jid"], "ret", minion], "job"
+                            ),
+                            "data": data,
+                        }, data["retcode"]
+                    else:
+                        yield {minion: data["return"]}, data["retcode"]
+                    if not self.quiet:
+                        salt.output.display_output(
+                            {minion: data["return"]}, data.get("out"), self.opts
+                        )
+                elif what == "done" and data["state"] == "failed":
+                    log.error("Batch %s stopped", self.bid)
@@ -1,8 +1,10 @@
 import os
+import sys
 
-import salt.cli.caller
 import salt.defaults.exitcodes
+import salt.utils.caller_service
 import salt.utils.parsers
+import salt.utils.platform
 from salt.config import _expand_glob_path, prepend_root_dir
 
 
@@ -46,6 +48,28 @@ class SaltCall(salt.utils.parsers.SaltCallOptionParser):
             self.config["extension_modules"] = os.path.join(cache_dir, "extmods")
             prepend_root_dir(self.config, ["cachedir", "extension_modules"])
 
+        is_local = self.config.get("file_client") == "local"
+        if self.options.serve:
+            if salt.utils.platform.is_windows():
+                self.error("--serve is not available on Windows")
+            if not is_local:
+                self.error("--serve only serves local calls, pass --local")
+        if (
+            is_local
+            and self.config.get("caller_service", False)
+            and not self.options.serve
+            and not self._overrides_config()
+        ):
+            self._call_service()
+
+        # Only imported when the call runs in this process, it pulls in the
+        # whole minion machinery
+        import salt.cli.caller  # pylint: disable=import-outside-toplevel
+
+        if self.options.serve:
+            salt.cli.caller.CallerService(self.config).serve()
+            self.exit(salt.defaults.exitcodes.EX_OK)
+
         caller = salt.cli.caller.Caller.factory(self.config)
 
         if self.options.doc:
@@ -57,3 +81,33 @@ class SaltCall(salt.utils.parsers.SaltCallOptionParser):
             self.exit(salt.defaults.exitcodes.EX_OK)
 
         caller.run()
+
+    def _overrides_config(self):
+        """
+        Whether the options change how the modules, grains or pillar of the
+        warm service are loaded. The service also refuses the calls made with
+        another config, see salt.utils.caller_service.CONFIG_OPTS
+        """
+        return any(
+            (
+                self.options.doc,
+                self.options.grains_run,
+                self.options.proxyid,
+                self.options.skip_grains,
+                self.options.refresh_grains_cache,
+            )
+        )
+
+    def _call_service(self):
+        """
+        Pass the call to the warm local service, return if it is not running
+        """
+        response = salt.utils.caller_service.call(self.config)
+        if response is None:
+            return
+        sys.stdout.write(response.get("stdout", ""))
+        sys.stderr.write(response.get("stderr", ""))
+        if "ret" not in response:
+            self.exit(response.get("exit", salt.defaults.exitcodes.EX_GENERIC))
+        salt.utils.caller_service.display_return(self.config, response["ret"])
+        self.exit(salt.defaults.exitcodes.EX_OK)
@@ -3,9 +3,17 @@ The caller module is used as a front-end to manage direct calls to the salt
 minion modules.
 """
 
+import contextlib
+import copy
+import functools
+import io
 import logging
 import os
+import select
+import socket
 import sys
+import threading
+import time
 import traceback
 
 import salt
@@ -16,6 +24,7 @@ import salt.minion
 import salt.output
 import salt.payload
 import salt.utils.args
+import salt.utils.caller_service
 import salt.utils.files
 import salt.utils.jid
 import salt.utils.minion
@@ -99,23 +108,7 @@ class BaseCaller:
                     stats_path=self.opts.get("profiling_path", "/tmp/stats"),
                     stop=True,
                 )
-            out = ret.get("out", "nested")
-            if self.opts["print_metadata"]:
-                print_ret = ret
-                out = "nested"
-            else:
-                print_ret = ret.get("return", {})
-            salt.output.display_output(
-                {"local": print_ret},
-                out=out,
-                opts=self.opts,
-                _retcode=ret.get("retcode", 0),
-            )
-            # _retcode will be available in the kwargs of the outputter function
-            if self.opts.get("retcode_passthrough", False):
-                sys.exit(ret["retcode"])
-            elif ret.get("retcode") != salt.defaults.exitcodes.EX_OK:
-                sys.exit(salt.defaults.exitcodes.EX_GENERIC)
+            salt.utils.caller_service.display_return(self.opts, ret)
         except SaltInvocationError as err:
             raise SystemExit(err)
 
@@ -309,3 +302,234 @@ class ZeroMQCaller(BaseCaller):
             for key, value in ret.items():
                 load[key] = value
             channel.send(load)
+
+
+class CallerService(BaseCaller):
+    """
+    Keep the minion modules, grains and pillar loaded and run the
+    ``salt-call --local`` calls passed over the unix socket of the service
+    """
+
+    # The events the minion reloads its modules, pillar or grains on
+    REFRESH_TAGS = ("module_refresh", "pillar_refresh", "grains_refresh")
+
+    def __init__(self, opts):
+        # The config the calls are checked against, before the grains and
+        # pillar are loaded into the opts
+        self.config = {
+            key: copy.deepcopy(opts.get(key))
+            for key in salt.utils.caller_service.CONFIG_OPTS
+        }
+        super().__init__(opts)
+        self.socket_path = salt.utils.caller_service.socket_path(self.opts)
+        self.refresh = set()
+        self.grains_refreshed = time.time()
+        self.extmods_fingerprint = self._extmods_fingerprint()
+        self._watch_refresh_events()
+
+    def _extmods_fingerprint(self):
+        """
+        The modification times of the synced module directories, the minion
+        daemon syncing modules changes them
+        """
+        extmods = self.opts.get("extension_modules")
+        if not extmods or not os.path.isdir(extmods):
+            return None
+        return sorted(
+            (entry.name, entry.stat().st_mtime_ns)
+            for entry in os.scandir(extmods)
+            if entry.is_dir()
+        )
+
+    def _watch_refresh_events(self):
+        """
+        Record the refresh events fired by the calls, the minion daemon (if any)
+        still receives them
+        """
+        try:
+            fire = self.minion.functions["event.fire"]
+        except KeyError:
+            return
+        # Wrap the function itself, the loader runs the wrapper in its context
+        fire = getattr(fire, "func", fire)
+        if getattr(fire, "caller_service", False):
+            # Already wrapped, the modules were not reloaded
+            return
+
+        @functools.wraps(fire)
+        def fire_event(data, tag):
+            if tag.startswith(self.REFRESH_TAGS):
+                self.refresh.add(tag.split("/")[0])
+            return fire(data, tag)
+
+        fire_event.caller_service = True
+        self.minion.functions["event.fire"] = fire_event
+
+    def refresh_data(self):
+        """
+        Refresh the modules, grains and pillar on the triggers the minion uses
+        """
+        grains_refresh_every = self.opts.get("grains_refresh_every", 0) or 0
+        if (
+            grains_refresh_every > 0
+            and time.time() - self.grains_refreshed >= grains_refresh_every * 60
+        ):
+            self.refresh.add("grains_refresh")
+        fingerprint = self._extmods_fingerprint()
+        if fingerprint != self.extmods_fingerprint:
+            self.extmods_fingerprint = fingerprint
+            self.refresh.add("module_refresh")
+        if not self.refresh:
+            return
+        refresh, self.refresh = self.refresh, set()
+        if "grains_refresh" in refresh:
+            grains = self.opts["grains"]
+            self.opts["grains"] = salt.loader.grains(self.opts, force_refresh=True)
+            self.grains_refreshed = time.time()
+            if self.opts["grains"] != grains:
+                # Changed grains can change the pillar, as on the minion
+                refresh.add("pillar_refresh")
+        if "pillar_refresh" in refresh:
+            log.debug("Refreshing the pillar of the salt-call service")
+            self.minion.gen_modules(initial_load=True)
+        elif refresh & {"module_refresh", "grains_refresh"}:
+            log.debug("Refreshing the modules of the salt-call service")
+            self.opts["grains"] = salt.loader.grains(self.opts)
+            self.minion.gen_modules()
+        self._watch_refresh_events()
+
+    def handle(self, request):
+        """
+        Run one salt-call call and return its response
+        """
+        self.refresh_data()
+        saved = {key: self.opts[key] for key in request if key in self.opts}
+        self.opts.update(request)
+        # The context outlives the calls, do not leak the retcode of the last one
+        self.minion.executors.pack["__context__"]["retcode"] = 0
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        response = {}
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                response["ret"] = self.call()
+        except SystemExit as exc:
+            if isinstance(exc.code, int) or exc.code is None:
+                response["exit"] = exc.code or 0
+            else:
+                stderr.write(f"{exc.code}\n")
+                response["exit"] = salt.defaults.exitcodes.EX_GENERIC
+        except Exception:  # pylint: disable=broad-except
+            log.exception("The salt-call service failed to run %s", request["fun"])
+            stderr.write(traceback.format_exc())
+            response["exit"] = salt.defaults.exitcodes.EX_GENERIC
+        finally:
+            for key in request:
+                if key in saved:
+                    self.opts[key] = saved[key]
+                else:
+                    self.opts.pop(key, None)
+        response["stdout"] = stdout.getvalue()
+        response["stderr"] = stderr.getvalue()
+        return response
+
+    def _bind(self):
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                # Left behind by a service which did not stop cleanly
+                os.remove(self.socket_path)
+            else:
+                raise SystemExit(
+                    f"A salt-call service is already listening on {self.socket_path}"
+                )
+            finally:
+                probe.close()
+        os.makedirs(os.path.dirname(self.socket_path), 0o750, exist_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the user running the service can pass calls to it
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        sock.listen(128)
+        return sock
+
+    def _answer_busy(self, sock, done):
+        """
+        Answer the calls passed while a call is running until ``done`` is set,
+        salt-call then runs them in process instead of waiting
+        """
+        while not done.is_set():
+            readable, _, _ = select.select([sock], [], [], 0.1)
+            if not readable:
+                continue
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                continue
+            with conn:
+                conn.settimeout(5)
+                try:
+                    salt.utils.caller_service.recv_msg(conn)
+                    salt.utils.caller_service.send_msg(conn, {"busy": True})
+                except (EOFError, OSError) as exc:
+                    log.debug("Lost a salt-call client: %s", exc)
+
+    def serve(self):
+        """
+        Answer the calls passed over the unix socket until interrupted. The
+        calls are run one at a time, the calls passed while one is running are
+        answered as busy and run in their salt-call process.
+        """
+        sock = self._bind()
+        log.info("The salt-call service is listening on %s", self.socket_path)
+        try:
+            while True:
+                conn, _ = sock.accept()
+                with conn:
+                    try:
+                        request = salt.utils.caller_service.recv_msg(conn)
+                        mismatch = [
+                            key
+                            for key, value in request.get("config", {}).items()
+                            if key in salt.utils.caller_service.CONFIG_OPTS
+                            and self.config.get(key) != value
+                        ]
+                        unsupported = [
+                            key
+                            for key in request.get("call", {})
+                            if key not in salt.utils.caller_service.CALL_OPTS
+                        ]
+                        if mismatch:
+                            response = {"mismatch": mismatch}
+                        elif unsupported:
+                            # Passed by a newer salt-call
+                            response = {"unsupported": unsupported}
+                        else:
+                            done = threading.Event()
+                            busy = threading.Thread(
+                                target=self._answer_busy,
+                                args=(sock, done),
+                                daemon=True,
+                            )
+                            busy.start()
+                            try:
+                                response = self.handle(request.get("call", {}))
+                            finally:
+                                done.set()
+                                busy.join()
+                        salt.utils.caller_service.send_msg(conn, response)
+                    except (EOFError, OSError) as exc:
+                        log.debug("Lost a salt-call client: %s", exc)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sock.close()
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
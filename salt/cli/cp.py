@@ -12,12 +12,9 @@ import os
 import re
 import sys
 
-import salt.client
-import salt.output
 import salt.utils.files
 import salt.utils.gzip_util
 import salt.utils.itertools
-import salt.utils.minions
 import salt.utils.parsers
 import salt.utils.platform
 import salt.utils.stringutils
@@ -126,6 +123,8 @@ class SaltCP:
         """
         Make the salt client call
         """
+        import salt.output
+
         if self.opts["chunked"]:
             ret = self.run_chunked()
         else:
@@ -137,6 +136,8 @@ class SaltCP:
         """
         Make the salt client call in old-style all-in-one call method
         """
+        import salt.client
+
         arg = [self._load_files(), self.opts["dest"]]
         args = [
             self.opts["tgt"],
@@ -156,6 +157,9 @@ class SaltCP:
         """
         Make the salt client call in the new fasion chunked multi-call way
         """
+        import salt.client
+        import salt.utils.minions
+
         files, empty_dirs = self._list_files()
         dest = self.opts["dest"]
         gzip = self.opts["gzip"]
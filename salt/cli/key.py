@@ -11,10 +11,10 @@ class SaltKey(salt.utils.parsers.SaltKeyOptionParser):
         """
         Execute salt-key
         """
-        import salt.key
-
         self.parse_args()
 
+        import salt.key
+
         key = salt.key.KeyCLI(self.config)
         if check_user(self.config["user"]):
             key.run()
@@ -14,10 +14,10 @@ class SaltRun(salt.utils.parsers.SaltRunOptionParser):
         """
         Execute salt-run
         """
-        import salt.runner
-
         self.parse_args()
 
+        import salt.runner
+
         profiling_enabled = self.options.profiling_enabled
 
         runner = salt.runner.Runner(self.config)
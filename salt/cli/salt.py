@@ -29,10 +29,12 @@ class SaltCMD(salt.utils.parsers.SaltCMDOptionParser):
         """
         Execute the salt command line
         """
-        import salt.client
-
         self.parse_args()
 
+        # Imported once the options are parsed, --help and --version do not
+        # need it
+        import salt.client
+
         try:
             # We don't need to bail on config file permission errors
             # if the CLI process is run with the -a flag
@@ -175,7 +177,7 @@ class SaltCMD(salt.utils.parsers.SaltCMDOptionParser):
                     except LoaderError as exc:
                         raise SaltSystemExit(exc)
                     if "return_count" not in progress:
-                        ret.update(progress)
+                        ret.update(self._summary_ret(progress))
                 self._progress_end(out)
                 self._print_returns_summary(ret)
             elif self.config["fun"] == "sys.doc":
@@ -194,7 +196,7 @@ class SaltCMD(salt.utils.parsers.SaltCMDOptionParser):
                         ret_, out, retcode = self._format_ret(full_ret)
                         retcodes.append(retcode)
                         self._output_ret(ret_, out, retcode=retcode)
-                        ret.update(full_ret)
+                        ret.update(self._summary_ret(full_ret))
                     except KeyError:
                         errors.append(full_ret)
 
@@ -265,7 +267,7 @@ class SaltCMD(salt.utils.parsers.SaltCMDOptionParser):
                 self.config["batch"] = "100%"
 
             try:
-                batch = salt.cli.batch.Batch(self.config, eauth=eauth, quiet=True)
+                batch = salt.cli.batch.get_batch(self.config, eauth=eauth, quiet=True)
             except SaltClientError:
                 sys.exit(2)
 
@@ -279,7 +281,7 @@ class SaltCMD(salt.utils.parsers.SaltCMDOptionParser):
         else:
             try:
                 self.config["batch"] = self.options.batch
-                batch = salt.cli.batch.Batch(
+                batch = salt.cli.batch.get_batch(
                     self.config, eauth=eauth, _parser=self.options
                 )
             except SaltClientError:
@@ -302,6 +304,24 @@ class SaltCMD(salt.utils.parsers.SaltCMDOptionParser):
             for error in errors:
                 salt.utils.stringutils.print_cli(self._format_error(error))
 
+    def _summary_ret(self, full_ret):
+        """
+        Return what the returns summary needs from the returns of the minions,
+        so the returns are not all kept until the end of the job
+        """
+        ret = {}
+        for minion_id, data in full_ret.items():
+            minion_ret = data
+            if isinstance(data, dict) and "ret" in data:
+                minion_ret = data.get("ret")
+            if isinstance(minion_ret, str) and minion_ret.startswith(
+                "Minion did not return"
+            ):
+                ret[minion_id] = minion_ret
+            else:
+                ret[minion_id] = {"retcode": self._get_retcode(data)}
+        return ret
+
     def _print_returns_summary(self, ret):
         """
         Display returns summary
@@ -1,6 +1,5 @@
 import sys
 
-import salt.client.ssh
 import salt.utils.parsers
 
 
@@ -15,6 +14,8 @@ class SaltSSH(salt.utils.parsers.SaltSSHOptionParser):
             # that won't be used anyways with -H or --hosts
         self.parse_args()
 
+        import salt.client.ssh
+
         ssh = salt.client.ssh.SSH(self.config)
         try:
             ssh.run()
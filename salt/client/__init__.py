@@ -575,6 +575,12 @@ class LocalClient:
 
         :param batch: The batch identifier of systems to execute on
 
+        :param batch_retries: The number of times the job is published again to
+            the minions it failed on, when the batch is run by the batch
+            server of the master, see :conf_master:`batch_server`.
+
+            .. versionadded:: 3008.0
+
         :returns: A generator of minion returns
 
         .. code-block:: python
@@ -612,6 +618,8 @@ class LocalClient:
             opts["gather_job_timeout"] = kwargs["gather_job_timeout"]
         if "batch_wait" in kwargs:
             opts["batch_wait"] = int(kwargs["batch_wait"])
+        if "batch_retries" in kwargs:
+            opts["batch_retries"] = int(kwargs["batch_retries"])
 
         eauth = {}
         if "eauth" in kwargs:
@@ -626,7 +634,7 @@ class LocalClient:
         for key, val in self.opts.items():
             if key not in opts:
                 opts[key] = val
-        batch = salt.cli.batch.Batch(opts, eauth=eauth, quiet=True)
+        batch = salt.cli.batch.get_batch(opts, eauth=eauth, quiet=True)
         for ret, _ in batch.run():
             yield ret
 
@@ -1145,6 +1153,9 @@ class LocalClient:
 
         # timeouts per minion, id_ -> timeout time
         minion_timeouts = {}
+        # minions sending heartbeats for the job, id_ -> time until which the
+        # minion is known to be running it
+        heartbeats = {}
 
         found = set()
         missing = set()
@@ -1201,6 +1212,16 @@ class LocalClient:
                         missing.update(raw["data"]["missing"])
                     continue
 
+                if raw["tag"] == f"salt/job/{jid}/alive":
+                    now = time.time()
+                    for id_, interval in raw["data"].get("alive", {}).items():
+                        # Allow for a missed heartbeat and the aggregation
+                        # by the master
+                        heartbeats[id_] = now + max(
+                            3 * (interval or 0), gather_job_timeout
+                        )
+                    continue
+
                 # Anything below this point is expected to be a job return event.
                 if not raw["tag"].startswith(f"salt/job/{jid}/ret/"):
                     log.debug("Skipping non return event: %s", raw["tag"])
@@ -1261,11 +1282,23 @@ class LocalClient:
             # if the jinfo has timed out and some minions are still running the job
             # re-do the ping
             if time.time() > timeout_at and minions_running:
-                # since this is a new ping, no one has responded yet
-                jinfo = self.gather_job_info(
-                    jid, list(minions - found), "list", **kwargs
-                )
+                # the minions sending heartbeats tell whether they are still
+                # running the job, only ping the others and the ones whose
+                # heartbeats stopped
+                now = time.time()
                 minions_running = False
+                pending = set()
+                for id_ in minions - found:
+                    if heartbeats.get(id_, 0) > now:
+                        minion_timeouts[id_] = now + timeout
+                        minions_running = True
+                    else:
+                        pending.add(id_)
+                if pending:
+                    # since this is a new ping, no one has responded yet
+                    jinfo = self.gather_job_info(jid, list(pending), "list", **kwargs)
+                else:
+                    jinfo = {}
                 # if we weren't assigned any jid that means the master thinks
                 # we have nothing to send
                 if "jid" not in jinfo:
@@ -2074,6 +2107,297 @@ class LocalClient:
         self.destroy()
 
 
+class AsyncLocalClient:
+    """
+    The asyncio interface of the :py:class:`LocalClient`, for the netapi
+    modules and the engines running in an event loop
+
+    .. versionadded:: 3008.0
+
+    The returns of the jobs of all the clients of the process are read from
+    a single :py:class:`~salt.utils.event.EventMultiplexer`, waiting for a job
+    does not take a thread nor an event bus connection.
+
+    .. code-block:: python
+
+        import salt.client
+
+        local = salt.client.AsyncLocalClient()
+        ret = await local.cmd("*", "test.ping")
+        async for ret in local.cmd_iter("*", "test.ping"):
+            print(ret)
+    """
+
+    def __init__(
+        self,
+        c_path=os.path.join(syspaths.CONFIG_DIR, "master"),
+        mopts=None,
+        skip_perm_errors=False,
+        io_loop=None,
+    ):
+        """
+        :param str c_path: Path of config file to use for opts.
+
+        :param dict mopts: When provided the client will use this dictionary of
+                           options instead of loading a config file from the
+                           value of c_path.
+
+        :param str skip_perm_errors: Ignore permissions errors while loading keys.
+
+        :param IOLoop io_loop: The io_loop the client runs in, the current one
+                               by default.
+        """
+        self.local = LocalClient(c_path, mopts=mopts, skip_perm_errors=skip_perm_errors)
+        self.opts = self.local.opts
+        self.io_loop = io_loop
+
+    @property
+    def events(self):
+        return salt.utils.event.get_event_multiplexer(self.opts, io_loop=self.io_loop)
+
+    async def run_job(
+        self,
+        tgt,
+        fun,
+        arg=(),
+        tgt_type="glob",
+        ret="",
+        timeout=None,
+        jid="",
+        kwarg=None,
+        **kwargs,
+    ):
+        """
+        Publish a command to the targeted minions, without waiting for their
+        returns
+
+        :return: A dictionary of (validated) ``pub_data`` or an empty
+            dictionary on failure. The ``pub_data`` contains the job ID and a
+            list of all minions that are expected to return data.
+
+        .. code-block:: python
+
+            >>> await local.run_job('*', 'test.sleep', [300])
+            {'jid': '20131219215650131543', 'minions': ['jerry']}
+        """
+        arg = salt.utils.args.condition_input(arg, kwarg)
+
+        try:
+            pub_data = await self.local.pub_async(
+                tgt,
+                fun,
+                arg,
+                tgt_type,
+                ret,
+                jid=jid,
+                timeout=self.local._get_timeout(timeout),
+                io_loop=self.io_loop,
+                listen=False,
+                **kwargs,
+            )
+        except SaltClientError:
+            # Re-raise error with specific message
+            raise SaltClientError(
+                "The salt master could not be contacted. Is master running?"
+            )
+        except (AuthenticationError, AuthorizationError):
+            raise
+        except Exception as general_exception:  # pylint: disable=broad-except
+            # Convert to generic client error and pass along message
+            raise SaltClientError(general_exception)
+
+        return self.local._check_pub_data(pub_data, listen=False)
+
+    async def cmd_iter(
+        self,
+        tgt,
+        fun,
+        arg=(),
+        timeout=None,
+        tgt_type="glob",
+        ret="",
+        kwarg=None,
+        **kwargs,
+    ):
+        """
+        Yield the individual minion returns as they come in
+
+        The arguments are the ones of :py:meth:`LocalClient.cmd_iter`.
+
+        .. code-block:: python
+
+            >>> async for ret in local.cmd_iter('*', 'test.ping'):
+            ...     print(ret)
+            {'jerry': {'ret': True}}
+            {'dave': {'ret': True}}
+        """
+        async for data in self._iter_returns(
+            tgt, fun, arg, timeout, tgt_type, ret, kwarg, **kwargs
+        ):
+            if "return" in data:
+                yield {data["id"]: self._fn_ret(data)}
+
+    @staticmethod
+    def _fn_ret(data):
+        """
+        Return the return of a minion in the form of the LocalClient returns
+        """
+        fn_ret = {"ret": data["return"]}
+        for key in ("out", "retcode", "jid"):
+            if key in data:
+                fn_ret[key] = data[key]
+        return fn_ret
+
+    async def cmd(
+        self,
+        tgt,
+        fun,
+        arg=(),
+        timeout=None,
+        tgt_type="glob",
+        ret="",
+        jid="",
+        full_return=False,
+        kwarg=None,
+        **kwargs,
+    ):
+        """
+        Publish a command and return the returns of the minions, the
+        arguments are the ones of :py:meth:`LocalClient.cmd`
+
+        .. code-block:: python
+
+            >>> await local.cmd('*', 'cmd.run', ['whoami'])
+            {'jerry': 'root'}
+        """
+        minions = ()
+        ret_ = {}
+        async for data in self._iter_returns(
+            tgt, fun, arg, timeout, tgt_type, ret, kwarg, jid=jid, **kwargs
+        ):
+            if "return" not in data:
+                minions = data["minions"]
+                continue
+            ret_[data["id"]] = self._fn_ret(data) if full_return else data["return"]
+        for failed in set(minions) - set(ret_):
+            ret_[failed] = False
+        return ret_
+
+    async def _iter_returns(
+        self, tgt, fun, arg, timeout, tgt_type, ret, kwarg, jid="", **kwargs
+    ):
+        """
+        Publish the job and yield its ``pub_data``, then the data of the
+        return events of the minions
+        """
+        jid = jid or salt.utils.jid.gen_jid(self.opts)
+        timeout = self.local._get_timeout(timeout)
+        gather_job_timeout = int(
+            kwargs.get("gather_job_timeout", self.opts["gather_job_timeout"])
+        )
+        # Subscribe before publishing, not to miss the early returns
+        with self.events.subscribe(f"salt/job/{jid}") as subscription:
+            if not await self.events.connect(timeout=timeout):
+                raise SaltClientError(
+                    "Unable to connect to the event bus of the master"
+                )
+            pub_data = await self.run_job(
+                tgt, fun, arg, tgt_type, ret, timeout, jid, kwarg=kwarg, **kwargs
+            )
+            if not pub_data:
+                return
+            yield pub_data
+            async for data in self._get_returns(
+                pub_data, subscription, timeout, gather_job_timeout
+            ):
+                yield data
+
+    async def _get_returns(self, pub_data, subscription, timeout, gather_job_timeout):
+        """
+        Yield the return events of the job until all the minions returned, or
+        the ones which did not are not running it anymore. The minions sending
+        heartbeats for the job are alive, the others are probed with
+        ``saltutil.find_job`` once ``timeout`` passed.
+        """
+        jid = pub_data["jid"]
+        minions = set(pub_data["minions"])
+        found = set()
+        # id -> time until which the minion is known to run the job
+        alive = {}
+        probe = None
+        probed = set()
+        running = set()
+        now = time.monotonic()
+        deadline = now + timeout
+        min_end = now
+        if self.opts["order_masters"]:
+            # The syndics take up to syndic_wait to tell their minions
+            min_end += self.opts["syndic_wait"]
+        while True:
+            waiting = minions - found
+            if not waiting and now >= min_end:
+                break
+            if waiting and now >= deadline:
+                if probe is None:
+                    live = {
+                        minion_id
+                        for minion_id in waiting
+                        if alive.get(minion_id, 0) > now
+                    }
+                    probed = waiting - live
+                    running = set()
+                    if probed:
+                        probe_jid = salt.utils.jid.gen_jid(self.opts)
+                        subscription.add(f"salt/job/{probe_jid}")
+                        probe = await self.run_job(
+                            sorted(probed),
+                            "saltutil.find_job",
+                            [jid],
+                            tgt_type="list",
+                            timeout=gather_job_timeout,
+                            jid=probe_jid,
+                        )
+                        if not probe:
+                            subscription.remove(f"salt/job/{probe_jid}")
+                    if probe:
+                        deadline = now + gather_job_timeout
+                    else:
+                        probe = None
+                        minions -= probed
+                        if not live:
+                            break
+                        deadline = min(alive[minion_id] for minion_id in live)
+                else:
+                    subscription.remove(f"salt/job/{probe['jid']}")
+                    # The minions not running the job anymore will not return
+                    minions -= probed - running
+                    probe = None
+                    deadline = now + timeout
+                continue
+            wait = (deadline if waiting else min_end) - now
+            evt = await subscription.get(timeout=max(wait, 0))
+            now = time.monotonic()
+            if evt is None:
+                continue
+            tag, data = evt["tag"], evt["data"]
+            if probe and tag.startswith(f"salt/job/{probe['jid']}/ret/"):
+                if data.get("return"):
+                    running.add(data["id"])
+            elif tag == f"salt/job/{jid}/alive":
+                for minion_id, interval in data.get("alive", {}).items():
+                    # Allow for a missed heartbeat and the aggregation by the
+                    # master
+                    alive[minion_id] = now + max(
+                        3 * (interval or 0), gather_job_timeout
+                    )
+            elif tag.startswith(f"salt/job/{jid}/ret/"):
+                if "return" not in data:
+                    log.warning("Malformed event return: %s", tag)
+                    continue
+                found.add(data["id"])
+                yield data
+
+
 class FunctionWrapper(dict):
     """
     Create a function wrapper that looks like the functions dict on the minion
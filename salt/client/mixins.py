@@ -43,6 +43,7 @@ CLIENT_INTERNAL_KEYWORDS = frozenset(
         "__jid__",
         "__tag__",
         "__user__",
+        "__auth_list__",
         "username",
         "password",
         "full_return",
@@ -288,6 +289,7 @@ class SyncClientMixin(ClientStateMixin):
                 - arg: a list of args to pass to fun
                 - kwarg: kwargs for fun
                 - __user__: user who is running the command
+                - __auth_list__: access list of the user, when restricted
                 - __jid__: jid to run under
                 - __tag__: tag to run under
         """
@@ -329,6 +331,7 @@ class SyncClientMixin(ClientStateMixin):
             func_globals = {
                 "__jid__": jid,
                 "__user__": data["user"],
+                "__auth_list__": low.get("__auth_list__"),
                 "__tag__": tag,
                 # weak ref to avoid the Exception in interpreter
                 # teardown of event
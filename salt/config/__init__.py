@@ -13,11 +13,11 @@ import types
 import urllib.parse
 from copy import deepcopy
 
-import salt.crypt
 import salt.defaults.exitcodes
 import salt.exceptions
 import salt.features
 import salt.syspaths
+import salt.utils.crypt
 import salt.utils.data
 import salt.utils.dictupdate
 import salt.utils.files
@@ -178,6 +178,10 @@ VALID_OPTS = immutabletypes.freeze(
         # 'maint': Runs on a schedule as a part of the maintenance process.
         # '': Disable the key cache [default]
         "key_cache": str,
+        # How the keys of the minions are read: 'localfs' or 'indexed'
+        "key_store": str,
+        # Fire a single event for the keys accepted, rejected or deleted at once
+        "key_events_batch": bool,
         # The user under which the daemon should run
         "user": str,
         # The root directory prepended to these options: pki_dir, cachedir,
@@ -451,6 +455,18 @@ VALID_OPTS = immutabletypes.freeze(
         "return_retry_timer_max": int,
         # Configures amount of return retries
         "return_retry_tries": int,
+        # Coalesce job returns finishing within this many seconds into a single
+        # request to the master. 0 disables batching.
+        "return_batch_window": float,
+        # Maximum number of job returns sent in a single batch
+        "return_batch_size": int,
+        # Compress request channel payloads when both the master and the minion
+        # enable it. The compression is negotiated during authentication.
+        "payload_compression": bool,
+        # Payloads smaller than this many bytes are never compressed
+        "payload_compression_threshold": int,
+        # Compress publications. Every minion must support payload compression.
+        "publish_compression": bool,
         # Specify one or more returners in which all events will be sent to. Requires that the returners
         # in question have an event_return(event) function!
         "event_return": (list, str),
@@ -680,6 +696,11 @@ VALID_OPTS = immutabletypes.freeze(
         # Subsystem to use to maintain eauth tokens. By default, tokens are stored on the local
         # filesystem
         "eauth_tokens": str,
+        # The number of seconds the eauth results, groups, access lists and tokens are cached
+        # in memory. Caching is disabled when set to 0.
+        "eauth_cache_ttl": int,
+        # The maximum number of entries of each of the eauth caches
+        "eauth_cache_size": int,
         # The number of open files a daemon is allowed to have open. Frequently needs to be increased
         # higher than the system default in order to account for the way zeromq consumes file handles.
         "max_open_files": int,
@@ -710,6 +731,9 @@ VALID_OPTS = immutabletypes.freeze(
         # cachedir under the name of the minion and used to predetermine what minions are expected to
         # reply from executions.
         "minion_data_cache": bool,
+        # Maintain an aggregated view of the mine data per mine function, used to
+        # answer mine.get requests without reading the mine of every targeted minion
+        "mine_index": bool,
         # The number of seconds between AES key rotations on the master
         "publish_session": int,
         # Defines a salt reactor. See https://docs.saltproject.io/en/latest/topics/reactor/
@@ -768,12 +792,22 @@ VALID_OPTS = immutabletypes.freeze(
         "winrepo_refspecs": list,
         # Set a hard limit for the amount of memory modules can consume on a minion.
         "modules_max_memory": int,
+        # Share the package inventory between processes until the package database changes
+        "pkg_inventory_cache": bool,
+        # Cache the hash sums of files keyed on their stat result
+        "file_hash_cache": bool,
         # Blacklist specific core grains to be filtered
         "grains_blacklist": list,
         # The number of minutes between the minion refreshing its cache of grains
         "grains_refresh_every": int,
         # Enable grains refresh prior to any operation
         "grains_refresh_pre_exec": bool,
+        # The number of threads running the grain functions, 0 runs them serially
+        "grains_worker_threads": int,
+        # The number of seconds to wait for a grain function running in a thread
+        "grains_function_timeout": int,
+        # Grain functions cached individually, mapped to the cache TTL in seconds
+        "grains_cache_functions": dict,
         # Use lspci to gather system data for grains on a minion
         "enable_lspci": bool,
         # The number of seconds for the salt client to wait for additional syndics to
@@ -802,6 +836,10 @@ VALID_OPTS = immutabletypes.freeze(
         "transport": str,
         # The number of seconds to wait when the client is requesting information about running jobs
         "gather_job_timeout": int,
+        # The number of seconds between the heartbeats a minion sends for the jobs it runs
+        "job_heartbeat_interval": int,
+        # The number of seconds during which the master aggregates the job heartbeats
+        "job_heartbeat_batch_interval": float,
         # The number of seconds to wait before timing out an authentication request
         "auth_timeout": int,
         # The number of attempts to authenticate to a master before giving up
@@ -824,6 +862,21 @@ VALID_OPTS = immutabletypes.freeze(
         "syndic_event_forward_timeout": float,
         # The length that the syndic event queue must hit before events are popped off and forwarded
         "syndic_jid_forward_cache_hwm": int,
+        # The number of returns a syndic aggregates before forwarding them without
+        # waiting for syndic_event_forward_timeout
+        "syndic_forward_batch_size": int,
+        # The number of returns a syndic holds in memory before spooling them to disk
+        "syndic_return_buffer_hwm": int,
+        # The maximum size in bytes of the returns a syndic spools to disk
+        "syndic_spool_max_size": int,
+        # Advertise the minions reachable through a syndic to the master of masters
+        "syndic_advertise_minions": bool,
+        # The number of seconds between two advertisements of the syndic minions
+        "syndic_advertise_interval": int,
+        # The grains to include in the syndic minions advertisement
+        "syndic_advertise_grains": list,
+        # Only publish to the syndics which advertised minions matching the target
+        "syndic_target_routing": bool,
         # Salt SSH configuration
         "ssh_passwd": str,
         "ssh_port": str,
@@ -855,11 +908,24 @@ VALID_OPTS = immutabletypes.freeze(
         "zmq_filtering": bool,
         # Connection caching. Can greatly speed up salt performance.
         "con_cache": bool,
+        # Run the batch jobs in a process of the master instead of the clients
+        "batch_server": bool,
         "rotate_aes_key": bool,
         # Cache ZeroMQ connections. Can greatly improve salt performance.
         "cache_sreqs": bool,
         # Can be set to override the python_shell=False default in the cmd module
         "cmd_safe": bool,
+        # The bytes of the head and the tail of the output of a streamed command
+        # which are kept for the return
+        "cmd_stream_head_bytes": int,
+        "cmd_stream_tail_bytes": int,
+        # The bytes or seconds of output of a streamed command fired per event
+        "cmd_stream_event_bytes": int,
+        "cmd_stream_event_interval": float,
+        # Pass the salt-call --local calls to the service started with salt-call --serve
+        "caller_service": bool,
+        # The unix socket of the salt-call service, defaults to a socket in sock_dir
+        "caller_service_socket": (type(None), str),
         # Used by salt-api for master requests timeout
         "rest_timeout": int,
         # If set, all minion exec module actions will be rerouted through sudo as this user
@@ -930,6 +996,8 @@ VALID_OPTS = immutabletypes.freeze(
         # Controls whether beacons are set up before a connection
         # to the master is attempted.
         "beacons_before_connect": bool,
+        # The number of threads running the beacons, 0 runs them in the minion loop
+        "beacons_worker_threads": int,
         # Controls whether the scheduler is set up before a connection
         # to the master is attempted.
         "scheduler_before_connect": bool,
@@ -1239,6 +1307,10 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "return_retry_timer": 5,
         "return_retry_timer_max": 10,
         "return_retry_tries": 3,
+        "return_batch_window": 0,
+        "return_batch_size": 100,
+        "payload_compression": False,
+        "payload_compression_threshold": 1024,
         "random_reauth_delay": 10,
         "winrepo_source_dir": "salt://win/repo-ng/",
         "winrepo_dir": os.path.join(salt.syspaths.BASE_FILE_ROOTS_DIR, "win", "repo"),
@@ -1271,7 +1343,12 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "tcp_keepalive_cnt": -1,
         "tcp_keepalive_intvl": -1,
         "modules_max_memory": -1,
+        "pkg_inventory_cache": True,
+        "file_hash_cache": True,
         "grains_refresh_every": 0,
+        "grains_worker_threads": 0,
+        "grains_function_timeout": 0,
+        "grains_cache_functions": {},
         "minion_id_caching": True,
         "minion_id_lowercase": False,
         "minion_id_remove_domain": False,
@@ -1286,12 +1363,19 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "cluster_mode": False,
         "restart_on_error": False,
         "ping_interval": 0,
+        "job_heartbeat_interval": 5,
         "username": None,
         "password": None,
         "zmq_filtering": False,
         "zmq_monitor": False,
         "cache_sreqs": True,
         "cmd_safe": True,
+        "cmd_stream_head_bytes": 1048576,
+        "cmd_stream_tail_bytes": 1048576,
+        "cmd_stream_event_bytes": 65536,
+        "cmd_stream_event_interval": 1.0,
+        "caller_service": False,
+        "caller_service_socket": None,
         "sudo_user": "",
         "http_connect_timeout": 20.0,  # tornado default - 20 seconds
         "http_request_timeout": 1 * 60 * 60.0,  # 1 hour
@@ -1307,6 +1391,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "ssl": None,
         "multifunc_ordered": False,
         "beacons_before_connect": False,
+        "beacons_worker_threads": 0,
         "scheduler_before_connect": False,
         "cache": "localfs",
         "salt_cp_chunk_size": 65536,
@@ -1345,6 +1430,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "root_dir": salt.syspaths.ROOT_DIR,
         "pki_dir": os.path.join(salt.syspaths.LIB_STATE_DIR, "pki", "master"),
         "key_cache": "",
+        "key_store": "localfs",
+        "key_events_batch": False,
         "cachedir": os.path.join(salt.syspaths.CACHE_DIR, "master"),
         "file_roots": {
             "base": [salt.syspaths.BASE_FILE_ROOTS_DIR, salt.syspaths.SPM_FORMULA_PATH]
@@ -1435,6 +1522,9 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "max_event_size": 1048576,
         "master_stats": False,
         "master_stats_event_iter": 60,
+        "payload_compression": False,
+        "payload_compression_threshold": 1024,
+        "publish_compression": False,
         "minionfs_env": "base",
         "minionfs_mountpoint": "",
         "minionfs_whitelist": [],
@@ -1474,6 +1564,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "keep_acl_in_token": False,
         "eauth_acl_module": "",
         "eauth_tokens": "localfs",
+        "eauth_cache_ttl": 0,
+        "eauth_cache_size": 1000,
         "extension_modules": os.path.join(salt.syspaths.CACHE_DIR, "master", "extmods"),
         "module_dirs": [],
         "file_recv": False,
@@ -1506,6 +1598,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "job_cache_store_endtime": False,
         "minion_data_cache": True,
         "enforce_mine_cache": False,
+        "mine_index": True,
         "ipc_mode": _DFLT_IPC_MODE,
         "ipc_write_buffer": _DFLT_IPC_WBUFFER,
         # various subprocess niceness levels
@@ -1602,8 +1695,16 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "keysize": 2048,
         "transport": "zeromq",
         "gather_job_timeout": 10,
+        "job_heartbeat_batch_interval": 1.0,
         "syndic_event_forward_timeout": 0.5,
         "syndic_jid_forward_cache_hwm": 100,
+        "syndic_forward_batch_size": 1000,
+        "syndic_return_buffer_hwm": 10000,
+        "syndic_spool_max_size": 104857600,
+        "syndic_advertise_minions": False,
+        "syndic_advertise_interval": 60,
+        "syndic_advertise_grains": [],
+        "syndic_target_routing": False,
         "regen_thin": False,
         "ssh_passwd": "",
         "ssh_priv_passwd": "",
@@ -1629,6 +1730,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "zmq_filtering": False,
         "zmq_monitor": False,
         "con_cache": False,
+        "batch_server": False,
         "rotate_aes_key": True,
         "cache_sreqs": True,
         "dummy_pub": False,
@@ -2551,12 +2653,13 @@ def apply_sdb(opts, sdb_opts=None):
     """
     Recurse for sdb:// links for opts
     """
-    # Late load of SDB to keep CLI light
-    import salt.utils.sdb
-
     if sdb_opts is None:
         sdb_opts = opts
     if isinstance(sdb_opts, str) and sdb_opts.startswith("sdb://"):
+        # Late load of SDB to keep CLI light, it loads the loader and is only
+        # needed when the config holds sdb:// links
+        import salt.utils.sdb
+
         return salt.utils.sdb.sdb_get(sdb_opts, opts)
     elif isinstance(sdb_opts, dict):
         for key, value in sdb_opts.items():
@@ -3888,15 +3991,15 @@ def apply_minion_config(
     _update_ssl_config(opts)
     _update_discovery_config(opts)
 
-    if opts["encryption_algorithm"] not in salt.crypt.VALID_ENCRYPTION_ALGORITHMS:
+    if opts["encryption_algorithm"] not in salt.utils.crypt.VALID_ENCRYPTION_ALGORITHMS:
         raise salt.exceptions.SaltConfigurationError(
             f"The encryption algorithm '{opts['encryption_algorithm']}' is not valid. "
-            f"Please specify one of {','.join(salt.crypt.VALID_ENCRYPTION_ALGORITHMS)}."
+            f"Please specify one of {','.join(salt.utils.crypt.VALID_ENCRYPTION_ALGORITHMS)}."
         )
-    if opts["signing_algorithm"] not in salt.crypt.VALID_SIGNING_ALGORITHMS:
+    if opts["signing_algorithm"] not in salt.utils.crypt.VALID_SIGNING_ALGORITHMS:
         raise salt.exceptions.SaltConfigurationError(
             f"The signging algorithm '{opts['signing_algorithm']}' is not valid. "
-            f"Please specify one of {','.join(salt.crypt.VALID_SIGNING_ALGORITHMS)}."
+            f"Please specify one of {','.join(salt.utils.crypt.VALID_SIGNING_ALGORITHMS)}."
         )
 
     # Store original `cachedir` value, before overriding,
@@ -4185,10 +4288,13 @@ def apply_master_config(overrides=None, defaults=None):
     _update_ssl_config(opts)
     _update_discovery_config(opts)
 
-    if opts["publish_signing_algorithm"] not in salt.crypt.VALID_SIGNING_ALGORITHMS:
+    if (
+        opts["publish_signing_algorithm"]
+        not in salt.utils.crypt.VALID_SIGNING_ALGORITHMS
+    ):
         raise salt.exceptions.SaltConfigurationError(
             f"The  publish signging algorithm '{opts['publish_signing_algorithm']}' is not valid. "
-            f"Please specify one of {','.join(salt.crypt.VALID_SIGNING_ALGORITHMS)}."
+            f"Please specify one of {','.join(salt.utils.crypt.VALID_SIGNING_ALGORITHMS)}."
         )
 
     return opts
@@ -21,6 +21,7 @@ import time
 import traceback
 import uuid
 import weakref
+import zlib
 
 import tornado.gen
 
@@ -45,6 +46,21 @@ from salt.exceptions import (
     SaltReqTimeoutError,
     UnsupportedAlgorithm,
 )
+from salt.utils.crypt import (  # pylint: disable=unused-import
+    OAEP,
+    OAEP_SHA1,
+    OAEP_SHA224,
+    SHA1,
+    SHA224,
+    VALID_ENCRYPTION_ALGORITHMS,
+    VALID_HASHES,
+    VALID_PADDING_FOR_ENCRYPTION,
+    VALID_PADDING_FOR_SIGNING,
+    VALID_SIGNING_ALGORITHMS,
+    PKCS1v15,
+    PKCS1v15_SHA1,
+    PKCS1v15_SHA224,
+)
 
 try:
     import cryptography.exceptions
@@ -59,35 +75,6 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
-OAEP = "OAEP"
-PKCS1v15 = "PKCS1v15"
-
-SHA1 = "SHA1"
-SHA224 = "SHA224"
-
-OAEP_SHA1 = f"{OAEP}-{SHA1}"
-OAEP_SHA224 = f"{OAEP}-{SHA224}"
-
-PKCS1v15_SHA1 = f"{PKCS1v15}-{SHA1}"
-PKCS1v15_SHA224 = f"{PKCS1v15}-{SHA224}"
-
-
-VALID_HASHES = (
-    SHA1,
-    SHA224,
-)
-
-VALID_PADDING_FOR_SIGNING = (PKCS1v15,)
-VALID_PADDING_FOR_ENCRYPTION = (OAEP,)
-VALID_ENCRYPTION_ALGORITHMS = (
-    OAEP_SHA1,
-    OAEP_SHA224,
-)
-VALID_SIGNING_ALGORITHMS = (
-    PKCS1v15_SHA1,
-    PKCS1v15_SHA224,
-)
-
 
 def fips_enabled():
     if HAS_CRYPTOGRAPHY:
@@ -1064,6 +1051,8 @@ class AsyncAuth:
                     self._finger_fail(self.opts["master_finger"], m_pub_fn)
 
         auth["publish_port"] = payload["publish_port"]
+        # The payload compression the master agreed on, if any
+        auth["compression"] = payload.get("compression")
         return auth
 
     def get_keys(self):
@@ -1115,6 +1104,8 @@ class AsyncAuth:
         payload["nonce"] = uuid.uuid4().hex
         payload["enc_algo"] = self.opts["encryption_algorithm"]
         payload["sig_algo"] = self.opts["signing_algorithm"]
+        if self.opts.get("payload_compression", False):
+            payload["compression"] = ["zlib"]
         if "autosign_grains" in self.opts:
             autosign_grains = {}
             for grain in self.opts["autosign_grains"]:
@@ -1609,14 +1600,28 @@ class Crypticle:
     """
 
     PICKLE_PAD = b"pickle::"
+    # Marks payloads which were zlib compressed after serialization. It is as
+    # long as PICKLE_PAD so the nonce is found at the same offset.
+    ZLIB_PAD = b"pickle:z"
     AES_BLOCK_SIZE = 16
     SIG_SIZE = hashlib.sha256().digest_size
 
+    # Process wide payload compression counters, see payload_compression
+    compression_stats = {
+        "compressed": 0,
+        "raw_bytes": 0,
+        "compressed_bytes": 0,
+        "compress_time": 0.0,
+        "decompressed": 0,
+        "decompress_time": 0.0,
+    }
+
     def __init__(self, opts, key_string, key_size=192, serial=0):
         self.key_string = key_string
         self.keys = self.extract_keys(self.key_string, key_size)
         self.key_size = key_size
         self.serial = serial
+        self.compression_threshold = opts.get("payload_compression_threshold", 1024)
 
     @classmethod
     def generate_key_string(cls, key_size=192, **kwargs):
@@ -1692,14 +1697,30 @@ class Crypticle:
         data = decryptor.update(data) + decryptor.finalize()
         return data[: -data[-1]]
 
-    def dumps(self, obj, nonce=None):
+    def dumps(self, obj, nonce=None, compress=False):
         """
         Serialize and encrypt a python object
+
+        When ``compress`` is ``True``, serialized objects of at least
+        ``payload_compression_threshold`` bytes are compressed before being
+        encrypted. Only pass ``compress=True`` when the receiving end is known
+        to support compressed payloads.
         """
+        pad = self.PICKLE_PAD
+        data = salt.payload.dumps(obj)
+        if compress and len(data) >= self.compression_threshold:
+            start = time.perf_counter()
+            compressed = zlib.compress(data, 6)
+            stats = self.compression_stats
+            stats["compress_time"] += time.perf_counter() - start
+            stats["compressed"] += 1
+            stats["raw_bytes"] += len(data)
+            stats["compressed_bytes"] += len(compressed)
+            pad, data = self.ZLIB_PAD, compressed
         if nonce:
-            toencrypt = self.PICKLE_PAD + nonce.encode() + salt.payload.dumps(obj)
+            toencrypt = pad + nonce.encode() + data
         else:
-            toencrypt = self.PICKLE_PAD + salt.payload.dumps(obj)
+            toencrypt = pad + data
         return self.encrypt(toencrypt)
 
     def loads(self, data, raw=False, nonce=None):
@@ -1708,7 +1729,8 @@ class Crypticle:
         """
         data = self.decrypt(data)
         # simple integrity check to verify that we got meaningful data
-        if not data.startswith(self.PICKLE_PAD):
+        compressed = data.startswith(self.ZLIB_PAD)
+        if not compressed and not data.startswith(self.PICKLE_PAD):
             return {}
         data = data[len(self.PICKLE_PAD) :]
         if nonce:
@@ -1716,6 +1738,15 @@ class Crypticle:
             data = data[32:]
             if ret_nonce != nonce:
                 raise SaltClientError(f"Nonce verification error {ret_nonce} {nonce}")
+        if compressed:
+            start = time.perf_counter()
+            try:
+                data = zlib.decompress(data)
+            except zlib.error:
+                log.error("Failed to decompress a payload")
+                return {}
+            self.compression_stats["decompress_time"] += time.perf_counter() - start
+            self.compression_stats["decompressed"] += 1
         payload = salt.payload.loads(data, raw=raw)
         if isinstance(payload, dict):
             if "serial" in payload:
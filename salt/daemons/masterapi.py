@@ -602,47 +602,76 @@ class RemoteFuncs:
         _res = checker.check_minions(load["tgt"], match_type, greedy=False)
         minions = _res["minions"]
         minion_side_acl = {}  # Cache minion-side ACL
+        for minion, function, mine_entry in self._mine_entries(
+            minions, functions_allowed
+        ):
+            mine_result = mine_entry
+            if (
+                isinstance(mine_entry, dict)
+                and salt.utils.mine.MINE_ITEM_ACL_ID in mine_entry
+            ):
+                mine_result = mine_entry[salt.utils.mine.MINE_ITEM_ACL_DATA]
+                # Check and fill minion-side ACL cache
+                if function not in minion_side_acl.get(minion, {}):
+                    if "allow_tgt" in mine_entry:
+                        # Only determine allowed targets if any have been specified.
+                        # This prevents having to add a list of all minions as allowed targets.
+                        get_minion = checker.check_minions(
+                            mine_entry["allow_tgt"],
+                            mine_entry.get("allow_tgt_type", "glob"),
+                        )["minions"]
+                        # the minion in allow_tgt does not exist
+                        if not get_minion:
+                            continue
+                        salt.utils.dictupdate.set_dict_key_value(
+                            minion_side_acl,
+                            f"{minion}:{function}",
+                            get_minion,
+                        )
+            if salt.utils.mine.minion_side_acl_denied(
+                minion_side_acl, minion, function, load["id"]
+            ):
+                continue
+            if _ret_dict:
+                ret.setdefault(function, {})[minion] = mine_result
+            else:
+                # There is only one function in functions_allowed.
+                ret[minion] = mine_result
+        return ret
+
+    def _mine_entries(self, minions, functions):
+        """
+        Yield the ``(minion, function, mine_entry)`` mine entries of the
+        functions for the targeted minions
+        """
+        if salt.utils.mine.mine_index_enabled(self.opts):
+            # Only the entries of the requested functions are read
+            mine_index = salt.utils.mine.fetch_mine_index(
+                self.opts, self.cache, functions, minions
+            )
+            for function, mine_entries in mine_index.items():
+                for minion, mine_entry in mine_entries.items():
+                    yield minion, function, mine_entry
+            return
         for minion in minions:
             mine_data = self.cache.fetch(f"minions/{minion}", "mine")
             if not isinstance(mine_data, dict):
                 continue
-            for function in functions_allowed:
-                if function not in mine_data:
-                    continue
-                mine_entry = mine_data[function]
-                mine_result = mine_data[function]
-                if (
-                    isinstance(mine_entry, dict)
-                    and salt.utils.mine.MINE_ITEM_ACL_ID in mine_entry
-                ):
-                    mine_result = mine_entry[salt.utils.mine.MINE_ITEM_ACL_DATA]
-                    # Check and fill minion-side ACL cache
-                    if function not in minion_side_acl.get(minion, {}):
-                        if "allow_tgt" in mine_entry:
-                            # Only determine allowed targets if any have been specified.
-                            # This prevents having to add a list of all minions as allowed targets.
-                            get_minion = checker.check_minions(
-                                mine_entry["allow_tgt"],
-                                mine_entry.get("allow_tgt_type", "glob"),
-                            )["minions"]
-                            # the minion in allow_tgt does not exist
-                            if not get_minion:
-                                continue
-                            salt.utils.dictupdate.set_dict_key_value(
-                                minion_side_acl,
-                                f"{minion}:{function}",
-                                get_minion,
-                            )
-                if salt.utils.mine.minion_side_acl_denied(
-                    minion_side_acl, minion, function, load["id"]
-                ):
-                    continue
-                if _ret_dict:
-                    ret.setdefault(function, {})[minion] = mine_result
-                else:
-                    # There is only one function in functions_allowed.
-                    ret[minion] = mine_result
-        return ret
+            for function in functions:
+                if function in mine_data:
+                    yield minion, function, mine_data[function]
+
+    def _update_mine_index(self, minion_id, old_data, new_data):
+        """
+        Keep the mine index in line with the mine data of a minion, or drop it
+        when it is disabled so that it is rebuilt once enabled again
+        """
+        if salt.utils.mine.mine_index_enabled(self.opts):
+            salt.utils.mine.update_mine_index(
+                self.opts, self.cache, minion_id, old_data, new_data
+            )
+        else:
+            salt.utils.mine.clear_mine_index(self.opts, self.cache)
 
     def _mine(self, load, skip_verify=False):
         """
@@ -656,12 +685,12 @@ class RemoteFuncs:
         ):
             cbank = "minions/{}".format(load["id"])
             ckey = "mine"
-            new_data = load["data"]
-            if not load.get("clear", False):
-                data = self.cache.fetch(cbank, ckey)
-                if isinstance(data, dict):
-                    data.update(new_data)
+            old_data = self.cache.fetch(cbank, ckey)
+            data = load["data"]
+            if not load.get("clear", False) and isinstance(old_data, dict):
+                data = dict(old_data, **data)
             self.cache.store(cbank, ckey, data)
+            self._update_mine_index(load["id"], old_data, data)
         return True
 
     def _mine_delete(self, load):
@@ -680,8 +709,10 @@ class RemoteFuncs:
                 if not isinstance(data, dict):
                     return False
                 if load["fun"] in data:
+                    old_data = dict(data)
                     del data[load["fun"]]
                     self.cache.store(cbank, ckey, data)
+                    self._update_mine_index(load["id"], old_data, data)
             except OSError:
                 return False
         return True
@@ -695,7 +726,35 @@ class RemoteFuncs:
         if self.opts.get("minion_data_cache", False) or self.opts.get(
             "enforce_mine_cache", False
         ):
-            return self.cache.flush("minions/{}".format(load["id"]), "mine")
+            cbank = "minions/{}".format(load["id"])
+            old_data = self.cache.fetch(cbank, "mine")
+            ret = self.cache.flush(cbank, "mine")
+            self._update_mine_index(load["id"], old_data, {})
+            return ret
+        return True
+
+    def _syndic_minions(self, load, skip_verify=False):
+        """
+        Store the summary of the minions a syndic is able to reach, used to
+        route publications to the syndics only when they can match
+        """
+        if not skip_verify:
+            if "id" not in load or "minions" not in load:
+                return False
+        if not isinstance(load["minions"], list):
+            return False
+        grains = load.get("grains")
+        self.cache.store(
+            "syndic_minions",
+            load["id"],
+            {
+                "minions": load["minions"],
+                "grain_names": list(load.get("grain_names") or []),
+                "grains": grains if isinstance(grains, dict) else {},
+                # Lets the master of masters ignore outdated summaries
+                "stamp": time.time(),
+            },
+        )
         return True
 
     def _file_recv(self, load):
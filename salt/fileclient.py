@@ -312,6 +312,25 @@ class Client:
         """
         return []
 
+    def file_manifest(self, saltenv="base", prefix=""):
+        """
+        Return the hash sum and stat result of each file under prefix, keyed
+        by the path of the file
+        """
+        ret = {}
+        for path in self.file_list(saltenv, prefix):
+            hash_result, stat_result = self.hash_and_stat_file(
+                salt.utils.url.create(path), saltenv
+            )
+            if not hash_result:
+                continue
+            ret[path] = {
+                "hsum": hash_result["hsum"],
+                "hash_type": hash_result["hash_type"],
+                "stat": stat_result,
+            }
+        return ret
+
     def symlink_list(self, saltenv="base", prefix=""):
         """
         This function must be overwritten
@@ -1362,6 +1381,16 @@ class RemoteClient(Client):
             load,
         )
 
+    def file_manifest(self, saltenv="base", prefix=""):
+        """
+        Return the hash sum and stat result of each file on the master under
+        prefix, in a single request
+        """
+        load = {"saltenv": saltenv, "prefix": prefix, "cmd": "_file_manifest"}
+        return self._channel_send(
+            load,
+        )
+
     def file_list_emptydirs(self, saltenv="base", prefix=""):
         """
         List the empty dirs on the master
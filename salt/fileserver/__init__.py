@@ -773,6 +773,35 @@ class Fileserver:
             ret = [f for f in ret if f.startswith(prefix)]
         return sorted(ret)
 
+    @ensure_unicode_args
+    def file_manifest(self, load):
+        """
+        Return the hash sum and stat result of each file from the dominant
+        environment, so a client can compare a whole directory at once
+        """
+        if "env" in load:
+            # "env" is not supported; Use "saltenv".
+            load.pop("env")
+
+        ret = {}
+        if "saltenv" not in load:
+            return ret
+        if not isinstance(load["saltenv"], str):
+            load["saltenv"] = str(load["saltenv"])
+
+        for path in self.file_list(dict(load)):
+            hash_result, stat_result = self.file_hash_and_stat(
+                {"path": path, "saltenv": load["saltenv"]}
+            )
+            if not hash_result:
+                continue
+            ret[path] = {
+                "hsum": hash_result["hsum"],
+                "hash_type": hash_result["hash_type"],
+                "stat": stat_result,
+            }
+        return ret
+
     @ensure_unicode_args
     def file_list_emptydirs(self, load):
         """
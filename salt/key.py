@@ -22,8 +22,10 @@ import salt.utils.data
 import salt.utils.event
 import salt.utils.files
 import salt.utils.json
+import salt.utils.keystore
 import salt.utils.kinds
 import salt.utils.master
+import salt.utils.mine
 import salt.utils.sdb
 import salt.utils.stringutils
 import salt.utils.user
@@ -328,6 +330,21 @@ class Key:
         self.passphrase = salt.utils.sdb.sdb_get(
             self.opts.get("signing_key_pass"), self.opts
         )
+        self.store = salt.utils.keystore.get_key_store(self.opts, self.pki_dir)
+
+    def _fire_events(self, act, keys):
+        """
+        Fire the events of the keys accepted, rejected or deleted, one event
+        for all of them when ``key_events_batch`` is set
+        """
+        if not keys:
+            return
+        tag = salt.utils.event.tagify(prefix="key")
+        if self.opts.get("key_events_batch"):
+            self.event.fire_event({"result": True, "act": act, "ids": keys}, tag)
+            return
+        for key in keys:
+            self.event.fire_event({"result": True, "act": act, "id": key}, tag)
 
     def _check_minions_directories(self):
         """
@@ -447,10 +464,12 @@ class Key:
         for key, val in keys.items():
             minions.extend(val)
         if not self.opts.get("preserve_minion_cache", False):
+            removed = False
             m_cache = os.path.join(self.opts["cachedir"], self.ACC)
             if os.path.isdir(m_cache):
                 for minion in os.listdir(m_cache):
                     if minion not in minions and minion not in preserve_minions:
+                        removed = True
                         try:
                             shutil.rmtree(os.path.join(m_cache, minion))
                         except OSError as ex:
@@ -465,7 +484,12 @@ class Key:
             if clist:
                 for minion in clist:
                     if minion not in minions and minion not in preserve_minions:
+                        removed = True
                         cache.flush(f"{self.ACC}/{minion}")
+            if removed:
+                # The mine data of the removed minions is gone, rebuild the
+                # mine index from what is left on its next use
+                salt.utils.mine.clear_mine_index(self.opts, cache)
 
     def check_master(self):
         """
@@ -482,26 +506,16 @@ class Key:
         """
         Accept a glob which to match the of a key and return the key's location
         """
+        ret = self.store.match(match)
         if full:
-            matches = self.all_keys()
-        else:
-            matches = self.list_keys()
-        ret = {}
-        if "," in match and isinstance(match, str):
-            match = match.split(",")
-        for status, keys in matches.items():
-            for key in salt.utils.data.sorted_ignorecase(keys):
-                if isinstance(match, list):
-                    for match_item in match:
-                        if fnmatch.fnmatch(key, match_item):
-                            if status not in ret:
-                                ret[status] = []
-                            ret[status].append(key)
-                else:
-                    if fnmatch.fnmatch(key, match):
-                        if status not in ret:
-                            ret[status] = []
-                        ret[status].append(key)
+            globs = salt.utils.keystore.split_match(match)
+            local = [
+                key
+                for key in self.local_keys()["local"]
+                if any(fnmatch.fnmatch(key, glob) for glob in globs)
+            ]
+            if local:
+                ret["local"] = local
         return ret
 
     def dict_match(self, match_dict):
@@ -511,10 +525,13 @@ class Key:
         """
         ret = {}
         cur_keys = self.list_keys()
+        cur_ids = {keydir: set(keys) for keydir, keys in cur_keys.items()}
         for status, keys in match_dict.items():
             for key in salt.utils.data.sorted_ignorecase(keys):
                 for keydir in (self.ACC, self.PEND, self.REJ, self.DEN):
-                    if keydir and fnmatch.filter(cur_keys.get(keydir, []), key):
+                    if key in cur_ids.get(keydir, ()) or fnmatch.filter(
+                        cur_keys.get(keydir, []), key
+                    ):
                         ret.setdefault(keydir, []).append(key)
         return ret
 
@@ -533,24 +550,7 @@ class Key:
         """
         Return a dict of managed keys and what the key status are
         """
-        key_dirs = self._check_minions_directories()
-
-        ret = {}
-
-        for dir_ in key_dirs:
-            if dir_ is None:
-                continue
-            ret[os.path.basename(dir_)] = []
-            try:
-                for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(dir_)):
-                    if not fn_.startswith("."):
-                        ret[os.path.basename(dir_)].append(
-                            salt.utils.stringutils.to_unicode(fn_)
-                        )
-            except OSError:
-                # key dir kind is not created yet, just skip
-                continue
-        return ret
+        return self.store.list_keys((self.ACC, self.PEND, self.REJ, self.DEN))
 
     def all_keys(self):
         """
@@ -564,31 +564,19 @@ class Key:
         """
         Return a dict of managed keys under a named status
         """
-        acc, pre, rej, den = self._check_minions_directories()
-        ret = {}
         if match.startswith("acc"):
-            ret[os.path.basename(acc)] = []
-            for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(acc)):
-                if not fn_.startswith("."):
-                    ret[os.path.basename(acc)].append(fn_)
+            status = self.ACC
         elif match.startswith("pre") or match.startswith("un"):
-            ret[os.path.basename(pre)] = []
-            for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(pre)):
-                if not fn_.startswith("."):
-                    ret[os.path.basename(pre)].append(fn_)
+            status = self.PEND
         elif match.startswith("rej"):
-            ret[os.path.basename(rej)] = []
-            for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(rej)):
-                if not fn_.startswith("."):
-                    ret[os.path.basename(rej)].append(fn_)
-        elif match.startswith("den") and den is not None:
-            ret[os.path.basename(den)] = []
-            for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(den)):
-                if not fn_.startswith("."):
-                    ret[os.path.basename(den)].append(fn_)
+            status = self.REJ
+        elif match.startswith("den"):
+            status = self.DEN
         elif match.startswith("all"):
             return self.all_keys()
-        return ret
+        else:
+            return {}
+        return {status: self.store.list_state(status)}
 
     def key_str(self, match):
         """
@@ -598,9 +586,7 @@ class Key:
         for status, keys in self.name_match(match).items():
             ret[status] = {}
             for key in salt.utils.data.sorted_ignorecase(keys):
-                path = os.path.join(self.pki_dir, status, key)
-                with salt.utils.files.fopen(path, "r") as fp_:
-                    ret[status][key] = salt.utils.stringutils.to_unicode(fp_.read())
+                ret[status][key] = self.store.read(status, key)
         return ret
 
     def key_str_all(self):
@@ -611,9 +597,7 @@ class Key:
         for status, keys in self.list_keys().items():
             ret[status] = {}
             for key in salt.utils.data.sorted_ignorecase(keys):
-                path = os.path.join(self.pki_dir, status, key)
-                with salt.utils.files.fopen(path, "r") as fp_:
-                    ret[status][key] = salt.utils.stringutils.to_unicode(fp_.read())
+                ret[status][key] = self.store.read(status, key)
         return ret
 
     def accept(
@@ -636,23 +620,18 @@ class Key:
             keydirs.append(self.DEN)
         invalid_keys = []
         for keydir in keydirs:
+            valid_keys = []
             for key in matches.get(keydir, []):
-                key_path = os.path.join(self.pki_dir, keydir, key)
                 try:
-                    salt.crypt.get_rsa_pub_key(key_path)
+                    salt.crypt.get_rsa_pub_key(self.store.path(keydir, key))
                 except salt.exceptions.InvalidKeyError:
                     log.error("Invalid RSA public key: %s", key)
                     invalid_keys.append((keydir, key))
                     continue
-                try:
-                    shutil.move(
-                        key_path,
-                        os.path.join(self.pki_dir, self.ACC, key),
-                    )
-                    eload = {"result": True, "act": "accept", "id": key}
-                    self.event.fire_event(eload, salt.utils.event.tagify(prefix="key"))
                 except OSError:
-                    pass
+                    continue
+                valid_keys.append(key)
+            self._fire_events("accept", self.store.move(valid_keys, keydir, self.ACC))
         for keydir, key in invalid_keys:
             matches[keydir].remove(key)
             sys.stderr.write(f"Unable to accept invalid key for {key}.\n")
@@ -662,17 +641,8 @@ class Key:
         """
         Accept all keys in pre
         """
-        keys = self.list_keys()
-        for key in keys[self.PEND]:
-            try:
-                shutil.move(
-                    os.path.join(self.pki_dir, self.PEND, key),
-                    os.path.join(self.pki_dir, self.ACC, key),
-                )
-                eload = {"result": True, "act": "accept", "id": key}
-                self.event.fire_event(eload, salt.utils.event.tagify(prefix="key"))
-            except OSError:
-                pass
+        keys = self.store.list_state(self.PEND)
+        self._fire_events("accept", self.store.move(keys, self.PEND, self.ACC))
         return self.list_keys()
 
     def delete_key(
@@ -692,32 +662,25 @@ class Key:
             matches = {}
         with salt.client.get_local_client(mopts=self.opts) as client:
             for status, keys in matches.items():
-                for key in keys:
-                    try:
-                        if revoke_auth:
-                            if self.opts.get("rotate_aes_key") is False:
+                if revoke_auth:
+                    for key in keys:
+                        if self.opts.get("rotate_aes_key") is False:
+                            print(
+                                "Immediate auth revocation specified but AES key"
+                                " rotation not allowed. Minion will not be"
+                                " disconnected until the master AES key is rotated."
+                            )
+                        else:
+                            try:
+                                client.cmd_async(key, "saltutil.revoke_auth")
+                            except salt.exceptions.SaltClientError:
                                 print(
-                                    "Immediate auth revocation specified but AES key"
-                                    " rotation not allowed. Minion will not be"
-                                    " disconnected until the master AES key is rotated."
+                                    "Cannot contact Salt master. "
+                                    "Connection for {} will remain up until "
+                                    "master AES key is rotated or auth is revoked "
+                                    "with 'saltutil.revoke_auth'.".format(key)
                                 )
-                            else:
-                                try:
-                                    client.cmd_async(key, "saltutil.revoke_auth")
-                                except salt.exceptions.SaltClientError:
-                                    print(
-                                        "Cannot contact Salt master. "
-                                        "Connection for {} will remain up until "
-                                        "master AES key is rotated or auth is revoked "
-                                        "with 'saltutil.revoke_auth'.".format(key)
-                                    )
-                        os.remove(os.path.join(self.pki_dir, status, key))
-                        eload = {"result": True, "act": "delete", "id": key}
-                        self.event.fire_event(
-                            eload, salt.utils.event.tagify(prefix="key")
-                        )
-                    except OSError:
-                        pass
+                self._fire_events("delete", self.store.delete(status, keys))
         if self.opts.get("preserve_minions") is True:
             self.check_minion_cache(preserve_minions=matches.get("minions", []))
         else:
@@ -732,15 +695,8 @@ class Key:
         """
         Delete all denied keys
         """
-        keys = self.list_keys()
-        for status, keys in self.list_keys().items():
-            for key in keys[self.DEN]:
-                try:
-                    os.remove(os.path.join(self.pki_dir, status, key))
-                    eload = {"result": True, "act": "delete", "id": key}
-                    self.event.fire_event(eload, salt.utils.event.tagify(prefix="key"))
-                except OSError:
-                    pass
+        keys = self.store.list_state(self.DEN)
+        self._fire_events("delete", self.store.delete(self.DEN, keys))
         self.check_minion_cache()
         return self.list_keys()
 
@@ -749,13 +705,7 @@ class Key:
         Delete all keys
         """
         for status, keys in self.list_keys().items():
-            for key in keys:
-                try:
-                    os.remove(os.path.join(self.pki_dir, status, key))
-                    eload = {"result": True, "act": "delete", "id": key}
-                    self.event.fire_event(eload, salt.utils.event.tagify(prefix="key"))
-                except OSError:
-                    pass
+            self._fire_events("delete", self.store.delete(status, keys))
         self.check_minion_cache()
         if self.opts.get("rotate_aes_key"):
             salt.crypt.dropfile(
@@ -782,16 +732,8 @@ class Key:
         if include_denied:
             keydirs.append(self.DEN)
         for keydir in keydirs:
-            for key in matches.get(keydir, []):
-                try:
-                    shutil.move(
-                        os.path.join(self.pki_dir, keydir, key),
-                        os.path.join(self.pki_dir, self.REJ, key),
-                    )
-                    eload = {"result": True, "act": "reject", "id": key}
-                    self.event.fire_event(eload, salt.utils.event.tagify(prefix="key"))
-                except OSError:
-                    pass
+            moved = self.store.move(matches.get(keydir, []), keydir, self.REJ)
+            self._fire_events("reject", moved)
         self.check_minion_cache()
         if self.opts.get("rotate_aes_key"):
             salt.crypt.dropfile(
@@ -803,17 +745,8 @@ class Key:
         """
         Reject all keys in pre
         """
-        keys = self.list_keys()
-        for key in keys[self.PEND]:
-            try:
-                shutil.move(
-                    os.path.join(self.pki_dir, self.PEND, key),
-                    os.path.join(self.pki_dir, self.REJ, key),
-                )
-                eload = {"result": True, "act": "reject", "id": key}
-                self.event.fire_event(eload, salt.utils.event.tagify(prefix="key"))
-            except OSError:
-                pass
+        keys = self.store.list_state(self.PEND)
+        self._fire_events("reject", self.store.move(keys, self.PEND, self.REJ))
         self.check_minion_cache()
         if self.opts.get("rotate_aes_key"):
             salt.crypt.dropfile(
@@ -4,7 +4,10 @@ directories for python loadable code and organizes the code into the
 plugin interfaces used by Salt.
 """
 
+import concurrent.futures
 import contextlib
+import copy
+import fnmatch
 import inspect
 import logging
 import os
@@ -26,7 +29,7 @@ import salt.utils.odict
 import salt.utils.platform
 import salt.utils.stringutils
 import salt.utils.versions
-from salt.exceptions import LoaderError
+from salt.exceptions import LoaderError, SaltDeserializationError
 from salt.template import check_render_pipe_str
 from salt.utils import entrypoints
 
@@ -1069,6 +1072,150 @@ def _load_cached_grains(opts, cfn):
         return None
 
 
+def grains_timing(opts):
+    """
+    Return the execution time in seconds of each grain function during the
+    last collection of the grains, ``None`` for the grains served from the
+    per-function cache. See ``grains_cache_functions``.
+    """
+    try:
+        with salt.utils.files.fopen(
+            os.path.join(opts["cachedir"], "grains.timing.p"), "rb"
+        ) as fp_:
+            return salt.payload.load(fp_)
+    except (OSError, SaltDeserializationError):
+        return {}
+
+
+class _GrainFuncRunner:
+    """
+    Run the grain functions, concurrently in a thread pool when
+    ``grains_worker_threads`` is set, and serve the functions listed in
+    ``grains_cache_functions`` from their own cache entry until it expires.
+    """
+
+    def __init__(self, opts, funcs):
+        self.opts = opts
+        self.funcs = funcs
+        self.timeout = opts.get("grains_function_timeout") or None
+        self.ttls = opts.get("grains_cache_functions") or {}
+        self.cache_file = os.path.join(opts["cachedir"], "grains.functions.cache.p")
+        self.cache = self._load_cache() if self.ttls else {}
+        self.cache_updated = False
+        self.timing = {}
+        self.futures = {}
+        self.executor = None
+        if opts.get("grains_worker_threads"):
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=opts["grains_worker_threads"],
+                thread_name_prefix="grains",
+            )
+
+    def _load_cache(self):
+        try:
+            with salt.utils.files.fopen(self.cache_file, "rb") as fp_:
+                cache = salt.payload.load(fp_)
+        except (OSError, SaltDeserializationError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _ttl(self, key):
+        for pattern, ttl in self.ttls.items():
+            if fnmatch.fnmatch(key, pattern):
+                return ttl
+        return None
+
+    def _cached(self, key):
+        ttl = self._ttl(key)
+        if ttl is None or key not in self.cache:
+            return None
+        entry = self.cache[key]
+        # A TTL of 0 never expires
+        if ttl and time.time() - entry["time"] > ttl:
+            return None
+        return entry
+
+    def _call(self, key, kwargs):
+        start = time.monotonic()
+        try:
+            return self.funcs[key](**kwargs)
+        finally:
+            self.timing[key] = time.monotonic() - start
+
+    def submit(self, key, kwargs=None):
+        """
+        Start running a grain function in the thread pool
+        """
+        if self.executor is None or self._cached(key) is not None:
+            return
+        # Resolve the function in this thread, the loader is not thread safe
+        func = self.funcs[key]
+        self.futures[key] = self.executor.submit(
+            self._call, key, {} if kwargs is None else kwargs
+        )
+        log.trace("Started %s grain function %s", key, func)
+
+    def result(self, key, kwargs=None):
+        """
+        Return the data of a grain function
+        """
+        entry = self._cached(key)
+        if entry is not None:
+            log.trace("Loading %s grain from the cache", key)
+            self.timing[key] = None
+            return copy.deepcopy(entry["data"])
+        if key in self.futures:
+            try:
+                ret = self.futures.pop(key).result(timeout=self.timeout)
+            except concurrent.futures.TimeoutError:
+                log.error(
+                    "The %s grain function did not complete within %s seconds, "
+                    "its grains are not available",
+                    key,
+                    self.timeout,
+                )
+                return None
+        else:
+            ret = self._call(key, {} if kwargs is None else kwargs)
+        if self._ttl(key) is not None and isinstance(ret, dict):
+            self.cache[key] = {"time": time.time(), "data": copy.deepcopy(ret)}
+            self.cache_updated = True
+        return ret
+
+    def close(self):
+        """
+        Stop the thread pool, save the per-function cache and the timing
+        report
+        """
+        if self.executor is not None:
+            for future in self.futures.values():
+                future.cancel()
+            self.executor.shutdown(wait=False)
+        if self.timing:
+            slowest = sorted(
+                (item for item in self.timing.items() if item[1] is not None),
+                key=lambda item: item[1],
+                reverse=True,
+            )[:5]
+            log.debug(
+                "Slowest grain functions: %s",
+                ", ".join(f"{key} ({duration:.3f}s)" for key, duration in slowest),
+            )
+        for name, data, updated in (
+            ("grains.functions.cache.p", self.cache, self.cache_updated),
+            ("grains.timing.p", self.timing, bool(self.timing)),
+        ):
+            if not updated:
+                continue
+            path = os.path.join(self.opts["cachedir"], name)
+            try:
+                with salt.utils.files.set_umask(0o077):
+                    with salt.utils.files.fopen(path, "w+b") as fp_:
+                        salt.payload.dump(data, fp_)
+            except (OSError, TypeError) as exc:
+                log.debug("Unable to write %s: %s", path, exc)
+
+
 def grains(opts, force_refresh=False, proxy=None, context=None, loaded_base_name=None):
     """
     Return the functions for the dynamic grains and the values for the static
@@ -1144,31 +1291,17 @@ def grains(opts, force_refresh=False, proxy=None, context=None, loaded_base_name
     )
     if force_refresh:  # if we refresh, lets reload grain modules
         funcs.clear()
-    # Run core grains
-    for key in funcs:
-        if not key.startswith("core."):
-            continue
-        log.trace("Loading %s grain", key)
-        ret = funcs[key]()
-        if not isinstance(ret, dict):
-            continue
-        if blist:
-            for key in list(ret):
-                for block in blist:
-                    if salt.utils.stringutils.expr_match(key, block):
-                        del ret[key]
-                        log.trace("Filtering %s grain", key)
-            if not ret:
-                continue
-        if grains_deep_merge:
-            salt.utils.dictupdate.update(grains_data, ret)
-        else:
-            grains_data.update(ret)
-
-    # Run the rest of the grains
-    for key in funcs:
-        if key.startswith("core.") or key == "_errors":
-            continue
+    core_keys = [key for key in funcs if key.startswith("core.")]
+    other_keys = [
+        key for key in funcs if not key.startswith("core.") and key != "_errors"
+    ]
+    runner = _GrainFuncRunner(opts, funcs)
+    # Grain functions which do not depend on the grains collected before them
+    # run in the thread pool when grains_worker_threads is set
+    for key in core_keys:
+        runner.submit(key)
+    other_kwargs = {}
+    for key in other_keys:
         try:
             # Grains are loaded too early to take advantage of the injected
             # __proxy__ variable.  Pass an instance of that LazyLoader
@@ -1176,41 +1309,74 @@ def grains(opts, force_refresh=False, proxy=None, context=None, loaded_base_name
             # one parameter.  Then the grains can have access to the
             # proxymodule for retrieving information from the connected
             # device.
-            log.trace("Loading %s grain", key)
             parameters = inspect.signature(funcs[key]).parameters
-            kwargs = {}
-            if "proxy" in parameters:
-                kwargs["proxy"] = proxy
-            if "grains" in parameters:
-                kwargs["grains"] = grains_data
-            ret = funcs[key](**kwargs)
         except Exception:  # pylint: disable=broad-except
-            if salt.utils.platform.is_proxy():
-                log.info(
-                    "The following CRITICAL message may not be an error; the proxy may not be completely established yet."
-                )
-            log.critical(
-                "Failed to load grains defined in grain file %s in "
-                "function %s, error:\n",
-                key,
-                funcs[key],
-                exc_info=True,
-            )
-            continue
-        if not isinstance(ret, dict):
+            # Reported when the function is called below
             continue
-        if blist:
-            for key in list(ret):
-                for block in blist:
-                    if salt.utils.stringutils.expr_match(key, block):
-                        del ret[key]
-                        log.trace("Filtering %s grain", key)
-            if not ret:
+        kwargs = {}
+        if "proxy" in parameters:
+            kwargs["proxy"] = proxy
+        if "grains" not in parameters:
+            runner.submit(key, kwargs)
+        other_kwargs[key] = ("grains" in parameters, kwargs)
+
+    try:
+        # Run core grains
+        for key in core_keys:
+            log.trace("Loading %s grain", key)
+            ret = runner.result(key)
+            if not isinstance(ret, dict):
                 continue
-        if grains_deep_merge:
-            salt.utils.dictupdate.update(grains_data, ret)
-        else:
-            grains_data.update(ret)
+            if blist:
+                for key in list(ret):
+                    for block in blist:
+                        if salt.utils.stringutils.expr_match(key, block):
+                            del ret[key]
+                            log.trace("Filtering %s grain", key)
+                if not ret:
+                    continue
+            if grains_deep_merge:
+                salt.utils.dictupdate.update(grains_data, ret)
+            else:
+                grains_data.update(ret)
+
+        # Run the rest of the grains
+        for key in other_keys:
+            try:
+                log.trace("Loading %s grain", key)
+                needs_grains, kwargs = other_kwargs.get(key, (False, {}))
+                if needs_grains:
+                    kwargs = dict(kwargs, grains=grains_data)
+                ret = runner.result(key, kwargs)
+            except Exception:  # pylint: disable=broad-except
+                if salt.utils.platform.is_proxy():
+                    log.info(
+                        "The following CRITICAL message may not be an error; the proxy may not be completely established yet."
+                    )
+                log.critical(
+                    "Failed to load grains defined in grain file %s in "
+                    "function %s, error:\n",
+                    key,
+                    funcs[key],
+                    exc_info=True,
+                )
+                continue
+            if not isinstance(ret, dict):
+                continue
+            if blist:
+                for key in list(ret):
+                    for block in blist:
+                        if salt.utils.stringutils.expr_match(key, block):
+                            del ret[key]
+                            log.trace("Filtering %s grain", key)
+                if not ret:
+                    continue
+            if grains_deep_merge:
+                salt.utils.dictupdate.update(grains_data, ret)
+            else:
+                grains_data.update(ret)
+    finally:
+        runner.close()
 
     if opts.get("proxy_merge_grains_in_module", True) and proxy:
         try:
@@ -38,6 +38,7 @@ import salt.serializers.msgpack
 import salt.state
 import salt.utils.args
 import salt.utils.atomicfile
+import salt.utils.batch
 import salt.utils.ctx
 import salt.utils.event
 import salt.utils.files
@@ -45,6 +46,7 @@ import salt.utils.gitfs
 import salt.utils.gzip_util
 import salt.utils.jid
 import salt.utils.job
+import salt.utils.keystore
 import salt.utils.master
 import salt.utils.minions
 import salt.utils.platform
@@ -323,16 +325,15 @@ class Maintenance(salt.utils.process.SignalHandlingProcess):
         which contains a list
         """
         if self.opts["key_cache"] == "sched":
-            keys = []
             # TODO DRY from CKMinions
             if self.opts["transport"] in TRANSPORTS:
                 acc = "minions"
             else:
                 acc = "accepted"
 
-            for fn_ in os.listdir(os.path.join(self.pki_dir, acc)):
-                if not fn_.startswith("."):
-                    keys.append(fn_)
+            keys = salt.utils.keystore.get_key_store(
+                self.opts, self.pki_dir
+            ).list_state(acc)
             log.debug("Writing master key cache")
             # Write a temporary file securely
             with salt.utils.atomicfile.atomic_open(
@@ -855,6 +856,12 @@ class Master(SMaster):
                 name="Maintenance",
             )
 
+            if self.opts.get("batch_server"):
+                log.info("Creating master batch server process")
+                self.process_manager.add_process(
+                    salt.utils.batch.BatchServer, args=(self.opts,), name="BatchServer"
+                )
+
             if self.opts.get("event_return"):
                 log.info("Creating master event return process")
                 self.process_manager.add_process(
@@ -1162,6 +1169,8 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         Bind to the local port
         """
         self.io_loop = tornado.ioloop.IOLoop()
+        # Fires the job heartbeats held back by the aggregation
+        self.aes_funcs.io_loop = self.io_loop
         for req_channel in self.req_channels:
             req_channel.post_fork(
                 self._handle_payload, io_loop=self.io_loop
@@ -1217,6 +1226,7 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
                     "time": end - self.stat_clock,
                     "worker": self.name,
                     "stats": self.stats,
+                    "compression": dict(salt.crypt.Crypticle.compression_stats),
                 },
                 tagify(self.name, "stats"),
             )
@@ -1354,7 +1364,9 @@ class AESFuncs(TransportMethods):
         "_minion_event",
         "_handle_minion_event",
         "_return",
+        "_return_batch",
         "_syndic_return",
+        "_syndic_minions",
         "minion_runner",
         "pub_ret",
         "minion_pub",
@@ -1365,6 +1377,7 @@ class AESFuncs(TransportMethods):
         "_file_hash",
         "_file_hash_and_stat",
         "_file_list",
+        "_file_manifest",
         "_file_list_emptydirs",
         "_dir_list",
         "_symlink_list",
@@ -1393,6 +1406,13 @@ class AESFuncs(TransportMethods):
         )
         self.__setup_fileserver()
         self.masterapi = salt.daemons.masterapi.RemoteFuncs(opts)
+        # The job heartbeats received since they were last fired, jid ->
+        # {minion id: heartbeat interval}
+        self._heartbeats = {}
+        self._heartbeats_fired = None
+        self._heartbeats_handle = None
+        # The loop of the worker, set once it runs
+        self.io_loop = None
         if "cluster_id" in self.opts and self.opts["cluster_id"]:
             self.pki_dir = self.opts["cluster_pki_dir"]
         else:
@@ -1411,6 +1431,7 @@ class AESFuncs(TransportMethods):
         self._file_hash = self.fs_.file_hash
         self._file_hash_and_stat = self.fs_.file_hash_and_stat
         self._file_list = self.fs_.file_list
+        self._file_manifest = self.fs_.file_manifest
         self._file_list_emptydirs = self.fs_.file_list_emptydirs
         self._dir_list = self.fs_.dir_list
         self._symlink_list = self.fs_.symlink_list
@@ -1634,6 +1655,20 @@ class AESFuncs(TransportMethods):
             return {}
         return self.masterapi._mine(load, skip_verify=True)
 
+    def _syndic_minions(self, load):
+        """
+        Store the summary of the minions reachable through a syndic
+
+        :param dict load: A payload received from a syndic
+
+        :rtype: bool
+        :return: True if the summary has been stored
+        """
+        load = self.__verify_load(load, ("id", "minions", "tok"))
+        if load is False:
+            return {}
+        return self.masterapi._syndic_minions(load, skip_verify=True)
+
     def _mine_delete(self, load):
         """
         Allow the minion to delete a specific function from its own mine
@@ -1797,11 +1832,61 @@ class AESFuncs(TransportMethods):
         load = self.__verify_load(load, ("id", "tok"))
         if load is False:
             return {}
+        if load.get("tag") == salt.utils.event.JOB_HEARTBEAT:
+            self._job_heartbeat(load)
+            return
         # Route to master event bus
         self.masterapi._minion_event(load)
         # Process locally
         self._handle_minion_event(load)
 
+    def _job_heartbeat(self, load):
+        """
+        Aggregate the heartbeats of the minions running jobs. The heartbeats
+        are fired at most every ``job_heartbeat_batch_interval`` seconds, as
+        one ``salt/job/<jid>/alive`` event per job listing the minions which
+        are still running it.
+
+        :param dict load: The minion payload
+        """
+        data = load.get("data") or {}
+        interval = data.get("interval")
+        for jid in data.get("jids") or ():
+            if isinstance(jid, str):
+                self._heartbeats.setdefault(jid, {})[load["id"]] = interval
+        if not self._heartbeats:
+            return
+        wait = 0
+        if self._heartbeats_fired is not None:
+            wait = self.opts["job_heartbeat_batch_interval"] - (
+                time.monotonic() - self._heartbeats_fired
+            )
+        if wait <= 0:
+            self._fire_heartbeats()
+        elif self._heartbeats_handle is None and self.io_loop is not None:
+            # Fire the heartbeats held back even if no other heartbeat is
+            # received by this worker
+            self._heartbeats_handle = self.io_loop.call_later(
+                wait, self._fire_heartbeats
+            )
+
+    def _fire_heartbeats(self):
+        """
+        Fire the aggregated job heartbeats
+        """
+        if self._heartbeats_handle is not None:
+            self.io_loop.remove_timeout(self._heartbeats_handle)
+            self._heartbeats_handle = None
+        if not self._heartbeats:
+            return
+        self._heartbeats_fired = time.monotonic()
+        heartbeats, self._heartbeats = self._heartbeats, {}
+        for jid, alive in heartbeats.items():
+            self.event.fire_event(
+                {"jid": jid, "alive": alive},
+                salt.utils.event.tagify([jid, "alive"], "job"),
+            )
+
     def _handle_minion_event(self, load):
         """
         Act on specific events from minions
@@ -1878,6 +1963,75 @@ class AESFuncs(TransportMethods):
             )
         except salt.exceptions.SaltCacheError:
             log.error("Could not store job information for load: %s", load)
+            return False
+
+    def _return_batch(self, load):
+        """
+        Handle a batch of return data coalesced by a minion.
+
+        Every return in the batch is verified, stored in the job cache and
+        fired on the master event bus exactly as if it had been sent through
+        :py:meth:`_return`.
+
+        :param dict load: The minion payload, holding the list of returns
+            under ``load``, optionally compressed as named by ``compression``
+
+        :rtype: dict
+        :return: A dict mapping the jid of every return in the batch to
+            ``True`` when it was processed, or to a string describing why it
+            was not. ``False`` if the batch itself is invalid.
+        """
+        if "id" not in load or "load" not in load:
+            return False
+        rets = load["load"]
+        if load.get("compression") == "gzip":
+            try:
+                rets = salt.payload.loads(salt.utils.gzip_util.uncompress(rets))
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error("Invalid return batch from %s: %s", load["id"], exc)
+                return False
+        elif load.get("compression"):
+            log.error(
+                "Unsupported return batch compression %s from %s",
+                load["compression"],
+                load["id"],
+            )
+            return False
+        if not isinstance(rets, list):
+            log.error("Invalid return batch from %s", load["id"])
+            return False
+
+        results = {}
+        for ret in rets:
+            if not isinstance(ret, dict) or "jid" not in ret:
+                continue
+            jid = ret["jid"]
+            if ret.get("id") != load["id"]:
+                # A minion can only return for itself
+                log.warning(
+                    "Return for job %s from %s was sent in a batch by %s",
+                    jid,
+                    ret.get("id"),
+                    load["id"],
+                )
+                results[jid] = "return id does not match the sending minion"
+                continue
+            try:
+                stored = self._return(ret)
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error(
+                    "Error handling return for job %s from %s",
+                    jid,
+                    load["id"],
+                    exc_info=True,
+                )
+                results[jid] = f"{exc.__class__.__name__}: {exc}"
+                continue
+            if stored is False:
+                results[jid] = "return could not be verified or stored"
+            else:
+                results[jid] = True
+        return results
 
     def _syndic_return(self, load):
         """
@@ -2211,10 +2365,14 @@ class ClearFuncs(TransportMethods):
         # Authorized. Do the job!
         try:
             fun = clear_load.pop("fun")
+            low = clear_load.get("kwarg", {})
+            low.pop("__auth_list__", None)
+            if auth_check.get("auth_list"):
+                # The runners publishing on behalf of the user check the jobs
+                # against its access list
+                low["__auth_list__"] = auth_check["auth_list"]
             runner_client = salt.runner.RunnerClient(self.opts)
-            return runner_client.asynchronous(
-                fun, clear_load.get("kwarg", {}), username, local=True
-            )
+            return runner_client.asynchronous(fun, low, username, local=True)
         except Exception as exc:  # pylint: disable=broad-except
             log.error("Exception occurred while introspecting %s: %s", fun, exc)
             return {
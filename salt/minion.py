@@ -48,6 +48,7 @@ import salt.utils.error
 import salt.utils.event
 import salt.utils.extmods
 import salt.utils.files
+import salt.utils.gzip_util
 import salt.utils.jid
 import salt.utils.minion
 import salt.utils.minions
@@ -66,6 +67,7 @@ from salt.exceptions import (
     CommandNotFoundError,
     SaltClientError,
     SaltDaemonNotRunning,
+    SaltDeserializationError,
     SaltException,
     SaltInvocationError,
     SaltMasterUnresolvableError,
@@ -1255,6 +1257,8 @@ class Minion(MinionBase):
 
         self._running = None
         self.subprocess_list = salt.utils.process.SubprocessList()
+        # The jobs published by the master which are running, jid -> process
+        self.running_jobs = {}
         self.loaded_base_name = loaded_base_name
         self.connected = False
         self.restart = False
@@ -1264,6 +1268,11 @@ class Minion(MinionBase):
         self.jid_queue = [] if jid_queue is None else jid_queue
         self.periodic_callbacks = {}
         self.req_channel = None
+        # Job returns waiting to be sent to the master in a single request,
+        # see return_batch_window
+        self._return_batch = []
+        self._return_batch_handle = None
+        self._return_batch_supported = True
 
         if io_loop is None:
             self.io_loop = tornado.ioloop.IOLoop.current()
@@ -1822,6 +1831,30 @@ class Minion(MinionBase):
         else:
             process.start()
         self.subprocess_list.add(process)
+        if self.opts.get("job_heartbeat_interval", 0) > 0:
+            self.running_jobs[data["jid"]] = process
+
+    def _prune_running_jobs(self):
+        for jid, process in list(self.running_jobs.items()):
+            if not process.is_alive():
+                del self.running_jobs[jid]
+
+    def _job_heartbeat(self):
+        """
+        Tell the master which of the jobs it published are still running, in
+        a single heartbeat whatever the number of jobs
+        """
+        self._prune_running_jobs()
+        if not self.running_jobs or not self.connected:
+            return
+        self._fire_master(
+            data={
+                "jids": sorted(self.running_jobs),
+                "interval": self.opts["job_heartbeat_interval"],
+            },
+            tag=salt.utils.event.JOB_HEARTBEAT,
+            sync=False,
+        )
 
     def ctx(self):
         """
@@ -2310,6 +2343,121 @@ class Minion(MinionBase):
         log.trace("ret_val = %s", ret_val)  # pylint: disable=no-member
         return ret_val
 
+    def _batch_returns(self):
+        """
+        Return whether job returns should be coalesced before being sent to
+        the master
+        """
+        return (
+            self._return_batch_supported and self.opts.get("return_batch_window", 0) > 0
+        )
+
+    def _queue_return(self, load):
+        """
+        Hold a job return so that it is sent to the master together with all
+        the other returns which finish within ``return_batch_window`` seconds
+        """
+        self._return_batch.append(load)
+        if len(self._return_batch) >= self.opts["return_batch_size"]:
+            self.io_loop.spawn_callback(self._flush_return_batch)
+        elif self._return_batch_handle is None:
+            self._return_batch_handle = self.io_loop.call_later(
+                self.opts["return_batch_window"], self._flush_return_batch
+            )
+
+    @tornado.gen.coroutine
+    def _flush_return_batch(self):
+        """
+        Send all the queued job returns to the master as a single compressed
+        ``_return_batch`` request
+        """
+        if self._return_batch_handle is not None:
+            self.io_loop.remove_timeout(self._return_batch_handle)
+            self._return_batch_handle = None
+        rets, self._return_batch = self._return_batch, []
+        if not rets:
+            return
+        if len(rets) == 1:
+            # Nothing to coalesce, don't pay for the compression
+            yield self._send_returns(rets)
+            return
+        load = {
+            "cmd": "_return_batch",
+            "id": self.opts["id"],
+            "compression": "gzip",
+            "load": salt.utils.gzip_util.compress(
+                salt.payload.dumps(rets), compresslevel=6
+            ),
+        }
+        log.debug("Sending %d coalesced job returns to the master", len(rets))
+        try:
+            ret = yield self.req_channel.send(
+                load,
+                timeout=self._return_retry_timer(),
+                tries=self.opts["return_retry_tries"],
+            )
+        except salt.exceptions.SaltReqTimeoutError:
+            log.error(
+                "Timeout encountered while sending %d batched job returns: %s",
+                len(rets),
+                ", ".join(str(ret.get("jid")) for ret in rets),
+            )
+            return
+        if not ret or not isinstance(ret, dict):
+            # Masters which predate _return_batch answer unknown commands with
+            # an empty dict, a batch with returns always gets a result per jid
+            log.warning(
+                "The master does not support batched job returns, disabling "
+                "return_batch_window"
+            )
+            self._return_batch_supported = False
+            yield self._send_returns(rets)
+            return
+        for jid, result in ret.items():
+            if result is not True:
+                log.error(
+                    "The master failed to process the return for job %s: %s",
+                    jid,
+                    result,
+                )
+
+    def _send_queued_returns(self):
+        """
+        Send the job returns still waiting for ``return_batch_window`` to the
+        master one at a time, when the minion is torn down
+        """
+        if self._return_batch_handle is not None:
+            self.io_loop.remove_timeout(self._return_batch_handle)
+            self._return_batch_handle = None
+        rets, self._return_batch = self._return_batch, []
+        if not rets:
+            return
+        with salt.channel.client.ReqChannel.factory(self.opts) as channel:
+            for load in rets:
+                try:
+                    channel.send(
+                        load,
+                        timeout=self._return_retry_timer(),
+                        tries=self.opts["return_retry_tries"],
+                    )
+                except SaltReqTimeoutError:
+                    log.error("Timeout encountered while sending %r request", load)
+
+    @tornado.gen.coroutine
+    def _send_returns(self, rets):
+        """
+        Send job returns to the master one request at a time
+        """
+        for load in rets:
+            try:
+                yield self.req_channel.send(
+                    load,
+                    timeout=self._return_retry_timer(),
+                    tries=self.opts["return_retry_tries"],
+                )
+            except salt.exceptions.SaltReqTimeoutError:
+                log.error("Timeout encountered while sending %r request", load)
+
     def _return_pub_multi(self, rets, ret_cmd="_return", timeout=60, sync=True):
         """
         Return the data from the executed command to the master server
@@ -2489,6 +2637,8 @@ class Minion(MinionBase):
         if not self.beacons_leader:
             return
         log.debug("Refreshing beacons.")
+        if getattr(self, "beacons", None) is not None:
+            self.beacons.destroy()
         self.beacons = salt.beacons.Beacon(self.opts, self.functions)
 
     def matchers_refresh(self):
@@ -2636,6 +2786,7 @@ class Minion(MinionBase):
                 {"include_opts": include_opts, "include_pillar": include_pillar},
             ),
             "list_available": ("list_available_beacons", {}),
+            "stats": ("beacons_stats", {}),
             "validate_beacon": (
                 "validate_beacon",
                 {"name": name, "beacon_data": beacon_data},
@@ -2746,6 +2897,9 @@ class Minion(MinionBase):
         elif tag.startswith("__master_req_channel_payload"):
             job_master = tag.rsplit("/", 1)[1]
             if job_master == self.opts["master"]:
+                if data.get("cmd") == "_return" and _minion._batch_returns():
+                    _minion._queue_return(data)
+                    raise tornado.gen.Return()
                 try:
                     yield _minion.req_channel.send(
                         data,
@@ -2975,6 +3129,7 @@ class Minion(MinionBase):
         # Add an extra fallback in case a forked process leaks through
         multiprocessing.active_children()
         self.subprocess_list.cleanup()
+        self._prune_running_jobs()
         if self.schedule:
             self.schedule.cleanup_subprocesses()
 
@@ -3013,6 +3168,8 @@ class Minion(MinionBase):
         self._setup_core()
         loop_interval = self.opts["loop_interval"]
         if "beacons" not in self.periodic_callbacks:
+            if getattr(self, "beacons", None) is not None:
+                self.beacons.destroy()
             self.beacons = salt.beacons.Beacon(self.opts, self.functions)
 
             def handle_beacons():
@@ -3137,6 +3294,11 @@ class Minion(MinionBase):
         self.setup_beacons()
         self.setup_scheduler()
         self.add_periodic_callback("cleanup", self.cleanup_subprocesses)
+        job_heartbeat_interval = self.opts.get("job_heartbeat_interval", 0)
+        if job_heartbeat_interval > 0:
+            self.add_periodic_callback(
+                "job_heartbeat", self._job_heartbeat, job_heartbeat_interval
+            )
 
         # schedule the stuff that runs every interval
         ping_interval = self.opts.get("ping_interval", 0) * 60
@@ -3251,6 +3413,10 @@ class Minion(MinionBase):
         self._running = False
         if hasattr(self, "schedule"):
             del self.schedule
+        if getattr(self, "beacons", None) is not None:
+            self.beacons.destroy()
+        if getattr(self, "_return_batch", None):
+            self._send_queued_returns()
         if hasattr(self, "pub_channel") and self.pub_channel is not None:
             self.pub_channel.on_recv(None)
             self.pub_channel.close()
@@ -3361,6 +3527,21 @@ class Syndic(Minion):
         )
         return ret
 
+    def send_minion_summary(self, summary):
+        """
+        Advertise the minions reachable through this syndic to the master of
+        masters, see ``syndic_advertise_minions``
+        """
+        load = {
+            "cmd": "_syndic_minions",
+            "id": self.opts["id"],
+            "tok": self.tok,
+            "minions": summary.get("minions", []),
+            "grain_names": summary.get("grain_names", []),
+            "grains": summary.get("grains", {}),
+        }
+        return self._send_req_async(load, timeout=self._return_retry_timer())
+
     def fire_master_syndic_start(self):
         # Send an event to the master that the minion is live
         if self.opts["enable_legacy_startup_events"]:
@@ -3479,7 +3660,8 @@ class SyndicManager(MinionBase):
         self.max_auth_wait = self.opts["acceptance_wait_time_max"]
 
         self._has_master = threading.Event()
-        self.jid_forward_cache = set()
+        # LRU of the jids whose load has already been forwarded
+        self.jid_forward_cache = OrderedDict()
 
         if io_loop is None:
             self.io_loop = tornado.ioloop.IOLoop.current()
@@ -3493,8 +3675,26 @@ class SyndicManager(MinionBase):
         # List of delayed job_rets which was unable to send for some reason and will be resend to
         # any available master
         self.delayed = []
-        # Active pub futures: {master_id: (future, [job_ret, ...]), ...}
+        # Active pub futures:
+        # {master_id: (future, [job_ret, ...], spooled file or None), ...}
         self.pub_futures = {}
+        # Number of minion returns aggregated in job_rets: {master_id: count, ...}
+        self.pending_rets = {}
+        # Returns the masters could not accept yet are spooled to disk once
+        # syndic_return_buffer_hwm returns are held in memory
+        self.spool_dir = os.path.join(self.opts["cachedir"], "syndic_spool")
+        # The spooled files being forwarded, they are removed once a master
+        # accepted their returns
+        self.spool_inflight = set()
+        self.stats = {
+            "forwarded": 0,
+            "spooled": 0,
+            "forward_latency": {"last": 0, "mean": 0, "max": 0, "runs": 0},
+        }
+        self.stat_clock = time.time()
+        # The minions of the last advertisement, see syndic_advertise_minions
+        self._advertised_minions = set()
+        self._advertise_handle = None
 
     def _spawn_syndics(self):
         """
@@ -3532,6 +3732,10 @@ class SyndicManager(MinionBase):
 
                 # Send an event to the master that the minion is live
                 syndic.fire_master_syndic_start()
+                if self.opts["syndic_advertise_minions"]:
+                    summary = yield self._get_minion_summary()
+                    if summary is not None:
+                        syndic.send_minion_summary(summary)
 
                 log.info("Syndic successfully connected to %s", opts["master"])
                 break
@@ -3599,9 +3803,12 @@ class SyndicManager(MinionBase):
         if not successful:
             log.critical("Unable to call %s on any masters!", func)
 
-    def _return_pub_syndic(self, values, master_id=None):
+    def _return_pub_syndic(self, values, master_id=None, spool=None):
         """
         Wrapper to call the '_return_pub_multi' a syndic, best effort to get the one you asked for
+
+        ``spool`` is the spooled file the returns were read from, it is
+        removed once a master accepted them.
         """
         func = "_return_pub_multi"
         for master, syndic_future in self.iter_master_options(master_id):
@@ -3613,7 +3820,7 @@ class SyndicManager(MinionBase):
                 )
                 continue
 
-            future, data = self.pub_futures.get(master, (None, None))
+            future, data, spooled = self.pub_futures.get(master, (None, None, None))
             if future is not None:
                 if not future.done():
                     if master == master_id:
@@ -3629,13 +3836,26 @@ class SyndicManager(MinionBase):
                     )
                     self._mark_master_dead(master)
                     del self.pub_futures[master]
-                    # Add not sent data to the delayed list and try the next master
-                    self.delayed.extend(data)
+                    # Add not sent data to the delayed list and try the next
+                    # master, spooled data is read again from its file
+                    if spooled is None:
+                        self.delayed.extend(data)
                     continue
             future = getattr(syndic_future.result(), func)(
                 values, "_syndic_return", timeout=self._return_retry_timer(), sync=False
             )
-            self.pub_futures[master] = (future, values)
+            self.pub_futures[master] = (future, values, spool)
+            start = time.time()
+            future.add_done_callback(
+                lambda fut, count=self._count_returns(values): self._post_forward(
+                    fut, start, count
+                )
+            )
+            if spool is not None:
+                self.spool_inflight.add(spool)
+                future.add_done_callback(
+                    lambda fut: self._post_forward_spool(fut, spool)
+                )
             return True
         # Loop done and didn't exit: wasn't sent, try again later
         return False
@@ -3660,6 +3880,7 @@ class SyndicManager(MinionBase):
 
     def _reset_event_aggregation(self):
         self.job_rets = {}
+        self.pending_rets = {}
         self.raw_events = []
 
     def reconnect_event_bus(self, something):
@@ -3693,6 +3914,15 @@ class SyndicManager(MinionBase):
         )
         self.forward_events.start()
 
+        # advertise the minions behind this syndic every
+        # syndic_advertise_interval
+        if self.opts["syndic_advertise_minions"]:
+            self.advertise_minions = tornado.ioloop.PeriodicCallback(
+                self._advertise_minions,
+                self.opts["syndic_advertise_interval"] * 1000,
+            )
+            self.advertise_minions.start()
+
         # Make sure to gracefully handle SIGUSR1
         enable_sigusr1_handler()
 
@@ -3729,17 +3959,17 @@ class SyndicManager(MinionBase):
                 fstr = "{}.get_load".format(self.opts["master_job_cache"])
                 # Only need to forward each load once. Don't hit the disk
                 # for every minion return!
-                if data["jid"] not in self.jid_forward_cache:
+                if data["jid"] in self.jid_forward_cache:
+                    self.jid_forward_cache.move_to_end(data["jid"])
+                else:
                     jdict["__load__"].update(self.mminion.returners[fstr](data["jid"]))
-                    self.jid_forward_cache.add(data["jid"])
-                    if (
+                    self.jid_forward_cache[data["jid"]] = True
+                    while (
                         len(self.jid_forward_cache)
                         > self.opts["syndic_jid_forward_cache_hwm"]
                     ):
-                        # Pop the oldest jid from the cache
-                        tmp = sorted(list(self.jid_forward_cache))
-                        tmp.pop(0)
-                        self.jid_forward_cache = set(tmp)
+                        # Pop the least recently used jid from the cache
+                        self.jid_forward_cache.popitem(last=False)
             if master is not None:
                 # __'s to make sure it doesn't print out on the master cli
                 jdict["__master_id__"] = master
@@ -3748,7 +3978,21 @@ class SyndicManager(MinionBase):
                 if key in data:
                     ret[key] = data[key]
             jdict[data["id"]] = ret
+            self.pending_rets[master] = self.pending_rets.get(master, 0) + 1
+            if self.pending_rets[master] % self.opts["syndic_forward_batch_size"] == 0:
+                # Do not wait for syndic_event_forward_timeout to flush a
+                # full batch
+                self._flush_job_rets(master)
         else:
+            if self.opts["syndic_advertise_minions"] and (
+                mtag == "salt/key"
+                or (
+                    mtag == "salt/auth"
+                    and data.get("act") == "accept"
+                    and data.get("id") not in self._advertised_minions
+                )
+            ):
+                self._schedule_advertise_minions()
             # TODO: config to forward these? If so we'll have to keep track of who
             # has seen them
             # if we are the top level masters-- don't forward all the minion events
@@ -3757,6 +4001,238 @@ class SyndicManager(MinionBase):
                 if "retcode" not in data:
                     self.raw_events.append({"data": data, "tag": mtag})
 
+    def _minion_summary(self):
+        """
+        Build the summary of the minions this syndic is able to reach: the
+        accepted minions of the local master, the minions advertised by lower
+        level syndics and the grains listed in ``syndic_advertise_grains``.
+        Return None when the summaries of the lower level syndics can not be
+        read, an incomplete summary would hide minions from the master.
+        """
+        ckminions = salt.utils.minions.CkMinions(self.opts)
+        grain_names = list(self.opts["syndic_advertise_grains"])
+        minions = set(ckminions._pki_minions())
+        grains = {}
+        summaries = ckminions.syndic_summaries()
+        if summaries is None:
+            return None
+        for summary in summaries.values():
+            minions.update(summary.get("minions", []))
+            # Only relay the grains the lower level syndic advertised as well
+            if set(grain_names).issubset(summary.get("grain_names", [])):
+                grains.update(summary.get("grains") or {})
+        if grain_names:
+            for minion in minions:
+                if minion in grains:
+                    continue
+                mdata = ckminions.cache.fetch("minions/{}".format(minion), "data")
+                if not isinstance(mdata, dict) or "grains" not in mdata:
+                    continue
+                grains[minion] = {
+                    name: mdata["grains"][name]
+                    for name in grain_names
+                    if name in mdata["grains"]
+                }
+        return {
+            "minions": sorted(minions),
+            "grain_names": grain_names,
+            "grains": grains,
+        }
+
+    @tornado.gen.coroutine
+    def _get_minion_summary(self):
+        """
+        Build the summary of the minions in a thread, reading the grains of
+        every minion from the cache must not block the event loop
+        """
+        try:
+            summary = yield self.io_loop.run_in_executor(None, self._minion_summary)
+        except Exception:  # pylint: disable=broad-except
+            log.error("Unable to build the summary of the minions", exc_info=True)
+            summary = None
+        if summary is None:
+            log.warning("Not advertising the minions, their summary is incomplete")
+        raise tornado.gen.Return(summary)
+
+    @tornado.gen.coroutine
+    def _advertise_minions(self):
+        if self._advertise_handle is not None:
+            self.io_loop.remove_timeout(self._advertise_handle)
+            self._advertise_handle = None
+        log.trace("Advertising minions")  # pylint: disable=no-member
+        summary = yield self._get_minion_summary()
+        if summary is None:
+            return
+        self._advertised_minions = set(summary["minions"])
+        self._call_syndic("send_minion_summary", kwargs={"summary": summary})
+
+    def _schedule_advertise_minions(self):
+        """
+        Advertise the minions shortly, after a key of the local master was
+        accepted or deleted, instead of waiting for the next interval
+        """
+        if self._advertise_handle is None:
+            self._advertise_handle = self.io_loop.call_later(1, self._advertise_minions)
+
+    @staticmethod
+    def _count_returns(values):
+        """
+        Count the minion returns held in a list of aggregated job returns
+        """
+        return sum(
+            len([key for key in jdict if not key.startswith("__")]) for jdict in values
+        )
+
+    def _buffered_returns(self):
+        return sum(self.pending_rets.values()) + self._count_returns(self.delayed)
+
+    def _post_forward(self, future, start, count):
+        """
+        Track the forward latency of the aggregated returns
+        """
+        if future.cancelled() or future.exception():
+            return
+        duration = time.time() - start
+        latency = self.stats["forward_latency"]
+        latency["runs"] += 1
+        latency["last"] = duration
+        latency["max"] = max(latency["max"], duration)
+        latency["mean"] += (duration - latency["mean"]) / latency["runs"]
+        self.stats["forwarded"] += count
+
+    def _post_forward_spool(self, future, path):
+        """
+        Remove a spooled file once a master accepted its returns. It is read
+        again when the forward failed.
+        """
+        self.spool_inflight.discard(path)
+        if future.cancelled() or future.exception():
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _trim_spool(self, size):
+        """
+        Drop the oldest spooled files until ``size`` more bytes fit in
+        ``syndic_spool_max_size``
+        """
+        files = []
+        total = size
+        for fn_ in self._spool_files():
+            path = os.path.join(self.spool_dir, fn_)
+            try:
+                fsize = os.path.getsize(path)
+            except OSError:
+                continue
+            files.append((path, fsize))
+            total += fsize
+        for path, fsize in files:
+            if total <= self.opts["syndic_spool_max_size"]:
+                break
+            if path in self.spool_inflight:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= fsize
+            log.error(
+                "The syndic spool reached syndic_spool_max_size, dropped the "
+                "spooled job returns %s",
+                path,
+            )
+
+    def _spool_returns(self, values, master_id=None):
+        """
+        Write aggregated returns the masters could not accept yet to the spool
+        """
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            path = os.path.join(
+                self.spool_dir, "{}.p".format(salt.utils.jid.gen_jid(self.opts))
+            )
+            while os.path.exists(path):
+                path = "{}_".format(path)
+            data = salt.payload.dumps({"master_id": master_id, "rets": values})
+            self._trim_spool(len(data))
+            with salt.utils.files.fopen(path, "w+b") as fp_:
+                fp_.write(data)
+        except OSError as exc:
+            log.error("Unable to spool %d job returns: %s", len(values), exc)
+            return False
+        self.stats["spooled"] += self._count_returns(values)
+        log.warning(
+            "The masters are not accepting returns fast enough, spooled %d job "
+            "returns to %s",
+            len(values),
+            path,
+        )
+        return True
+
+    def _spool_files(self):
+        try:
+            return sorted(os.listdir(self.spool_dir))
+        except OSError:
+            return []
+
+    def _read_spool(self):
+        """
+        Load the oldest spooled returns which are not being forwarded, return
+        the path of their file and the returns. The file is only removed once
+        a master accepted them.
+        """
+        for fn_ in self._spool_files():
+            path = os.path.join(self.spool_dir, fn_)
+            if path in self.spool_inflight:
+                continue
+            try:
+                with salt.utils.files.fopen(path, "rb") as fp_:
+                    spooled = salt.payload.load(fp_)
+            except (OSError, SaltDeserializationError) as exc:
+                log.error("Unable to read spooled job returns %s: %s", path, exc)
+                spooled = None
+            if spooled and spooled.get("rets"):
+                return path, spooled["rets"]
+            # Nothing can be forwarded from this file
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return None, []
+
+    def _flush_job_rets(self, master):
+        """
+        Forward the returns aggregated for a master, spool them when the
+        buffered returns reach syndic_return_buffer_hwm
+        """
+        values = list(self.job_rets[master].values())
+        if self._return_pub_syndic(values, master_id=master):
+            del self.job_rets[master]
+            self.pending_rets.pop(master, None)
+        elif self._buffered_returns() >= self.opts["syndic_return_buffer_hwm"]:
+            if self._spool_returns(values, master_id=master):
+                del self.job_rets[master]
+                self.pending_rets.pop(master, None)
+
+    def _fire_stats(self):
+        """
+        Fire an event with the aggregation queue depth and forward latency
+        """
+        now = time.time()
+        if now - self.stat_clock <= self.opts["master_stats_event_iter"]:
+            return
+        stats = dict(self.stats)
+        stats["queue_depth"] = sum(self.pending_rets.values())
+        stats["delayed"] = self._count_returns(self.delayed)
+        stats["spool_files"] = len(self._spool_files())
+        self.local.event.fire_event(
+            {"time": now - self.stat_clock, "stats": stats},
+            tagify([self.opts["id"], "stats"], "syndic"),
+        )
+        self.stat_clock = now
+
     def _forward_events(self):
         log.trace("Forwarding events")  # pylint: disable=no-member
         if self.raw_events:
@@ -3775,11 +4251,21 @@ class SyndicManager(MinionBase):
             res = self._return_pub_syndic(self.delayed)
             if res:
                 self.delayed = []
+            elif (
+                self._count_returns(self.delayed)
+                >= self.opts["syndic_return_buffer_hwm"]
+            ):
+                if self._spool_returns(self.delayed):
+                    self.delayed = []
+        else:
+            # The spooled file stays on disk until a master accepted it
+            path, spooled = self._read_spool()
+            if spooled:
+                self._return_pub_syndic(spooled, spool=path)
         for master in list(self.job_rets.keys()):
-            values = list(self.job_rets[master].values())
-            res = self._return_pub_syndic(values, master_id=master)
-            if res:
-                del self.job_rets[master]
+            self._flush_job_rets(master)
+        if self.opts["master_stats"]:
+            self._fire_stats()
 
     def destroy(self):
         if self._closing is True:
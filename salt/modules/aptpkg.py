@@ -49,6 +49,7 @@ from salt.utils.pkg.deb import SourceEntry, SourcesList
 log = logging.getLogger(__name__)
 
 APT_LISTS_PATH = "/var/lib/apt/lists"
+DPKG_STATUS_PATH = "/var/lib/dpkg/status"
 PKG_ARCH_SEPARATOR = ":"
 
 # Source format for urllib fallback on PPA handling
@@ -778,6 +779,7 @@ def install(
                 errors.append(out["stderr"])
 
         __context__.pop("pkg.list_pkgs", None)
+        salt.utils.pkg.clear_inventory_cache(__opts__, "aptpkg")
         new = list_pkgs()
         ret = salt.utils.data.compare_dicts(old, new)
 
@@ -840,6 +842,7 @@ def _uninstall(action="remove", name=None, pkgs=None, **kwargs):
         errors = []
 
     __context__.pop("pkg.list_pkgs", None)
+    salt.utils.pkg.clear_inventory_cache(__opts__, "aptpkg")
     new = list_pkgs()
     new_removed = list_pkgs(removed=True)
 
@@ -912,6 +915,7 @@ def autoremove(list_only=False, purge=False):
         cmd.append("autoremove")
         _call_apt(cmd, ignore_retcode=True)
         __context__.pop("pkg.list_pkgs", None)
+        salt.utils.pkg.clear_inventory_cache(__opts__, "aptpkg")
         new = list_pkgs()
         return salt.utils.data.compare_dicts(old, new)
 
@@ -1099,6 +1103,7 @@ def upgrade(refresh=True, dist_upgrade=False, **kwargs):
     cmd.append("dist-upgrade" if dist_upgrade else "upgrade")
     result = _call_apt(cmd, env=DPKG_ENV_VARS.copy())
     __context__.pop("pkg.list_pkgs", None)
+    salt.utils.pkg.clear_inventory_cache(__opts__, "aptpkg")
     new = list_pkgs()
     ret = salt.utils.data.compare_dicts(old, new)
 
@@ -1251,43 +1256,10 @@ def _list_pkgs_from_context(versions_as_list, removed, purge_desired):
     return ret
 
 
-def list_pkgs(
-    versions_as_list=False, removed=False, purge_desired=False, **kwargs
-):  # pylint: disable=W0613
+def _list_pkgs_from_dpkg():
     """
-    List the packages currently installed in a dict::
-
-        {'<package_name>': '<version>'}
-
-    removed
-        If ``True``, then only packages which have been removed (but not
-        purged) will be returned.
-
-    purge_desired
-        If ``True``, then only packages which have been marked to be purged,
-        but can't be purged due to their status as dependencies for other
-        installed packages, will be returned. Note that these packages will
-        appear in installed
-
-        .. versionchanged:: 2014.1.1
-
-            Packages in this state now correctly show up in the output of this
-            function.
-
-    CLI Example:
-
-    .. code-block:: bash
-
-        salt '*' pkg.list_pkgs
-        salt '*' pkg.list_pkgs versions_as_list=True
+    Return the installed, removed and purge desired packages from dpkg-query
     """
-    versions_as_list = salt.utils.data.is_true(versions_as_list)
-    removed = salt.utils.data.is_true(removed)
-    purge_desired = salt.utils.data.is_true(purge_desired)
-
-    if "pkg.list_pkgs" in __context__ and kwargs.get("use_context", True):
-        return _list_pkgs_from_context(versions_as_list, removed, purge_desired)
-
     ret = {"installed": {}, "removed": {}, "purge_desired": {}}
     cmd = [
         "dpkg-query",
@@ -1324,6 +1296,55 @@ def list_pkgs(
 
     for pkglist_type in ("installed", "removed", "purge_desired"):
         __salt__["pkg_resource.sort_pkglist"](ret[pkglist_type])
+    return ret
+
+
+def list_pkgs(
+    versions_as_list=False, removed=False, purge_desired=False, **kwargs
+):  # pylint: disable=W0613
+    """
+    List the packages currently installed in a dict::
+
+        {'<package_name>': '<version>'}
+
+    removed
+        If ``True``, then only packages which have been removed (but not
+        purged) will be returned.
+
+    purge_desired
+        If ``True``, then only packages which have been marked to be purged,
+        but can't be purged due to their status as dependencies for other
+        installed packages, will be returned. Note that these packages will
+        appear in installed
+
+        .. versionchanged:: 2014.1.1
+
+            Packages in this state now correctly show up in the output of this
+            function.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' pkg.list_pkgs
+        salt '*' pkg.list_pkgs versions_as_list=True
+    """
+    versions_as_list = salt.utils.data.is_true(versions_as_list)
+    removed = salt.utils.data.is_true(removed)
+    purge_desired = salt.utils.data.is_true(purge_desired)
+
+    if "pkg.list_pkgs" in __context__ and kwargs.get("use_context", True):
+        return _list_pkgs_from_context(versions_as_list, removed, purge_desired)
+
+    # The inventory cached by another process is used as long as the dpkg
+    # database did not change
+    fingerprint = salt.utils.pkg.db_fingerprint([DPKG_STATUS_PATH])
+    ret = None
+    if kwargs.get("use_context", True):
+        ret = salt.utils.pkg.read_inventory_cache(__opts__, "aptpkg", fingerprint)
+    if ret is None:
+        ret = _list_pkgs_from_dpkg()
+        salt.utils.pkg.write_inventory_cache(__opts__, "aptpkg", fingerprint, ret)
 
     __context__["pkg.list_pkgs"] = copy.deepcopy(ret)
 
@@ -123,6 +123,49 @@ def list_available(return_yaml=True, **kwargs):
         return {"beacons": {}}
 
 
+def stats(**kwargs):
+    """
+    Report the execution time of the beacons running on the minion
+
+    .. versionadded:: 3008.0
+
+    :return:                The number of runs, the last, mean and maximum
+                            execution time in seconds, the number of runs
+                            longer than the ``loop_interval`` and the number
+                            of runs skipped because the previous run was still
+                            in progress, for each beacon.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' beacons.stats
+
+    """
+    beacon_stats = None
+
+    try:
+        with salt.utils.event.get_event(
+            "minion", opts=__opts__, listen=True
+        ) as event_bus:
+            res = __salt__["event.fire"]({"func": "stats"}, "manage_beacons")
+            if res:
+                event_ret = event_bus.get_event(
+                    tag="/salt/minion/minion_beacons_stats_complete",
+                    wait=kwargs.get("timeout", default_event_wait),
+                )
+                if event_ret and event_ret["complete"]:
+                    beacon_stats = event_ret["stats"]
+    except KeyError:
+        # Effectively a no-op, since we can't really return without an event system
+        ret = {}
+        ret["result"] = False
+        ret["comment"] = "Event module not available. Beacon stats failed."
+        return ret
+
+    return beacon_stats or {}
+
+
 def add(name, beacon_data, **kwargs):
     """
     Add a beacon on the minion
@@ -16,13 +16,16 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import traceback
 
 import salt.grains.extra
 import salt.utils.args
 import salt.utils.data
+import salt.utils.event
 import salt.utils.files
+import salt.utils.jid
 import salt.utils.json
 import salt.utils.path
 import salt.utils.pkg
@@ -296,6 +299,94 @@ def _prep_powershell_cmd(win_shell, cmd, encoded_cmd):
     return new_cmd
 
 
+class _OutputStreamer:
+    """
+    Fire the output of a command as progress events, coalescing the chunks
+    read until ``cmd_stream_event_bytes`` bytes or
+    ``cmd_stream_event_interval`` seconds are reached
+    """
+
+    def __init__(self, cmd, jid=None):
+        self.cmd = cmd
+        self.jid = jid or salt.utils.jid.gen_jid(__opts__)
+        self.tag = salt.utils.event.tagify(
+            [self.jid, "prog", __opts__["id"], "cmd"], "job"
+        )
+        self.event_bytes = __opts__.get("cmd_stream_event_bytes", 65536)
+        self.interval = __opts__.get("cmd_stream_event_interval", 1.0)
+        self.pid = None
+        self.seq = 0
+        # Guards the pending chunks and the sequence of the events, the
+        # streams are read from their own thread and flushed from the timers
+        self.lock = threading.RLock()
+        self.pending = {"stdout": [], "stderr": []}
+        self.pending_bytes = {"stdout": 0, "stderr": 0}
+        self.last = {"stdout": time.monotonic(), "stderr": time.monotonic()}
+        self.timers = {}
+
+    def _fire(self, data):
+        with self.lock:
+            data.update({"cmd": self.cmd, "pid": self.pid, "seq": self.seq})
+            self.seq += 1
+            if __opts__.get("local") or __opts__.get("file_client") == "local":
+                __salt__["event.fire"](data, self.tag)
+            else:
+                __salt__["event.fire_master"](data, self.tag)
+
+    def flush(self, name):
+        with self.lock:
+            timer = self.timers.pop(name, None)
+            if timer is not None:
+                timer.cancel()
+            if not self.pending[name]:
+                return
+            chunk = b"".join(self.pending[name])
+            self.pending[name] = []
+            self.pending_bytes[name] = 0
+            self.last[name] = time.monotonic()
+            self._fire(
+                {
+                    "stream": name,
+                    "data": salt.utils.stringutils.to_unicode(chunk, errors="replace"),
+                }
+            )
+
+    def _flush_timer(self, name, timer):
+        with self.lock:
+            # The timer may have been replaced since it was started
+            if self.timers.get(name) is timer:
+                self.flush(name)
+
+    def write(self, name, chunk):
+        # Called from the reader thread of each stream
+        with self.lock:
+            self.pending[name].append(chunk)
+            self.pending_bytes[name] += len(chunk)
+            if (
+                self.pending_bytes[name] >= self.event_bytes
+                or time.monotonic() - self.last[name] >= self.interval
+            ):
+                self.flush(name)
+            elif name not in self.timers:
+                # Fire the chunks pending when the command stops writing
+                # before the interval is reached
+                timer = threading.Timer(self.interval, self._flush_timer)
+                timer.args = (name, timer)
+                timer.daemon = True
+                self.timers[name] = timer
+                timer.start()
+
+    def close(self, ret, buffers):
+        with self.lock:
+            for name in self.pending:
+                self.flush(name)
+        data = {"done": True, "retcode": ret.get("retcode")}
+        for name, buf in buffers.items():
+            data[f"{name}_bytes"] = buf.total
+            data[f"{name}_truncated"] = buf.truncated
+        self._fire(data)
+
+
 def _run(
     cmd,
     cwd=None,
@@ -330,6 +421,7 @@ def _run(
     success_stdout=None,
     success_stderr=None,
     windows_codepage=65001,
+    stream=False,
     **kwargs,
 ):
     """
@@ -737,6 +829,13 @@ def _run(
     else:
         success_stderr = salt.utils.args.split_input(success_stderr)
 
+    streamer = None
+    if stream and not bg and with_communicate:
+        streamer = _OutputStreamer(_log_cmd(cmd), kwargs.get("__pub_jid"))
+        new_kwargs["stream_callback"] = streamer.write
+        new_kwargs["output_head"] = __opts__.get("cmd_stream_head_bytes", 1048576)
+        new_kwargs["output_tail"] = __opts__.get("cmd_stream_tail_bytes", 1048576)
+
     if not use_vt:
         # This is where the magic happens
         try:
@@ -744,6 +843,8 @@ def _run(
                 salt.utils.win_chcp.set_codepage_id(windows_codepage)
             try:
                 proc = salt.utils.timed_subprocess.TimedProc(cmd, **new_kwargs)
+                if streamer is not None:
+                    streamer.pid = proc.process.pid
             except OSError as exc:
                 msg = "Unable to run command '{}' with the context '{}', reason: {}".format(
                     cmd if output_loglevel is not None else "REDACTED",
@@ -761,6 +862,8 @@ def _run(
                 ret["pid"] = proc.process.pid
                 # ok return code for timeouts?
                 ret["retcode"] = 1
+                if streamer is not None:
+                    streamer.close(ret, proc.buffers)
                 return ret
         finally:
             if change_windows_codepage:
@@ -828,6 +931,8 @@ def _run(
             + [stde in ret["stderr"] for stde in success_stderr]
         ):
             ret["retcode"] = 0
+        if streamer is not None:
+            streamer.close(ret, proc.buffers)
     else:
         formatted_timeout = ""
         if timeout:
@@ -1273,6 +1378,15 @@ def run(
 
       .. versionadded:: 3002
 
+    :param bool stream: False
+        If ``True``, the output of the command is fired in chunks as progress
+        events tagged ``salt/job/<jid>/prog/<minion_id>/cmd`` while it runs,
+        and only the first :conf_minion:`cmd_stream_head_bytes` and the last
+        :conf_minion:`cmd_stream_tail_bytes` of stdout and stderr are kept for
+        the return. Not used with ``use_vt`` or ``bg``.
+
+      .. versionadded:: 3008.0
+
     CLI Example:
 
     .. code-block:: bash
@@ -2312,6 +2426,15 @@ def run_all(
 
       .. versionadded:: 2019.2.0
 
+    :param bool stream: False
+        If ``True``, the output of the command is fired in chunks as progress
+        events tagged ``salt/job/<jid>/prog/<minion_id>/cmd`` while it runs,
+        and only the first :conf_minion:`cmd_stream_head_bytes` and the last
+        :conf_minion:`cmd_stream_tail_bytes` of stdout and stderr are kept for
+        the return. Not used with ``use_vt`` or ``bg``.
+
+      .. versionadded:: 3008.0
+
     CLI Example:
 
     .. code-block:: bash
@@ -171,6 +171,17 @@ def _client():
     return salt.fileclient.get_file_client(__opts__)
 
 
+def _manifest_entry(path, saltenv):
+    """
+    Return the entry of a salt:// path in the file manifest loaded for the
+    saltenv by ``file.recurse``, if any
+    """
+    manifest = __context__.get("cp.file_manifest", {}).get(saltenv)
+    if not manifest or not path.startswith("salt://"):
+        return None
+    return manifest.get(salt.utils.url.parse(path)[0])
+
+
 def _render_filenames(path, dest, saltenv, template, **kw):
     """
     Process markup in the :param:`path` and :param:`dest` variables (NOT the
@@ -549,6 +560,17 @@ def cache_file(path, saltenv=None, source_hash=None, verify_ssl=True, use_etag=F
     if senv:
         saltenv = senv
 
+    entry = _manifest_entry(path, saltenv)
+    if entry:
+        # The file manifest tells if the cached copy is current, without
+        # asking the master for the hash of the file
+        cached = is_cached(path, saltenv)
+        if (
+            cached
+            and __salt__["file.get_hash"](cached, entry["hash_type"]) == entry["hsum"]
+        ):
+            return cached
+
     with _client() as client:
         result = client.cache_file(
             path,
@@ -770,6 +792,26 @@ def list_master(saltenv=None, prefix=""):
         return client.file_list(saltenv, prefix)
 
 
+def list_master_manifest(saltenv=None, prefix=""):
+    """
+    .. versionadded:: 3008.0
+
+    Return the hash sum and stat result of all of the files stored on the
+    master under ``prefix``, keyed by the path of the file. The whole
+    manifest is returned by a single request to the master.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' cp.list_master_manifest prefix=apache
+    """
+    if not saltenv:
+        saltenv = __opts__["saltenv"] or "base"
+    with _client() as client:
+        return client.file_manifest(saltenv, prefix)
+
+
 def list_master_dirs(saltenv=None, prefix=""):
     """
     .. versionchanged:: 3005
@@ -874,6 +916,10 @@ def hash_file(path, saltenv=None):
     if senv:
         saltenv = senv
 
+    entry = _manifest_entry(path, saltenv)
+    if entry:
+        return {"hsum": entry["hsum"], "hash_type": entry["hash_type"]}
+
     with _client() as client:
         return client.hash_file(path, saltenv)
 
@@ -903,8 +949,12 @@ def stat_file(path, saltenv=None, octal=True):
     if senv:
         saltenv = senv
 
-    with _client() as client:
-        stat = client.hash_and_stat_file(path, saltenv)[1]
+    entry = _manifest_entry(path, saltenv)
+    if entry:
+        stat = entry["stat"]
+    else:
+        with _client() as client:
+            stat = client.hash_and_stat_file(path, saltenv)[1]
     if stat is None:
         return stat
     return salt.utils.files.st_mode_to_octal(stat[0]) if octal is True else stat[0]
@@ -93,6 +93,28 @@ def __clean_tmp(sfn):
             os.remove(sfn)
 
 
+def _hash_cachedir():
+    """
+    Return the directory of the file hash cache, None when it is disabled
+    """
+    if not __opts__.get("file_hash_cache") or "cachedir" not in __opts__:
+        return None
+    return os.path.join(__opts__["cachedir"], "file_hashes")
+
+
+def _written_hash(path, source_sum=None):
+    """
+    Return the hash cache record of ``path`` once it was written, None when
+    the hash cache is disabled. The sum of the source is used when it is
+    known, otherwise the file is hashed when the record is kept.
+    """
+    if not _hash_cachedir():
+        return None
+    source_sum = source_sum or {}
+    form = source_sum.get("hash_type", __opts__["hash_type"])
+    return path, form, source_sum.get("hsum")
+
+
 def _error(ret, err_msg):
     """
     Common function for setting error information for return dicts
@@ -750,13 +772,19 @@ def get_hash(path, form="sha256", chunk_size=65536):
     chunk_size
         amount to sum at once
 
+    When :conf_minion:`file_hash_cache` is enabled, the sum cached for the
+    file is returned as long as its device, inode, size, mtime and ctime did
+    not change.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt '*' file.get_hash /etc/shadow
     """
-    return salt.utils.hashutils.get_hash(os.path.expanduser(path), form, chunk_size)
+    return salt.utils.hashutils.get_cached_hash(
+        os.path.expanduser(path), form, chunk_size, cachedir=_hash_cachedir()
+    )
 
 
 def get_source_sum(
@@ -6669,6 +6697,8 @@ def manage_file(
     # Ensure that user-provided hash string is lowercase
     if source_sum and ("hsum" in source_sum):
         source_sum["hsum"] = source_sum["hsum"].lower()
+    # The hash sum of the file written, to be recorded in the hash cache
+    written_hash = None
 
     if source:
         if not sfn:
@@ -6687,6 +6717,10 @@ def manage_file(
                 except Exception as exc:  # pylint: disable=broad-except
                     log.warning("Unable to stat %s: %s", sfn, exc)
 
+    # The sum of the source is the one of the file written, unless a newer
+    # version of the source may have been downloaded since it was computed
+    written_sum = None if use_etag else source_sum
+
     # Check changes if the target file exists
     if os.path.isfile(name) or os.path.islink(name):
         if os.path.islink(name) and follow_symlinks:
@@ -6785,6 +6819,7 @@ def manage_file(
             except OSError as io_error:
                 __clean_tmp(sfn)
                 return _error(ret, f"Failed to commit change: {io_error}")
+            written_hash = _written_hash(real_name, written_sum)
 
         if contents is not None:
             # Write the static contents to a temporary file
@@ -6845,6 +6880,7 @@ def manage_file(
                 except OSError as io_error:
                     __clean_tmp(tmp)
                     return _error(ret, f"Failed to commit change: {io_error}")
+                written_hash = _written_hash(real_name)
             __clean_tmp(tmp)
 
         # Check for changing symlink to regular file here
@@ -6895,6 +6931,7 @@ def manage_file(
             except OSError as io_error:
                 __clean_tmp(sfn)
                 return _error(ret, f"Failed to commit change: {io_error}")
+            written_hash = _written_hash(name, written_sum)
 
             ret["changes"]["diff"] = "Replace symbolic link with regular file"
 
@@ -6927,6 +6964,11 @@ def manage_file(
                 serange=serange,
             )
 
+        if written_hash:
+            # The sum is recorded once the permissions, which change the
+            # ctime, are set
+            salt.utils.hashutils.record_hash(_hash_cachedir(), *written_hash)
+
         if ret["changes"]:
             ret["comment"] = f"File {salt.utils.data.decode(name)} updated"
             if (
@@ -7098,12 +7140,14 @@ def manage_file(
             salt.utils.files.copyfile(
                 tmp, name, __salt__["config.backup_mode"](backup), __opts__["cachedir"]
             )
+            written_hash = _written_hash(name)
             __clean_tmp(tmp)
         # Now copy the file contents if there is a source file
         elif sfn:
             salt.utils.files.copyfile(
                 sfn, name, __salt__["config.backup_mode"](backup), __opts__["cachedir"]
             )
+            written_hash = _written_hash(name, written_sum)
             __clean_tmp(sfn)
 
         # This is a new file, if no mode specified, use the umask to figure
@@ -7142,6 +7186,9 @@ def manage_file(
                 serange=serange,
             )
 
+        if written_hash:
+            salt.utils.hashutils.record_hash(_hash_cachedir(), *written_hash)
+
         if not ret["comment"]:
             ret["comment"] = "File " + name + " updated"
 
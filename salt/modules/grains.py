@@ -19,6 +19,7 @@ from functools import reduce  # pylint: disable=redefined-builtin
 
 import yaml
 
+import salt.loader
 import salt.utils.compat
 import salt.utils.data
 import salt.utils.files
@@ -125,6 +126,23 @@ def get(key, default="", delimiter=DEFAULT_TARGET_DELIM, ordered=True):
     return salt.utils.data.traverse_dict_and_list(grains, key, default, delimiter)
 
 
+def timing():
+    """
+    .. versionadded:: 3008.0
+
+    Return the execution time in seconds of each grain function during the
+    last collection of the grains. The grain functions served from the cache
+    configured with :conf_minion:`grains_cache_functions` report ``None``.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' grains.timing
+    """
+    return salt.loader.grains_timing(__opts__)
+
+
 def has_value(key):
     """
     Determine whether a key exists in the grains dictionary.
@@ -32,12 +32,14 @@ from salt.modules.file import (
     _get_bkroot,
     _get_eol,
     _get_flags,
+    _hash_cachedir,
     _mkstemp_copy,
     _regex_to_static,
     _set_line,
     _set_line_eol,
     _set_line_indent,
     _splitlines_preserving_trailing_newline,
+    _written_hash,
     access,
     append,
     apply_template_on_contents,
@@ -132,6 +134,8 @@ if salt.utils.platform.is_windows():
             _splitlines_preserving_trailing_newline, globals()
         )
         _error = namespaced_function(_error, globals())
+        _hash_cachedir = namespaced_function(_hash_cachedir, globals())
+        _written_hash = namespaced_function(_written_hash, globals())
         _get_bkroot = namespaced_function(_get_bkroot, globals())
         list_backups = namespaced_function(list_backups, globals())
         restore_backup = namespaced_function(restore_backup, globals())
@@ -50,6 +50,20 @@ __HOLD_PATTERN = r"[\w+]+(?:[.-][^-]+)*"
 
 PKG_ARCH_SEPARATOR = "."
 
+# The files of the bdb, ndb and sqlite rpm database backends. The sqlite
+# database may run in WAL mode, its changes then go to the -wal file first.
+RPMDB_PATHS = [
+    os.path.join(dbpath, dbfile)
+    for dbpath in ("/var/lib/rpm", "/usr/lib/sysimage/rpm")
+    for dbfile in (
+        "Packages",
+        "Packages.db",
+        "rpmdb.sqlite",
+        "rpmdb.sqlite-wal",
+        "rpmdb.sqlite-shm",
+    )
+]
+
 # Define the module's virtual name
 __virtualname__ = "pkg"
 
@@ -714,6 +728,17 @@ def list_pkgs(versions_as_list=False, **kwargs):
     if contextkey in __context__ and kwargs.get("use_context", True):
         return _list_pkgs_from_context(versions_as_list, contextkey, attr)
 
+    # The inventory cached by another process is used as long as the rpm
+    # database did not change
+    fingerprint = salt.utils.pkg.db_fingerprint(RPMDB_PATHS)
+    if kwargs.get("use_context", True):
+        ret = salt.utils.pkg.read_inventory_cache(__opts__, "yumpkg", fingerprint)
+        if ret is not None:
+            __context__[contextkey] = ret
+            return __salt__["pkg_resource.format_pkg_list"](
+                __context__[contextkey], versions_as_list, attr
+            )
+
     ret = {}
     cmd = [
         "rpm",
@@ -748,6 +773,7 @@ def list_pkgs(versions_as_list=False, **kwargs):
     for pkgname in ret:
         ret[pkgname] = sorted(ret[pkgname], key=lambda d: d["version"])
 
+    salt.utils.pkg.write_inventory_cache(__opts__, "yumpkg", fingerprint, ret)
     __context__[contextkey] = ret
 
     return __salt__["pkg_resource.format_pkg_list"](
@@ -1780,6 +1806,7 @@ def install(
                 errors.append(out["stdout"])
 
     __context__.pop("pkg.list_pkgs", None)
+    salt.utils.pkg.clear_inventory_cache(__opts__, "yumpkg")
     new = (
         list_pkgs(versions_as_list=False, attr=diff_attr)
         if not downloadonly
@@ -2031,6 +2058,7 @@ def upgrade(
     cmd.extend(targets)
     result = _call_yum(cmd)
     __context__.pop("pkg.list_pkgs", None)
+    salt.utils.pkg.clear_inventory_cache(__opts__, "yumpkg")
     new = list_pkgs(attr=diff_attr)
     ret = salt.utils.data.compare_dicts(old, new)
 
@@ -2164,6 +2192,7 @@ def remove(name=None, pkgs=None, **kwargs):  # pylint: disable=W0613
         errors = []
 
     __context__.pop("pkg.list_pkgs", None)
+    salt.utils.pkg.clear_inventory_cache(__opts__, "yumpkg")
     new = list_pkgs()
     ret = salt.utils.data.compare_dicts(old, new)
 
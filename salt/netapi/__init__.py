@@ -16,6 +16,7 @@ import salt.exceptions
 import salt.runner
 import salt.syspaths
 import salt.utils.args
+import salt.utils.event
 import salt.utils.minions
 import salt.wheel
 from salt.defaults import DEFAULT_TARGET_DELIM
@@ -57,6 +58,22 @@ def sum_permissions(token, eauth):
     return perms
 
 
+def dropped_event(subscription):
+    """
+    Return the event telling an event stream client that the events it did
+    not read in time were dropped, if any were
+
+    .. versionadded:: 3008.0
+    """
+    dropped = subscription.take_dropped()
+    if not dropped:
+        return None
+    return {
+        "tag": salt.utils.event.tagify(["events", "dropped"], "netapi"),
+        "data": {"dropped": dropped, "lag": subscription.lag},
+    }
+
+
 class NetapiClient:
     """
     Provide a uniform method of accessing the various client interfaces in Salt
@@ -126,6 +126,12 @@ A REST API for Salt
         Do not require authentication to access the ``/stats`` endpoint.
 
         .. versionadded:: 2018.3.0
+    events_queue_size : ``1000``
+        The number of events waiting for a client of the :py:class:`Events`
+        stream which reads slower than they are fired. The older events are
+        dropped.
+
+        .. versionadded:: 3008.0
     static
         A filesystem path to static HTML/JavaScript/CSS/image assets.
     static_path : ``/static``
@@ -601,9 +607,11 @@ import cherrypy  # pylint: disable=import-error,3rd-party-module-not-gated
 import salt
 import salt.auth
 import salt.exceptions
+import salt.loader
 import salt.netapi
 import salt.utils.args
 import salt.utils.event
+import salt.utils.job
 import salt.utils.json
 import salt.utils.stringutils
 import salt.utils.versions
@@ -843,6 +851,77 @@ ct_out_map = (
 )
 
 
+class StreamedReturn:
+    """
+    Return data whose ``return`` mapping is produced item by item. The items
+    are serialized and sent to the client as they are produced, instead of
+    serializing the whole return data at once.
+
+    :param head: A dictionary of the other keys of the return data
+    :param items: An iterable of the ``(key, value)`` pairs of the single
+        mapping of the ``return`` list
+    """
+
+    def __init__(self, head, items):
+        self.head = head
+        self.items = items
+
+
+def json_stream_out(ret):
+    """
+    Yield a :py:class:`StreamedReturn` serialized in JSON by chunks
+    """
+    head = salt.utils.json.dumps(ret.head)
+    yield '{}{}"return": [{{'.format(head[:-1], ", " if ret.head else "")
+    sep = ""
+    for key, value in ret.items:
+        yield "{}{}: {}".format(
+            sep, salt.utils.json.dumps(key), salt.utils.json.dumps(value)
+        )
+        sep = ", "
+    yield "}]}"
+
+
+def yaml_stream_out(ret):
+    """
+    Yield a :py:class:`StreamedReturn` serialized in YAML by chunks
+    """
+    if ret.head:
+        yield salt.utils.yaml.safe_dump(ret.head, default_flow_style=False)
+    yield "return:\n"
+    prefix = "- "
+    for key, value in ret.items:
+        lines = salt.utils.yaml.safe_dump(
+            {key: value}, default_flow_style=False
+        ).splitlines(True)
+        yield "".join(
+            [prefix + lines[0]]
+            + ["  " + line if line != "\n" else line for line in lines[1:]]
+        )
+        prefix = "  "
+    if prefix == "- ":
+        yield "- {}\n"
+
+
+# Maps Content-Type to the functions serializing a StreamedReturn by chunks
+ct_stream_map = {
+    "application/json": json_stream_out,
+    "application/x-yaml": yaml_stream_out,
+}
+
+
+def _stream_response(out, ret):
+    """
+    Yield the chunks of a serialized StreamedReturn as bytes
+    """
+    try:
+        for chunk in out(ret):
+            yield salt.utils.stringutils.to_bytes(chunk)
+    except Exception:  # pylint: disable=broad-except
+        # The status and the headers are already sent
+        logger.error("Could not serialize the return data from Salt.", exc_info=True)
+
+
 def hypermedia_handler(*args, **kwargs):
     """
     Determine the best output format based on the Accept header, execute the
@@ -910,6 +989,9 @@ def hypermedia_handler(*args, **kwargs):
 
     # Transform the output from the handler into the requested output format
     cherrypy.response.headers["Content-Type"] = best
+    if isinstance(ret, StreamedReturn):
+        cherrypy.response.stream = True
+        return _stream_response(ct_stream_map[best], ret)
     out = cherrypy.response.processors[best]
     try:
         response = out(ret)
@@ -1448,11 +1530,20 @@ class Minions(LowDataAdapter):
 class Jobs(LowDataAdapter):
     _cp_config = dict(LowDataAdapter._cp_config, **{"tools.salt_auth.on": True})
 
+    def __init__(self):
+        super().__init__()
+        self.returners = None
+
     def GET(self, jid=None, timeout=""):  # pylint: disable=arguments-differ
         """
         A convenience URL for getting lists of previously run jobs or getting
         the return from a single job
 
+        .. versionchanged:: 3008.0
+
+            The returns of the minions for a single job are read from the job
+            cache by pages and sent to the client as they are read.
+
         .. http:get:: /jobs/(jid)
 
             List jobs or show a single job from the job cache.
@@ -1510,7 +1601,7 @@ class Jobs(LowDataAdapter):
         .. code-block:: text
 
             HTTP/1.1 200 OK
-            Content-Length: 73
+            Transfer-Encoding: chunked
             Content-Type: application/x-yaml
 
             info:
@@ -1534,28 +1625,30 @@ class Jobs(LowDataAdapter):
         """
         lowstate = {"client": "runner"}
         if jid:
-            lowstate.update({"fun": "jobs.list_job", "jid": jid})
+            # The returns of the minions are read by pages below
+            lowstate.update({"fun": "jobs.list_job", "jid": jid, "result": False})
         else:
             lowstate.update({"fun": "jobs.list_jobs"})
 
         cherrypy.request.lowstate = [lowstate]
         job_ret_info = list(self.exec_lowstate(token=cherrypy.session.get("token")))
 
-        ret = {}
         if jid:
-            ret["info"] = [job_ret_info[0]]
-            minion_ret = {}
-            returns = job_ret_info[0].get("Result")
-            for minion in returns:
-                if "return" in returns[minion]:
-                    minion_ret[minion] = returns[minion].get("return")
-                else:
-                    minion_ret[minion] = returns[minion].get("return")
-            ret["return"] = [minion_ret]
-        else:
-            ret["return"] = [job_ret_info[0]]
+            return StreamedReturn({"info": [job_ret_info[0]]}, self._job_returns(jid))
 
-        return ret
+        return {"return": [job_ret_info[0]]}
+
+    def _job_returns(self, jid):
+        """
+        Yield the ids of the minions and what they returned for a job, reading
+        the job cache by pages
+        """
+        if self.returners is None:
+            self.returners = salt.loader.returners(self.opts, {})
+        returner = self.opts["ext_job_cache"] or self.opts["master_job_cache"]
+        for page in salt.utils.job.get_jid_pages(self.returners, returner, jid):
+            for minion, data in page.items():
+                yield minion, data.get("return")
 
 
 class Keys(LowDataAdapter):
@@ -2222,7 +2315,7 @@ class Events:
 
         return False
 
-    def GET(self, token=None, salt_token=None):
+    def GET(self, token=None, salt_token=None, tag=None):
         r"""
         An HTTP stream of the Salt master event bus
 
@@ -2243,6 +2336,10 @@ class Events:
                 *eauth token* (not to be confused with the token returned from
                 the /login URL). E.g.,
                 ``curl -NsS localhost:8000/events?salt_token=30742765``
+            :query tag: **optional** glob pattern of the tags of the events
+                to stream, it can be given several times. All the events are
+                streamed by default. E.g.,
+                ``curl -NsS 'localhost:8000/events?tag=salt/job/*/new'``
 
         **Example request:**
 
@@ -2365,29 +2462,34 @@ class Events:
         cherrypy.response.headers["Cache-Control"] = "no-cache"
         cherrypy.response.headers["Connection"] = "keep-alive"
 
+        if isinstance(tag, str):
+            tag = [tag]
+        # All the streams of the process read from a single connection to the
+        # event bus
+        multiplexer = salt.utils.event.get_threaded_event_multiplexer(self.opts)
+        queue_size = cherrypy.config.get("apiopts", {}).get("events_queue_size", 1000)
+
         def listen():
             """
             An iterator to yield Salt events
             """
-            with salt.utils.event.get_event(
-                "master",
-                sock_dir=self.opts["sock_dir"],
-                opts=self.opts,
-                listen=True,
-            ) as event:
-                stream = event.iter_events(full=True, auto_reconnect=True)
-
+            with multiplexer.subscribe_tags(tag, maxsize=queue_size) as subscription:
                 yield "retry: 400\n"
 
+                verified = time.time()
                 while True:
                     # make sure the token is still valid
-                    if not self._is_valid_token(auth_token):
-                        logger.debug("Token is no longer valid")
-                        break
-
-                    data = next(stream)
-                    yield "tag: {}\n".format(data.get("tag", ""))
-                    yield f"data: {salt.utils.json.dumps(data)}\n\n"
+                    if time.time() - verified >= 1:
+                        if not self._is_valid_token(auth_token):
+                            logger.debug("Token is no longer valid")
+                            break
+                        verified = time.time()
+
+                    data = subscription.get(timeout=5)
+                    for evt in (salt.netapi.dropped_event(subscription), data):
+                        if evt is not None:
+                            yield "tag: {}\n".format(evt.get("tag", ""))
+                            yield f"data: {salt.utils.json.dumps(evt)}\n\n"
 
         return listen()
 
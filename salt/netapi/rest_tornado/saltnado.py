@@ -31,6 +31,8 @@ add the following to the Salt master config file.
         disable_ssl: False
         webhook_disable_auth: False
         cors_origin: null
+        # events buffered for each event stream client
+        events_queue_size: 1000
 
 .. _rest_tornado-auth:
 
@@ -189,13 +191,14 @@ import cgi
 import fnmatch
 import logging
 import time
-from collections import defaultdict
+from collections import Counter, defaultdict
 from copy import copy
 
 import tornado.escape
 import tornado.gen
 import tornado.httpserver
 import tornado.ioloop
+import tornado.iostream
 import tornado.web
 from tornado.concurrent import Future
 
@@ -268,21 +271,25 @@ class EventListener:
     Class responsible for listening to the salt master event bus and updating
     futures. This is the core of what makes this asynchronous, this allows us to do
     non-blocking work in the main processes and "wait" for an event to happen
+
+    The events are read from the :py:class:`~salt.utils.event.EventMultiplexer`
+    of the process, which also feeds the event streams of the clients.
     """
 
     def __init__(self, mod_opts, opts):
         self.mod_opts = mod_opts
         self.opts = opts
-        self.event = salt.utils.event.get_event(
-            "master",
-            opts["sock_dir"],
-            opts=opts,
-            listen=True,
-            io_loop=tornado.ioloop.IOLoop.current(),
+        self.multiplexer = salt.utils.event.get_event_multiplexer(
+            opts, io_loop=tornado.ioloop.IOLoop.current()
         )
+        self.event = self.multiplexer.event
 
         # tag -> list of futures
         self.tag_map = defaultdict(list)
+        # length -> number of the prefix_matcher tags of this length in tag_map
+        self.prefix_lengths = Counter()
+        # the tags of tag_map with custom matchers
+        self.matcher_tags = set()
 
         # request_obj -> list of (tag, future)
         self.request_map = defaultdict(list)
@@ -290,7 +297,19 @@ class EventListener:
         # map of future -> timeout_callback
         self.timeout_map = {}
 
-        self.event.set_event_handler(self._handle_event_socket_recv)
+        self.subscription = self.multiplexer.subscribe("")
+        self.reader = self.multiplexer.io_loop.asyncio_loop.create_task(
+            self._read_events()
+        )
+
+    def subscribe(self, tags=None):
+        """
+        Return the subscription of an event stream to the events matching one
+        of the glob patterns of ``tags``, or to all the events
+        """
+        return self.multiplexer.subscribe_tags(
+            tags, maxsize=self.mod_opts.get("events_queue_size", 1000)
+        )
 
     def clean_by_request(self, request):
         """
@@ -341,6 +360,11 @@ class EventListener:
 
             future.add_done_callback(handle_future)
         # add this tag and future to the callbacks
+        if (tag, matcher) not in self.tag_map:
+            if matcher is EventListener.prefix_matcher:
+                self.prefix_lengths[len(tag)] += 1
+            elif matcher is not EventListener.exact_matcher:
+                self.matcher_tags.add((tag, matcher))
         self.tag_map[(tag, matcher)].append(future)
         self.request_map[request].append((tag, matcher, future))
 
@@ -366,29 +390,45 @@ class EventListener:
             self.tag_map[(tag, matcher)].remove(future)
         if len(self.tag_map[(tag, matcher)]) == 0:
             del self.tag_map[(tag, matcher)]
+            if matcher is EventListener.prefix_matcher:
+                self.prefix_lengths[len(tag)] -= 1
+                if not self.prefix_lengths[len(tag)]:
+                    del self.prefix_lengths[len(tag)]
+            else:
+                self.matcher_tags.discard((tag, matcher))
 
-    def _handle_event_socket_recv(self, raw):
+    async def _read_events(self):
+        async for evt in self.subscription:
+            self._handle_event(evt["tag"], evt["data"])
+
+    def _matching_tags(self, mtag):
         """
-        Callback for events on the event sub socket
+        Return the keys of the tag_map matching the tag of an event, looked up
+        by the tag and its prefixes rather than by trying every matcher
         """
-        mtag, data = self.event.unpack(raw)
-
-        # see if we have any futures that need this info:
-        for (tag, matcher), futures in self.tag_map.items():
+        keys = [(mtag, EventListener.exact_matcher)]
+        for length in self.prefix_lengths:
+            if length <= len(mtag):
+                keys.append((mtag[:length], EventListener.prefix_matcher))
+        ret = [key for key in keys if key in self.tag_map]
+        for tag, matcher in self.matcher_tags:
             try:
-                is_matched = matcher(mtag, tag)
+                if matcher(mtag, tag):
+                    ret.append((tag, matcher))
             except Exception:  # pylint: disable=broad-except
                 log.error("Failed to run a matcher.", exc_info=True)
-                is_matched = False
+        return ret
 
-            if not is_matched:
-                continue
-
-            for future in futures:
+    def _handle_event(self, mtag, data):
+        """
+        Resolve the futures waiting for an event
+        """
+        for key in self._matching_tags(mtag):
+            for future in list(self.tag_map[key]):
                 if future.done():
                     continue
                 future.set_result({"data": data, "tag": mtag})
-                self.tag_map[(tag, matcher)].remove(future)
+                self.tag_map[key].remove(future)
                 if future in self.timeout_map:
                     tornado.ioloop.IOLoop.current().remove_timeout(
                         self.timeout_map[future]
@@ -396,7 +436,10 @@ class EventListener:
                     del self.timeout_map[future]
 
     def destroy(self):
-        self.event.destroy()
+        self.reader.cancel()
+        self.subscription.close()
+        if not self.multiplexer.index:
+            self.multiplexer.destroy()
 
 
 class BaseSaltAPIHandler(tornado.web.RequestHandler):  # pylint: disable=W0223
@@ -431,12 +474,18 @@ class BaseSaltAPIHandler(tornado.web.RequestHandler):  # pylint: disable=W0223
                 self.application.opts,
             )
 
+        if not hasattr(self.application, "local_client"):
+            # A single client publishes the jobs of all the requests
+            self.application.local_client = salt.client.AsyncLocalClient(
+                mopts=self.application.opts
+            )
+
         if not hasattr(self, "saltclients"):
-            local_client = salt.client.get_local_client(mopts=self.application.opts)
+            local_client = self.application.local_client
             self.saltclients = {
-                "local": local_client.run_job_async,
+                "local": local_client.run_job,
                 # not the actual client we'll use.. but its what we'll use to get args
-                "local_async": local_client.run_job_async,
+                "local_async": local_client.run_job,
                 "runner": salt.runner.RunnerClient(
                     opts=self.application.opts
                 ).cmd_async,
@@ -1195,14 +1244,10 @@ class SaltAPIHandler(BaseSaltAPIHandler):  # pylint: disable=W0223
         pub_data = self.saltclients["runner"](chunk)
         raise tornado.gen.Return(pub_data)
 
-    # salt.utils.args.format_call doesn't work for functions having the
-    # annotation tornado.gen.coroutine
     def _format_call_run_job_async(self, chunk):
-        f_call = salt.utils.args.format_call(
-            salt.client.LocalClient.run_job, chunk, is_class_method=True
+        return salt.utils.args.format_call(
+            salt.client.AsyncLocalClient.run_job, chunk, is_class_method=True
         )
-        f_call.get("kwargs", {})["io_loop"] = tornado.ioloop.IOLoop.current()
-        return f_call
 
 
 class MinionSaltAPIHandler(SaltAPIHandler):  # pylint: disable=W0223
@@ -1521,6 +1566,9 @@ class EventsSaltAPIHandler(SaltAPIHandler):  # pylint: disable=W0223
             :status 200: |200|
             :status 401: |401|
             :status 406: |406|
+            :query tag: **optional** glob pattern of the tags of the events
+                to stream, it can be given several times. All the events are
+                streamed by default.
 
         **Example request:**
 
@@ -1602,6 +1650,19 @@ class EventsSaltAPIHandler(SaltAPIHandler):  # pylint: disable=W0223
             data: {"tag": "salt/job/20140112010149808995/new", "data": {"tgt_type": "glob", "jid": "20140112010149808995", "tgt": "jerry", "_stamp": "2014-01-12_01:01:49.809617", "user": "shouse", "arg": [], "fun": "test.ping", "minions": ["jerry"]}}
             tag: 20140112010149808995
             data: {"tag": "20140112010149808995", "data": {"fun_args": [], "jid": "20140112010149808995", "return": true, "retcode": 0, "success": true, "cmd": "_return", "_stamp": "2014-01-12_01:01:49.819316", "fun": "test.ping", "id": "jerry"}}
+
+        The same filtering is done by the server with the ``tag`` parameter:
+
+        .. code-block:: bash
+
+            curl -NsS 'localhost:8000/events?tag=salt/job/*/new'
+
+        .. versionadded:: 3008.0
+
+            Up to ``events_queue_size`` events, 1000 by default, wait for
+            a client reading the stream slower than they are fired. The older
+            ones are dropped, and the next event of the stream is a
+            ``salt/netapi/events/dropped`` event giving their number.
         """
         # if you aren't authenticated, redirect to login
         if not self._verify_auth():
@@ -1615,19 +1676,28 @@ class EventsSaltAPIHandler(SaltAPIHandler):  # pylint: disable=W0223
         self.write(f"retry: {400}\n")
         self.flush()
 
-        while True:
-            try:
-                if not self._verify_auth():
-                    log.debug("Token is no longer valid")
+        with self.application.event_listener.subscribe(
+            self.get_arguments("tag")
+        ) as subscription:
+            verified = time.time()
+            while True:
+                if time.time() - verified >= 1:
+                    if not self._verify_auth():
+                        log.debug("Token is no longer valid")
+                        break
+                    verified = time.time()
+
+                event = yield subscription.get(timeout=5)
+                for evt in (salt.netapi.dropped_event(subscription), event):
+                    if evt is not None:
+                        self.write("tag: {}\n".format(evt.get("tag", "")))
+                        self.write(f"data: {_json_dumps(evt)}\n\n")
+                try:
+                    # Wait for slow clients, their events queue up meanwhile
+                    yield self.flush()
+                except tornado.iostream.StreamClosedError:
                     break
 
-                event = yield self.application.event_listener.get_event(self)
-                self.write("tag: {}\n".format(event.get("tag", "")))
-                self.write(f"data: {_json_dumps(event)}\n\n")
-                self.flush()
-            except TimeoutException:
-                break
-
 
 class WebhookSaltAPIHandler(SaltAPIHandler):  # pylint: disable=W0223
     """
@@ -29,7 +29,8 @@ Exposes ``all`` "real-time" events from Salt's event bus on a websocket connecti
 It should be noted that "Real-time" here means these events are made available
 to the server as soon as any salt related action (changes to minions, new jobs etc) happens.
 Clients are however assumed to be able to tolerate any network transport related latencies.
-Functionality provided by this endpoint is similar to the ``/events`` end point.
+Functionality provided by this endpoint is similar to the ``/events`` end point,
+the ``tag`` query parameter filters the events the same way.
 
 The event bus on the Salt master exposes a large variety of things, notably
 when executions are started on the master and also when minions ultimately
@@ -334,6 +335,7 @@ class AllEventsHandler(
         representing Salt's "real time" event stream.
         """
         self.connected = False
+        self.closed = False
 
     @tornado.gen.coroutine
     def on_message(self, message):
@@ -352,16 +354,25 @@ class AllEventsHandler(
 
             self.connected = True
 
-            while True:
-                try:
-                    event = yield self.application.event_listener.get_event(self)
-                    self.write_message(salt.utils.json.dumps(event, _json_module=_json))
-                except Exception as err:  # pylint: disable=broad-except
-                    log.info(
-                        "Error! Ending server side websocket connection. Reason = %s",
-                        err,
-                    )
-                    break
+            with self.application.event_listener.subscribe(
+                self.get_arguments("tag")
+            ) as subscription:
+                while not self.closed:
+                    try:
+                        event = yield subscription.get(timeout=5)
+                        for evt in (salt.netapi.dropped_event(subscription), event):
+                            if evt is not None:
+                                # Wait for slow clients, their events queue
+                                # up meanwhile
+                                yield self.write_message(
+                                    salt.utils.json.dumps(evt, _json_module=_json)
+                                )
+                    except Exception as err:  # pylint: disable=broad-except
+                        log.info(
+                            "Error! Ending server side websocket connection. Reason = %s",
+                            err,
+                        )
+                        break
 
             self.close()
         else:
@@ -371,6 +382,7 @@ class AllEventsHandler(
     def on_close(self, *args, **kwargs):
         """Cleanup."""
         log.debug("In the websocket close method")
+        self.closed = True
         self.close()
 
     def check_origin(self, origin):
@@ -416,17 +428,22 @@ class FormattedEventsHandler(AllEventsHandler):  # pylint: disable=W0223,W0232
                     "client": "local",
                 }
             )
-            while True:
-                try:
-                    event = yield self.application.event_listener.get_event(self)
-                    evt_processor.process(event, self.token, self.application.opts)
-                    # self.write_message('data: {0}\n\n'.format(salt.utils.json.dumps(event, _json_module=_json)))
-                except Exception as err:  # pylint: disable=broad-except
-                    log.debug(
-                        "Error! Ending server side websocket connection. Reason = %s",
-                        err,
-                    )
-                    break
+            with self.application.event_listener.subscribe(
+                self.get_arguments("tag")
+            ) as subscription:
+                while not self.closed:
+                    try:
+                        event = yield subscription.get(timeout=5)
+                        if event is not None:
+                            evt_processor.process(
+                                event, self.token, self.application.opts
+                            )
+                    except Exception as err:  # pylint: disable=broad-except
+                        log.debug(
+                            "Error! Ending server side websocket connection. Reason = %s",
+                            err,
+                        )
+                        break
 
             self.close()
         else:
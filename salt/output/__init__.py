@@ -31,8 +31,16 @@ def try_printout(data, out, opts, **kwargs):
     Safely get the string to print out, try the configured outputter, then
     fall back to nested and then to raw
     """
+    return _try_printout(get_printout(out, opts), data, opts, **kwargs)
+
+
+def _try_printout(printer, data, opts, **kwargs):
+    """
+    Safely get the string to print out with the given printer function, fall
+    back to nested and then to raw
+    """
     try:
-        printout = get_printout(out, opts)(data, **kwargs)
+        printout = printer(data, **kwargs)
         if printout is not None:
             return printout.rstrip()
     except (KeyError, AttributeError, TypeError):
@@ -48,6 +56,49 @@ def try_printout(data, out, opts, **kwargs):
                 return printout.rstrip()
 
 
+def try_printout_iter(data, out, opts, **kwargs):
+    """
+    Safely get the strings to print out one after the other when the
+    configured outputter streams its output, fall back to ``try_printout``
+    when it does not
+    """
+    outputters, out = _get_outputters(out, opts)
+    try:
+        printout_iter = outputters._dict.get(f"{out}.output_iter")
+    except Exception:  # pylint: disable=broad-except
+        log.debug(traceback.format_exc())
+        printout_iter = None
+    if printout_iter is not None:
+        last = None
+        written = False
+        try:
+            for printout in printout_iter(data, **kwargs):
+                if printout is None:
+                    continue
+                if last is not None:
+                    yield last
+                    written = True
+                last = str(printout)
+        except (KeyError, AttributeError, TypeError):
+            if not written:
+                # Nothing was printed, print the whole output at once
+                log.debug(traceback.format_exc())
+            else:
+                # Only print the rest of the output, the data already printed
+                # is not printed again
+                log.error("The %s outputter failed", out, exc_info=True)
+                yield last.rstrip()
+                yield f"The {out} outputter failed, the output is incomplete"
+                return
+        else:
+            if last is not None:
+                yield last.rstrip()
+            return
+    printout = _try_printout(outputters[out], data, opts, **kwargs)
+    if printout is not None:
+        yield printout
+
+
 def get_progress(opts, out, progress):
     """
     Get the progress bar from the given outputter
@@ -84,7 +135,7 @@ def display_output(data, out=None, opts=None, **kwargs):
     """
     if opts is None:
         opts = {}
-    display_data = try_printout(data, out, opts, **kwargs)
+    printouts = try_printout_iter(data, out, opts, **kwargs)
 
     output_filename = opts.get("output_file", None)
     log.trace("data = %s", data)
@@ -102,23 +153,26 @@ def display_output(data, out=None, opts=None, **kwargs):
                 fh_opened = False
 
             try:
-                fdata = display_data
-                if isinstance(fdata, str):
-                    try:
-                        fdata = fdata.encode("utf-8")
-                    except (UnicodeDecodeError, UnicodeEncodeError):
-                        # try to let the stream write
-                        # even if we didn't encode it
-                        pass
-                if fdata:
-                    ofh.write(salt.utils.stringutils.to_str(fdata))
-                    ofh.write("\n")
+                for fdata in printouts:
+                    if isinstance(fdata, str):
+                        try:
+                            fdata = fdata.encode("utf-8")
+                        except (UnicodeDecodeError, UnicodeEncodeError):
+                            # try to let the stream write
+                            # even if we didn't encode it
+                            pass
+                    if fdata:
+                        ofh.write(salt.utils.stringutils.to_str(fdata))
+                        ofh.write("\n")
             finally:
                 if fh_opened:
                     ofh.close()
             return
-        if display_data:
-            salt.utils.stringutils.print_cli(display_data)
+        for display_data in printouts:
+            if display_data:
+                salt.utils.stringutils.print_cli(display_data)
+        # Show each return as soon as it is printed, also when piped
+        sys.stdout.flush()
     except OSError as exc:
         # Only raise if it's NOT a broken pipe
         if exc.errno != errno.EPIPE:
@@ -129,6 +183,14 @@ def get_printout(out, opts=None, **kwargs):
     """
     Return a printer function
     """
+    outputters, out = _get_outputters(out, opts, **kwargs)
+    return outputters[out]
+
+
+def _get_outputters(out, opts=None, **kwargs):
+    """
+    Return the outputters and the name of the outputter to use
+    """
     if opts is None:
         opts = {}
 
@@ -193,8 +255,8 @@ def get_printout(out, opts=None, **kwargs):
                 "Invalid outputter %s specified, fall back to nested",
                 out,
             )
-        return outputters["nested"]
-    return outputters[out]
+        return outputters, "nested"
+    return outputters, out
 
 
 def out_format(data, out, opts=None, **kwargs):
@@ -276,10 +276,10 @@ def _compress_ids(data):
     return compressed
 
 
-def output(data, **kwargs):  # pylint: disable=unused-argument
+def _prepare(data):
     """
-    The HighState Outputter is only meant to be used with the state.highstate
-    function, or a function that returns highstate return data.
+    Return the state data passed to the highstate outputter, without the data
+    wrapping it
     """
     # If additional information is passed through via the "data" dictionary to
     # the highstate outputter, such as "outputter" or "retcode", discard it.
@@ -302,12 +302,9 @@ def output(data, **kwargs):  # pylint: disable=unused-argument
                 data = _data.get("return", {}).get("data", data)
 
     # output() is recursive, if we aren't passed a dict just return it
-    if isinstance(data, int) or isinstance(data, str):
+    if isinstance(data, int) or isinstance(data, str) or data is None:
         return data
 
-    if data is None:
-        return "None"
-
     # Discard retcode in dictionary as present in orchestrate data
     local_masters = [key for key in data.keys() if key.endswith("_master")]
     orchestrator_output = "retcode" in data.keys() and len(local_masters) == 1
@@ -318,12 +315,25 @@ def output(data, **kwargs):  # pylint: disable=unused-argument
     # pre-process data if state_compress_ids is set
     if __opts__.get("state_compress_ids", False):
         data = _compress_ids(data)
+    return data
+
+
+def output(data, **kwargs):  # pylint: disable=unused-argument
+    """
+    The HighState Outputter is only meant to be used with the state.highstate
+    function, or a function that returns highstate return data.
+    """
+    data = _prepare(data)
+
+    # output() is recursive, if we aren't passed a dict just return it
+    if isinstance(data, int) or isinstance(data, str):
+        return data
+
+    if data is None:
+        return "None"
 
     indent_level = kwargs.get("indent_level", 1)
-    ret = [
-        _format_host(host, hostdata, indent_level=indent_level)[0]
-        for host, hostdata in data.items()
-    ]
+    ret = list(_iter_hosts(data, indent_level=indent_level))
     if ret:
         return "\n".join(ret)
     log.error(
@@ -333,11 +343,56 @@ def output(data, **kwargs):  # pylint: disable=unused-argument
     return ""
 
 
+def output_iter(data, **kwargs):  # pylint: disable=unused-argument
+    """
+    Yield the lines of the highstate output as soon as they are formatted, the
+    results of the states of a host are printed while the next ones are still
+    being formatted and only the totals of the summary are kept.
+
+    .. versionadded:: 3008.0
+    """
+    data = _prepare(data)
+    if isinstance(data, int) or isinstance(data, str) or data is None:
+        yield output(data, **kwargs)
+        return
+
+    empty = True
+    for line in _iter_hosts(data, indent_level=kwargs.get("indent_level", 1)):
+        empty = False
+        yield line
+    if empty:
+        log.error(
+            "Data passed to highstate outputter is not a valid highstate return: %s",
+            data,
+        )
+
+
+def _iter_hosts(data, indent_level=1):
+    """
+    Yield the lines of the output of the hosts, one host after the other
+    """
+    for host, hostdata in data.items():
+        yield from _iter_host(host, hostdata, indent_level=indent_level)
+
+
 def _format_host(host, data, indent_level=1):
     """
     Main highstate formatter. can be called recursively if a nested highstate
     contains other highstates (ie in an orchestration)
     """
+    lines = []
+    host_lines = _iter_host(host, data, indent_level=indent_level)
+    while True:
+        try:
+            lines.append(next(host_lines))
+        except StopIteration as exc:
+            return "\n".join(lines), exc.value
+
+
+def _iter_host(host, data, indent_level=1):
+    """
+    Yield the lines of the output of a host, return whether there were changes
+    """
     host = salt.utils.data.decode(host)
 
     colors = salt.utils.color.get_colors(
@@ -348,29 +403,15 @@ def _format_host(host, data, indent_level=1):
     rdurations = []
     pdurations = []
     hcolor = colors["GREEN"]
-    hstrs = []
     nchanges = 0
     strip_colors = __opts__.get("strip_colors", True)
+    errors = []
 
-    if isinstance(data, int):
-        nchanges = 1
-        hstrs.append("{0}    {1}{2[ENDC]}".format(hcolor, data, colors))
-        hcolor = colors["CYAN"]  # Print the minion name in cyan
-    elif isinstance(data, str):
-        # Data in this format is from saltmod.function,
-        # so it is always a 'change'
-        nchanges = 1
-        for data in data.splitlines():
-            hstrs.append("{0}    {1}{2[ENDC]}".format(hcolor, data, colors))
+    if isinstance(data, (int, str)):
         hcolor = colors["CYAN"]  # Print the minion name in cyan
     elif isinstance(data, list):
         # Errors have been detected, list them in RED!
         hcolor = colors["LIGHT_RED"]
-        hstrs.append("    {0}Data failed to compile:{1[ENDC]}".format(hcolor, colors))
-        for err in data:
-            if strip_colors:
-                err = salt.output.strip_esc_sequence(salt.utils.data.decode(err))
-            hstrs.append("{0}----------\n    {1}{2[ENDC]}".format(hcolor, err, colors))
     elif isinstance(data, dict):
         # Verify that the needed data is present
         data_tmp = {}
@@ -386,11 +427,40 @@ def _format_host(host, data, indent_level=1):
                     "in which all states were executed. The state "
                     "return missing data is:"
                 )
-                hstrs.insert(0, pprint.pformat(info))
-                hstrs.insert(0, err)
+                errors[0:0] = [err, pprint.pformat(info)]
             if isinstance(info, dict) and "result" in info:
                 data_tmp[tname] = info
         data = data_tmp
+        # The host is printed before its states, in the color of the last one
+        # which did not succeed
+        for info in sorted(data.values(), key=lambda k: k.get("__run_num__", 0)):
+            if info["result"] is False:
+                hcolor = colors["RED"]
+            elif info["result"] is None:
+                hcolor = colors["LIGHT_YELLOW"]
+
+    header_host = host
+    if strip_colors:
+        header_host = salt.output.strip_esc_sequence(host)
+    yield "{0}{1}:{2[ENDC]}".format(hcolor, header_host, colors)
+    yield from errors
+
+    if isinstance(data, int):
+        nchanges = 1
+        yield "{0}    {1}{2[ENDC]}".format(colors["GREEN"], data, colors)
+    elif isinstance(data, str):
+        # Data in this format is from saltmod.function,
+        # so it is always a 'change'
+        nchanges = 1
+        for data in data.splitlines():
+            yield "{0}    {1}{2[ENDC]}".format(colors["GREEN"], data, colors)
+    elif isinstance(data, list):
+        yield "    {0}Data failed to compile:{1[ENDC]}".format(hcolor, colors)
+        for err in data:
+            if strip_colors:
+                err = salt.output.strip_esc_sequence(salt.utils.data.decode(err))
+            yield "{0}----------\n    {1}{2[ENDC]}".format(hcolor, err, colors)
+    elif isinstance(data, dict):
         # Everything rendered as it should display the output
         for tname in sorted(data, key=lambda k: data[k].get("__run_num__", 0)):
             ret = data[tname]
@@ -472,10 +542,8 @@ def _format_host(host, data, indent_level=1):
             if schanged:
                 tcolor = colors["CYAN"]
             if ret["result"] is False:
-                hcolor = colors["RED"]
                 tcolor = colors["RED"]
             if ret["result"] is None:
-                hcolor = colors["LIGHT_YELLOW"]
                 tcolor = colors["LIGHT_YELLOW"]
 
             state_output = __opts__.get("state_output", "full").lower()
@@ -512,7 +580,7 @@ def _format_host(host, data, indent_level=1):
 
                 if str(ret["result"]) in terse:
                     msg = _format_terse(tcolor, comps, ret, colors, tabular)
-                    hstrs.append(msg)
+                    yield msg
                     continue
                 if str(ret["result"]) in exclude:
                     continue
@@ -529,7 +597,7 @@ def _format_host(host, data, indent_level=1):
             ):
                 # Print this chunk in a terse way and continue in the loop
                 msg = _format_terse(tcolor, comps, ret, colors, tabular)
-                hstrs.append(msg)
+                yield msg
                 continue
 
             state_lines = [
@@ -589,9 +657,10 @@ def _format_host(host, data, indent_level=1):
                 # This nukes any trailing \n and indents the others.
                 "colors": colors,
             }
-            hstrs.extend([sline.format(**svars) for sline in state_lines])
+            for sline in state_lines:
+                yield sline.format(**svars)
             changes = "     Changes:   " + ctext
-            hstrs.append("{0}{1}{2[ENDC]}".format(tcolor, changes, colors))
+            yield "{0}{1}{2[ENDC]}".format(tcolor, changes, colors)
 
             if "warnings" in ret:
                 rcounts.setdefault("warnings", 0)
@@ -599,10 +668,8 @@ def _format_host(host, data, indent_level=1):
                 wrapper = textwrap.TextWrapper(
                     width=80, initial_indent=" " * 14, subsequent_indent=" " * 14
                 )
-                hstrs.append(
-                    "   {colors[LIGHT_RED]} Warnings: {0}{colors[ENDC]}".format(
-                        wrapper.fill("\n".join(ret["warnings"])).lstrip(), colors=colors
-                    )
+                yield "   {colors[LIGHT_RED]} Warnings: {0}{colors[ENDC]}".format(
+                    wrapper.fill("\n".join(ret["warnings"])).lstrip(), colors=colors
                 )
 
         # Append result counts to end of output
@@ -616,12 +683,10 @@ def _format_host(host, data, indent_level=1):
         count_max_len = max([len(str(x)) for x in rcounts.values()] or [0])
         label_max_len = max([len(x) for x in rlabel.values()] or [0])
         line_max_len = label_max_len + count_max_len + 2  # +2 for ': '
-        hstrs.append(
-            colorfmt.format(
-                colors["CYAN"],
-                "\nSummary for {}\n{}".format(host, "-" * line_max_len),
-                colors,
-            )
+        yield colorfmt.format(
+            colors["CYAN"],
+            "\nSummary for {}\n{}".format(host, "-" * line_max_len),
+            colors,
         )
 
         def _counts(label, count):
@@ -646,7 +711,7 @@ def _format_host(host, data, indent_level=1):
             changestats = " ({})".format(", ".join(changestats))
         else:
             changestats = ""
-        hstrs.append(
+        yield (
             colorfmt.format(
                 colors["GREEN"],
                 _counts(rlabel[True], rcounts.get(True, 0) + rcounts.get(None, 0)),
@@ -657,12 +722,10 @@ def _format_host(host, data, indent_level=1):
 
         # Failed states
         num_failed = rcounts.get(False, 0)
-        hstrs.append(
-            colorfmt.format(
-                colors["RED"] if num_failed else colors["CYAN"],
-                _counts(rlabel[False], num_failed),
-                colors,
-            )
+        yield colorfmt.format(
+            colors["RED"] if num_failed else colors["CYAN"],
+            _counts(rlabel[False], num_failed),
+            colors,
         )
 
         if __opts__.get("state_output_pct", False):
@@ -677,12 +740,10 @@ def _format_host(host, data, indent_level=1):
                     2,
                 )
 
-                hstrs.append(
-                    colorfmt.format(
-                        colors["GREEN"],
-                        _counts("Success %", success_pct),
-                        colors,
-                    )
+                yield colorfmt.format(
+                    colors["GREEN"],
+                    _counts("Success %", success_pct),
+                    colors,
                 )
             except ZeroDivisionError:
                 pass
@@ -695,31 +756,27 @@ def _format_host(host, data, indent_level=1):
                     2,
                 )
 
-                hstrs.append(
-                    colorfmt.format(
-                        colors["RED"] if num_failed else colors["CYAN"],
-                        _counts("Failure %", failed_pct),
-                        colors,
-                    )
+                yield colorfmt.format(
+                    colors["RED"] if num_failed else colors["CYAN"],
+                    _counts("Failure %", failed_pct),
+                    colors,
                 )
             except ZeroDivisionError:
                 pass
 
         num_warnings = rcounts.get("warnings", 0)
         if num_warnings:
-            hstrs.append(
-                colorfmt.format(
-                    colors["LIGHT_RED"],
-                    _counts(rlabel["warnings"], num_warnings),
-                    colors,
-                )
+            yield colorfmt.format(
+                colors["LIGHT_RED"],
+                _counts(rlabel["warnings"], num_warnings),
+                colors,
             )
         totals = "{0}\nTotal states run: {1:>{2}}".format(
             "-" * line_max_len,
             sum(rcounts.values()) - rcounts.get("warnings", 0),
             line_max_len - 7,
         )
-        hstrs.append(colorfmt.format(colors["CYAN"], totals, colors))
+        yield colorfmt.format(colors["CYAN"], totals, colors)
 
         if __opts__.get("state_output_profile"):
             sum_duration = sum(rdurations)
@@ -734,12 +791,9 @@ def _format_host(host, data, indent_level=1):
             total_duration = "Total run time: {} {}".format(
                 f"{sum_duration:.3f}".rjust(line_max_len - 5), duration_unit
             )
-            hstrs.append(colorfmt.format(colors["CYAN"], total_duration, colors))
+            yield colorfmt.format(colors["CYAN"], total_duration, colors)
 
-    if strip_colors:
-        host = salt.output.strip_esc_sequence(host)
-    hstrs.insert(0, "{0}{1}:{2[ENDC]}".format(hcolor, host, colors))
-    return "\n".join(hstrs), nchanges > 0
+    return nchanges > 0
 
 
 def _nested_changes(changes):
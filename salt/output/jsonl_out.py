@@ -0,0 +1,74 @@
+"""
+Display return data in JSON lines format
+========================================
+
+.. versionadded:: 3008.0
+
+Each key of the return data, usually the id of a minion, is output with its
+value as a JSON object on a single line, as soon as it is serialized. The
+returns of the minions can be read line by line by the consumers of the
+output, while the next returns are still being serialized. Example output
+(truncated)::
+
+    {"dave": {"en0": {"hwaddr": "02:b0:26:32:4c:69", ...}}}
+    {"jerry": {"en0": {"hwaddr": "02:26:ab:0d:b9:0d", ...}}}
+
+Return data which is not a dictionary is output as a single JSON value.
+
+CLI Example:
+
+.. code-block:: bash
+
+    salt '*' state.apply --out=jsonl
+"""
+
+import logging
+
+import salt.utils.json
+
+log = logging.getLogger(__name__)
+
+# Define the module's virtual name
+__virtualname__ = "jsonl"
+
+
+def __virtual__():
+    """
+    Rename to jsonl
+    """
+    return __virtualname__
+
+
+def _dumps(data):
+    """
+    Serialize the data on a single line
+    """
+    try:
+        return salt.utils.json.dumps(data, default=repr)
+    except UnicodeDecodeError as exc:
+        log.error("Unable to serialize output to json")
+        return salt.utils.json.dumps(
+            {"error": "Unable to serialize output to json", "message": str(exc)}
+        )
+    except TypeError:
+        log.debug("An error occurred while outputting JSON", exc_info=True)
+    # Return valid JSON for unserializable objects
+    return salt.utils.json.dumps({})
+
+
+def output(data, **kwargs):  # pylint: disable=unused-argument
+    """
+    Print the output data in JSON lines
+    """
+    return "\n".join(output_iter(data, **kwargs))
+
+
+def output_iter(data, **kwargs):  # pylint: disable=unused-argument
+    """
+    Yield the output data in JSON lines, one line for each key
+    """
+    if not isinstance(data, dict):
+        yield _dumps(data)
+        return
+    for key, value in data.items():
+        yield _dumps({key: value})
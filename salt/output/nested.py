@@ -117,31 +117,64 @@ class NestDisplay:
                 else:
                     self.display(ind, indent, "- ", out)
         elif isinstance(ret, Mapping):
-            if indent:
-                color = self.CYAN
-                if self.retcode != 0:
-                    color = self.RED
-                out.append(self.ustring(indent, color, "----------"))
-
-            # respect key ordering of ordered dicts
-            if isinstance(ret, salt.utils.odict.OrderedDict):
-                keys = ret.keys()
-            else:
-                try:
-                    keys = sorted(ret)
-                except TypeError:
-                    # Some of the keys must be non-string types
-                    ret = {str(k): v for k, v in ret.items()}
-                    keys = sorted(ret)
+            for _ in self._display_mapping(ret, indent, prefix, out):
+                pass
+        return out
 
+    def _display_mapping(self, ret, indent, prefix, out):
+        """
+        Add the output of the items of a mapping to out, yield out after each
+        item
+        """
+        if indent:
             color = self.CYAN
             if self.retcode != 0:
                 color = self.RED
-            for key in keys:
-                val = ret[key]
-                out.append(self.ustring(indent, color, key, suffix=":", prefix=prefix))
-                self.display(val, indent + 4, "", out)
-        return out
+            out.append(self.ustring(indent, color, "----------"))
+
+        # respect key ordering of ordered dicts
+        if isinstance(ret, salt.utils.odict.OrderedDict):
+            keys = ret.keys()
+        else:
+            try:
+                keys = sorted(ret)
+            except TypeError:
+                # Some of the keys must be non-string types
+                ret = {str(k): v for k, v in ret.items()}
+                keys = sorted(ret)
+
+        color = self.CYAN
+        if self.retcode != 0:
+            color = self.RED
+        for key in keys:
+            val = ret[key]
+            out.append(self.ustring(indent, color, key, suffix=":", prefix=prefix))
+            self.display(val, indent + 4, "", out)
+            yield out
+
+    def display_iter(self, ret, indent, prefix):
+        """
+        Yield the output lines of the data by chunks, one chunk for each item
+        of a mapping, so the output of a minion is printed before the next
+        one is formatted
+        """
+        if not isinstance(ret, Mapping):
+            yield self.display(ret, indent, prefix, [])
+            return
+        out = []
+        for lines in self._display_mapping(ret, indent, prefix, out):
+            yield lines
+            out.clear()
+        if out:
+            yield out
+
+
+def _join(lines):
+    try:
+        return "\n".join(lines)
+    except UnicodeDecodeError:
+        # output contains binary data that can't be decoded
+        return "\n".join([salt.utils.stringutils.to_str(x) for x in lines])
 
 
 def output(ret, **kwargs):
@@ -153,8 +186,17 @@ def output(ret, **kwargs):
     base_indent = kwargs.get("nested_indent", 0) or __opts__.get("nested_indent", 0)
     nest = NestDisplay(retcode=retcode)
     lines = nest.display(ret, base_indent, "", [])
-    try:
-        return "\n".join(lines)
-    except UnicodeDecodeError:
-        # output contains binary data that can't be decoded
-        return "\n".join([salt.utils.stringutils.to_str(x) for x in lines])
+    return _join(lines)
+
+
+def output_iter(ret, **kwargs):
+    """
+    Display ret data, one top level key after the other
+
+    .. versionadded:: 3008.0
+    """
+    retcode = kwargs.get("_retcode", 0)
+    base_indent = kwargs.get("nested_indent", 0) or __opts__.get("nested_indent", 0)
+    nest = NestDisplay(retcode=retcode)
+    for lines in nest.display_iter(ret, base_indent, ""):
+        yield _join(lines)
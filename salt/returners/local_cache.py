@@ -323,36 +323,67 @@ def get_jid(jid):
     """
     Return the information returned when the specified job id was executed
     """
+    ret = {}
+    for page in get_jid_pages(jid):
+        ret.update(page)
+    return ret
+
+
+def get_jid_pages(jid, page_size=salt.utils.job.JID_PAGE_SIZE):
+    """
+    Yield the information returned when the specified job id was executed, by
+    pages of at most ``page_size`` minions
+
+    .. versionadded:: 3008.0
+    """
     jid_dir = salt.utils.jid.jid_dir(jid, _job_dir(), __opts__["hash_type"])
 
-    ret = {}
-    # Check to see if the jid is real, if not return the empty dict
+    page = {}
+    # Check to see if the jid is real, if not there is nothing to yield
     if not os.path.isdir(jid_dir):
-        return ret
-    for fn_ in os.listdir(jid_dir):
-        if fn_.startswith("."):
-            continue
-        if fn_ not in ret:
-            retp = os.path.join(jid_dir, fn_, RETURN_P)
-            outp = os.path.join(jid_dir, fn_, OUT_P)
-            if not os.path.isfile(retp):
+        return
+    with os.scandir(jid_dir) as entries:
+        for entry in entries:
+            fn_ = entry.name
+            if fn_.startswith("."):
                 continue
-            while fn_ not in ret:
-                try:
-                    with salt.utils.files.fopen(retp, "rb") as rfh:
-                        ret_data = salt.payload.load(rfh)
-                    if not isinstance(ret_data, dict) or "return" not in ret_data:
-                        # Convert the old format in which return.p contains the only return data to
-                        # the new that is dict containing 'return' and optionally 'retcode' and
-                        # 'success'.
-                        ret_data = {"return": ret_data}
-                    ret[fn_] = ret_data
-                    if os.path.isfile(outp):
-                        with salt.utils.files.fopen(outp, "rb") as rfh:
-                            ret[fn_]["out"] = salt.payload.load(rfh)
-                except Exception as exc:  # pylint: disable=broad-except
-                    if "Permission denied:" in str(exc):
-                        raise
+            ret_data = _read_return(os.path.join(jid_dir, fn_))
+            if ret_data is None:
+                continue
+            page[fn_] = ret_data
+            if len(page) >= page_size:
+                yield page
+                page = {}
+    if page:
+        yield page
+
+
+def _read_return(minion_dir):
+    """
+    Return the information returned by a minion from its directory of the
+    job, None when it has no return
+    """
+    retp = os.path.join(minion_dir, RETURN_P)
+    outp = os.path.join(minion_dir, OUT_P)
+    if not os.path.isfile(retp):
+        return None
+    ret = None
+    while ret is None:
+        try:
+            with salt.utils.files.fopen(retp, "rb") as rfh:
+                ret_data = salt.payload.load(rfh)
+            if not isinstance(ret_data, dict) or "return" not in ret_data:
+                # Convert the old format in which return.p contains the only return data to
+                # the new that is dict containing 'return' and optionally 'retcode' and
+                # 'success'.
+                ret_data = {"return": ret_data}
+            ret = ret_data
+            if os.path.isfile(outp):
+                with salt.utils.files.fopen(outp, "rb") as rfh:
+                    ret["out"] = salt.payload.load(rfh)
+        except Exception as exc:  # pylint: disable=broad-except
+            if "Permission denied:" in str(exc):
+                raise
     return ret
 
 
@@ -133,6 +133,7 @@ from contextlib import contextmanager
 import salt.exceptions
 import salt.returners
 import salt.utils.data
+import salt.utils.job
 import salt.utils.json
 
 try:
@@ -326,6 +327,23 @@ def get_jid(jid):
         return ret
 
 
+def get_jid_pages(jid, page_size=salt.utils.job.JID_PAGE_SIZE):
+    """
+    Yield the information returned when the specified job id was executed, by
+    pages of at most ``page_size`` minions. The returns are read from the
+    database with a server side cursor, a page at a time.
+
+    .. versionadded:: 3008.0
+    """
+    with _get_serv(ret=None, commit=True) as cur:
+
+        sql = """SELECT id, full_ret FROM salt_returns
+                WHERE jid = %s"""
+
+        for data in salt.utils.job.fetch_pages(cur.connection, sql, (jid,), page_size):
+            yield {minion: salt.utils.json.loads(full_ret) for minion, full_ret in data}
+
+
 def get_fun(fun):
     """
     Return a dict of the last function called for all minions
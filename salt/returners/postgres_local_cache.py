@@ -360,6 +360,18 @@ def get_load(jid):
     return {}
 
 
+def _load_return(full_ret):
+    """
+    Load the information returned by a minion
+    """
+    ret_data = salt.utils.json.loads(full_ret)
+    if not isinstance(ret_data, dict) or "return" not in ret_data:
+        # Convert the old format in which the return contains the only return data to the
+        # new that is dict containing 'return' and optionally 'retcode' and 'success'.
+        ret_data = {"return": ret_data}
+    return ret_data
+
+
 def get_jid(jid):
     """
     Return the information returned when the specified job id was executed
@@ -376,16 +388,31 @@ def get_jid(jid):
     ret = {}
     if data:
         for minion, full_ret in data:
-            ret_data = salt.utils.json.loads(full_ret)
-            if not isinstance(ret_data, dict) or "return" not in ret_data:
-                # Convert the old format in which the return contains the only return data to the
-                # new that is dict containing 'return' and optionally 'retcode' and 'success'.
-                ret_data = {"return": ret_data}
-            ret[minion] = ret_data
+            ret[minion] = _load_return(full_ret)
     _close_conn(conn)
     return ret
 
 
+def get_jid_pages(jid, page_size=salt.utils.job.JID_PAGE_SIZE):
+    """
+    Yield the information returned when the specified job id was executed, by
+    pages of at most ``page_size`` minions. The returns are read from the
+    database with a server side cursor, a page at a time.
+
+    .. versionadded:: 3008.0
+    """
+    jid = _escape_jid(jid)
+    conn = _get_conn()
+    if conn is None:
+        return
+    try:
+        sql = """SELECT id, return FROM salt_returns WHERE jid = %s"""
+        for data in salt.utils.job.fetch_pages(conn, sql, (jid,), page_size):
+            yield {minion: _load_return(full_ret) for minion, full_ret in data}
+    finally:
+        _close_conn(conn)
+
+
 def get_jids():
     """
     Return a list of all job ids
@@ -0,0 +1,207 @@
+"""
+Submit batch jobs to the batch server of the master and follow them
+
+.. versionadded:: 3008.0
+
+The batch server runs the batch jobs in a process of the master, it is
+enabled with the :conf_master:`batch_server` option. The batches submitted
+with this runner go on when the client which submitted them exits, their
+progress is fired on the master event bus under ``salt/batch/<id>/``.
+
+.. code-block:: bash
+
+    salt-run batch.submit '*' state.apply batch=10% batch_wait=5 retries=1
+    salt-run batch.wait 20240101000000000001
+"""
+
+import logging
+
+import salt.utils.batch
+import salt.utils.event
+from salt.exceptions import CommandExecutionError
+
+log = logging.getLogger(__name__)
+
+__func_alias__ = {"list_": "list"}
+
+
+def _get(bid):
+    data = salt.utils.batch.read(__opts__, bid)
+    if data is None:
+        raise CommandExecutionError(f"Batch {bid} does not exist")
+    return data
+
+
+def _user():
+    """
+    Return the user running the runner and its access list, ``None`` when the
+    user is not restricted
+    """
+    try:
+        user = __user__
+    except NameError:
+        user = __opts__.get("user")
+    try:
+        auth_list = __auth_list__
+    except NameError:
+        auth_list = None
+    return user, auth_list
+
+
+def submit(
+    tgt,
+    fun,
+    arg=None,
+    tgt_type="glob",
+    batch="10%",
+    batch_wait=0,
+    failhard=False,
+    retries=0,
+    timeout=None,
+    ret="",
+    kwarg=None,
+):
+    """
+    Submit a batch job to the batch server, return the id of the batch
+
+    tgt
+        The target of the job
+
+    fun
+        The function to run on the minions
+
+    arg
+        The list of the arguments of the function
+
+    batch : 10%
+        The number of minions, or the percentage of the targeted minions, to
+        run the job on at a time
+
+    batch_wait : 0
+        The number of seconds to wait after a minion returns before freeing
+        its slot for the next minion
+
+    failhard : False
+        Stop the batch when a minion fails
+
+    retries : 0
+        The number of times the job is published again to the minions it
+        failed on
+
+    The users restricted by the ``publisher_acl`` or ``external_auth`` access
+    lists must be allowed to run the job, each of its publications is checked
+    against their access list.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run batch.submit '*' state.apply batch=10% retries=1
+    """
+    if not __opts__.get("batch_server"):
+        raise CommandExecutionError("The batch server is not enabled on the master")
+    if not salt.utils.batch.server_running(__opts__):
+        log.warning("The batch server is not running, the batch will wait for it")
+    user, auth_list = _user()
+    return salt.utils.batch.submit(
+        __opts__,
+        tgt,
+        fun,
+        arg or [],
+        tgt_type=tgt_type,
+        ret=ret,
+        kwarg=kwarg,
+        batch=batch,
+        batch_wait=batch_wait,
+        failhard=failhard,
+        retries=retries,
+        timeout=timeout,
+        user=user,
+        auth_list=auth_list,
+    )
+
+
+def status(bid):
+    """
+    Return the state of a batch, and of each of its minions
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run batch.status 20240101000000000001
+    """
+    return salt.utils.batch.summary(_get(bid))
+
+
+def list_(state=None):
+    """
+    List the batches, optionally only the ones in the given state: pending,
+    gathering, running, done, failed or cancelled
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run batch.list
+        salt-run batch.list state=running
+    """
+    ret = {}
+    for bid, data in salt.utils.batch.list_batches(__opts__).items():
+        if state is None or data["state"] == state:
+            summary = salt.utils.batch.summary(data)
+            summary.pop("minions")
+            ret[bid] = summary
+    return ret
+
+
+def cancel(bid):
+    """
+    Cancel a batch. The minions running the job finish it, the job is not
+    published to the other minions. The users restricted by an access list
+    can only cancel their own batches.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run batch.cancel 20240101000000000001
+    """
+    _get(bid)
+    user, auth_list = _user()
+    return salt.utils.batch.cancel(__opts__, bid, user=user if auth_list else None)
+
+
+def wait(bid, timeout=None):
+    """
+    Wait for a batch to be over, firing its progress, and return its state
+
+    timeout
+        The number of seconds after which to stop waiting, the batch goes on
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run batch.wait 20240101000000000001
+    """
+    with salt.utils.event.get_master_event(
+        __opts__, __opts__["sock_dir"], listen=True
+    ) as event:
+        if _get(bid)["state"] not in salt.utils.batch.FINISHED:
+            for what, data in salt.utils.batch.follow(
+                __opts__, bid, event, timeout=timeout
+            ):
+                if what == "wave":
+                    msg = "Executing run on {}".format(
+                        ", ".join(sorted(data["minions"]))
+                    )
+                elif what.startswith("ret/"):
+                    if data.get("failed"):
+                        msg = "{}: failed".format(data["id"])
+                    else:
+                        msg = "{}: retcode {}".format(data["id"], data["retcode"])
+                else:
+                    continue
+                __jid_event__.fire_event({"message": msg}, "progress")
+    return status(bid)
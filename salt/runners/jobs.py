@@ -13,6 +13,7 @@ import salt.returners
 import salt.utils.args
 import salt.utils.files
 import salt.utils.jid
+import salt.utils.job
 import salt.utils.master
 from salt.exceptions import SaltClientError
 
@@ -88,9 +89,8 @@ def active(display_progress=False):
         returner = _get_returner(
             (__opts__["ext_job_cache"], __opts__["master_job_cache"])
         )
-        data = mminion.returners[f"{returner}.get_jid"](jid)
-        if data:
-            for minion in data:
+        for page in salt.utils.job.get_jid_pages(mminion.returners, returner, jid):
+            for minion in page:
                 if minion not in ret[jid]["Returned"]:
                     ret[jid]["Returned"].append(minion)
 
@@ -98,7 +98,12 @@ def active(display_progress=False):
 
 
 def lookup_jid(
-    jid, ext_source=None, returned=True, missing=False, display_progress=False
+    jid,
+    ext_source=None,
+    returned=True,
+    missing=False,
+    display_progress=False,
+    page_size=salt.utils.job.JID_PAGE_SIZE,
 ):
     """
     Return the printout from a previously executed job
@@ -123,6 +128,13 @@ def lookup_jid(
 
         .. versionadded:: 2015.5.0
 
+    page_size
+        The number of minions whose returns are read from the job cache at a
+        time. Only the return data of the minions is kept, not the full
+        returns stored in the job cache.
+
+        .. versionadded:: 3008.0
+
     CLI Example:
 
     .. code-block:: bash
@@ -136,44 +148,51 @@ def lookup_jid(
         (__opts__["ext_job_cache"], ext_source, __opts__["master_job_cache"])
     )
 
+    outputter = None
+    returned_minions = set()
     try:
-        data = list_job(jid, ext_source=ext_source, display_progress=display_progress)
+        data = _list_job(
+            mminion,
+            jid,
+            ext_source=ext_source,
+            display_progress=display_progress,
+            result=False,
+        )
     except TypeError:
         return "Requested returner could not be loaded. No JIDs could be retrieved."
 
-    targeted_minions = data.get("Minions", [])
-    returns = data.get("Result", {})
-
-    if returns:
-        for minion in returns:
+    pages = salt.utils.job.get_jid_pages(
+        mminion.returners, returner, jid, page_size=page_size
+    )
+    for page in pages:
+        for minion, minion_ret in page.items():
             if display_progress:
                 __jid_event__.fire_event({"message": minion}, "progress")
-            if "return" in returns[minion]:
-                if returned:
-                    ret[minion] = returns[minion].get("return")
-            else:
-                if returned:
-                    ret[minion] = returns[minion].get("return")
+            if not returned_minions:
+                # We need to check to see if the 'out' key is present and
+                # use it to specify the correct outputter, so we get
+                # highstate output for highstate runs. We'll use that as the
+                # outputter in the absence of one being passed on the CLI.
+                try:
+                    outputter = minion_ret.get("out")
+                except AttributeError:
+                    outputter = None
+            returned_minions.add(minion)
+            if returned:
+                ret[minion] = minion_ret.get("return")
+
     if missing:
-        for minion_id in (x for x in targeted_minions if x not in returns):
+        targeted_minions = data.get("Minions", [])
+        for minion_id in (x for x in targeted_minions if x not in returned_minions):
             ret[minion_id] = "Minion did not return"
 
-    # We need to check to see if the 'out' key is present and use it to specify
-    # the correct outputter, so we get highstate output for highstate runs.
-    try:
-        # Check if the return data has an 'out' key. We'll use that as the
-        # outputter in the absence of one being passed on the CLI.
-        outputter = returns[next(iter(returns))].get("out")
-    except (StopIteration, AttributeError):
-        outputter = None
-
     if outputter:
         return {"outputter": outputter, "data": ret}
     else:
         return ret
 
 
-def list_job(jid, ext_source=None, display_progress=False):
+def list_job(jid, ext_source=None, display_progress=False, result=True):
     """
     List a specific job given by its jid
 
@@ -185,6 +204,11 @@ def list_job(jid, ext_source=None, display_progress=False):
 
         .. versionadded:: 2015.8.8
 
+    result : True
+        If ``False``, the returns of the minions are not included.
+
+        .. versionadded:: 3008.0
+
     CLI Example:
 
     .. code-block:: bash
@@ -192,8 +216,20 @@ def list_job(jid, ext_source=None, display_progress=False):
         salt-run jobs.list_job 20130916125524463507
         salt-run jobs.list_job 20130916125524463507 --out=pprint
     """
+    return _list_job(
+        salt.minion.MasterMinion(__opts__),
+        jid,
+        ext_source=ext_source,
+        display_progress=display_progress,
+        result=result,
+    )
+
+
+def _list_job(mminion, jid, ext_source=None, display_progress=False, result=True):
+    """
+    Helper to list a specific job with the given MasterMinion
+    """
     ret = {"jid": jid}
-    mminion = salt.minion.MasterMinion(__opts__)
     returner = _get_returner(
         (__opts__["ext_job_cache"], ext_source, __opts__["master_job_cache"])
     )
@@ -204,7 +240,10 @@ def list_job(jid, ext_source=None, display_progress=False):
 
     job = mminion.returners[f"{returner}.get_load"](jid)
     ret.update(_format_jid_instance(jid, job))
-    ret["Result"] = mminion.returners[f"{returner}.get_jid"](jid)
+    if result:
+        ret["Result"] = {}
+        for page in salt.utils.job.get_jid_pages(mminion.returners, returner, jid):
+            ret["Result"].update(page)
 
     fstr = "{}.get_endtime".format(__opts__["master_job_cache"])
     if __opts__.get("job_cache_store_endtime") and fstr in mminion.returners:
@@ -14,9 +14,19 @@ import time
 import traceback
 from random import randint
 
+import salt.utils.startup_profile
+
+# Start profiling before the CLIs, which are imported by the functions below,
+# get imported
+if salt.utils.startup_profile.OPTION in sys.argv:
+    salt.utils.startup_profile.start()
+
+# pylint: disable=wrong-import-position
 import salt.defaults.exitcodes
 from salt.exceptions import SaltClientError, SaltReqTimeoutError, SaltSystemExit
 
+# pylint: enable=wrong-import-position
+
 log = logging.getLogger(__name__)
 
 
@@ -430,6 +430,26 @@ def _salt_to_os_path(path):
     return os.path.normpath(path.replace(posixpath.sep, os.path.sep))
 
 
+def _recurse_changed_files(managed_files, manifest):
+    """
+    Return the sources of the managed files of a recurse state which do not
+    match the hash sum of their source in the file manifest
+    """
+    changed = []
+    for dest, src in sorted(managed_files):
+        entry = manifest.get(salt.utils.url.parse(src)[0])
+        if not entry:
+            continue
+        if os.path.isfile(dest) and not os.path.islink(dest):
+            try:
+                if __salt__["file.get_hash"](dest, entry["hash_type"]) == entry["hsum"]:
+                    continue
+            except OSError:
+                pass
+        changed.append(src)
+    return changed
+
+
 def _gen_recurse_managed_files(
     name,
     source,
@@ -4474,6 +4494,8 @@ def recurse(
     win_perms=None,
     win_deny_perms=None,
     win_inheritance=True,
+    bulk=False,
+    bulk_batch_size=100,
     **kwargs,
 ):
     """
@@ -4680,6 +4702,22 @@ def recurse(
 
         .. versionadded:: 2017.7.7
 
+    bulk
+        Set to ``True`` to request the hash sum and mode of all of the source
+        files from the master at once with :py:func:`cp.list_master_manifest
+        <salt.modules.cp.list_master_manifest>`, instead of requesting them
+        for each file. The files are compared to the manifest locally and the
+        changed files are downloaded in batches before they are managed. This
+        speeds up the recursion of large directories considerably.
+
+        .. versionadded:: 3008.0
+
+    bulk_batch_size
+        The number of changed files downloaded at once in ``bulk`` mode.
+        Default is 100.
+
+        .. versionadded:: 3008.0
+
     """
     if "env" in kwargs:
         # "env" is not supported; Use "saltenv".
@@ -4896,8 +4934,26 @@ def recurse(
         merge_ret(os.path.join(name, srelpath), _ret)
     for dirname in mng_dirs:
         manage_directory(dirname)
-    for dest, src in mng_files:
-        manage_file(dest, src, replace)
+    if bulk:
+        # The hashes and modes of the source files are served from the
+        # manifest by the cp module until all of the files are managed
+        manifest = __salt__["cp.list_master_manifest"](senv, srcpath + "/")
+        manifests = __context__.setdefault("cp.file_manifest", {})
+        manifests[senv] = manifest
+        try:
+            if not template and (replace or clean):
+                changed = _recurse_changed_files(mng_files, manifest)
+                for idx in range(0, len(changed), bulk_batch_size):
+                    __salt__["cp.cache_files"](
+                        changed[idx : idx + bulk_batch_size], senv
+                    )
+            for dest, src in mng_files:
+                manage_file(dest, src, replace)
+        finally:
+            manifests.pop(senv, None)
+    else:
+        for dest, src in mng_files:
+            manage_file(dest, src, replace)
 
     if clean:
         # TODO: Use directory(clean=True) instead
@@ -68,6 +68,20 @@ def get_token(opts, tok):
         return {}
 
 
+def token_exists(opts, tok):
+    """
+    Check whether the token is in the store, without reading it.
+
+    :param opts: Salt master config options
+    :param tok: Token value to check
+    :returns: True if the token is in the store
+    """
+    t_path = os.path.join(opts["token_dir"], tok)
+    if not salt.utils.verify.clean_path(opts["token_dir"], t_path):
+        return False
+    return os.path.isfile(t_path)
+
+
 def rm_token(opts, tok):
     """
     Remove token from the store.
@@ -373,6 +373,7 @@ class DaemonizedPublishServer(PublishServer):
         publish_payload,
         presence_callback=None,
         remove_presence_callback=None,
+        presence_registry=None,
     ):
         """
         If a daemon is needed to act as a broker implement it here.
@@ -385,6 +386,9 @@ class DaemonizedPublishServer(PublishServer):
                                               callbacks call this method to
                                               notify the channel a client is no
                                               longer present
+        :param presence_registry: The salt.utils.presence.PresenceRegistry of
+                                  the minions connected to the publish server,
+                                  the daemon runs it from its io loop
         """
         raise NotImplementedError
 
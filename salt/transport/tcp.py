@@ -1341,7 +1341,11 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
 
     @property
     def topic_support(self):
-        return not self.opts.get("order_masters", False)
+        # Publications from a master of masters target minions behind the
+        # syndics, they can only be filtered when routing to the syndics
+        return not self.opts.get("order_masters", False) or self.opts.get(
+            "syndic_target_routing", False
+        )
 
     def __setstate__(self, state):
         self.__init__(**state)
@@ -1362,6 +1366,7 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
         publish_payload,
         presence_callback=None,
         remove_presence_callback=None,
+        presence_registry=None,
     ):
         """
         Bind to the interface specified in the configuration file
@@ -1374,12 +1379,16 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
             remove_presence_callback,
             io_loop,
         )
+        if presence_registry is not None:
+            io_loop.add_callback(presence_registry.start, io_loop)
         # run forever
         try:
             io_loop.start()
         except (KeyboardInterrupt, SystemExit):
             pass
         finally:
+            if presence_registry is not None:
+                presence_registry.stop()
             self.close()
 
     async def publisher(
@@ -173,7 +173,9 @@ class PublishClient(salt.transport.base.PublishClient):
         await self._connect(timeout=timeout)
 
     async def send(self, msg):
-        await self.message_client.send(msg, reply=False)
+        while self._ws is None:
+            await self.connect()
+        await self._ws.send_bytes(msg)
 
     async def recv(self, timeout=None):
         while self._ws is None:
@@ -236,6 +238,17 @@ class PublishClient(salt.transport.base.PublishClient):
         self.close()
 
 
+class Subscriber:
+    """
+    Client connection of the websocket publisher
+    """
+
+    def __init__(self, ws, address):
+        self.ws = ws
+        self.address = address
+        self.id_ = None
+
+
 class PublishServer(salt.transport.base.DaemonizedPublishServer):
     """ """
 
@@ -270,6 +283,8 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
         self.pull_path = pull_path
         self.ssl = ssl
         self.clients = set()
+        self.presence_callback = None
+        self.remove_presence_callback = None
         self._run = None
         self.pub_writer = None
         self.pub_reader = None
@@ -277,7 +292,11 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
 
     @property
     def topic_support(self):
-        return not self.opts.get("order_masters", False)
+        # Publications from a master of masters target minions behind the
+        # syndics, they can only be filtered when routing to the syndics
+        return not self.opts.get("order_masters", False) or self.opts.get(
+            "syndic_target_routing", False
+        )
 
     def __setstate__(self, state):
         self.__init__(**state)
@@ -298,6 +317,7 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
         publish_payload,
         presence_callback=None,
         remove_presence_callback=None,
+        presence_registry=None,
     ):
         """
         Bind to the interface specified in the configuration file
@@ -310,12 +330,16 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
             remove_presence_callback,
             io_loop,
         )
+        if presence_registry is not None:
+            io_loop.add_callback(presence_registry.start, io_loop)
         # run forever
         try:
             io_loop.start()
         except (KeyboardInterrupt, SystemExit):
             pass
         finally:
+            if presence_registry is not None:
+                presence_registry.stop()
             self.close()
 
     async def publisher(
@@ -355,6 +379,8 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
         await site.start()
 
         self._pub_payload = publish_payload
+        self.presence_callback = presence_callback
+        self.remove_presence_callback = remove_presence_callback
         if self.pull_path:
             with salt.utils.files.set_umask(0o177):
                 self.puller = await asyncio.start_unix_server(
@@ -401,8 +427,30 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
         ws = aiohttp.web.WebSocketResponse()
         await ws.prepare(request)
         self.clients.add(ws)
-        while True:
-            await asyncio.sleep(1)
+        subscriber = Subscriber(ws, request.remote)
+        try:
+            # The minions send their id, authenticated by the channel, once
+            # connected
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.BINARY:
+                    continue
+                if self.presence_callback:
+                    try:
+                        framed_msg = salt.transport.frame.decode_embedded_strs(
+                            salt.payload.loads(msg.data)
+                        )
+                        self.presence_callback(subscriber, framed_msg["body"])
+                    except Exception:  # pylint: disable=broad-except
+                        log.error(
+                            "Exception parsing response from %s",
+                            subscriber.address,
+                            exc_info=True,
+                        )
+        finally:
+            self.clients.discard(ws)
+            if self.remove_presence_callback:
+                self.remove_presence_callback(subscriber)
+        return ws
 
     async def _connect(self):
         if self.pull_path:
@@ -9,6 +9,7 @@ import hashlib
 import logging
 import os
 import signal
+import socket
 import sys
 import threading
 from random import randint
@@ -149,10 +150,11 @@ class PublishClient(salt.transport.base.PublishClient):
             self._socket.setsockopt(zmq.SUBSCRIBE, b"broadcast")
             if role == "syndic":
                 self._socket.setsockopt(zmq.SUBSCRIBE, b"syndic")
-            else:
-                self._socket.setsockopt(
-                    zmq.SUBSCRIBE, salt.utils.stringutils.to_bytes(self.hexid)
-                )
+            # Syndics are also targeted by id when the master of masters
+            # routes publications with syndic_target_routing
+            self._socket.setsockopt(
+                zmq.SUBSCRIBE, salt.utils.stringutils.to_bytes(self.hexid)
+            )
         else:
             self._socket.setsockopt(zmq.SUBSCRIBE, b"")
 
@@ -306,7 +308,7 @@ class PublishClient(salt.transport.base.PublishClient):
                     and message_target not in ("broadcast", self.hexid)
                 ) or (
                     self.opts.get("__role") == "syndic"
-                    and message_target not in ("broadcast", "syndic")
+                    and message_target not in ("broadcast", "syndic", self.hexid)
                 ):
                     log.debug(
                         "Publish received for not this minion: %s", message_target
@@ -753,17 +755,35 @@ class AsyncReqMessageClient:
                 future.set_exception(exc)
 
 
+def _peer_address(fd):
+    """
+    Return the peer address of the connected socket ``fd``
+    """
+    sock = socket.socket(fileno=fd)
+    try:
+        return sock.getpeername()
+    except OSError:
+        return None
+    finally:
+        sock.detach()
+
+
 class ZeroMQSocketMonitor:
     __EVENT_MAP = None
 
-    def __init__(self, socket):
+    def __init__(self, socket, registry=None):
         """
         Create ZMQ monitor sockets
 
         More information:
             http://api.zeromq.org/4-0:zmq-socket-monitor
+
+        :param registry: A salt.utils.presence.PresenceRegistry in which to
+                         record the peer addresses of the connections accepted
+                         by the socket
         """
         self._socket = socket
+        self._registry = registry
         self._monitor_socket = self._socket.get_monitor_socket()
         self._monitor_task = None
         self._running = asyncio.Event()
@@ -815,6 +835,13 @@ class ZeroMQSocketMonitor:
         evt = zmq.utils.monitor.parse_monitor_message(msg)
         evt["description"] = self.event_map[evt["event"]]
         log.debug("ZeroMQ event: %s", evt)
+        if self._registry is not None:
+            if evt["event"] == zmq.EVENT_ACCEPTED:
+                address = _peer_address(evt["value"])
+                if address:
+                    self._registry.add_address(evt["value"], address)
+            elif evt["event"] == zmq.EVENT_DISCONNECTED:
+                self._registry.remove_address(evt["value"])
         if evt["event"] == zmq.EVENT_MONITOR_STOPPED:
             self.stop()
 
@@ -883,21 +910,31 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
         publish_payload,
         presence_callback=None,
         remove_presence_callback=None,
+        presence_registry=None,
     ):
         """
         This method represents the Publish Daemon process. It is intended to be
         run in a thread or process as it creates and runs its own ioloop.
         """
+        # ZeroMQ does not identify the subscribers of the publish socket, the
+        # socket monitor records the addresses of their connections
+        self.presence_registry = presence_registry
         ioloop = tornado.ioloop.IOLoop()
         ioloop.add_callback(self.publisher, publish_payload, ioloop=ioloop)
+        if presence_registry is not None:
+            ioloop.add_callback(presence_registry.start, ioloop)
         try:
             ioloop.start()
         finally:
+            if presence_registry is not None:
+                presence_registry.stop()
             self.close()
 
     def _get_sockets(self, context, ioloop):
         pub_sock = context.socket(zmq.PUB)
-        monitor = ZeroMQSocketMonitor(pub_sock)
+        monitor = ZeroMQSocketMonitor(
+            pub_sock, registry=getattr(self, "presence_registry", None)
+        )
         monitor.start_io_loop(ioloop)
         _set_tcp_keepalive(pub_sock, self.opts)
         self.dpub_sock = pub_sock  # = zmq.eventloop.zmqstream.ZMQStream(pub_sock)
@@ -962,7 +999,7 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
                     exc_info_on_loglevel=logging.DEBUG,
                 )
 
-    async def publish_payload(self, payload, topic_list=None):
+    async def publish_payload(self, payload, topic_list=None, syndics=True):
         log.trace("Publish payload %r", payload)
         if self.opts["zmq_filtering"]:
             if topic_list:
@@ -975,8 +1012,9 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
                     )
                     await self.dpub_sock.send_multipart([htopic, payload])
                     log.trace("Filtered data has been sent")
-                # Syndic broadcast
-                if self.opts.get("order_masters"):
+                # Syndic broadcast, unless the syndics which can match are
+                # part of the topics already
+                if self.opts.get("order_masters") and syndics:
                     log.trace("Sending filtered data to syndic")
                     await self.dpub_sock.send_multipart([b"syndic", payload])
                     log.trace("Filtered data has been sent to syndic")
@@ -0,0 +1,784 @@
+"""
+Run batch jobs on the master
+
+The batch server is a process of the master, enabled with the
+:conf_master:`batch_server` option, which runs all of the batch jobs submitted
+to it in a single event loop. For each batch it pings the targeted minions,
+publishes the job to a sliding window of the minions which answered, honoring
+``batch_wait``, ``failhard`` and the retries of the failed minions, and fires
+the progress of the batch on the master event bus:
+
+``salt/batch/<id>/start``
+    The minions the job will run on, and the minions which did not answer the
+    ping.
+
+``salt/batch/<id>/wave``
+    The job was published to the next minions of the batch.
+
+``salt/batch/<id>/retry/<minion id>``
+    A minion failed and was queued to run the job again.
+
+``salt/batch/<id>/ret/<minion id>``
+    The final return of a minion.
+
+``salt/batch/<id>/done``
+    The batch is over.
+
+The state of each batch is kept in the ``batches`` directory of the master's
+``cachedir``. The batch goes on when the client which submitted it exits, and
+resumes when the master restarts.
+"""
+
+import logging
+import math
+import os
+import time
+
+import salt.acl
+import salt.payload
+import salt.utils.args
+import salt.utils.atomicfile
+import salt.utils.event
+import salt.utils.files
+import salt.utils.jid
+import salt.utils.minions
+import salt.utils.process
+from salt.exceptions import AuthorizationError, SaltException, SaltInvocationError
+
+log = logging.getLogger(__name__)
+
+BATCH_DIR = "batches"
+# The batch server touches this file each time it scans the batch directory
+SERVER_FILE = ".server"
+SERVER_STALE_AFTER = 30
+# The number of seconds between the scans of the batch directory
+SCAN_INTERVAL = 5
+# The number of seconds the batch server waits for events between its steps
+STEP_INTERVAL = 0.2
+# The number of seconds between the writes of the state of a running batch
+WRITE_INTERVAL = 1
+
+FINISHED = ("done", "failed", "cancelled")
+ACTIVE = ("running", "probing")
+
+
+def batch_dir(opts):
+    """
+    Return the directory holding the state of the batches of the master
+    """
+    return os.path.join(opts["cachedir"], BATCH_DIR)
+
+
+def _path(opts, bid, ext=".p"):
+    return os.path.join(batch_dir(opts), f"{bid}{ext}")
+
+
+def batch_size(batch, count):
+    """
+    Return the number of minions a batch runs on at a time
+
+    :param batch: A number of minions, or a percentage of the minions like
+        ``10%``
+    :param int count: The number of minions of the batch
+    :raises ValueError: When ``batch`` is not a number or a percentage
+    """
+    if isinstance(batch, str) and "%" in batch:
+        res = float(batch.strip("%")) / 100.0 * count
+        if res < 1:
+            return int(math.ceil(res))
+        return int(res)
+    return int(batch)
+
+
+def write(opts, data):
+    """
+    Write the state of a batch
+    """
+    path = _path(opts, data["id"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with salt.utils.files.set_umask(0o177):
+        with salt.utils.atomicfile.atomic_open(path, "wb") as fp_:
+            fp_.write(salt.payload.dumps(data))
+
+
+def read(opts, bid):
+    """
+    Return the state of the batch ``bid``, ``None`` when it does not exist
+    """
+    try:
+        with salt.utils.files.fopen(_path(opts, bid), "rb") as fp_:
+            return salt.payload.loads(fp_.read())
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def list_batches(opts):
+    """
+    Return the state of all of the batches, keyed on their id
+    """
+    ret = {}
+    try:
+        names = os.listdir(batch_dir(opts))
+    except OSError:
+        return ret
+    for name in sorted(names):
+        if name.endswith(".p"):
+            data = read(opts, name[:-2])
+            if data is not None:
+                ret[data["id"]] = data
+    return ret
+
+
+def summary(data):
+    """
+    Return the summary of the state of a batch
+    """
+    counts = {}
+    for minion in data["minions"].values():
+        counts[minion["state"]] = counts.get(minion["state"], 0) + 1
+    ret = {
+        key: data.get(key)
+        for key in (
+            "id",
+            "state",
+            "user",
+            "tgt",
+            "tgt_type",
+            "fun",
+            "batch",
+            "created",
+            "started",
+            "finished",
+            "down",
+        )
+    }
+    ret["counts"] = counts
+    ret["minions"] = {
+        minion_id: {
+            key: minion.get(key) for key in ("state", "jid", "attempts", "retcode")
+        }
+        for minion_id, minion in data["minions"].items()
+    }
+    return ret
+
+
+def server_running(opts):
+    """
+    Return whether the batch server of the master is running
+    """
+    try:
+        mtime = os.stat(os.path.join(batch_dir(opts), SERVER_FILE)).st_mtime
+    except OSError:
+        return False
+    return time.time() - mtime < SERVER_STALE_AFTER
+
+
+def _wake(opts, bid, what):
+    with salt.utils.event.get_master_event(
+        opts, opts["sock_dir"], listen=False
+    ) as event:
+        event.fire_event({"id": bid}, salt.utils.event.tagify([bid, what], "batch"))
+
+
+def submit(
+    opts,
+    tgt,
+    fun,
+    arg=(),
+    tgt_type="glob",
+    ret="",
+    kwarg=None,
+    batch="10%",
+    batch_wait=0,
+    failhard=False,
+    retries=0,
+    timeout=None,
+    gather_job_timeout=None,
+    user=None,
+    bid=None,
+    auth_list=None,
+):
+    """
+    Submit a batch job to the batch server of the master
+
+    :param int retries: The number of times a job is published again to the
+        minions it failed on
+    :param str user: The user the jobs of the batch are published as
+    :param str bid: The id of the batch, generated when not passed
+    :param list auth_list: The access list of ``user``, the job must be
+        allowed by it and each of its publications is checked against it. The
+        user is not restricted when not passed.
+    :raises AuthorizationError: When ``user`` is not allowed to run the job
+    :return: The id of the batch
+    """
+    try:
+        batch_size(batch, 100)
+    except (TypeError, ValueError):
+        raise SaltInvocationError(
+            f"Invalid batch data sent: {batch}\n"
+            "Data must be in the form of %10, 10% or 3"
+        )
+    arg = salt.utils.args.condition_input(arg or [], kwarg)
+    if auth_list:
+        publisher_acl = salt.acl.PublisherACL(opts.get("publisher_acl_blacklist", {}))
+        if (
+            publisher_acl.user_is_blacklisted(user)
+            or publisher_acl.cmd_is_blacklisted(fun)
+            or not salt.utils.minions.CkMinions(opts).auth_check(
+                auth_list, fun, arg, tgt, tgt_type
+            )
+        ):
+            raise AuthorizationError(f"User {user} is not allowed to run {fun}")
+    bid = bid or salt.utils.jid.gen_jid(opts)
+    data = {
+        "id": bid,
+        "state": "pending",
+        "created": time.time(),
+        "user": user,
+        "auth_list": auth_list or None,
+        "tgt": tgt,
+        "tgt_type": tgt_type,
+        "fun": fun,
+        "arg": arg,
+        "ret": ret,
+        "batch": batch,
+        "batch_wait": batch_wait or 0,
+        "failhard": failhard,
+        "retries": int(retries or 0),
+        "timeout": timeout or opts["timeout"],
+        "gather_job_timeout": gather_job_timeout or opts["gather_job_timeout"],
+        "minions": {},
+        "queue": [],
+        "down": [],
+    }
+    write(opts, data)
+    _wake(opts, bid, "new")
+    return bid
+
+
+def cancel(opts, bid, user=None):
+    """
+    Cancel the batch ``bid``. The minions running the job finish it, the job
+    is not published to the other minions.
+
+    :param str user: The user cancelling the batch, it must have submitted it.
+        Any batch is cancelled when not passed.
+    :raises AuthorizationError: When ``user`` did not submit the batch
+    :return: ``False`` when the batch does not exist
+    """
+    data = read(opts, bid)
+    if data is None:
+        return False
+    if user is not None and data.get("user") != user:
+        raise AuthorizationError(f"Batch {bid} was not submitted by {user}")
+    with salt.utils.files.fopen(_path(opts, bid, ".cancel"), "wb"):
+        pass
+    _wake(opts, bid, "cancel")
+    return True
+
+
+def follow(opts, bid, event, timeout=None):
+    """
+    Yield the ``(tag, data)`` of the events of the batch ``bid`` until the
+    batch is over. ``event`` must be listening before the batch is submitted
+    for none of its events to be missed.
+
+    :param int timeout: The number of seconds after which to stop following
+        the batch, it is followed until it is over by default
+    """
+    prefix = salt.utils.event.tagify([bid], "batch") + "/"
+    until = None if timeout is None else time.time() + timeout
+    while until is None or time.time() < until:
+        evt = event.get_event(wait=SCAN_INTERVAL, tag=prefix, full=True)
+        if evt is None:
+            # The done event may have been missed
+            data = read(opts, bid)
+            if data is None or data["state"] in FINISHED:
+                return
+            continue
+        what = evt["tag"][len(prefix) :]
+        if what in ("new", "cancel"):
+            continue
+        yield what, evt["data"]
+        if what == "done":
+            return
+
+
+class BatchRun:
+    """
+    A batch job run by the batch server
+    """
+
+    def __init__(self, server, data):
+        self.server = server
+        self.data = data
+        self.dirty = False
+        self.written = 0
+        # minion id -> time after which the minion is considered gone
+        self.deadlines = {}
+        # minion id -> time until which the minion is known to run the job,
+        # from its heartbeats
+        self.alive = {}
+        # The times at which the slots held for batch_wait are freed
+        self.waits = []
+        self.gather_deadline = None
+
+    @property
+    def id(self):
+        return self.data["id"]
+
+    @property
+    def finished(self):
+        return self.data["state"] in FINISHED
+
+    def jids(self):
+        """
+        Return the jids of the jobs published for the batch
+        """
+        jids = set()
+        if self.data.get("ping_jid"):
+            jids.add(self.data["ping_jid"])
+        for minion in self.data["minions"].values():
+            for key in ("jid", "probe_jid"):
+                if minion.get(key):
+                    jids.add(minion[key])
+        return jids
+
+    def _fire(self, data, *tag):
+        self.server.fire(data, salt.utils.event.tagify([self.id, *tag], "batch"))
+
+    def step(self, now):
+        """
+        Advance the batch
+        """
+        state = self.data["state"]
+        if state == "pending":
+            self._gather(now)
+        elif state == "gathering":
+            if self.gather_deadline is None:
+                self.gather_deadline = now + self.data["timeout"]
+            elif now >= self.gather_deadline:
+                self._start(now)
+        if self.data["state"] == "running":
+            self._expire(now)
+            self._publish(now)
+            if not self.data["queue"] and not any(
+                minion["state"] in ACTIVE for minion in self.data["minions"].values()
+            ):
+                self.finish(now, "done")
+
+    def _gather(self, now):
+        pub_data = self.server.publish(
+            self,
+            self.data["tgt"],
+            "test.ping",
+            tgt_type=self.data["tgt_type"],
+            timeout=self.data["timeout"],
+        )
+        if not pub_data:
+            self.finish(now, "failed")
+            return
+        self.data["state"] = "gathering"
+        self.data["ping_jid"] = pub_data["jid"]
+        self.data["expected"] = sorted(pub_data.get("minions") or ())
+        self.gather_deadline = now + self.data["timeout"]
+        self.dirty = True
+        if not self.data["expected"]:
+            self._start(now)
+
+    def _start(self, now):
+        minions = self.data["minions"]
+        self.data["down"] = sorted(set(self.data.get("expected", ())) - set(minions))
+        try:
+            bnum = batch_size(self.data["batch"], len(minions))
+        except (TypeError, ValueError):
+            bnum = len(minions)
+        self.data["bnum"] = max(bnum, 1)
+        self.data["state"] = "running"
+        self.data["started"] = now
+        self.dirty = True
+        self._fire(
+            {"minions": sorted(minions), "down": self.data["down"]},
+            "start",
+        )
+
+    def _expire(self, now):
+        self.waits = [wait for wait in self.waits if wait > now]
+        probes = {}
+        for minion_id, minion in self.data["minions"].items():
+            if minion["state"] not in ACTIVE:
+                continue
+            deadline = self.deadlines.setdefault(minion_id, now + self.data["timeout"])
+            if now < deadline:
+                continue
+            if self.alive.get(minion_id, 0) > now:
+                # The minion sends heartbeats for the job
+                minion["state"] = "running"
+                self.deadlines[minion_id] = now + self.data["timeout"]
+            elif minion["state"] == "running":
+                probes.setdefault(minion["jid"], []).append(minion_id)
+            else:
+                self._result(minion_id, now, failed=True)
+        for jid, minion_ids in probes.items():
+            # Ask the minions which do not send heartbeats whether they still
+            # run the job
+            pub_data = self.server.publish(
+                self,
+                minion_ids,
+                "saltutil.find_job",
+                [jid],
+                tgt_type="list",
+                timeout=self.data["gather_job_timeout"],
+            )
+            for minion_id in minion_ids:
+                minion = self.data["minions"][minion_id]
+                minion["state"] = "probing"
+                minion["probe_jid"] = pub_data.get("jid")
+                self.deadlines[minion_id] = now + self.data["gather_job_timeout"]
+            self.dirty = True
+
+    def _publish(self, now):
+        active = sum(
+            1 for minion in self.data["minions"].values() if minion["state"] in ACTIVE
+        )
+        slots = self.data["bnum"] - active - len(self.waits)
+        queue = self.data["queue"]
+        if slots <= 0 or not queue:
+            return
+        next_ = queue[:slots]
+        del queue[:slots]
+        self.dirty = True
+        pub_data = self.server.publish(
+            self,
+            next_,
+            self.data["fun"],
+            self.data["arg"],
+            tgt_type="list",
+            timeout=self.data["timeout"],
+            ret=self.data["ret"],
+        )
+        for minion_id in next_:
+            minion = self.data["minions"][minion_id]
+            minion["attempts"] = minion.get("attempts", 0) + 1
+            minion["state"] = "running"
+            minion["jid"] = pub_data.get("jid")
+            minion.pop("probe_jid", None)
+            if not pub_data:
+                self._result(minion_id, now, failed=True)
+            else:
+                self.deadlines[minion_id] = now + self.data["timeout"]
+        if pub_data:
+            self._fire({"jid": pub_data["jid"], "minions": next_}, "wave")
+
+    def _result(self, minion_id, now, retcode=0, data=None, failed=False):
+        minion = self.data["minions"][minion_id]
+        self.deadlines.pop(minion_id, None)
+        self.alive.pop(minion_id, None)
+        self.dirty = True
+        if self.data["batch_wait"]:
+            self.waits.append(now + self.data["batch_wait"])
+        bad = failed or retcode > 0
+        if bad and minion["attempts"] <= self.data["retries"]:
+            minion["state"] = "queued"
+            self.data["queue"].append(minion_id)
+            self._fire(
+                {
+                    "id": minion_id,
+                    "jid": minion["jid"],
+                    "retcode": retcode,
+                    "failed": failed,
+                    "attempts": minion["attempts"],
+                },
+                "retry",
+                minion_id,
+            )
+            return
+        minion["state"] = "failed" if bad else "done"
+        minion["retcode"] = retcode
+        event = {
+            "id": minion_id,
+            "jid": minion["jid"],
+            "retcode": retcode,
+            "attempts": minion["attempts"],
+        }
+        if failed:
+            event["failed"] = True
+        else:
+            event["return"] = data.get("return")
+            if "out" in data:
+                event["out"] = data["out"]
+        self._fire(event, "ret", minion_id)
+        if bad and self.data["failhard"]:
+            log.error(
+                "Minion %s returned with non-zero exit code. "
+                "Batch %s stopped due to failhard",
+                minion_id,
+                self.id,
+            )
+            self.finish(now, "failed")
+
+    def on_return(self, jid, minion_id, data, now):
+        """
+        Handle the return of a minion to a job published for the batch
+        """
+        minions = self.data["minions"]
+        if jid == self.data.get("ping_jid"):
+            if minion_id not in minions and not self.finished:
+                minions[minion_id] = {"state": "queued", "attempts": 0}
+                self.data["queue"].append(minion_id)
+                self.dirty = True
+                if self.data["state"] == "gathering" and set(minions) >= set(
+                    self.data["expected"]
+                ):
+                    self._start(now)
+            return
+        minion = minions.get(minion_id)
+        if minion is None or minion["state"] not in ACTIVE:
+            return
+        if jid == minion.get("probe_jid"):
+            if data.get("return"):
+                # The minion is still running the job
+                minion["state"] = "running"
+                self.deadlines[minion_id] = now + self.data["timeout"]
+            return
+        if jid != minion.get("jid"):
+            return
+        retcode = data.get("retcode", 0)
+        if isinstance(retcode, dict):
+            # If we are executing multiple modules with the same cmd,
+            # We use the highest retcode.
+            retcode = max(retcode.values(), default=0)
+        self._result(minion_id, now, retcode=retcode or 0, data=data)
+
+    def on_alive(self, alive, now):
+        """
+        Handle the heartbeats of the minions running a job of the batch
+        """
+        for minion_id, interval in alive.items():
+            if minion_id in self.data["minions"]:
+                self.alive[minion_id] = now + max(
+                    3 * (interval or 0), self.data["gather_job_timeout"]
+                )
+
+    def finish(self, now, state):
+        """
+        End the batch
+        """
+        if self.finished:
+            return
+        self.data["state"] = state
+        self.data["finished"] = now
+        self.dirty = True
+        counts = summary(self.data)["counts"]
+        self._fire({"state": state, "counts": counts}, "done")
+
+
+class BatchServer(salt.utils.process.SignalHandlingProcess):
+    """
+    Run the batch jobs submitted to the master
+    """
+
+    def __init__(self, opts, **kwargs):
+        super().__init__(**kwargs)
+        self.opts = opts
+        # batch id -> BatchRun
+        self.runs = {}
+        # jid -> BatchRun
+        self.jids = {}
+        # batch id -> (mtime of its file, finish time) of the finished batches,
+        # not read again by the scans until their file changes
+        self.finished = {}
+        self.next_scan = 0
+        self.local = None
+        self.event = None
+
+    def run(self):
+        """
+        Run the batches in a single event loop
+        """
+        import salt.client
+
+        self.local = salt.client.get_local_client(mopts=self.opts)
+        self.event = salt.utils.event.get_master_event(
+            self.opts, self.opts["sock_dir"], listen=True
+        )
+        try:
+            while True:
+                now = time.time()
+                if now >= self.next_scan:
+                    self.scan(now)
+                    self.next_scan = now + SCAN_INTERVAL
+                evt = self.event.get_event(
+                    wait=STEP_INTERVAL, full=True, auto_reconnect=True
+                )
+                while evt is not None:
+                    self.handle_event(evt, time.time())
+                    evt = self.event.get_event(
+                        no_block=True, full=True, auto_reconnect=True
+                    )
+                self.step(time.time())
+        finally:
+            self.event.destroy()
+            self.local.destroy()
+
+    def fire(self, data, tag):
+        self.event.fire_event(data, tag)
+
+    def publish(self, run, tgt, fun, arg=(), tgt_type="glob", timeout=None, **kwargs):
+        """
+        Publish a job for the batch ``run``
+
+        :return: The publish data of the job, empty when it was not published
+        """
+        if run.data.get("auth_list"):
+            # The master checks the publication against the access list of the
+            # user, as for the publications of the syndics
+            kwargs["auth_list"] = run.data["auth_list"]
+        salt_user = self.local.salt_user
+        if run.data.get("user"):
+            self.local.salt_user = run.data["user"]
+        try:
+            pub_data = self.local.run_job(
+                tgt,
+                fun,
+                arg=arg,
+                tgt_type=tgt_type,
+                timeout=timeout,
+                listen=False,
+                metadata={"batch": run.id},
+                **kwargs,
+            )
+        except SaltException as exc:
+            log.error("Unable to publish %s for batch %s: %s", fun, run.id, exc)
+            return {}
+        finally:
+            self.local.salt_user = salt_user
+        if not pub_data or not pub_data.get("jid"):
+            log.error("Unable to publish %s for batch %s", fun, run.id)
+            return {}
+        self.jids[pub_data["jid"]] = run
+        return pub_data
+
+    def handle_event(self, evt, now):
+        tag = evt["tag"]
+        data = evt.get("data") or {}
+        if tag.startswith("salt/batch/"):
+            if tag.endswith(("/new", "/cancel")):
+                self.next_scan = 0
+            return
+        if not tag.startswith("salt/job/"):
+            return
+        parts = tag.split("/")
+        if len(parts) < 4:
+            return
+        run = self.jids.get(parts[2])
+        if run is None:
+            return
+        if parts[3] == "ret" and "id" in data:
+            run.on_return(parts[2], data["id"], data, now)
+        elif parts[3] == "alive":
+            run.on_alive(data.get("alive") or {}, now)
+
+    def step(self, now):
+        for bid, run in list(self.runs.items()):
+            try:
+                run.step(now)
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Batch %s failed", bid)
+                run.finish(now, "failed")
+            if run.dirty and (run.finished or now - run.written >= WRITE_INTERVAL):
+                write(self.opts, run.data)
+                run.dirty = False
+                run.written = now
+            if run.finished and not run.dirty:
+                del self.runs[bid]
+                self.jids = {
+                    jid: jid_run
+                    for jid, jid_run in self.jids.items()
+                    if jid_run is not run
+                }
+
+    def scan(self, now):
+        """
+        Pick up the batches submitted and cancelled, and remove the state of
+        the expired batches
+        """
+        path = batch_dir(self.opts)
+        os.makedirs(path, exist_ok=True)
+        with salt.utils.files.fopen(os.path.join(path, SERVER_FILE), "ab"):
+            pass
+        os.utime(os.path.join(path, SERVER_FILE))
+        names = set(os.listdir(path))
+        for bid in set(self.finished) - {name[:-2] for name in names}:
+            del self.finished[bid]
+        for name in sorted(names):
+            if not name.endswith(".p") or name[:-2] in self.runs:
+                continue
+            bid = name[:-2]
+            try:
+                mtime = os.stat(os.path.join(path, name)).st_mtime
+            except OSError:
+                continue
+            if self.finished.get(bid, (None,))[0] == mtime:
+                finished = self.finished[bid][1]
+            else:
+                data = read(self.opts, bid)
+                if data is None:
+                    continue
+                if data["state"] not in FINISHED:
+                    self.finished.pop(bid, None)
+                    self.resume(BatchRun(self, data), now)
+                    continue
+                finished = data.get("finished", now)
+                self.finished[bid] = (mtime, finished)
+            if now - finished > self.opts["keep_jobs_seconds"]:
+                for ext in (".p", ".cancel"):
+                    try:
+                        os.remove(_path(self.opts, bid, ext))
+                    except OSError:
+                        pass
+                self.finished.pop(bid, None)
+        for name in names:
+            if name.endswith(".cancel"):
+                run = self.runs.get(name[:-7])
+                if run is not None:
+                    run.finish(now, "cancelled")
+                try:
+                    os.remove(os.path.join(path, name))
+                except OSError:
+                    pass
+
+    def resume(self, run, now):
+        """
+        Run a batch submitted, or left running when the master stopped
+        """
+        log.info("Running batch %s", run.id)
+        self.runs[run.id] = run
+        for jid in run.jids():
+            self.jids[jid] = run
+        if run.data["state"] == "gathering":
+            # Ping the minions again
+            run.data["state"] = "pending"
+        cached = {}
+        for minion_id, minion in run.data["minions"].items():
+            if minion["state"] not in ACTIVE:
+                continue
+            minion["state"] = "running"
+            # Look for the returns received while the batch was not running
+            jid = minion["jid"]
+            if jid not in cached:
+                cached[jid] = self._get_jid(jid)
+            if minion_id in cached[jid]:
+                run.on_return(jid, minion_id, cached[jid][minion_id], now)
+
+    def _get_jid(self, jid):
+        try:
+            return (
+                self.local.returners[
+                    "{}.get_jid".format(self.opts["master_job_cache"])
+                ](jid)
+                or {}
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            log.debug("Unable to get the returns of job %s: %s", jid, exc)
+            return {}
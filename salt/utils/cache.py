@@ -7,6 +7,7 @@ import logging
 import os
 import re
 import shutil
+import threading
 import time
 
 import salt.config
@@ -78,6 +79,50 @@ class CacheDict(dict):
         return dict.__contains__(self, key)
 
 
+class BoundedCacheDict(CacheDict):
+    """
+    CacheDict holding at most ``maxsize`` items, the oldest items are evicted
+    first
+
+    .. versionadded:: 3008.0
+    """
+
+    def __init__(self, ttl, maxsize, *args, **kwargs):
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        super().__init__(ttl, *args, **kwargs)
+
+    def _enforce_ttl_key(self, key):
+        with self._lock:
+            super()._enforce_ttl_key(key)
+
+    def __setitem__(self, key, val):
+        with self._lock:
+            # Re-insert the key to move it to the end of the eviction order
+            self._key_cache_time.pop(key, None)
+            dict.pop(self, key, None)
+            while self and len(self) >= self._maxsize:
+                oldest = next(iter(self))
+                self._key_cache_time.pop(oldest, None)
+                dict.__delitem__(self, oldest)
+            CacheDict.__setitem__(self, key, val)
+
+    def __delitem__(self, key):
+        with self._lock:
+            self._key_cache_time.pop(key, None)
+            dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        with self._lock:
+            self._key_cache_time.pop(key, None)
+            return dict.pop(self, key, *default)
+
+    def clear(self):
+        with self._lock:
+            self._key_cache_time.clear()
+            dict.clear(self)
+
+
 class CacheDisk(CacheDict):
     """
     Class that represents itself as a dictionary to a consumer
@@ -0,0 +1,174 @@
+"""
+Helpers shared by salt-call and its warm local service, which keeps the minion
+modules, grains and pillar loaded between ``salt-call --local`` runs and
+answers them over a unix socket.
+
+This module is imported by the thin client side of salt-call, keep its imports
+light: ``salt.payload`` and ``salt.output`` are only imported once a call is
+passed to the service or its return is displayed.
+"""
+
+import logging
+import os
+import socket
+import struct
+import sys
+
+import salt.defaults.exitcodes
+
+log = logging.getLogger(__name__)
+
+# The opts of a salt-call run passed to the service with each call. The service
+# refuses the calls passing opts it does not know, they then run in process.
+CALL_OPTS = (
+    "fun",
+    "arg",
+    "return",
+    "metadata",
+    "no_parse",
+    "executor_opts",
+    "module_executors",
+    "no_return_event",
+    "retcode_passthrough",
+    "local",
+    "file_client",
+    "master_type",
+    "cache_jobs",
+    "log_level",
+)
+# The config the service must have loaded to run the call, salt-call options
+# such as --file-root or --module-dirs change it
+CONFIG_OPTS = (
+    "id",
+    "cachedir",
+    "extension_modules",
+    "module_dirs",
+    "file_roots",
+    "pillar_roots",
+    "states_dirs",
+    "saltenv",
+    "pillarenv",
+    "grains",
+    "pillar",
+)
+
+_HEADER = struct.Struct("!I")
+
+
+def socket_path(opts):
+    """
+    Return the path of the unix socket of the local service
+    """
+    return opts.get("caller_service_socket") or os.path.join(
+        opts["sock_dir"], "caller_service.ipc"
+    )
+
+
+def send_msg(sock, data):
+    """
+    Send a length prefixed message on the socket
+    """
+    import salt.payload
+
+    payload = salt.payload.dumps(data)
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exactly(sock, size):
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise EOFError("Connection closed")
+        buf += chunk
+    return bytes(buf)
+
+
+def recv_msg(sock):
+    """
+    Receive a length prefixed message from the socket
+    """
+    import salt.payload
+
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return salt.payload.loads(_recv_exactly(sock, size))
+
+
+def call(opts):
+    """
+    Pass the salt-call run described by ``opts`` to the local service.
+
+    :rtype: dict
+    :return: The response of the service, with the ``ret`` of the call and the
+        ``stdout``, ``stderr`` and ``exit`` code of the call when it did not
+        complete. ``None`` if the service is not running, is running another
+        call, runs with another config or does not support an option of the
+        call, the call should then be run in process.
+    """
+    path = socket_path(opts)
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(path)
+        except OSError as exc:
+            log.debug("The salt-call service at %s is not available: %s", path, exc)
+            return None
+        send_msg(
+            sock,
+            {
+                "call": {key: opts[key] for key in CALL_OPTS if key in opts},
+                "config": {key: opts.get(key) for key in CONFIG_OPTS},
+            },
+        )
+        try:
+            response = recv_msg(sock)
+        except (EOFError, OSError) as exc:
+            return {
+                "stderr": f"The salt-call service did not complete the call: {exc}\n",
+                "exit": salt.defaults.exitcodes.EX_GENERIC,
+            }
+    finally:
+        sock.close()
+    if "busy" in response:
+        log.debug("The salt-call service is running another call, running in process")
+        return None
+    if "mismatch" in response:
+        log.debug(
+            "The salt-call service runs with a different %s, running in process",
+            ", ".join(response["mismatch"]),
+        )
+        return None
+    if "unsupported" in response:
+        log.debug(
+            "The salt-call service does not support %s, running in process",
+            ", ".join(response["unsupported"]),
+        )
+        return None
+    return response
+
+
+def display_return(opts, ret):
+    """
+    Display the return of a salt-call run and exit with its retcode
+    """
+    import salt.output
+
+    out = ret.get("out", "nested")
+    if opts["print_metadata"]:
+        print_ret = ret
+        out = "nested"
+    else:
+        print_ret = ret.get("return", {})
+    salt.output.display_output(
+        {"local": print_ret},
+        out=out,
+        opts=opts,
+        _retcode=ret.get("retcode", 0),
+    )
+    # _retcode will be available in the kwargs of the outputter function
+    if opts.get("retcode_passthrough", False):
+        sys.exit(ret["retcode"])
+    elif ret.get("retcode") != salt.defaults.exitcodes.EX_OK:
+        sys.exit(salt.defaults.exitcodes.EX_GENERIC)
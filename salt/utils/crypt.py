@@ -11,6 +11,37 @@ from salt.exceptions import SaltInvocationError
 
 log = logging.getLogger(__name__)
 
+# The algorithms of the salt keys. They are defined here rather than in
+# salt.crypt so that validating the config does not import the transports
+OAEP = "OAEP"
+PKCS1v15 = "PKCS1v15"
+
+SHA1 = "SHA1"
+SHA224 = "SHA224"
+
+OAEP_SHA1 = f"{OAEP}-{SHA1}"
+OAEP_SHA224 = f"{OAEP}-{SHA224}"
+
+PKCS1v15_SHA1 = f"{PKCS1v15}-{SHA1}"
+PKCS1v15_SHA224 = f"{PKCS1v15}-{SHA224}"
+
+
+VALID_HASHES = (
+    SHA1,
+    SHA224,
+)
+
+VALID_PADDING_FOR_SIGNING = (PKCS1v15,)
+VALID_PADDING_FOR_ENCRYPTION = (OAEP,)
+VALID_ENCRYPTION_ALGORITHMS = (
+    OAEP_SHA1,
+    OAEP_SHA224,
+)
+VALID_SIGNING_ALGORITHMS = (
+    PKCS1v15_SHA1,
+    PKCS1v15_SHA224,
+)
+
 
 def decrypt(
     data, rend, translate_newlines=False, renderers=None, opts=None, valid_rend=None
@@ -49,6 +49,7 @@ Namespaced tag
 
 """
 
+import abc
 import asyncio
 import atexit
 import contextlib
@@ -58,6 +59,8 @@ import fnmatch
 import hashlib
 import logging
 import os
+import queue
+import threading
 import time
 from collections.abc import Iterable, MutableMapping
 
@@ -102,8 +105,13 @@ TAGS = {
     "cloud": "cloud",  # prefix for all salt/cloud events
     "fileserver": "fileserver",  # prefix for all salt/fileserver events
     "queue": "queue",  # prefix for all salt/queue events
+    "batch": "batch",  # prefix for all salt/batch events (master side batches)
 }
 
+# Tag of the heartbeats minions send to the master for the jobs they are
+# running, the master aggregates them into salt/job/<jid>/alive events
+JOB_HEARTBEAT = "__job_heartbeat"
+
 
 def get_event(
     node,
@@ -749,7 +757,10 @@ class SaltEvent:
         data["_stamp"] = datetime.datetime.utcnow().isoformat()
         event = self.pack(tag, data, max_size=self.opts["max_event_size"])
         msg = salt.utils.stringutils.to_bytes(event, "utf-8")
-        self.pusher.publish(msg)
+        if self._run_io_loop_sync:
+            self.pusher.publish(msg)
+        else:
+            await self.pusher.publish(msg)
         if cb is not None:
             warn_until(
                 3008,
@@ -995,6 +1006,371 @@ class NamespacedEvent:
         self.destroy()
 
 
+class EventSubscription:
+    """
+    The events of an :py:class:`EventFanout` matching a set of tag prefixes,
+    read with ``await subscription.get()`` or ``async for``
+
+    ``tags`` are glob patterns further filtering the tags of the events. When
+    a ``maxsize`` is given and the reader does not keep up, the oldest events
+    are dropped and counted in ``dropped``.
+    """
+
+    def __init__(self, fanout, prefixes=(), maxsize=0, tags=None):
+        self.fanout = fanout
+        self.prefixes = set()
+        self.tags = list(tags or ())
+        self.dropped = 0
+        self._reported = 0
+        self.queue = self._make_queue(maxsize)
+        for prefix in prefixes:
+            self.add(prefix)
+
+    _full = asyncio.QueueFull
+    _empty = asyncio.QueueEmpty
+
+    def _make_queue(self, maxsize):
+        return asyncio.Queue(maxsize)
+
+    def add(self, prefix):
+        """
+        Also receive the events matching ``prefix``
+        """
+        with self.fanout.lock:
+            self.prefixes.add(prefix)
+            self.fanout.index.setdefault(prefix, set()).add(self)
+
+    def remove(self, prefix):
+        """
+        Stop receiving the events matching ``prefix``
+        """
+        with self.fanout.lock:
+            self.prefixes.discard(prefix)
+            subscriptions = self.fanout.index.get(prefix)
+            if subscriptions is not None:
+                subscriptions.discard(self)
+                if not subscriptions:
+                    del self.fanout.index[prefix]
+
+    def match(self, tag):
+        return not self.tags or any(
+            fnmatch.fnmatch(tag, pattern) for pattern in self.tags
+        )
+
+    def put(self, evt):
+        if not self.match(evt["tag"]):
+            return
+        while True:
+            try:
+                self.queue.put_nowait(evt)
+                return
+            except self._full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except self._empty:
+                    pass
+
+    @property
+    def lag(self):
+        """
+        The number of events waiting to be read
+        """
+        return self.queue.qsize()
+
+    def take_dropped(self):
+        """
+        Return the number of events dropped since the last call
+        """
+        dropped = self.dropped - self._reported
+        self._reported += dropped
+        return dropped
+
+    async def get(self, timeout=None):
+        """
+        Return the next event, or None if none arrives within ``timeout``
+        seconds
+        """
+        try:
+            return self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            if timeout is not None and timeout <= 0:
+                return None
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        for prefix in list(self.prefixes):
+            self.remove(prefix)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ThreadedEventSubscription(EventSubscription):
+    """
+    An :py:class:`EventSubscription` read from threads, with ``get()`` or by
+    iterating it
+    """
+
+    _full = queue.Full
+    _empty = queue.Empty
+
+    def _make_queue(self, maxsize):
+        return queue.Queue(maxsize)
+
+    def get(self, timeout=None):  # pylint: disable=invalid-overridden-method
+        """
+        Return the next event, or None if none arrives within ``timeout``
+        seconds
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.queue.get()
+
+
+class EventFanout(metaclass=abc.ABCMeta):
+    """
+    Hand the events read from a single connection to the event bus to the
+    subscriptions of the readers of the process
+
+    .. versionadded:: 3008.0
+
+    The readers subscribe to tag prefixes. A prefix matches the tags it
+    starts, up to a ``/``: ``salt/job/20240101000000000001`` matches the
+    events of this job but not the ones of ``salt/job/200``. The prefixes are
+    indexed by these boundaries, the cost of dispatching an event does not
+    depend on the number of readers.
+    """
+
+    subscription_class = EventSubscription
+
+    def __init__(self, opts, node="master"):
+        self.opts = opts
+        self.node = node
+        # prefix -> subscriptions
+        self.index = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, *prefixes, maxsize=0, tags=None):
+        """
+        Return a subscription to the events matching ``prefixes`` and, when
+        given, one of the glob patterns of ``tags``
+        """
+        self.start()
+        return self.subscription_class(self, prefixes, maxsize=maxsize, tags=tags)
+
+    @abc.abstractmethod
+    def start(self):
+        """
+        Start reading the event bus
+        """
+
+    @staticmethod
+    def prefixes(tag):
+        """
+        Return the prefixes a subscription matching ``tag`` can have
+        """
+        ret = ["", tag]
+        pos = tag.find(TAGPARTER)
+        while pos != -1:
+            ret.append(tag[:pos])
+            ret.append(tag[: pos + 1])
+            pos = tag.find(TAGPARTER, pos + 1)
+        return ret
+
+    def subscribe_tags(self, tags=None, maxsize=0):
+        """
+        Return a subscription to the events matching one of the glob patterns
+        of ``tags``, to all the events when there are none
+        """
+        if not tags:
+            return self.subscribe("", maxsize=maxsize)
+        prefixes = {self._tag_prefix(pattern) for pattern in tags}
+        return self.subscribe(*prefixes, maxsize=maxsize, tags=tags)
+
+    @staticmethod
+    def _tag_prefix(pattern):
+        """
+        Return the prefix of the tags matching the glob ``pattern``
+        """
+        for pos, char in enumerate(pattern):
+            if char in "*?[":
+                return pattern[: pattern.rfind(TAGPARTER, 0, pos) + 1]
+        return pattern
+
+    def dispatch(self, tag, data):
+        """
+        Hand an event to the subscriptions matching its tag
+        """
+        subscriptions = set()
+        with self.lock:
+            for prefix in self.prefixes(tag):
+                subscriptions.update(self.index.get(prefix, ()))
+        evt = {"tag": tag, "data": data}
+        for subscription in subscriptions:
+            subscription.put(evt)
+
+
+class EventMultiplexer(EventFanout):
+    """
+    The :py:class:`EventFanout` of the coroutines running in an io_loop
+
+    .. versionadded:: 3008.0
+    """
+
+    def __init__(self, opts, node="master", io_loop=None):
+        super().__init__(opts, node=node)
+        if io_loop is None:
+            io_loop = tornado.ioloop.IOLoop.current()
+        self.io_loop = io_loop
+        # Connected in start()
+        self.event = get_event(
+            node, opts["sock_dir"], opts=opts, listen=False, io_loop=io_loop
+        )
+        self._connecting = None
+
+    def start(self):
+        if self._connecting is None:
+            self._connecting = self.io_loop.asyncio_loop.create_task(self._connect())
+
+    async def _connect(self):
+        self.event.subscriber = salt.transport.ipc_publish_client(
+            self.node, self.event.opts, io_loop=self.io_loop
+        )
+        self.event.cpub = True
+        try:
+            await self.event.subscriber.connect()
+        except BaseException:
+            self.event.cpub = False
+            self.event.subscriber.close()
+            self.event.subscriber = None
+            raise
+        self.event.subscriber.on_recv(self._handle_event)
+
+    async def connect(self, timeout=None):
+        """
+        Wait for the connection to the event bus, return whether it is
+        established. A failed connection is attempted again by the next call.
+        """
+        self.start()
+        connecting = self._connecting
+        try:
+            await asyncio.wait_for(asyncio.shield(connecting), timeout)
+        except asyncio.TimeoutError:
+            return False
+        except asyncio.CancelledError:
+            if not connecting.cancelled():
+                # This coroutine is cancelled, not the connection
+                raise
+        except Exception as exc:  # pylint: disable=broad-except
+            log.debug("Unable to connect to the %s event bus: %s", self.node, exc)
+        else:
+            return True
+        if self._connecting is connecting:
+            self._connecting = None
+        return False
+
+    async def _handle_event(self, raw):
+        mtag, data = self.event.unpack(raw)
+        self.dispatch(mtag, data)
+
+    def destroy(self):
+        _MULTIPLEXERS.pop((self.io_loop, self.node, self.opts["sock_dir"]), None)
+        if self._connecting is not None:
+            self._connecting.cancel()
+        self.event.destroy()
+
+
+class ThreadedEventMultiplexer(EventFanout):
+    """
+    The :py:class:`EventFanout` of the threads of a process, the events are
+    read in a thread of their own
+
+    .. versionadded:: 3008.0
+    """
+
+    subscription_class = ThreadedEventSubscription
+
+    def __init__(self, opts, node="master"):
+        super().__init__(opts, node=node)
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, name="EventMultiplexer", daemon=True
+                )
+                self.thread.start()
+
+    def run(self):
+        with get_event(
+            self.node, self.opts["sock_dir"], opts=self.opts, listen=True
+        ) as event:
+            while not self.stopped.is_set():
+                evt = event.get_event(wait=1, full=True, auto_reconnect=True)
+                if evt:
+                    self.dispatch(evt["tag"], evt["data"])
+
+    def destroy(self):
+        with _MULTIPLEXERS_LOCK:
+            _MULTIPLEXERS.pop((None, self.node, self.opts["sock_dir"]), None)
+        self.stopped.set()
+
+
+_MULTIPLEXERS = {}
+_MULTIPLEXERS_LOCK = threading.Lock()
+
+
+def get_event_multiplexer(opts, node="master", io_loop=None):
+    """
+    Return the :py:class:`EventMultiplexer` of the process for the event bus
+    of ``node`` and the ``io_loop``, the current one by default
+
+    .. versionadded:: 3008.0
+    """
+    if io_loop is None:
+        io_loop = tornado.ioloop.IOLoop.current()
+    key = (io_loop, node, opts["sock_dir"])
+    if key not in _MULTIPLEXERS:
+        _MULTIPLEXERS[key] = EventMultiplexer(opts, node=node, io_loop=io_loop)
+    return _MULTIPLEXERS[key]
+
+
+def get_threaded_event_multiplexer(opts, node="master"):
+    """
+    Return the :py:class:`ThreadedEventMultiplexer` of the process for the
+    event bus of ``node``
+
+    .. versionadded:: 3008.0
+    """
+    key = (None, node, opts["sock_dir"])
+    with _MULTIPLEXERS_LOCK:
+        if key not in _MULTIPLEXERS:
+            _MULTIPLEXERS[key] = ThreadedEventMultiplexer(opts, node=node)
+        return _MULTIPLEXERS[key]
+
+
 class MinionEvent(SaltEvent):
     """
     Warning! Use the get_event function or the code will not be
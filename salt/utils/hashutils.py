@@ -5,14 +5,30 @@ A collection of hashing and encoding utils.
 import base64
 import hashlib
 import hmac
+import logging
 import os
 import random
+import time
 
+import salt.utils.atomicfile
 import salt.utils.files
+import salt.utils.json
 import salt.utils.platform
 import salt.utils.stringutils
 from salt.utils.decorators.jinja import jinja_filter
 
+log = logging.getLogger(__name__)
+
+# A write in the same timestamp tick as the hashing of a file does not change
+# its stat result, a cached hash sum is only used when it was recorded at least
+# this number of seconds after the file last changed
+HASH_CACHE_RACY_WINDOW = 2
+# The hash cache entries older than this number of seconds, or for files which
+# no longer exist, are removed when the cache is pruned
+HASH_CACHE_MAX_AGE = 30 * 86400
+# The number of seconds between two prunings of the hash cache
+HASH_CACHE_PRUNE_INTERVAL = 86400
+
 
 @jinja_filter("base64_encode")
 def base64_b64encode(instr):
@@ -170,6 +186,178 @@ def get_hash(path, form="sha256", chunk_size=65536):
         return hash_obj.hexdigest()
 
 
+def _hash_cache_key(stat):
+    """
+    Return the stat fields a cached hash sum is valid for
+    """
+    return [
+        stat.st_dev,
+        stat.st_ino,
+        stat.st_size,
+        stat.st_mtime_ns,
+        stat.st_ctime_ns,
+    ]
+
+
+def _hash_cache_file(cachedir, path):
+    """
+    Return the file of ``cachedir`` holding the hash sums of ``path``
+    """
+    name = hashlib.sha256(salt.utils.stringutils.to_bytes(path)).hexdigest()
+    return os.path.join(cachedir, name[:2], name)
+
+
+def _read_hash_cache(cachedir, path, stat):
+    """
+    Return the hash sums cached for ``path``, provided they were recorded for
+    the exact same ``stat`` result.
+    """
+    try:
+        with salt.utils.files.fopen(_hash_cache_file(cachedir, path), "r") as fp_:
+            entry = salt.utils.json.load(fp_)
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(entry, dict)
+        or entry.get("path") != path
+        or entry.get("stat") != _hash_cache_key(stat)
+        or _hash_cache_racy(stat, entry.get("recorded"))
+    ):
+        return {}
+    return entry.get("sums", {})
+
+
+def _hash_cache_racy(stat, recorded):
+    """
+    Return whether the hash sums of a file were recorded too soon after it
+    last changed to be trusted, a later write in the same timestamp tick
+    would not have changed its stat result
+    """
+    if not isinstance(recorded, (int, float)):
+        return True
+    return recorded - HASH_CACHE_RACY_WINDOW < max(stat.st_mtime, stat.st_ctime)
+
+
+def record_hash(cachedir, path, form, hsum=None, stat=None):
+    """
+    Record the ``form`` hash sum of ``path`` in the hash cache in ``cachedir``.
+    The sum is recorded for the current stat result of ``path`` unless the
+    ``stat`` result it was computed for is passed. When ``hsum`` is None the
+    file is hashed. The sums of the files modified too recently are ignored
+    when they are read back, see ``HASH_CACHE_RACY_WINDOW``.
+    """
+    path = os.path.abspath(path)
+    # Taken before the stat result, a write after it makes the entry racy
+    recorded = time.time()
+    try:
+        current = os.stat(path)
+    except OSError:
+        return
+    if stat is not None and _hash_cache_key(stat) != _hash_cache_key(current):
+        # The file changed while it was hashed
+        return
+    if hsum is None:
+        try:
+            hsum = get_hash(path, form)
+            if _hash_cache_key(os.stat(path)) != _hash_cache_key(current):
+                return
+        except OSError:
+            return
+    sums = dict(_read_hash_cache(cachedir, path, current))
+    sums[form] = hsum
+    cache_file = _hash_cache_file(cachedir, path)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with salt.utils.files.set_umask(0o077):
+            with salt.utils.atomicfile.atomic_open(cache_file, "w") as fp_:
+                salt.utils.json.dump(
+                    {
+                        "path": path,
+                        "stat": _hash_cache_key(current),
+                        "recorded": recorded,
+                        "sums": sums,
+                    },
+                    fp_,
+                )
+    except OSError as exc:
+        log.debug("Unable to write the hash cache of %s: %s", path, exc)
+        return
+    _maybe_prune_hash_cache(cachedir)
+
+
+def prune_hash_cache(cachedir, max_age=HASH_CACHE_MAX_AGE):
+    """
+    Remove the entries of the hash cache in ``cachedir`` recorded more than
+    ``max_age`` seconds ago, and the ones of the files which no longer exist
+    """
+    limit = time.time() - max_age
+    try:
+        subdirs = os.listdir(cachedir)
+    except OSError:
+        return
+    for subdir in subdirs:
+        subdir = os.path.join(cachedir, subdir)
+        if not os.path.isdir(subdir):
+            continue
+        for name in os.listdir(subdir):
+            cache_file = os.path.join(subdir, name)
+            try:
+                if os.stat(cache_file).st_mtime >= limit:
+                    with salt.utils.files.fopen(cache_file, "r") as fp_:
+                        path = salt.utils.json.load(fp_).get("path")
+                    if path and os.path.exists(path):
+                        continue
+                os.remove(cache_file)
+            except (OSError, ValueError, AttributeError):
+                try:
+                    os.remove(cache_file)
+                except OSError:
+                    pass
+
+
+def _maybe_prune_hash_cache(cachedir):
+    """
+    Prune the hash cache in ``cachedir`` when it was not pruned for
+    ``HASH_CACHE_PRUNE_INTERVAL`` seconds
+    """
+    stamp = os.path.join(cachedir, ".pruned")
+    try:
+        if time.time() - os.stat(stamp).st_mtime < HASH_CACHE_PRUNE_INTERVAL:
+            return
+    except OSError:
+        pass
+    try:
+        with salt.utils.files.fopen(stamp, "w"):
+            pass
+    except OSError:
+        return
+    prune_hash_cache(cachedir)
+
+
+def get_cached_hash(path, form="sha256", chunk_size=65536, cachedir=None):
+    """
+    Get the hash sum of a file like ``get_hash``, using the hash cache in
+    ``cachedir``. A cached sum is only used when the device, inode, size,
+    mtime and ctime of the file are the ones it was recorded for, and it was
+    not recorded too soon after the file changed. The sum is recorded again
+    otherwise.
+    """
+    if not cachedir:
+        return get_hash(path, form, chunk_size)
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        # Let get_hash raise the error
+        return get_hash(path, form, chunk_size)
+    hsum = _read_hash_cache(cachedir, path, stat).get(form)
+    if hsum:
+        return hsum
+    hsum = get_hash(path, form, chunk_size)
+    record_hash(cachedir, path, form, hsum, stat=stat)
+    return hsum
+
+
 class DigestCollector:
     """
     Class to collect digest of the file tree.
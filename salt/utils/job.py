@@ -3,6 +3,7 @@ Functions for interacting with the job cache
 """
 
 import logging
+import uuid
 
 import salt.minion
 import salt.utils.event
@@ -12,6 +13,9 @@ import salt.utils.versions
 
 log = logging.getLogger(__name__)
 
+# The number of minions in the pages of the returns of a job
+JID_PAGE_SIZE = 100
+
 
 def store_job(opts, load, event=None, mminion=None):
     """
@@ -168,6 +172,50 @@ def store_minions(opts, jid, minions, mminion=None, syndic_id=None):
         raise KeyError(f"Returner '{job_cache}' does not support function save_minions")
 
 
+def get_jid_pages(returners, returner, jid, page_size=JID_PAGE_SIZE):
+    """
+    Yield the information returned by the minions when the specified job id
+    was executed, by pages of at most ``page_size`` minions. The
+    ``get_jid_pages`` function of the returner is used when it has one,
+    otherwise the return of its ``get_jid`` function is split in pages.
+
+    .. versionadded:: 3008.0
+    """
+    fstr = f"{returner}.get_jid_pages"
+    if fstr in returners:
+        yield from returners[fstr](jid, page_size=page_size)
+        return
+    returns = returners[f"{returner}.get_jid"](jid)
+    if not returns:
+        return
+    page = {}
+    for minion, data in returns.items():
+        page[minion] = data
+        if len(page) >= page_size:
+            yield page
+            page = {}
+    if page:
+        yield page
+
+
+def fetch_pages(conn, sql, args, page_size=JID_PAGE_SIZE):
+    """
+    Yield the rows of a SQL query by pages of at most ``page_size`` rows, read
+    with a server side cursor of the DB-API connection ``conn``. Each query
+    gets a cursor of its own name, several of them can be paged at the same
+    time on a connection.
+
+    .. versionadded:: 3008.0
+    """
+    with conn.cursor(name=f"salt_pages_{uuid.uuid4().hex}") as cur:
+        cur.execute(sql, args)
+        while True:
+            rows = cur.fetchmany(page_size)
+            if not rows:
+                return
+            yield rows
+
+
 def get_retcode(ret):
     """
     Determine a retcode for a given return
@@ -0,0 +1,351 @@
+"""
+Stores of the public keys of the minions on the master
+
+.. versionadded:: 3008.0
+
+The keys are files named after the minion ids in the ``minions``,
+``minions_pre``, ``minions_rejected`` and ``minions_denied`` directories of
+the PKI directory of the master. The :conf_master:`key_store` option selects
+how they are read:
+
+``localfs``
+    The directories are listed, and the key files read, on every use.
+
+``indexed``
+    The listings of the directories and the contents of the keys are kept in
+    memory. A listing is read again when the modification time of its
+    directory changed, the content of a key when its file changed. The
+    listings changed by the store are updated with the keys it wrote, moved or
+    deleted, and read again once the directories are out of the last seconds.
+    The directories and files modified in the last seconds are not read from
+    the memory otherwise. The keys stay in the same files, ``salt-key`` and
+    the other tools keep working on them.
+
+Both stores move, reject and delete the keys by batches.
+"""
+
+import fnmatch
+import logging
+import os
+import threading
+import time
+
+import salt.crypt
+import salt.utils.data
+import salt.utils.files
+import salt.utils.stringutils
+
+log = logging.getLogger(__name__)
+
+ACC = "minions"
+PEND = "minions_pre"
+REJ = "minions_rejected"
+DEN = "minions_denied"
+STATES = (ACC, PEND, REJ, DEN)
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+# The files and directories modified this recently are not cached, a change
+# in the same timestamp tick would not change their stamp
+_RACY_WINDOW = 2
+
+
+def _stamp(path):
+    """
+    Return what identifies the version of a file or directory, None when it
+    does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _trusted(stamp):
+    """
+    Return whether a stamp identifies the version of its file or directory. A
+    change made within the granularity of the modification times of the file
+    system after it was taken may leave it unchanged.
+    """
+    return time.time() - _RACY_WINDOW > stamp[0] / 1e9
+
+
+def split_match(match):
+    """
+    Return the list of the globs of a match: a glob, a comma separated list of
+    globs or a list of globs
+    """
+    if isinstance(match, str):
+        return match.split(",") if "," in match else [match]
+    return list(match)
+
+
+class LocalFSKeyStore:
+    """
+    The keys stored in the directories of the PKI directory, read from the
+    filesystem on every use
+    """
+
+    def __init__(self, opts, pki_dir):
+        self.opts = opts
+        self.pki_dir = pki_dir
+
+    def path(self, state, minion_id):
+        return os.path.join(self.pki_dir, state, minion_id)
+
+    def _listdir(self, state):
+        try:
+            names = os.listdir(os.path.join(self.pki_dir, state))
+        except OSError:
+            # key dir kind is not created yet
+            return None
+        return salt.utils.data.sorted_ignorecase(
+            salt.utils.stringutils.to_unicode(name)
+            for name in names
+            if not name.startswith(".")
+        )
+
+    def list_state(self, state):
+        """
+        Return the sorted ids of the keys in a state
+        """
+        return self._listdir(state) or []
+
+    def list_keys(self, states=STATES):
+        """
+        Return the sorted ids of the keys of each state
+        """
+        return {state: self.list_state(state) for state in states}
+
+    def exists(self, state, minion_id):
+        return os.path.isfile(self.path(state, minion_id))
+
+    def match(self, match, states=STATES):
+        """
+        Return the sorted ids of the keys of each state matching the globs
+        """
+        globs = split_match(match)
+        # Only minion ids, no need to go through all the keys
+        literal = not any(char in glob for glob in globs for char in "*?[")
+        ret = {}
+        for state, keys in self.list_keys(states).items():
+            if literal:
+                ids = set(globs)
+            else:
+                ids = set()
+                for glob in globs:
+                    ids.update(fnmatch.filter(keys, glob))
+            matched = [key for key in keys if key in ids]
+            if matched:
+                ret[state] = matched
+        return ret
+
+    def read(self, state, minion_id):
+        """
+        Return the public key of a minion in a state, None when there is none
+        """
+        try:
+            with salt.utils.files.fopen(self.path(state, minion_id), "r") as fp_:
+                return salt.utils.stringutils.to_unicode(fp_.read())
+        except OSError:
+            return None
+
+    def public_key(self, state, minion_id):
+        """
+        Return the loaded public key of a minion in a state. Raise OSError when
+        there is none, and salt.crypt.InvalidKeyError when it is invalid.
+        """
+        return salt.crypt.PublicKey(self.path(state, minion_id))
+
+    def write(self, state, minion_id, pub):
+        with salt.utils.files.fopen(self.path(state, minion_id), "w+") as fp_:
+            fp_.write(pub)
+
+    def move(self, minion_ids, src, dst):
+        """
+        Move the keys of the given minions from a state to another one, return
+        the ids of the moved keys
+        """
+        moved = []
+        for minion_id in minion_ids:
+            try:
+                os.replace(self.path(src, minion_id), self.path(dst, minion_id))
+            except OSError:
+                continue
+            moved.append(minion_id)
+        return moved
+
+    def delete(self, state, minion_ids):
+        """
+        Delete the keys of the given minions in a state, return the ids of
+        the deleted keys
+        """
+        deleted = []
+        for minion_id in minion_ids:
+            try:
+                os.remove(self.path(state, minion_id))
+            except OSError:
+                continue
+            deleted.append(minion_id)
+        return deleted
+
+
+class IndexedKeyStore(LocalFSKeyStore):
+    """
+    The keys stored in the directories of the PKI directory, with the listings
+    of the directories and the contents of the keys kept in memory
+    """
+
+    def __init__(self, opts, pki_dir):
+        super().__init__(opts, pki_dir)
+        self._lock = threading.RLock()
+        # state -> (stamp of the directory, sorted ids, True when they were
+        # listed from the directory, False when updated by the store)
+        self._index = {}
+        # (state, minion id) -> (stamp of the file, key)
+        self._keys = {}
+        # (state, minion id) -> (stamp of the file, loaded public key)
+        self._public_keys = {}
+
+    def _listdir(self, state):
+        with self._lock:
+            stamp = _stamp(os.path.join(self.pki_dir, state))
+            cached = self._index.get(state)
+            if stamp is not None and cached is not None and cached[0] == stamp:
+                # The listings updated by the store are listed again once out
+                # of the racy window, another change within the same tick
+                # would not be in them
+                if cached[2] or not _trusted(stamp):
+                    return list(cached[1])
+            self._index.pop(state, None)
+            if stamp is None:
+                return None
+            keys = super()._listdir(state)
+            if keys is not None and _trusted(stamp):
+                self._index[state] = (stamp, keys, True)
+            return keys
+
+    def _listed(self, state):
+        """
+        Return the ids in the listing of a state about to be changed by this
+        store, None when the directory changed since it was listed
+        """
+        cached = self._index.pop(state, None)
+        if cached is None or cached[0] != _stamp(os.path.join(self.pki_dir, state)):
+            return None
+        return cached[1]
+
+    def _update(self, state, listed, added=(), removed=()):
+        """
+        Update the listing of a state changed by this store with the ids added
+        and removed, instead of listing the directory again
+        """
+        stamp = _stamp(os.path.join(self.pki_dir, state))
+        if listed is None or stamp is None:
+            return
+        keys = set(listed)
+        keys.update(added)
+        keys.difference_update(removed)
+        self._index[state] = (stamp, salt.utils.data.sorted_ignorecase(keys), False)
+
+    def exists(self, state, minion_id):
+        return self.read(state, minion_id) is not None
+
+    def read(self, state, minion_id):
+        path = self.path(state, minion_id)
+        stamp = _stamp(path)
+        key = (state, minion_id)
+        if stamp is None:
+            self._keys.pop(key, None)
+            return None
+        cached = self._keys.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        self._keys.pop(key, None)
+        pub = super().read(state, minion_id)
+        if pub is not None and _trusted(stamp):
+            self._keys[key] = (stamp, pub)
+        return pub
+
+    def public_key(self, state, minion_id):
+        stamp = _stamp(self.path(state, minion_id))
+        key = (state, minion_id)
+        cached = self._public_keys.get(key)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            return cached[1]
+        self._public_keys.pop(key, None)
+        pub = super().public_key(state, minion_id)
+        if stamp is not None and _trusted(stamp):
+            self._public_keys[key] = (stamp, pub)
+        return pub
+
+    def _forget(self, state, minion_id):
+        self._keys.pop((state, minion_id), None)
+        self._public_keys.pop((state, minion_id), None)
+
+    def write(self, state, minion_id, pub):
+        with self._lock:
+            listed = self._listed(state)
+            try:
+                super().write(state, minion_id, pub)
+            finally:
+                self._forget(state, minion_id)
+            self._update(state, listed, added=[minion_id])
+
+    def move(self, minion_ids, src, dst):
+        minion_ids = list(minion_ids)
+        with self._lock:
+            src_listed = self._listed(src)
+            dst_listed = self._listed(dst)
+            try:
+                moved = super().move(minion_ids, src, dst)
+            finally:
+                for minion_id in minion_ids:
+                    self._forget(src, minion_id)
+                    self._forget(dst, minion_id)
+            self._update(src, src_listed, removed=moved)
+            self._update(dst, dst_listed, added=moved)
+            return moved
+
+    def delete(self, state, minion_ids):
+        minion_ids = list(minion_ids)
+        with self._lock:
+            listed = self._listed(state)
+            try:
+                deleted = super().delete(state, minion_ids)
+            finally:
+                for minion_id in minion_ids:
+                    self._forget(state, minion_id)
+            self._update(state, listed, removed=deleted)
+            return deleted
+
+
+BACKENDS = {
+    "localfs": LocalFSKeyStore,
+    "indexed": IndexedKeyStore,
+}
+
+
+def get_key_store(opts, pki_dir=None):
+    """
+    Return the key store of the master selected by the ``key_store`` option.
+    The stores are shared in a process, by the ``salt-key`` functions and the
+    authentication of the minions.
+    """
+    if pki_dir is None:
+        pki_dir = opts["pki_dir"]
+        if opts.get("cluster_id") and opts.get("cluster_pki_dir"):
+            pki_dir = opts["cluster_pki_dir"]
+    backend = opts.get("key_store") or "localfs"
+    if backend not in BACKENDS:
+        log.error("Unknown key store %r, using localfs", backend)
+        backend = "localfs"
+    key = (backend, pki_dir)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = BACKENDS[backend](opts, pki_dir)
+    return store
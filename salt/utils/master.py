@@ -18,6 +18,7 @@ import salt.payload
 import salt.pillar
 import salt.utils.atomicfile
 import salt.utils.files
+import salt.utils.mine
 import salt.utils.minions
 import salt.utils.platform
 import salt.utils.stringutils
@@ -572,13 +573,27 @@ class MasterPillarUtil:
                     self.cache.store(bank, "data", {"pillar": minion_pillar})
                 if clear_mine:
                     # Delete the whole mine file
+                    mine_data = self.cache.fetch(bank, "mine")
                     self.cache.flush(bank, "mine")
+                    if salt.utils.mine.mine_index_enabled(self.opts):
+                        salt.utils.mine.update_mine_index(
+                            self.opts, self.cache, minion_id, mine_data, {}
+                        )
                 elif clear_mine_func is not None:
                     # Delete a specific function from the mine file
                     mine_data = self.cache.fetch(bank, "mine")
                     if isinstance(mine_data, dict):
+                        old_data = dict(mine_data)
                         if mine_data.pop(clear_mine_func, False):
                             self.cache.store(bank, "mine", mine_data)
+                            if salt.utils.mine.mine_index_enabled(self.opts):
+                                salt.utils.mine.update_mine_index(
+                                    self.opts,
+                                    self.cache,
+                                    minion_id,
+                                    old_data,
+                                    mine_data,
+                                )
         except OSError:
             return True
         return True
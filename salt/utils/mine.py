@@ -2,9 +2,13 @@
 This module contains routines used for the salt mine
 """
 
+import contextlib
 import logging
+import os
+import urllib.parse
 
 import salt.utils.data
+import salt.utils.files
 
 log = logging.getLogger(__name__)
 
@@ -12,6 +16,13 @@ MINE_ITEM_ACL_ID = "__saltmine_acl__"
 MINE_ITEM_ACL_VERSION = 1
 MINE_ITEM_ACL_DATA = "__data__"
 
+# The cache bank of the mine index. It holds one bank per mine function, named
+# after it, with one key per minion holding its mine entry for that function
+MINE_INDEX_BANK = "mine_index"
+# Stored in the index bank once the index has been built from the mine data
+# of every minion
+MINE_INDEX_BUILT = "__built__"
+
 
 def minion_side_acl_denied(minion_acl_cache, mine_minion, mine_function, req_minion):
     """
@@ -107,3 +118,133 @@ def parse_function_definition(function_definition):
     )
 
     return (function_name, function_args, function_kwargs, minion_acl)
+
+
+def mine_index_enabled(opts):
+    """
+    Return whether the mine index is used.
+
+    :param dict opts: The master options.
+
+    :rtype: bool
+    """
+    return bool(opts.get("mine_index", True))
+
+
+def _mine_index_bank(function):
+    """
+    Return the cache bank of the mine index holding the entries of ``function``
+    """
+    return "{}/{}".format(MINE_INDEX_BANK, urllib.parse.quote(function, safe=""))
+
+
+@contextlib.contextmanager
+def _mine_index_lock(opts):
+    """
+    Serialize the build of the mine index with its updates between the master
+    worker processes
+    """
+    lock_fn = os.path.join(opts["cachedir"], ".mine_index.lock")
+    with salt.utils.files.flopen(lock_fn, "a"):
+        yield
+
+
+def rebuild_mine_index(opts, cache):
+    """
+    Build the mine index from the mine data of every minion in the cache, if it
+    has not been built yet.
+
+    :param dict opts: The master options.
+    :param cache: The ``salt.cache.Cache`` holding the mine data.
+    """
+    with _mine_index_lock(opts):
+        if cache.contains(MINE_INDEX_BANK, MINE_INDEX_BUILT):
+            return
+        log.debug("Building the mine index")
+        cache.flush(MINE_INDEX_BANK)
+        for minion_id in cache.list("minions"):
+            mine_data = cache.fetch(f"minions/{minion_id}", "mine")
+            if not isinstance(mine_data, dict):
+                continue
+            for function, mine_entry in mine_data.items():
+                cache.store(_mine_index_bank(function), minion_id, mine_entry)
+        cache.store(MINE_INDEX_BANK, MINE_INDEX_BUILT, True)
+
+
+def clear_mine_index(opts, cache):
+    """
+    Drop the mine index, it is rebuilt from the mine data of the minions on its
+    next use.
+
+    :param dict opts: The master options.
+    :param cache: The ``salt.cache.Cache`` holding the mine data.
+    """
+    if not cache.contains(MINE_INDEX_BANK):
+        return
+    with _mine_index_lock(opts):
+        cache.flush(MINE_INDEX_BANK)
+
+
+def update_mine_index(opts, cache, minion_id, old_data, new_data):
+    """
+    Update the mine index after the mine data of a minion changed. Only the
+    entries of the minion for the functions which changed are rewritten.
+
+    :param dict opts: The master options.
+    :param cache: The ``salt.cache.Cache`` holding the mine data.
+    :param str minion_id: The minion whose mine data changed.
+    :param dict old_data: The previous mine data of the minion.
+    :param dict new_data: The new mine data of the minion, an empty dict if the
+        mine of the minion was flushed.
+    """
+    if not isinstance(old_data, dict):
+        old_data = {}
+    if not isinstance(new_data, dict):
+        new_data = {}
+    changed = [
+        function
+        for function in set(old_data) | set(new_data)
+        if function not in old_data
+        or function not in new_data
+        or old_data[function] != new_data[function]
+    ]
+    if not changed:
+        return
+    if not cache.contains(MINE_INDEX_BANK, MINE_INDEX_BUILT):
+        # Wait for a build of the index in progress, which may have read the
+        # previous mine data of the minion
+        with _mine_index_lock(opts):
+            if not cache.contains(MINE_INDEX_BANK, MINE_INDEX_BUILT):
+                # The whole index is built from the minion data on its first use
+                return
+    for function in changed:
+        if function in new_data:
+            cache.store(_mine_index_bank(function), minion_id, new_data[function])
+        else:
+            cache.flush(_mine_index_bank(function), minion_id)
+
+
+def fetch_mine_index(opts, cache, functions, minions):
+    """
+    Return the mine entries of the ``minions`` for the ``functions`` from the
+    mine index, building the index first if needed. The index of a function is
+    listed once, only the entries of the targeted minions it holds are read.
+
+    :param dict opts: The master options.
+    :param cache: The ``salt.cache.Cache`` holding the mine data.
+    :param list functions: The mine functions.
+    :param minions: The minion ids whose entries are returned.
+
+    :rtype: dict
+    :return: The mine entries keyed by function and minion id. The entries
+        still contain the minion-side ACL data, if any.
+    """
+    if not cache.contains(MINE_INDEX_BANK, MINE_INDEX_BUILT):
+        rebuild_mine_index(opts, cache)
+    minions = set(minions)
+    ret = {}
+    for function in functions:
+        bank = _mine_index_bank(function)
+        for minion_id in sorted(minions.intersection(cache.list(bank))):
+            ret.setdefault(function, {})[minion_id] = cache.fetch(bank, minion_id)
+    return ret
@@ -4,9 +4,11 @@ expected to return
 """
 
 import fnmatch
+import functools
 import logging
 import os
 import re
+import time
 
 import salt.cache
 import salt.payload
@@ -14,7 +16,9 @@ import salt.roster
 import salt.transport
 import salt.utils.data
 import salt.utils.files
+import salt.utils.keystore
 import salt.utils.network
+import salt.utils.presence
 import salt.utils.stringutils
 import salt.utils.versions
 from salt._compat import ipaddress
@@ -196,6 +200,247 @@ def nodegroup_comp(nodegroup, nodegroups, skip=None, first_call=True):
         return ret
 
 
+def syndic_summary_match(
+    summary, expr, tgt_type="glob", delimiter=DEFAULT_TARGET_DELIM
+):
+    """
+    Check a target against the minion summary advertised by a syndic.
+
+    Returns ``False`` only when none of the minions behind the syndic can
+    match the target. Targets which can not be evaluated against the summary
+    always return ``True``.
+    """
+    minions = summary.get("minions") or []
+    if tgt_type == "list":
+        if isinstance(expr, str):
+            expr = [m for m in expr.split(",") if m]
+        return not set(minions).isdisjoint(expr)
+    if tgt_type == "glob":
+        return any(fnmatch.fnmatch(minion, expr) for minion in minions)
+    if tgt_type == "pcre":
+        reg = re.compile(expr)
+        return any(reg.match(minion) for minion in minions)
+    if tgt_type in ("grain", "grain_pcre"):
+        if expr.split(delimiter, 1)[0] not in summary.get("grain_names", ()):
+            # The syndic does not advertise this grain
+            return True
+        grains = summary.get("grains") or {}
+        for minion in minions:
+            if minion not in grains:
+                # No cached grains, the minion could still match
+                return True
+            if salt.utils.data.subdict_match(
+                grains[minion],
+                expr,
+                delimiter=delimiter,
+                regex_match=tgt_type == "grain_pcre",
+            ):
+                return True
+        return False
+    return True
+
+
+# The number of seconds the syndic summaries read from the cache are used for
+# before they are read again
+SYNDIC_SUMMARIES_TTL = 5
+
+# The literal prefix of a regular expression of an access list, a function
+# name can only match the expression when it starts with this prefix
+ACL_PREFIX_REX = re.compile(r"\w*")
+
+# The regular expression of the invalid expressions of an access list
+_ACL_NO_MATCH = re.compile(r"(?!)")
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_regex(regex):
+    return re.compile(regex)
+
+
+def _acl_regex(regex):
+    """
+    Return the compiled regular expression of an access list condition, an
+    invalid expression never matches
+    """
+    try:
+        if isinstance(regex, str):
+            return _compile_regex(regex)
+    except Exception:  # pylint: disable=broad-except
+        pass
+    log.error("Invalid regular expression: %s", regex)
+    return _ACL_NO_MATCH
+
+
+def _acl_prefix(regex):
+    """
+    Return the literal prefix of a function expression, the characters made
+    optional by a quantifier and the alternations are not part of the prefix
+    """
+    if not isinstance(regex, str) or "|" in regex:
+        return ""
+    prefix = ACL_PREFIX_REX.match(regex).group()
+    if regex[len(prefix) : len(prefix) + 1] in ("?", "*", "{"):
+        prefix = prefix[:-1]
+    return prefix
+
+
+def _compile_args(valid):
+    """
+    Compile the conditions on the arguments of a function:
+    ``{'args': [...], 'kwargs': {...}}`` or a list of them
+    """
+    if not isinstance(valid, list):
+        valid = [valid]
+    ret = []
+    for cond in valid:
+        if not isinstance(cond, dict):
+            # Invalid argument
+            continue
+        try:
+            args = [
+                None if arg is None else _acl_regex(arg) for arg in cond.get("args", [])
+            ]
+            kwargs = {
+                key: None if value is None else _acl_regex(value)
+                for key, value in cond.get("kwargs", {}).items()
+            }
+        except (AttributeError, TypeError):
+            log.error("Invalid arguments condition: %s", cond)
+            continue
+        ret.append((args, kwargs))
+    return ret
+
+
+def _check_args(conds, args=None, kwargs=None):
+    """
+    Check the arguments of a function against the compiled conditions
+    """
+    for cond_args, cond_kwargs in conds:
+        good = True
+        for i, cond_arg in enumerate(cond_args):
+            if args is None or len(args) <= i:
+                good = False
+                break
+            if cond_arg is None:  # None == '.*' i.e. allow any
+                continue
+            if not cond_arg.match(str(args[i])):
+                good = False
+                break
+        if not good:
+            continue
+        for key, value in cond_kwargs.items():
+            if kwargs is None or key not in kwargs:
+                good = False
+                break
+            if value is None:  # None == '.*' i.e. allow any
+                continue
+            if not value.match(str(kwargs[key])):
+                good = False
+                break
+        if good:
+            return True
+    return False
+
+
+class FunctionConditions:
+    """
+    The conditions of an access list on the functions and their arguments,
+    indexed by the literal prefix of their expression
+
+    .. versionadded:: 3008.0
+    """
+
+    def __init__(self):
+        self.index = {}
+
+    def add(self, valid):
+        """
+        Add the conditions of an access list entry: function expressions, or
+        ``{function: {'args': [...], 'kwargs': {...}}}`` dictionaries
+        """
+        if not isinstance(valid, list):
+            valid = [valid]
+        for cond in valid:
+            # Function name match
+            if isinstance(cond, str):
+                self._add(cond, None)
+            # Function and args match
+            elif isinstance(cond, dict):
+                if len(cond) != 1:
+                    # Invalid argument
+                    continue
+                fname_cond, args_cond = next(iter(cond.items()))
+                self._add(fname_cond, _compile_args(args_cond))
+
+    def _add(self, regex, args):
+        self.index.setdefault(_acl_prefix(regex), []).append((_acl_regex(regex), args))
+
+    def check(self, fun, args=None, kwargs=None):
+        """
+        Check the given function name and its arguments against the conditions
+        """
+        if not isinstance(fun, str):
+            return False
+        word = ACL_PREFIX_REX.match(fun).group()
+        for idx in range(len(word) + 1):
+            for regex, args_conds in self.index.get(word[:idx], ()):
+                if regex.match(fun) and (
+                    args_conds is None or _check_args(args_conds, args, kwargs)
+                ):
+                    return True
+        return False
+
+
+class CompiledACL:
+    """
+    An access list compiled once into the regular expressions of its
+    conditions. The conditions given for a target are grouped by target, the
+    ``@`` entries of the runner and wheel functions by name.
+
+    .. versionadded:: 3008.0
+    """
+
+    def __init__(self, auth_list):
+        # The functions allowed on all the minions
+        self.funs = FunctionConditions()
+        # The functions allowed on the minions of a target
+        self.targets = {}
+        # The names of the ``@`` entries allowing all their functions
+        self.specs = set()
+        # The functions allowed by the ``@`` entries
+        self.spec_funs = {}
+        for ind in auth_list:
+            if isinstance(ind, str):
+                self.funs.add(ind)
+                if ind.startswith("@"):
+                    self.specs.add(ind[1:])
+            elif isinstance(ind, dict):
+                if len(ind) != 1:
+                    # Invalid argument
+                    continue
+                valid, funs = next(iter(ind.items()))
+                self.targets.setdefault(valid, FunctionConditions()).add(funs)
+                if isinstance(valid, str) and valid.startswith("@"):
+                    self.spec_funs.setdefault(valid[1:], FunctionConditions()).add(funs)
+
+    def check_spec(self, mod_name, fun_name, fun, args, form):
+        """
+        Check a runner, wheel or cloud function against the ``@`` entries
+        """
+        if self.specs.intersection((mod_name, form, f"{form}s")):
+            return True
+        if mod_name in self.spec_funs:
+            if self.spec_funs[mod_name].check(
+                fun_name, args.get("arg"), args.get("kwarg")
+            ):
+                return True
+        for name in (form, f"{form}s"):
+            if name in self.spec_funs:
+                if self.spec_funs[name].check(fun, args.get("arg"), args.get("kwarg")):
+                    return True
+        return False
+
+
 class CkMinions:
     """
     Used to check what minions should respond from a target
@@ -218,6 +463,21 @@ class CkMinions:
             self.pki_dir = self.opts.get("cluster_pki_dir", "")
         else:
             self.pki_dir = self.opts.get("pki_dir", "")
+        # syndic id -> (update time of the cache entry, summary)
+        self._syndic_summaries = {}
+        # when the syndic summaries were last read from the cache
+        self._syndic_summaries_read = 0
+        self._acls = {}
+        self._key_store = None
+
+    @property
+    def key_store(self):
+        """
+        The key store of the keys of the minions
+        """
+        if self._key_store is None:
+            self._key_store = salt.utils.keystore.get_key_store(self.opts, self.pki_dir)
+        return self._key_store
 
     def _check_nodegroup_minions(self, expr, greedy):  # pylint: disable=unused-argument
         """
@@ -274,11 +534,7 @@ class CkMinions:
                 with salt.utils.files.fopen(pki_cache_fn, mode="rb") as fn_:
                     return salt.payload.load(fn_)
             else:
-                for fn_ in salt.utils.data.sorted_ignorecase(
-                    os.listdir(os.path.join(self.pki_dir, self.acc))
-                ):
-                    if not fn_.startswith("."):
-                        minions.append(fn_)
+                minions = self.key_store.list_state(self.acc)
             return minions
         except OSError as exc:
             log.error(
@@ -301,12 +557,7 @@ class CkMinions:
             return self.cache.list("minions")
 
         if greedy:
-            minions = []
-            for fn_ in salt.utils.data.sorted_ignorecase(
-                os.listdir(os.path.join(self.pki_dir, self.acc))
-            ):
-                if not fn_.startswith("."):
-                    minions.append(fn_)
+            minions = self.key_store.list_state(self.acc)
         elif cache_enabled:
             minions = list_cached_minions()
         else:
@@ -447,13 +698,10 @@ class CkMinions:
             log.error("Range exception in compound match: %s", exc)
             cache_enabled = self.opts.get("minion_data_cache", False)
             if greedy:
-                mlist = []
-                for fn_ in salt.utils.data.sorted_ignorecase(
-                    os.listdir(os.path.join(self.pki_dir, self.acc))
-                ):
-                    if not fn_.startswith("."):
-                        mlist.append(fn_)
-                return {"minions": mlist, "missing": []}
+                return {
+                    "minions": self.key_store.list_state(self.acc),
+                    "missing": [],
+                }
             elif cache_enabled:
                 return {"minions": self.cache.list("minions"), "missing": []}
             else:
@@ -626,11 +874,33 @@ class CkMinions:
         Return a set of all connected minion ids, optionally within a subset
         """
         minions = set()
+        found = set()
+        presence = salt.utils.presence.load(self.opts)
+        if presence is not None:
+            # The minions which authenticated their connection to the publish
+            # servers of the tcp and ws transports
+            for id_ in subset or presence.minions:
+                if id_ not in presence:
+                    continue
+                found.add(id_)
+                if show_ip:
+                    minions.add((id_, presence.minions[id_]["addr"]))
+                else:
+                    minions.add(id_)
+            if not presence.addrs and not self.opts.get("detect_remote_minions"):
+                return minions
         if self.opts.get("minion_data_cache", False):
             search = self.cache.list("minions")
             if search is None:
                 return minions
-            addrs = salt.utils.network.local_port_tcp(int(self.opts["publish_port"]))
+            if presence is not None:
+                # The addresses of the connections to the zeromq publish
+                # servers, which do not identify the minions
+                addrs = set(presence.addrs)
+            else:
+                addrs = salt.utils.network.local_port_tcp(
+                    int(self.opts["publish_port"])
+                )
             if self.opts.get("detect_remote_minions", False):
                 addrs = addrs.union(
                     salt.utils.network.remote_port_tcp(self.opts["remote_minions_port"])
@@ -646,6 +916,8 @@ class CkMinions:
             if subset:
                 search = subset
             for id_ in search:
+                if id_ in found:
+                    continue
                 try:
                     mdata = self.cache.fetch(f"minions/{id_}", "data")
                 except SaltCacheError:
@@ -677,13 +949,7 @@ class CkMinions:
         """
         Return a list of all minions that have auth'd
         """
-        mlist = []
-        for fn_ in salt.utils.data.sorted_ignorecase(
-            os.listdir(os.path.join(self.pki_dir, self.acc))
-        ):
-            if not fn_.startswith("."):
-                mlist.append(fn_)
-        return {"minions": mlist, "missing": []}
+        return {"minions": self.key_store.list_state(self.acc), "missing": []}
 
     def check_minions(
         self, expr, tgt_type="glob", delimiter=DEFAULT_TARGET_DELIM, greedy=True
@@ -729,6 +995,116 @@ class CkMinions:
             _res = {"minions": [], "missing": []}
         return _res
 
+    def syndic_summaries(self):
+        """
+        Return the minion summaries advertised by the syndics, keyed by syndic
+        id, or None when they can not be read from the cache. The summaries
+        are read again at most every ``SYNDIC_SUMMARIES_TTL`` seconds, and a
+        summary is only fetched again when its cache entry was updated.
+        """
+        now = time.time()
+        if 0 <= now - self._syndic_summaries_read < SYNDIC_SUMMARIES_TTL:
+            return self._valid_syndic_summaries()
+        summaries = {}
+        try:
+            for syndic in self.cache.list("syndic_minions"):
+                updated = self.cache.updated("syndic_minions", syndic)
+                cached = self._syndic_summaries.get(syndic)
+                # The update times are only accurate to the second, a summary
+                # stored in the same second would be missed
+                if (
+                    cached is None
+                    or updated is None
+                    or cached[0] != updated
+                    or now - updated < 2
+                ):
+                    cached = (updated, self.cache.fetch("syndic_minions", syndic))
+                summaries[syndic] = cached
+        except SaltCacheError as exc:
+            log.error("Unable to read the syndic minion summaries: %s", exc)
+            return None
+        self._syndic_summaries = summaries
+        self._syndic_summaries_read = now
+        return self._valid_syndic_summaries()
+
+    def _valid_syndic_summaries(self):
+        """
+        Return the syndic summaries last read from the cache, keyed by syndic
+        id
+        """
+        return {
+            syndic: summary
+            for syndic, (_, summary) in self._syndic_summaries.items()
+            if isinstance(summary, dict)
+        }
+
+    def _syndic_summary_fresh(self, summary, now):
+        """
+        Return whether a syndic advertised its minions recently enough for
+        its summary to be trusted
+        """
+        stamp = summary.get("stamp")
+        return isinstance(stamp, (int, float)) and now - stamp <= 3 * self.opts.get(
+            "syndic_advertise_interval", 60
+        )
+
+    def syndic_topics(
+        self, expr, tgt_type="glob", delimiter=DEFAULT_TARGET_DELIM, minions=()
+    ):
+        """
+        Return the ids a master of masters publishes a target to with
+        ``syndic_target_routing``: the ``minions`` matched among its own
+        accepted keys and the syndics which advertised their minions, but the
+        syndics whose fresh summary proves none of their minions can match
+        the target.
+
+        Return None when no syndic can be left out, the publication is then
+        sent to every syndic. This is the case when the summaries can not be
+        read, and for a list target naming a minion no summary knows of yet.
+        A syndic with an outdated summary always gets the publication, a
+        syndic which never advertised its minions only gets the publications
+        sent to every syndic.
+        """
+        summaries = self.syndic_summaries()
+        if not summaries:
+            return None
+        now = time.time()
+        fresh = {
+            syndic: summary
+            for syndic, summary in summaries.items()
+            if self._syndic_summary_fresh(summary, now)
+        }
+        pruned = set()
+        for syndic, summary in fresh.items():
+            try:
+                if not syndic_summary_match(summary, expr, tgt_type, delimiter):
+                    pruned.add(syndic)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(
+                    "Failed matching syndic %s with %s pattern: %s",
+                    syndic,
+                    tgt_type,
+                    expr,
+                )
+        if not pruned:
+            return None
+        if tgt_type == "list":
+            known = set(self._pki_minions())
+            for summary in fresh.values():
+                known.update(summary.get("minions") or [])
+            if isinstance(expr, str):
+                expr = [minion for minion in expr.split(",") if minion]
+            if not known.issuperset(expr):
+                # The minion may have just been accepted behind a syndic
+                return None
+        topics = [minion for minion in minions if minion not in pruned]
+        topics.extend(
+            syndic
+            for syndic in summaries
+            if syndic not in pruned and syndic not in topics
+        )
+        return topics
+
     def validate_tgt(self, valid, expr, tgt_type, minions=None, expr_form=None):
         """
         Validate the target minions against the possible valid minions.
@@ -763,7 +1139,7 @@ class CkMinions:
             fun = [fun]
         for func in fun:
             try:
-                if re.match(regex, func):
+                if _compile_regex(regex).match(func):
                     vals.append(True)
                 else:
                     vals.append(False)
@@ -933,39 +1309,57 @@ class CkMinions:
         if not isinstance(funs, list):
             funs = [funs]
             args = [args]
+        valid_tgts = {}
         try:
+            acl = self.compile_acl(auth_list)
             for num, fun in enumerate(funs):
                 if whitelist and fun in whitelist:
                     return True
-                for ind in auth_list:
-                    if isinstance(ind, str):
-                        # Allowed for all minions
-                        if self.match_check(ind, fun):
+                # Allowed for all minions
+                if acl.funs.check(fun):
+                    return True
+                for valid, conds in acl.targets.items():
+                    # Check if minions are allowed
+                    if valid not in valid_tgts:
+                        if minions is None:
+                            minions = self.check_minions(tgt, tgt_type)["minions"]
+                        valid_tgts[valid] = self.validate_tgt(
+                            valid, tgt, tgt_type, minions=minions
+                        )
+                    if valid_tgts[valid]:
+                        # Minions are allowed, verify function in allowed list
+                        fun_args = args[num]
+                        fun_kwargs = fun_args[-1] if fun_args else None
+                        if isinstance(fun_kwargs, dict) and "__kwarg__" in fun_kwargs:
+                            fun_args = list(fun_args)  # copy on modify
+                            del fun_args[-1]
+                        else:
+                            fun_kwargs = None
+                        if conds.check(fun, fun_args, fun_kwargs):
                             return True
-                    elif isinstance(ind, dict):
-                        if len(ind) != 1:
-                            # Invalid argument
-                            continue
-                        valid = next(iter(ind.keys()))
-                        # Check if minions are allowed
-                        if self.validate_tgt(valid, tgt, tgt_type, minions=minions):
-                            # Minions are allowed, verify function in allowed list
-                            fun_args = args[num]
-                            fun_kwargs = fun_args[-1] if fun_args else None
-                            if (
-                                isinstance(fun_kwargs, dict)
-                                and "__kwarg__" in fun_kwargs
-                            ):
-                                fun_args = list(fun_args)  # copy on modify
-                                del fun_args[-1]
-                            else:
-                                fun_kwargs = None
-                            if self.__fun_check(ind[valid], fun, fun_args, fun_kwargs):
-                                return True
         except TypeError:
             return False
         return False
 
+    def compile_acl(self, auth_list):
+        """
+        Return the compiled access list of an auth list. The compiled access
+        lists are cached, the auth list is compiled again when it changed.
+
+        .. versionadded:: 3008.0
+        """
+        try:
+            key = salt.payload.dumps(auth_list)
+        except Exception:  # pylint: disable=broad-except
+            return CompiledACL(auth_list)
+        acl = self._acls.get(key)
+        if acl is None:
+            acl = CompiledACL(auth_list)
+            while len(self._acls) >= 128:
+                self._acls.pop(next(iter(self._acls)), None)
+            self._acls[key] = acl
+        return acl
+
     def fill_auth_list_from_groups(self, auth_provider, user_groups, auth_list):
         """
         Returns a list of authorisation matchers that a user is eligible for.
@@ -1041,87 +1435,6 @@ class CkMinions:
             fun_name = comps[1]
         else:
             fun_name = mod_name = fun
-        for ind in auth_list:
-            if isinstance(ind, str):
-                if ind[0] == "@":
-                    if ind[1:] == mod_name or ind[1:] == form or ind == f"@{form}s":
-                        return True
-            elif isinstance(ind, dict):
-                if len(ind) != 1:
-                    continue
-                valid = next(iter(ind.keys()))
-                if valid[0] == "@":
-                    if valid[1:] == mod_name:
-                        if self.__fun_check(
-                            ind[valid], fun_name, args.get("arg"), args.get("kwarg")
-                        ):
-                            return True
-                    if valid[1:] == form or valid == f"@{form}s":
-                        if self.__fun_check(
-                            ind[valid], fun, args.get("arg"), args.get("kwarg")
-                        ):
-                            return True
-        return False
-
-    def __fun_check(self, valid, fun, args=None, kwargs=None):
-        """
-        Check the given function name (fun) and its arguments (args) against the list of conditions.
-        """
-        if not isinstance(valid, list):
-            valid = [valid]
-        for cond in valid:
-            # Function name match
-            if isinstance(cond, str):
-                if self.match_check(cond, fun):
-                    return True
-            # Function and args match
-            elif isinstance(cond, dict):
-                if len(cond) != 1:
-                    # Invalid argument
-                    continue
-                fname_cond = next(iter(cond.keys()))
-                if self.match_check(
-                    fname_cond, fun
-                ):  # check key that is function name match
-                    if self.__args_check(cond[fname_cond], args, kwargs):
-                        return True
-        return False
-
-    def __args_check(self, valid, args=None, kwargs=None):
-        """
-        valid is a dicts: {'args': [...], 'kwargs': {...}} or a list of such dicts.
-        """
-        if not isinstance(valid, list):
-            valid = [valid]
-        for cond in valid:
-            if not isinstance(cond, dict):
-                # Invalid argument
-                continue
-            # whitelist args, kwargs
-            cond_args = cond.get("args", [])
-            good = True
-            for i, cond_arg in enumerate(cond_args):
-                if args is None or len(args) <= i:
-                    good = False
-                    break
-                if cond_arg is None:  # None == '.*' i.e. allow any
-                    continue
-                if not self.match_check(cond_arg, str(args[i])):
-                    good = False
-                    break
-            if not good:
-                continue
-            # Check kwargs
-            cond_kwargs = cond.get("kwargs", {})
-            for k, v in cond_kwargs.items():
-                if kwargs is None or k not in kwargs:
-                    good = False
-                    break
-                if v is None:  # None == '.*' i.e. allow any
-                    continue
-                if not self.match_check(v, str(kwargs[k])):
-                    good = False
-                    break
-            if good:
-                return True
-        return False
+        return self.compile_acl(auth_list).check_spec(
+            mod_name, fun_name, fun, args, form
+        )
@@ -33,6 +33,7 @@ import salt.utils.files
 import salt.utils.jid
 import salt.utils.platform
 import salt.utils.process
+import salt.utils.startup_profile
 import salt.utils.stringutils
 import salt.utils.user
 import salt.utils.win_functions
@@ -161,6 +162,16 @@ class OptionParser(optparse.OptionParser):
         return option_group
 
     def parse_args(self, args=None, values=None):
+        with salt.utils.startup_profile.phase("parse options"):
+            options, args = self._parse_args(args, values)
+        with salt.utils.startup_profile.phase("process options"):
+            self._process_options(options)
+        with salt.utils.startup_profile.phase("after parsed"):
+            self._after_parsed()
+        # Retain the standard behavior of optparse to return options and args
+        return options, args
+
+    def _parse_args(self, args, values):
         options, args = optparse.OptionParser.parse_args(self, args, values)
         if "args_stdin" in options.__dict__ and options.args_stdin is True:
             # Read additional options and/or arguments from stdin and combine
@@ -175,7 +186,9 @@ class OptionParser(optparse.OptionParser):
             self.print_versions_report()
 
         self.options, self.args = options, args
+        return options, args
 
+    def _process_options(self, options):
         # Let's get some proper sys.stderr logging as soon as possible!!!
         # This logging handler will be removed once the proper console or
         # logfile logging is setup.
@@ -203,6 +216,7 @@ class OptionParser(optparse.OptionParser):
                     )
                 )
 
+    def _after_parsed(self):
         # Run the functions on self._mixin_after_parsed_funcs
         for (
             mixin_after_parsed_func
@@ -225,13 +239,20 @@ class OptionParser(optparse.OptionParser):
             )
 
         salt.utils.process.appendproctitle("MainProcess")
-        # Retain the standard behavior of optparse to return options and args
-        return options, args
 
     def _populate_option_list(self, option_list, add_help=True):
         optparse.OptionParser._populate_option_list(
             self, option_list, add_help=add_help
         )
+        self.add_option(
+            salt.utils.startup_profile.OPTION,
+            default=False,
+            action="store_true",
+            help=(
+                "Print the time spent importing modules and in each startup "
+                "phase on stderr when %prog exits."
+            ),
+        )
         for mixin_setup_func in self._mixin_setup_funcs:  # pylint: disable=no-member
             log.trace("Processing %s", mixin_setup_func)
             mixin_setup_func(self)
@@ -2936,8 +2957,22 @@ class SaltCallOptionParser(
             default=False,
             help="Report only those states that have changed.",
         )
+        self.add_option(
+            "--serve",
+            default=False,
+            action="store_true",
+            help=(
+                "Run a service keeping the modules, grains and pillar loaded, "
+                "which runs the salt-call --local calls when caller_service is "
+                "enabled in the minion config."
+            ),
+        )
 
     def _mixin_after_parsed(self):
+        if self.options.serve:
+            if self.args or self.options.grains_run or self.options.doc:
+                self.error("--serve does not accept a function, --grains or --doc")
+            return
         if not self.args and not self.options.grains_run and not self.options.doc:
             self.print_help()
             self.error("Requires function, --grains or --doc")
@@ -9,9 +9,12 @@ import os
 import re
 import sys
 
+import salt.payload
+import salt.utils.atomicfile
 import salt.utils.data
 import salt.utils.files
 import salt.utils.versions
+from salt.exceptions import SaltDeserializationError
 
 log = logging.getLogger(__name__)
 
@@ -66,6 +69,83 @@ def check_refresh(opts, refresh=None):
     )
 
 
+def db_fingerprint(paths):
+    """
+    Return the fingerprint of the package database files which exist among
+    ``paths``, made of their inode, size and modification time. None is
+    returned when none of the files exist.
+    """
+    fingerprint = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        fingerprint.append([path, st.st_ino, st.st_size, st.st_mtime_ns])
+    return fingerprint or None
+
+
+def inventory_cache(opts, name):
+    """
+    Return the location of the package inventory cache of a package provider
+    """
+    return os.path.join(opts["cachedir"], "pkg_inventory", f"{name}.p")
+
+
+def read_inventory_cache(opts, name, fingerprint):
+    """
+    Return the package inventory cached by any process for ``name``, or None
+    when there is none or when it was collected for another state of the
+    package database.
+    """
+    if not fingerprint or not opts.get("pkg_inventory_cache") or "cachedir" not in opts:
+        return None
+    try:
+        with salt.utils.files.fopen(inventory_cache(opts, name), "rb") as fp_:
+            cached = salt.payload.load(fp_)
+    except (OSError, SaltDeserializationError):
+        return None
+    if not isinstance(cached, dict) or cached.get("fingerprint") != fingerprint:
+        return None
+    log.trace("Using the %s package inventory cache", name)
+    return cached.get("pkgs")
+
+
+def write_inventory_cache(opts, name, fingerprint, pkgs):
+    """
+    Cache the package inventory collected for the ``fingerprint`` state of
+    the package database. The file is replaced atomically so the processes
+    reading it concurrently get either the old or the new inventory.
+    """
+    if not fingerprint or not opts.get("pkg_inventory_cache") or "cachedir" not in opts:
+        return
+    path = inventory_cache(opts, name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with salt.utils.files.set_umask(0o077):
+            with salt.utils.atomicfile.atomic_open(path, "wb") as fp_:
+                fp_.write(
+                    salt.payload.dumps({"fingerprint": fingerprint, "pkgs": pkgs})
+                )
+    except OSError as exc:
+        log.warning("Encountered error writing the package inventory cache: %s", exc)
+
+
+def clear_inventory_cache(opts, name):
+    """
+    Remove the package inventory cache of a package provider
+    """
+    if "cachedir" not in opts:
+        return
+    try:
+        os.remove(inventory_cache(opts, name))
+    except OSError as exc:
+        if exc.errno != errno.ENOENT:
+            log.warning(
+                "Encountered error removing the package inventory cache: %s", exc
+            )
+
+
 def split_comparison(version):
     match = re.match(r"^(<=>|!=|>=|<=|>>|<<|<>|>|<|=)?\s?([^<>=]+)$", version)
     if match:
@@ -0,0 +1,236 @@
+"""
+Registry of the minions connected to the publish servers of the master.
+
+Each publish server daemon keeps the minions connected to it in a registry file
+in the ``presence`` directory of the master's ``sock_dir``, which is kept on a
+memory backed filesystem on most platforms. The registry of the tcp and ws
+transports holds the ids of the minions which authenticated their connection
+with their token, along with their address and the time they were last seen.
+ZeroMQ publish sockets do not carry the identity of the minions, the registry
+of the zeromq transport holds the addresses of the connected minions.
+
+The publish daemons write their registry at most once a second and touch it
+when nothing changed. A registry which was not touched for ``STALE_AFTER``
+seconds belongs to a publish server which is not running and is ignored.
+"""
+
+import logging
+import os
+import time
+
+import salt.payload
+import salt.utils.atomicfile
+import salt.utils.files
+
+log = logging.getLogger(__name__)
+
+REGISTRY_DIR = "presence"
+FLUSH_INTERVAL = 1
+STALE_AFTER = 10
+
+# The registries loaded by load(), keyed on their path, with the inode, size
+# and mtime of the file they were read from and its content. The registries are
+# replaced on each write and touched when unchanged, a touched registry is only
+# compared to the content it was loaded from.
+_LOADED = {}
+
+
+def registry_dir(opts):
+    """
+    Return the directory holding the presence registries of the master
+    """
+    return os.path.join(opts["sock_dir"], REGISTRY_DIR)
+
+
+def _ip(address):
+    """
+    Return the IP address of a ``(host, port)`` peer address
+    """
+    if isinstance(address, (list, tuple)):
+        address = address[0]
+    if isinstance(address, str) and address.startswith("::ffff:"):
+        # IPv4 mapped IPv6 address
+        address = address[7:]
+    return address
+
+
+class PresenceRegistry:
+    """
+    The registry of the minions connected to a publish server, written by the
+    publish server daemon
+    """
+
+    def __init__(self, opts, name):
+        self.opts = opts
+        self.path = os.path.join(registry_dir(opts), f"{name}.p")
+        # The minion ids, with their address and the time they were last seen
+        self.minions = {}
+        # The number of connections of each minion id
+        self._connections = {}
+        # The peer addresses of the connections, keyed on their socket
+        self.addrs = {}
+        self.dirty = True
+        self._periodic = None
+
+    def add(self, id_, address=None):
+        """
+        Add a connection of the authenticated minion ``id_``
+        """
+        self._connections[id_] = self._connections.get(id_, 0) + 1
+        self.seen(id_, address)
+
+    def seen(self, id_, address=None):
+        """
+        Update the time the minion ``id_`` was last seen
+        """
+        if address is None and id_ in self.minions:
+            address = self.minions[id_]["addr"]
+        self.minions[id_] = {"addr": _ip(address), "last_seen": time.time()}
+        self.dirty = True
+
+    def remove(self, id_):
+        """
+        Remove a connection of the minion ``id_``
+        """
+        count = self._connections.get(id_, 0) - 1
+        if count > 0:
+            self._connections[id_] = count
+            return
+        self._connections.pop(id_, None)
+        if self.minions.pop(id_, None) is not None:
+            self.dirty = True
+
+    def add_address(self, key, address):
+        """
+        Add the peer address of an unauthenticated connection
+        """
+        self.addrs[key] = _ip(address)
+        self.dirty = True
+
+    def remove_address(self, key):
+        """
+        Remove the peer address of an unauthenticated connection
+        """
+        if self.addrs.pop(key, None) is not None:
+            self.dirty = True
+
+    def flush(self):
+        """
+        Write the registry when it changed, touch it otherwise
+        """
+        if not self.dirty:
+            try:
+                os.utime(self.path)
+                return
+            except OSError:
+                pass
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            "minions": self.minions,
+            "addrs": sorted(set(self.addrs.values())),
+        }
+        with salt.utils.files.set_umask(0o177):
+            with salt.utils.atomicfile.atomic_open(self.path, "wb") as fp_:
+                fp_.write(salt.payload.dumps(data))
+        self.dirty = False
+
+    def start(self, io_loop):
+        """
+        Periodically flush the registry from ``io_loop``
+        """
+        import tornado.ioloop
+
+        self.flush()
+        self._periodic = tornado.ioloop.PeriodicCallback(
+            self._flush, FLUSH_INTERVAL * 1000
+        )
+        self._periodic.start()
+
+    def _flush(self):
+        try:
+            self.flush()
+        except OSError as exc:
+            log.error("Unable to write the presence registry %s: %s", self.path, exc)
+
+    def stop(self):
+        """
+        Stop flushing the registry and remove it
+        """
+        if self._periodic is not None:
+            self._periodic.stop()
+            self._periodic = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class Presence:
+    """
+    The minions connected to the publish servers of the master, merged from
+    their registries
+    """
+
+    def __init__(self, minions, addrs):
+        self.minions = minions
+        self.addrs = addrs
+
+    def __contains__(self, id_):
+        return id_ in self.minions
+
+
+def _read(path, stat):
+    key = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    cached = _LOADED.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[2]
+    with salt.utils.files.fopen(path, "rb") as fp_:
+        raw = fp_.read()
+    if cached is not None and cached[1] == raw:
+        data = cached[2]
+    else:
+        data = salt.payload.loads(raw)
+    _LOADED[path] = (key, raw, data)
+    return data
+
+
+def load(opts):
+    """
+    Load the registries of the running publish servers of the master.
+
+    :rtype: Presence
+    :return: The connected minions, ``None`` when no publish server of the
+        master maintains a registry, the connected minions must then be found
+        another way.
+    """
+    if not opts.get("sock_dir"):
+        return None
+    path = registry_dir(opts)
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return None
+    now = time.time()
+    minions = {}
+    addrs = set()
+    found = False
+    for name in names:
+        if not name.endswith(".p"):
+            continue
+        fpath = os.path.join(path, name)
+        try:
+            stat = os.stat(fpath)
+            if now - stat.st_mtime > STALE_AFTER:
+                continue
+            data = _read(fpath, stat)
+        except (OSError, ValueError, TypeError) as exc:
+            log.debug("Unable to read the presence registry %s: %s", fpath, exc)
+            continue
+        found = True
+        for id_, info in data.get("minions", {}).items():
+            if id_ not in minions or info["last_seen"] > minions[id_]["last_seen"]:
+                minions[id_] = info
+        addrs.update(data.get("addrs", ()))
+    if not found:
+        return None
+    return Presence(minions, addrs)
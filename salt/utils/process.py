@@ -21,8 +21,6 @@ import sys
 import threading
 import time
 
-from tornado import gen
-
 import salt._logging
 import salt.defaults.exitcodes
 import salt.utils.files
@@ -605,11 +603,19 @@ class ProcessManager:
                 # Otherwise, it's a dead process, remove it from the process map
                 del self._process_map[pid]
 
-    @gen.coroutine
     def run(self, asynchronous=False):
         """
         Load and start all available api modules
         """
+        # tornado is imported here rather than at the top of the module, this
+        # module is on the import path of every salt CLI
+        from tornado import gen
+
+        return gen.coroutine(self._run)(asynchronous=asynchronous)
+
+    def _run(self, asynchronous=False):
+        from tornado import gen
+
         log.debug("Process Manager starting!")
         if multiprocessing.current_process().name != "MainProcess":
             appendproctitle(self.name)
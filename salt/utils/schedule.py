@@ -14,6 +14,7 @@ Requires that python-dateutil is installed on the minion.
 import copy
 import datetime
 import errno
+import heapq
 import itertools
 import logging
 import os
@@ -67,6 +68,13 @@ except ImportError:
 log = logging.getLogger(__name__)
 
 
+def _chop_ms(dt):
+    """
+    Remove the microseconds from a datetime object
+    """
+    return dt - datetime.timedelta(microseconds=dt.microsecond)
+
+
 class Schedule:
     """
     Create a Schedule object, pass in the opts and the functions dict to use
@@ -178,6 +186,7 @@ class Schedule:
         self.loop_interval = sys.maxsize
         if not self.standalone:
             clean_proc_dir(opts)
+        self._reset_deadlines()
         if cleanup:
             for prefix in cleanup:
                 self.delete_job_prefix(prefix)
@@ -189,6 +198,82 @@ class Schedule:
     def __getnewargs__(self):
         return self.opts, self.functions, self.returners, self.intervals, None
 
+    def _reset_deadlines(self, name=None):
+        """
+        Forget the next fire times computed by eval, for a single job or for
+        the whole schedule, so they are computed again on the next eval
+        """
+        if name is None:
+            # min-heap of (deadline, sequence, job name)
+            self._deadline_heap = []
+            # job name -> (job data, deadline)
+            self._deadlines = {}
+            self._deadline_seq = itertools.count()
+            self._global_settings = None
+        else:
+            self._deadlines.pop(name, None)
+
+    def _job_deadline(self, data):
+        """
+        Return the time before which evaluating a job can not make it run, or
+        None when the job has to be evaluated on every loop
+        """
+        if not self.enabled or not data.get("enabled", True):
+            # Disabled jobs are flagged as skipped on every evaluation
+            return None
+        if data.get("_continue") or data.get("_error") or data.get("_run_on_start"):
+            return None
+        if "run_explicit" in data:
+            return None
+        if "_seconds" not in data and "cron" not in data and "once" not in data:
+            return None
+        deadline = data.get("_splay") or data.get("_next_fire_time")
+        if not isinstance(deadline, datetime.datetime):
+            return None
+        return _chop_ms(deadline)
+
+    def _track_deadline(self, name, data):
+        """
+        Put an evaluated job in the deadline heap
+        """
+        deadline = self._job_deadline(data)
+        if deadline is None:
+            return
+        self._deadlines[name] = (data, deadline)
+        heapq.heappush(self._deadline_heap, (deadline, next(self._deadline_seq), name))
+        if len(self._deadline_heap) > 2 * len(self._deadlines) + 64:
+            # Drop the stale entries
+            self._deadline_heap = [
+                (deadline, next(self._deadline_seq), name)
+                for name, (_, deadline) in self._deadlines.items()
+            ]
+            heapq.heapify(self._deadline_heap)
+
+    def _due_jobs(self, now):
+        """
+        Pop the jobs whose deadline has been reached from the deadline heap
+        """
+        due = set()
+        now = _chop_ms(now)
+        while self._deadline_heap and self._deadline_heap[0][0] <= now:
+            deadline, _, name = heapq.heappop(self._deadline_heap)
+            entry = self._deadlines.get(name)
+            if entry is not None and entry[1] == deadline:
+                due.add(name)
+        return due
+
+    def _is_pending(self, name, data, due):
+        """
+        Check if a job can be left alone during this evaluation: it was
+        evaluated before, is not due yet and has not been modified since
+        """
+        if name in due:
+            return False
+        entry = self._deadlines.get(name)
+        if entry is None or entry[0] is not data:
+            return False
+        return self._job_deadline(data) == entry[1]
+
     def option(self, opt):
         """
         Return options merged from config and pillar
@@ -338,6 +423,7 @@ class Schedule:
         # remove from self.intervals
         if name in self.intervals:
             del self.intervals[name]
+        self._reset_deadlines(name)
 
         if persist:
             self.persist()
@@ -351,6 +437,7 @@ class Schedule:
         self.enabled = True
         self.splay = None
         self.opts["schedule"] = {}
+        self._reset_deadlines()
 
     def delete_job_prefix(self, name, persist=True, fire_event=True):
         """
@@ -378,6 +465,9 @@ class Schedule:
         for job in list(self.intervals.keys()):
             if job.startswith(name):
                 del self.intervals[job]
+        for job in list(self._deadlines):
+            if job.startswith(name):
+                self._reset_deadlines(job)
 
         if persist:
             self.persist()
@@ -403,6 +493,7 @@ class Schedule:
                 data[job]["enabled"] = True
 
         new_job = next(iter(data.keys()))
+        self._reset_deadlines(new_job)
 
         if new_job in self._get_schedule(include_opts=False):
             log.warning("Cannot update job %s, it's in the pillar!", new_job)
@@ -435,6 +526,7 @@ class Schedule:
         # ensure job exists, then enable it
         if name in self.opts["schedule"]:
             self.opts["schedule"][name]["enabled"] = True
+            self._reset_deadlines(name)
             log.info("Enabling job %s in scheduler", name)
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -459,6 +551,7 @@ class Schedule:
         # ensure job exists, then disable it
         if name in self.opts["schedule"]:
             self.opts["schedule"][name]["enabled"] = False
+            self._reset_deadlines(name)
             log.info("Disabling job %s in scheduler", name)
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -488,6 +581,7 @@ class Schedule:
             return
 
         self.opts["schedule"][name] = schedule
+        self._reset_deadlines(name)
 
         if persist:
             self.persist()
@@ -570,6 +664,7 @@ class Schedule:
         """
         # Remove all jobs from self.intervals
         self.intervals = {}
+        self._reset_deadlines()
 
         if "schedule" in schedule:
             schedule = schedule["schedule"]
@@ -633,6 +728,7 @@ class Schedule:
             self.opts["schedule"][name]["run_explicit"].append(
                 {"time": new_time, "time_fmt": time_fmt}
             )
+            self._reset_deadlines(name)
 
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -662,6 +758,7 @@ class Schedule:
             self.opts["schedule"][name]["skip_explicit"].append(
                 {"time": time, "time_fmt": time_fmt}
             )
+            self._reset_deadlines(name)
 
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -1475,12 +1572,6 @@ class Schedule:
             else:
                 data["run"] = True
 
-        def _chop_ms(dt):
-            """
-            Remove the microseconds from a datetime object
-            """
-            return dt - datetime.timedelta(microseconds=dt.microsecond)
-
         schedule = self._get_schedule()
         if not isinstance(schedule, dict):
             raise ValueError("Schedule must be of type dict.")
@@ -1493,6 +1584,23 @@ class Schedule:
         if "splay" in schedule:
             self.splay = schedule["splay"]
 
+        global_settings = (
+            self.enabled,
+            self.skip_function,
+            repr(self.skip_during_range),
+            repr(self.splay),
+        )
+        if global_settings != self._global_settings:
+            # The global settings apply to every job
+            self._reset_deadlines()
+            self._global_settings = global_settings
+
+        if not now:
+            now = datetime.datetime.now()
+        # Only the jobs which are due or were added or modified since the
+        # last evaluation need to be evaluated
+        due = self._due_jobs(now)
+
         _hidden = ["enabled", "skip_function", "skip_during_range", "splay"]
         for job, data in schedule.items():
 
@@ -1500,6 +1608,10 @@ class Schedule:
             if job in _hidden:
                 continue
 
+            if self._is_pending(job, data, due):
+                continue
+            self._reset_deadlines(job)
+
             # Clear these out between runs
             for item in [
                 "_continue",
@@ -1551,9 +1663,6 @@ class Schedule:
             ):
                 data["_run_on_start"] = True
 
-            if not now:
-                now = datetime.datetime.now()
-
             # Used for quick lookups when detecting invalid option
             # combinations.
             schedule_keys = set(data.keys())
@@ -1816,6 +1925,7 @@ class Schedule:
                         data["_next_fire_time"] = now + datetime.timedelta(
                             seconds=data["_seconds"]
                         )
+            self._track_deadline(job, data)
         return jids
 
     def _run_job(self, func, data, jid=None):
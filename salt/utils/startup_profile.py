@@ -0,0 +1,184 @@
+"""
+Startup profiling of the salt command line tools.
+
+When ``--profile-startup`` is passed to a salt CLI, the time spent importing
+each module and in each startup phase (parsing the options, loading the config
+and setting up logging, ...) is recorded and printed on stderr when the command
+exits.
+
+This module is imported by every salt CLI before anything else is loaded, only
+import from the standard library here.
+"""
+
+import atexit
+import contextlib
+import os
+import sys
+import time
+
+OPTION = "--profile-startup"
+
+_PROFILE = None
+
+
+class _ImportTimer:
+    """
+    Meta path finder timing the execution of the modules imported while the
+    profile is active. It finds nothing itself, it wraps the ``exec_module``
+    of the loader found by the other finders.
+    """
+
+    def __init__(self):
+        self.imports = []
+        self._stack = []
+        self._finding = set()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(fullname)
+        loader = spec.loader
+        # Builtin and frozen modules are loaded by a class shared by all of
+        # them, only wrap the per module loaders
+        if loader is not None and not isinstance(loader, type):
+            exec_module = getattr(loader, "exec_module", None)
+            if exec_module is not None:
+                loader.exec_module = self._timed(fullname, exec_module)
+        return spec
+
+    def _timed(self, fullname, exec_module):
+        def timed_exec_module(module):
+            # The children imports are subtracted from the self time
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += elapsed
+                self.imports.append(
+                    (fullname, elapsed - children, elapsed, len(self._stack))
+                )
+
+        return timed_exec_module
+
+
+class StartupProfile:
+    """
+    The import times and phase timings of the start of a salt CLI
+    """
+
+    def __init__(self, prog=None):
+        self.prog = prog or os.path.basename(sys.argv[0])
+        self.start = time.perf_counter()
+        self.phases = []
+        self.timer = _ImportTimer()
+
+    def enable(self):
+        sys.meta_path.insert(0, self.timer)
+
+    def disable(self):
+        with contextlib.suppress(ValueError):
+            sys.meta_path.remove(self.timer)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.start, time.perf_counter() - start))
+
+    def report(self, limit=15):
+        """
+        Return the startup profile as text
+        """
+        total = time.perf_counter() - self.start
+        imports = self.timer.imports
+        lines = [
+            f"Startup profile of {self.prog}",
+            "",
+            f"  {'total':<40} {total * 1000:>9.1f} ms",
+            "  {:<40} {:>9.1f} ms  ({} modules)".format(
+                "imports",
+                sum(cumulative for _, _, cumulative, depth in imports if not depth)
+                * 1000,
+                len(imports),
+            ),
+            "",
+            "Phases (start offset, duration):",
+        ]
+        for name, offset, duration in self.phases:
+            lines.append(
+                f"  {name:<40} {offset * 1000:>9.1f} ms {duration * 1000:>9.1f} ms"
+            )
+        packages = {}
+        for name, self_time, _, _ in imports:
+            package = name.partition(".")[0]
+            packages[package] = packages.get(package, 0.0) + self_time
+        lines.extend(["", "Imports by top level package:"])
+        for package, elapsed in sorted(
+            packages.items(), key=lambda item: item[1], reverse=True
+        )[:limit]:
+            lines.append(f"  {package:<40} {elapsed * 1000:>9.1f} ms")
+        lines.extend(["", "Slowest modules (self, cumulative):"])
+        for name, self_time, cumulative, _ in sorted(
+            imports, key=lambda item: item[1], reverse=True
+        )[:limit]:
+            lines.append(
+                f"  {name:<40} {self_time * 1000:>9.1f} ms {cumulative * 1000:>9.1f} ms"
+            )
+        return "\n".join(lines)
+
+
+def start(prog=None):
+    """
+    Start profiling the startup of the current process, the profile is printed
+    on stderr when the process exits.
+    """
+    global _PROFILE
+    if _PROFILE is None:
+        _PROFILE = StartupProfile(prog)
+        _PROFILE.enable()
+        atexit.register(_print_report)
+    return _PROFILE
+
+
+def stop():
+    """
+    Stop profiling the startup of the current process
+    """
+    global _PROFILE
+    if _PROFILE is not None:
+        _PROFILE.disable()
+        _PROFILE = None
+
+
+def _print_report():
+    if _PROFILE is None:
+        return
+    _PROFILE.disable()
+    print(_PROFILE.report(), file=sys.stderr, flush=True)
+
+
+def phase(name):
+    """
+    Context manager recording the duration of a startup phase, a no-op when
+    the startup is not profiled
+    """
+    if _PROFILE is None:
+        return contextlib.nullcontext()
+    return _PROFILE.phase(name)
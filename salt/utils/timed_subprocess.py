@@ -2,14 +2,61 @@
 For running command line executables with a timeout
 """
 
+import logging
 import shlex
 import subprocess
+import sys
 import threading
 
 import salt.exceptions
 import salt.utils.data
 import salt.utils.stringutils
 
+log = logging.getLogger(__name__)
+
+# The size of the reads from the output pipes in streaming mode
+READ_SIZE = 65536
+
+
+class OutputBuffer:
+    """
+    Keep the first ``head`` and the last ``tail`` bytes written to the buffer,
+    counting the bytes dropped in between
+    """
+
+    def __init__(self, head, tail):
+        self.head_size = head
+        self.tail_size = tail
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def write(self, data):
+        self.total += len(data)
+        room = self.head_size - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data and self.tail_size > 0:
+            self.tail += data
+            # Trim once the tail doubled, so the copy is amortized
+            if len(self.tail) > 2 * self.tail_size:
+                del self.tail[: -self.tail_size]
+
+    @property
+    def truncated(self):
+        """
+        The number of bytes dropped between the head and the tail
+        """
+        return self.total - len(self.head) - len(self.tail[-self.tail_size :])
+
+    def getvalue(self):
+        tail = bytes(self.tail[-self.tail_size :]) if self.tail_size > 0 else b""
+        if not self.truncated:
+            return bytes(self.head) + tail
+        marker = f"\n[... {self.truncated} bytes truncated ...]\n".encode()
+        return bytes(self.head) + marker + tail
+
 
 class TimedProc:
     """
@@ -23,6 +70,12 @@ class TimedProc:
         self.with_communicate = kwargs.pop("with_communicate", self.wait)
         self.timeout = kwargs.pop("timeout", None)
         self.stdin_raw_newlines = kwargs.pop("stdin_raw_newlines", False)
+        # In streaming mode the output is passed to stream_callback as it is
+        # read, and only its head and tail are kept
+        self.stream_callback = kwargs.pop("stream_callback", None)
+        self.output_head = kwargs.pop("output_head", None)
+        self.output_tail = kwargs.pop("output_tail", None)
+        self.buffers = {}
 
         # If you're not willing to wait for the process
         # you can't define any stdin, stdout or stderr
@@ -86,7 +139,9 @@ class TimedProc:
         """
 
         def receive():
-            if self.with_communicate:
+            if self.with_communicate and self.streaming:
+                self.stdout, self.stderr = self._stream()
+            elif self.with_communicate:
                 self.stdout, self.stderr = self.process.communicate(input=self.stdin)
             elif self.wait:
                 self.process.wait()
@@ -113,3 +168,59 @@ class TimedProc:
                     )
                 )
         return self.process.returncode
+
+    @property
+    def streaming(self):
+        return self.stream_callback is not None or self.output_head is not None
+
+    def _read_stream(self, name, pipe, buf):
+        """
+        Read an output pipe of the process until it is closed
+        """
+        try:
+            for chunk in iter(lambda: pipe.read1(READ_SIZE), b""):
+                buf.write(chunk)
+                if self.stream_callback is not None:
+                    try:
+                        self.stream_callback(name, chunk)
+                    except Exception as exc:  # pylint: disable=broad-except
+                        log.warning(
+                            "Failed to stream the %s of %s: %s", name, self.command, exc
+                        )
+        finally:
+            pipe.close()
+
+    def _stream(self):
+        """
+        Like communicate, but read the output in chunks, passing them to the
+        stream callback and keeping only the head and tail of each stream
+        """
+        head = self.output_head if self.output_head is not None else sys.maxsize
+        tail = self.output_tail or 0
+        readers = []
+        for name in ("stdout", "stderr"):
+            pipe = getattr(self.process, name)
+            if pipe is None:
+                continue
+            self.buffers[name] = OutputBuffer(head, tail)
+            reader = threading.Thread(
+                target=self._read_stream,
+                args=(name, pipe, self.buffers[name]),
+                daemon=True,
+            )
+            reader.start()
+            readers.append(reader)
+        if self.process.stdin is not None:
+            try:
+                if self.stdin:
+                    self.process.stdin.write(self.stdin)
+                self.process.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+        for reader in readers:
+            reader.join()
+        self.process.wait()
+        return tuple(
+            self.buffers[name].getvalue() if name in self.buffers else None
+            for name in ("stdout", "stderr")
+        )
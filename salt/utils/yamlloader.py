@@ -8,19 +8,38 @@ from yaml.nodes import MappingNode, SequenceNode
 
 import salt.utils.stringutils
 
-# prefer C bindings over python when available
+# LibYAML is an optional C extension of PyYAML. When it's available the
+# scanner/parser stages run in C, while the construction stage below stays in
+# python so both variants produce the same data and the same errors.
+HAS_LIBYAML = hasattr(yaml, "CSafeLoader")
+
+# The loader class the salt loaders were based on, preferring the C bindings.
+# Kept for the code importing it, the loaders below pick their base class
+# explicitly.
 BaseLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
-__all__ = ["SaltYamlSafeLoader", "load", "safe_load"]
+__all__ = [
+    "SaltYamlSafeLoader",
+    "SaltYamlSafeCLoader",
+    "SaltYamlSafePyLoader",
+    "HAS_LIBYAML",
+    "BaseLoader",
+    "load",
+    "safe_load",
+]
 
 
 # with code integrated from https://gist.github.com/844388
-class SaltYamlSafeLoader(BaseLoader):
+class SaltYamlConstructorMixin:
     """
     Create a custom YAML loader that uses the custom constructor. This allows
     for the YAML loading defaults to be manipulated based on needs within salt
     to make things like sls file more intuitive.
+
+    This mixin holds the salt specific construction logic and is combined with
+    either the LibYAML backed ``yaml.CSafeLoader`` or the pure python
+    ``yaml.SafeLoader``.
     """
 
     def __init__(self, stream, dictclass=dict):
@@ -154,6 +173,26 @@ class SaltYamlSafeLoader(BaseLoader):
             node.value = mergeable_items + node.value
 
 
+class SaltYamlSafePyLoader(SaltYamlConstructorMixin, yaml.SafeLoader):
+    """
+    Salt's YAML loader on top of the pure python scanner and parser
+    """
+
+
+if HAS_LIBYAML:
+
+    class SaltYamlSafeCLoader(SaltYamlConstructorMixin, yaml.CSafeLoader):
+        """
+        Salt's YAML loader on top of the LibYAML scanner and parser
+        """
+
+    SaltYamlSafeLoader = SaltYamlSafeCLoader
+else:
+    # Keep the name importable, it just isn't accelerated
+    SaltYamlSafeCLoader = SaltYamlSafePyLoader
+    SaltYamlSafeLoader = SaltYamlSafePyLoader
+
+
 def load(stream, Loader=SaltYamlSafeLoader):
     return yaml.load(stream, Loader=Loader)
 
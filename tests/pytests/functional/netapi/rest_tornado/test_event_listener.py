@@ -3,6 +3,7 @@ import logging
 
 import pytest
 
+import salt.netapi
 import salt.utils.event
 from salt.netapi.rest_tornado import saltnado
 from tests.support.events import eventpublisher_process
@@ -175,3 +176,67 @@ async def test_clean_by_request(sock_dir, io_loop):
 
             assert 0 == len(event_listener.tag_map)
             assert 0 == len(event_listener.request_map)
+
+
+async def test_indexed_tags(sock_dir):
+    """
+    The futures waiting for exact and prefix tags get the events they match
+    """
+    with eventpublisher_process(sock_dir):
+        with salt.utils.event.MasterEvent(sock_dir) as me:
+            request = Request()
+            event_listener = saltnado.EventListener(
+                {},
+                {"sock_dir": sock_dir, "transport": "zeromq"},
+            )
+            await asyncio.sleep(1)
+            exact = event_listener.get_event(
+                request,
+                tag="salt/job/1/ret/m1",
+                matcher=saltnado.EventListener.exact_matcher,
+            )
+            exact_other = event_listener.get_event(
+                request,
+                tag="salt/job/1",
+                matcher=saltnado.EventListener.exact_matcher,
+            )
+            prefixes = [
+                event_listener.get_event(request, tag="salt/job/1/") for _ in range(2)
+            ]
+            everything = event_listener.get_event(request)
+            me.fire_event({"data": "foo"}, "salt/job/1/ret/m1")
+
+            for future in [exact, everything] + prefixes:
+                assert (await future)["tag"] == "salt/job/1/ret/m1"
+            assert not exact_other.done()
+            event_listener.clean_by_request(request)
+            assert event_listener.tag_map == {}
+            assert not event_listener.prefix_lengths
+            event_listener.destroy()
+
+
+async def test_subscribe(sock_dir):
+    """
+    The event streams get the events matching their tags, the events they do
+    not read in time are dropped
+    """
+    with eventpublisher_process(sock_dir):
+        with salt.utils.event.MasterEvent(sock_dir) as me:
+            event_listener = saltnado.EventListener(
+                {"events_queue_size": 2},
+                {"sock_dir": sock_dir, "transport": "zeromq"},
+            )
+            with event_listener.subscribe(["evt/*"]) as subscription:
+                assert await event_listener.multiplexer.connect(timeout=5)
+                await asyncio.sleep(1)
+                for idx in range(3):
+                    me.fire_event({"idx": idx}, f"evt/{idx}")
+                me.fire_event({}, "other")
+                await asyncio.sleep(1)
+                dropped = salt.netapi.dropped_event(subscription)
+                assert dropped["tag"] == "salt/netapi/events/dropped"
+                assert dropped["data"] == {"dropped": 1, "lag": 2}
+                assert (await subscription.get(timeout=1))["tag"] == "evt/1"
+                assert (await subscription.get(timeout=1))["tag"] == "evt/2"
+                assert await subscription.get(timeout=1) is None
+            event_listener.destroy()
@@ -2,6 +2,7 @@ import time
 
 import salt.auth
 import salt.config
+from tests.support.mock import MagicMock, patch
 
 
 def test_cve_2021_3244(tmp_path):
@@ -31,3 +32,70 @@ def test_cve_2021_3244(tmp_path):
     t_data = auth.get_tok(t_data["token"])
     assert not t_data
     assert not token_file.exists()
+
+
+def test_eauth_cache(tmp_path):
+    token_dir = tmp_path / "tokens"
+    token_dir.mkdir()
+    opts = salt.config.master_config(None)
+    opts.update(
+        {
+            "extension_modules": "",
+            "token_dir": str(token_dir),
+            "external_auth": {"auto": {"foo": ["test.*"], "admins%": [".*"]}},
+            "eauth_cache_ttl": 60,
+        }
+    )
+    auth = salt.auth.LoadAuth(opts)
+    load = {"eauth": "auto", "username": "foo", "password": "foo"}
+    calls = []
+
+    def auth_mock(username, password):
+        calls.append(username)
+        return True
+
+    groups_mock = MagicMock(return_value=["admins"])
+    with patch.dict(auth.auth, {"auto.auth": auth_mock, "auto.groups": groups_mock}):
+        for _ in range(2):
+            ret = auth.check_authentication(dict(load), "eauth")
+            assert sorted(ret["auth_list"]) == [".*", "test.*"]
+        assert calls == ["foo"]
+        groups_mock.assert_called_once()
+
+        # Other credentials are checked again
+        assert auth.time_auth(dict(load, password="bar"))
+        assert calls == ["foo", "foo"]
+
+        # The auth lists are built again when the configuration changes
+        opts["external_auth"] = {"auto": {"foo": ["grains.*"]}}
+        assert auth.get_auth_list(dict(load)) == ["grains.*"]
+        assert groups_mock.call_count == 2
+
+        token = auth.mk_token(dict(load))
+        with patch("salt.payload.loads") as loads:
+            assert auth.get_tok(token["token"]) == token
+            loads.assert_not_called()
+        auth.rm_token(token["token"])
+        assert not auth.get_tok(token["token"])
+
+        # The tokens removed by another process are not used
+        token = auth.mk_token(dict(load))
+        (token_dir / token["token"]).unlink()
+        assert not auth.get_tok(token["token"])
+
+
+def test_eauth_cache_token_store(tmp_path):
+    """
+    The tokens are not cached when the token store cannot tell whether they
+    still exist
+    """
+    opts = salt.config.master_config(None)
+    opts.update({"extension_modules": "", "eauth_cache_ttl": 60})
+    auth = salt.auth.LoadAuth(opts)
+    tdata = {"token": "abc", "expire": time.time() + 60}
+    get_token = MagicMock(return_value=tdata)
+    with patch.dict(auth.tokens, {"localfs.get_token": get_token}):
+        del auth.tokens["localfs.token_exists"]
+        for _ in range(2):
+            assert auth.get_tok("abc") == tdata
+        assert get_token.call_count == 2
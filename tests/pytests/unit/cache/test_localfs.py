@@ -261,3 +261,19 @@ def test_mix_of_utf8_and_non_utf8_can_be_round_tripped(tmp_cache_file):
     actual = localfs.fetch(bank, key, tmp_cache_file)
 
     assert data == actual
+
+
+def test_list_key_names(tmp_path):
+    """
+    Tests that the keys ending with the characters of the file extension are
+    listed whole
+    """
+    bank = tmp_path / "bank"
+    bank.mkdir()
+    for key in ("ftp", "web.p", "db"):
+        (bank / f"{key}.p").write_bytes(b"")
+    assert sorted(localfs.list_(bank="bank", cachedir=str(tmp_path))) == [
+        "db",
+        "ftp",
+        "web.p",
+    ]
@@ -1,6 +1,9 @@
 import pytest
 
 import salt.channel.server as server
+import salt.crypt
+import salt.utils.presence
+from tests.support.mock import MagicMock, patch
 
 
 @pytest.fixture
@@ -41,3 +44,59 @@ def test_compare_keys_newline_tgt(key_data, linesep):
     assert not src_key.endswith(linesep)
     assert tgt_key.endswith("\n")
     assert server.ReqServerChannel.compare_keys(src_key, tgt_key) is True
+
+
+@pytest.mark.parametrize(
+    "payload_compression,requested,expected_pad",
+    [
+        (True, "zlib", salt.crypt.Crypticle.ZLIB_PAD),
+        (True, None, salt.crypt.Crypticle.PICKLE_PAD),
+        (False, "zlib", salt.crypt.Crypticle.PICKLE_PAD),
+    ],
+)
+async def test_handle_message_compresses_negotiated_replies(
+    master_opts, payload_compression, requested, expected_pad
+):
+    master_opts["payload_compression"] = payload_compression
+    master_opts["payload_compression_threshold"] = 100
+    with patch("salt.crypt.MasterKeys"):
+        channel = server.ReqServerChannel(master_opts, MagicMock())
+    channel.crypticle = salt.crypt.Crypticle(
+        master_opts, salt.crypt.Crypticle.generate_key_string()
+    )
+
+    async def payload_handler(payload):
+        return {"data": "x" * 1000}, {"fun": "send"}
+
+    channel.payload_handler = payload_handler
+    payload = {
+        "enc": "aes",
+        "load": channel.crypticle.dumps({"cmd": "_pillar", "id": "minion"}),
+    }
+    if requested:
+        payload["compression"] = requested
+    try:
+        ret = await channel.handle_message(payload)
+    finally:
+        channel.event.destroy()
+    assert channel.crypticle.decrypt(ret).startswith(expected_pad)
+    assert channel.crypticle.loads(ret) == {"data": "x" * 1000}
+
+
+def test_pub_server_channel_presence_registry(master_opts):
+    master_opts["sock_dir"] = str(master_opts["sock_dir"])
+    with patch("salt.master.AESFuncs"):
+        channel = server.PubServerChannel(master_opts, MagicMock())
+    channel.registry = salt.utils.presence.PresenceRegistry(master_opts, "tcp")
+    first = MagicMock(id_="minion", address=("203.0.113.1", 40000))
+    second = MagicMock(id_="minion", address=("203.0.113.1", 40001))
+    try:
+        channel._add_client_present(first)
+        channel._add_client_present(second)
+        channel._add_client_present(first)
+        channel._remove_client_present(first)
+        assert "minion" in channel.registry.minions
+        channel._remove_client_present(second)
+        assert "minion" not in channel.registry.minions
+    finally:
+        channel.event.destroy()
@@ -4,7 +4,8 @@ Unit Tests for the salt.cli.batch module
 
 import pytest
 
-from salt.cli.batch import Batch
+import salt.cli.batch
+from salt.cli.batch import Batch, MasterBatch
 from tests.support.mock import MagicMock, patch
 
 
@@ -135,3 +136,63 @@ def test_return_value_in_run_for_return(batch):
         verbose=False,
         gather_job_timeout=5,
     )
+
+
+def test_get_batch(tmp_path):
+    """
+    The batch server runs the batches when it is enabled and running, the
+    batches using external authentication run in the client
+    """
+    opts = {
+        "cachedir": str(tmp_path),
+        "batch_server": True,
+        "conf_file": {},
+        "transport": "",
+    }
+    (tmp_path / "batches").mkdir()
+    with patch("salt.utils.batch.server_running", return_value=True):
+        assert isinstance(salt.cli.batch.get_batch(opts), MasterBatch)
+        with patch("salt.client.get_local_client"):
+            batch = salt.cli.batch.get_batch(opts, eauth={"eauth": "pam"})
+            assert isinstance(batch, Batch)
+            opts["batch_server"] = False
+            assert isinstance(salt.cli.batch.get_batch(opts), Batch)
+    opts["batch_server"] = True
+    with patch("salt.utils.batch.server_running", return_value=False):
+        with patch("salt.client.get_local_client"):
+            assert isinstance(salt.cli.batch.get_batch(opts), Batch)
+
+
+def test_master_batch_run():
+    """
+    The returns of the minions are yielded from the events of the batch server
+    """
+    opts = {
+        "sock_dir": "",
+        "tgt": "*",
+        "fun": "test.ping",
+        "arg": [],
+        "batch": "1",
+        "batch_retries": 2,
+        "user": "salt",
+    }
+    events = [
+        ("start", {"minions": ["foo", "bar"], "down": ["baz"]}),
+        ("wave", {"minions": ["foo"], "jid": "1"}),
+        ("ret/foo", {"id": "foo", "jid": "1", "return": True, "retcode": 0}),
+        ("wave", {"minions": ["bar"], "jid": "2"}),
+        ("ret/bar", {"id": "bar", "jid": "2", "failed": True}),
+        ("done", {"state": "done", "counts": {"done": 1, "failed": 1}}),
+    ]
+    submit = MagicMock()
+    with patch("salt.utils.event.get_master_event"), patch(
+        "salt.utils.batch.submit", submit
+    ), patch("salt.utils.batch.follow", return_value=iter(events)), patch(
+        "salt.utils.user.get_specific_user", return_value="sudo_alice"
+    ):
+        batch = MasterBatch(opts, quiet=True)
+        assert list(batch.run()) == [({"foo": True}, 0)]
+    assert submit.call_args.kwargs["retries"] == 2
+    # The batch is run for the user calling it, not the user of the master
+    assert submit.call_args.kwargs["user"] == "sudo_alice"
+    assert submit.call_args.kwargs["bid"] == batch.bid
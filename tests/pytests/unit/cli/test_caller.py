@@ -0,0 +1,139 @@
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+import salt.cli.caller
+import salt.utils.caller_service
+from tests.support.mock import patch
+
+pytestmark = [
+    pytest.mark.skip_on_windows(reason="The salt-call service uses a unix socket"),
+]
+
+
+@pytest.fixture
+def service_opts(minion_opts):
+    minion_opts["file_client"] = "local"
+    minion_opts["local"] = True
+    minion_opts["extension_modules"] = os.path.join(minion_opts["cachedir"], "extmods")
+    minion_opts["print_metadata"] = False
+    return minion_opts
+
+
+@pytest.fixture
+def service(service_opts):
+    service = salt.cli.caller.CallerService(service_opts.copy())
+    thread = threading.Thread(target=service.serve, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(service.socket_path):
+            break
+        time.sleep(0.05)
+    return service
+
+
+def _call(opts, fun, *args):
+    return salt.utils.caller_service.call(dict(opts, fun=fun, arg=list(args)))
+
+
+def test_call(service, service_opts):
+    ret = _call(service_opts, "test.echo", "hello")
+    assert ret["ret"]["return"] == "hello"
+    assert ret["ret"]["retcode"] == 0
+    assert ret["stderr"] == ""
+
+    ret = _call(service_opts, "test.retcode", 3)
+    assert ret["ret"]["retcode"] == 3
+    # The retcode of a call does not leak into the next one
+    assert _call(service_opts, "test.true")["ret"]["retcode"] == 0
+
+    ret = _call(service_opts, "nope.nope")
+    assert "ret" not in ret
+    assert ret["exit"] == -1
+    assert "'nope.nope' is not available." in ret["stderr"]
+
+
+def test_call_other_config(service, service_opts):
+    assert _call(dict(service_opts, file_roots={"base": ["/tmp"]}), "test.true") is None
+
+
+def test_call_not_running(service_opts):
+    assert _call(service_opts, "test.true") is None
+
+
+def test_refresh(service, service_opts):
+    with patch.object(service.minion, "gen_modules") as gen_modules:
+        assert (
+            _call(service_opts, "saltutil.refresh_modules")["ret"]["return"] is not None
+        )
+        assert service.refresh == {"module_refresh"}
+        _call(service_opts, "test.true")
+        gen_modules.assert_called_once_with()
+        assert not service.refresh
+
+        # Syncing modules, for instance by the minion daemon
+        os.makedirs(os.path.join(service_opts["extension_modules"], "modules"))
+        _call(service_opts, "test.true")
+        assert gen_modules.call_count == 2
+
+        _call(service_opts, "event.fire", {}, "pillar_refresh")
+        _call(service_opts, "test.true")
+        gen_modules.assert_called_with(initial_load=True)
+
+
+def test_call_opts(service, service_opts):
+    # The per call opts are applied to the call only
+    with patch("salt.utils.minion.cache_jobs") as cache_jobs:
+        ret = _call(dict(service_opts, cache_jobs=True), "test.true")
+        assert ret["ret"]["return"] is True
+        cache_jobs.assert_called_once()
+        _call(service_opts, "test.true")
+        cache_jobs.assert_called_once()
+    assert not service.opts.get("cache_jobs")
+
+
+def test_call_unsupported_opts(service, service_opts):
+    # A call from a newer salt-call, passing an opt the service does not know
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(service.socket_path)
+        salt.utils.caller_service.send_msg(
+            sock, {"call": {"fun": "test.true", "arg": [], "new": True}}
+        )
+        response = salt.utils.caller_service.recv_msg(sock)
+    assert response == {"unsupported": ["new"]}
+
+
+def test_call_other_env(service, service_opts):
+    # The grains and pillar loaded by the service are not compared
+    assert service.opts["grains"] != service_opts.get("grains")
+    assert _call(service_opts, "test.true")["ret"]["return"] is True
+    assert _call(dict(service_opts, saltenv="dev"), "test.true") is None
+    assert _call(dict(service_opts, pillarenv="dev"), "test.true") is None
+    assert _call(dict(service_opts, grains={"role": "web"}), "test.true") is None
+
+
+def test_call_busy(service, service_opts):
+    started = threading.Event()
+    release = threading.Event()
+
+    def _block():
+        started.set()
+        release.wait(10)
+        return {"return": True, "retcode": 0}
+
+    with patch.object(service, "call", side_effect=_block):
+        thread = threading.Thread(
+            target=_call, args=(service_opts, "test.true"), daemon=True
+        )
+        thread.start()
+        try:
+            assert started.wait(10)
+            # The call runs in process rather than waiting for the running one
+            assert _call(service_opts, "test.true") is None
+        finally:
+            release.set()
+            thread.join(10)
+    assert _call(service_opts, "test.true")["ret"]["return"] is True
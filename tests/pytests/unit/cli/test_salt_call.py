@@ -1,5 +1,8 @@
 import os
 
+import pytest
+
+import salt.utils.files
 from salt.cli.call import SaltCall
 from tests.support.mock import MagicMock, patch
 
@@ -30,3 +33,37 @@ def test_passing_cachedir_to_extension_modules(temp_salt_minion):
             assert salt_call.config["extension_modules"] == os.path.join(
                 test_cache_dir, "extmods"
             )
+
+
+def test_call_service(tmp_path):
+    """
+    Test passing the call to the warm salt-call service
+    """
+    with salt.utils.files.fopen(str(tmp_path / "minion"), "w") as fp_:
+        fp_.write(f"root_dir: {tmp_path}\nid: minion\ncaller_service: True\n")
+    with patch(
+        "sys.argv",
+        ["salt-call", "--local", "--config-dir", str(tmp_path), "test.true"],
+    ), patch("salt.utils.verify.verify_files", MagicMock()), patch(
+        "salt._logging.set_logging_options_dict", MagicMock()
+    ), patch(
+        "salt._logging.freeze_logging_options_dict", MagicMock()
+    ), patch(
+        "salt._logging.setup_logging", MagicMock()
+    ):
+        salt_call = SaltCall()
+        response = {"ret": {"return": True, "retcode": 0}, "stdout": "", "stderr": ""}
+        with patch(
+            "salt.utils.caller_service.call", MagicMock(return_value=response)
+        ) as call_mock, patch(
+            "salt.utils.caller_service.display_return", MagicMock()
+        ) as display_mock, patch(
+            "salt.cli.caller.Caller.factory", MagicMock()
+        ) as caller_mock:
+            with pytest.raises(SystemExit) as exc:
+                salt_call.run()
+            assert exc.value.code == 0
+            assert salt_call.config["caller_service"] is True
+            assert call_mock.call_args[0][0]["fun"] == "test.true"
+            display_mock.assert_called_once_with(salt_call.config, response["ret"])
+            caller_mock.assert_not_called()
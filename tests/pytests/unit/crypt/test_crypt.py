@@ -71,6 +71,41 @@ def test_cryptical_dumps_invalid_nonce():
         assert master_crypt.loads(ret, nonce="abcde")
 
 
+def test_cryptical_dumps_compressed():
+    nonce = uuid.uuid4().hex
+    master_crypt = salt.crypt.Crypticle(
+        {"payload_compression_threshold": 100},
+        salt.crypt.Crypticle.generate_key_string(),
+    )
+    data = {"foo": "bar" * 1000}
+    before = dict(salt.crypt.Crypticle.compression_stats)
+    ret = master_crypt.dumps(data, nonce=nonce, compress=True)
+
+    une = master_crypt.decrypt(ret)
+    assert une.startswith(master_crypt.ZLIB_PAD)
+    assert len(une) < len(salt.payload.dumps(data))
+    assert master_crypt.loads(ret, nonce=nonce) == data
+
+    stats = salt.crypt.Crypticle.compression_stats
+    assert stats["compressed"] == before["compressed"] + 1
+    assert stats["decompressed"] == before["decompressed"] + 1
+    assert (
+        stats["raw_bytes"] - before["raw_bytes"]
+        > stats["compressed_bytes"] - before["compressed_bytes"]
+    )
+
+
+def test_cryptical_dumps_below_compression_threshold():
+    master_crypt = salt.crypt.Crypticle(
+        {"payload_compression_threshold": 1024},
+        salt.crypt.Crypticle.generate_key_string(),
+    )
+    data = {"foo": "bar"}
+    ret = master_crypt.dumps(data, compress=True)
+    assert master_crypt.decrypt(ret).startswith(master_crypt.PICKLE_PAD)
+    assert master_crypt.loads(ret) == data
+
+
 @pytest.mark.skipif(FIPS_TESTRUN, reason="Legacy key can not be loaded in FIPS mode")
 def test_verify_signature(tmp_path):
     tmp_path.joinpath("foo.pem").write_text(PRIV_KEY.strip())
@@ -18,7 +18,35 @@ class FakeCache:
         self.data[bank, key] = value
 
     def fetch(self, bank, key):
-        return self.data[bank, key]
+        return self.data.get((bank, key), {})
+
+    def _in_bank(self, cbank, bank):
+        # Like the directories of localfs, a bank holds its sub banks
+        return cbank == bank or cbank.startswith(f"{bank}/")
+
+    def flush(self, bank, key=None):
+        for cbank, ckey in list(self.data):
+            if key is None and self._in_bank(cbank, bank):
+                del self.data[cbank, ckey]
+            elif cbank == bank and key == ckey:
+                del self.data[cbank, ckey]
+
+    def list(self, bank):
+        # Like localfs, list the keys and the sub banks of a bank
+        prefix = f"{bank}/"
+        return sorted(
+            {
+                cbank[len(prefix) :].split("/")[0]
+                for cbank, _ in self.data
+                if cbank.startswith(prefix)
+            }
+            | {ckey for cbank, ckey in self.data if cbank == bank}
+        )
+
+    def contains(self, bank, key=None):
+        if key is None:
+            return any(self._in_bank(cbank, bank) for cbank, _ in self.data)
+        return (bank, key) in self.data
 
 
 @pytest.fixture
@@ -203,3 +231,136 @@ def test_mine_get_acl_rejected(funcs):
             }
         )
     assert ret == {}
+
+
+def test_mine_index(funcs):
+    """
+    Asserts that the mine index is kept up to date by ``_mine``,
+    ``_mine_delete`` and ``_mine_flush`` and used by ``_mine_get``.
+    """
+    funcs.opts["minion_data_cache"] = True
+    funcs.cache.store("minions/web1", "mine", {"ip_addr": "10.0.0.1"})
+    load = {"id": "requester_minion", "tgt": "web*", "fun": "ip_addr"}
+
+    def mine_get(minions):
+        with patch(
+            "salt.utils.minions.CkMinions._check_glob_minions",
+            MagicMock(return_value={"minions": minions, "missing": []}),
+        ):
+            return funcs._mine_get(load)
+
+    # The index is built from the minion banks on its first use
+    assert mine_get(["web1", "web2"]) == {"web1": "10.0.0.1"}
+    assert funcs.cache.fetch("mine_index/ip_addr", "web1") == "10.0.0.1"
+
+    assert funcs._mine({"id": "web2", "data": {"ip_addr": "10.0.0.2", "os": "x"}})
+    assert funcs.cache.fetch("mine_index/os", "web2") == "x"
+    assert mine_get(["web1", "web2"]) == {"web1": "10.0.0.1", "web2": "10.0.0.2"}
+    # The target still filters the index
+    assert mine_get(["web2"]) == {"web2": "10.0.0.2"}
+
+    # Minion data is only read from the index
+    funcs.cache.store("minions/web1", "mine", {"ip_addr": "10.0.0.99"})
+    assert mine_get(["web1"]) == {"web1": "10.0.0.1"}
+
+    assert funcs._mine({"id": "web2", "data": {"os": "y"}, "clear": True})
+    assert funcs.cache.fetch("minions/web2", "mine") == {"os": "y"}
+    assert mine_get(["web1", "web2"]) == {"web1": "10.0.0.1"}
+
+    assert funcs._mine_delete({"id": "web2", "fun": "os"})
+    assert not funcs.cache.contains("mine_index/os", "web2")
+
+    funcs._mine_flush({"id": "web1"})
+    assert mine_get(["web1", "web2"]) == {}
+
+
+def test_mine_index_acl(funcs):
+    """
+    Asserts that the minion-side ACL still applies to the data of the mine index.
+    """
+    funcs.opts["minion_data_cache"] = True
+    entry = salt.utils.mine.wrap_acl_structure(
+        "2001:db8::1:4", allow_tgt="allowed_minion"
+    )
+    assert funcs._mine({"id": "webserver", "data": {"ip_addr": entry}})
+    for requester, expected in (
+        ("allowed_minion", {"webserver": "2001:db8::1:4"}),
+        ("other_minion", {}),
+    ):
+        with patch(
+            "salt.utils.minions.CkMinions._check_glob_minions",
+            MagicMock(
+                side_effect=lambda expr, greedy: {
+                    "minions": (
+                        ["allowed_minion"]
+                        if expr == "allowed_minion"
+                        else ["webserver"]
+                    ),
+                    "missing": [],
+                }
+            ),
+        ):
+            ret = funcs._mine_get({"id": requester, "tgt": "web*", "fun": "ip_addr"})
+        assert ret == expected
+    assert funcs.cache.fetch("mine_index/ip_addr", "webserver") == entry
+
+
+def test_mine_index_disabled(funcs):
+    """
+    Asserts that the mine of every targeted minion is read, and the index
+    dropped, when ``mine_index`` is disabled.
+    """
+    funcs.opts["minion_data_cache"] = True
+    funcs.cache.store("mine_index", "__built__", True)
+    funcs.opts["mine_index"] = False
+    assert funcs._mine({"id": "web1", "data": {"ip_addr": "10.0.0.1"}})
+    assert not funcs.cache.contains("mine_index")
+    with patch(
+        "salt.utils.minions.CkMinions._check_glob_minions",
+        MagicMock(return_value={"minions": ["web1"], "missing": []}),
+    ):
+        ret = funcs._mine_get({"id": "requester", "tgt": "web*", "fun": "ip_addr"})
+    assert ret == {"web1": "10.0.0.1"}
+    assert not funcs.cache.contains("mine_index")
+
+
+def test_mine_index_function_bank(funcs):
+    """
+    Asserts that the mine functions whose name is not a valid bank name are
+    indexed.
+    """
+    funcs.opts["minion_data_cache"] = True
+    funcs.cache.store("mine_index", "__built__", True)
+    assert funcs._mine({"id": "web1", "data": {"net/ip": "10.0.0.1"}})
+    assert funcs.cache.fetch("mine_index/net%2Fip", "web1") == "10.0.0.1"
+    with patch(
+        "salt.utils.minions.CkMinions._check_glob_minions",
+        MagicMock(return_value={"minions": ["web1"], "missing": []}),
+    ):
+        ret = funcs._mine_get({"id": "requester", "tgt": "web*", "fun": "net/ip"})
+    assert ret == {"web1": "10.0.0.1"}
+
+
+def test_mine_index_reads(funcs):
+    """
+    Asserts that the index of a function is listed once, and only the entries
+    of the targeted minions it holds are read, whatever the cache driver.
+    """
+    funcs.opts["minion_data_cache"] = True
+    funcs.opts["cache"] = "redis"
+    funcs.cache.store("mine_index", "__built__", True)
+    for minion in ("web1", "web2", "db1"):
+        assert funcs._mine({"id": minion, "data": {"ip_addr": minion}})
+    with patch(
+        "salt.utils.minions.CkMinions._check_glob_minions",
+        MagicMock(return_value={"minions": ["web1", "web3"], "missing": []}),
+    ), patch.object(funcs.cache, "list", wraps=funcs.cache.list) as list_, patch.object(
+        funcs.cache, "fetch", wraps=funcs.cache.fetch
+    ) as fetch, patch.object(
+        funcs.cache, "contains", wraps=funcs.cache.contains
+    ) as contains:
+        ret = funcs._mine_get({"id": "requester", "tgt": "web*", "fun": "ip_addr"})
+    assert ret == {"web1": "web1"}
+    list_.assert_called_once_with("mine_index/ip_addr")
+    fetch.assert_called_once_with("mine_index/ip_addr", "web1")
+    contains.assert_called_once_with("mine_index", "__built__")
@@ -336,3 +336,26 @@ def test_cache_dest(mocked_opts, minion_opts):
         _check(client.cache_dest(f"salt://{relpath}?saltenv=dev"), _salt("dev"))
 
         _check("/foo/bar", "/foo/bar")
+
+
+def test_file_manifest(mocked_opts, minion_opts):
+    """
+    Ensure the file manifest holds the hash sum and stat result of each file
+    under the prefix
+    """
+    patched_opts = minion_opts.copy()
+    patched_opts.update(mocked_opts)
+
+    with patch.dict(fileclient.__opts__, patched_opts):
+        client = fileclient.get_file_client(fileclient.__opts__, pillar=False)
+        for saltenv in _saltenvs():
+            manifest = client.file_manifest(saltenv, f"{SUBDIR}/")
+            assert sorted(manifest) == sorted(
+                f"{SUBDIR}/{subdir_file}" for subdir_file in _subdir_files()
+            )
+            for path, entry in manifest.items():
+                assert entry == {
+                    "hsum": client.hash_file(f"salt://{path}", saltenv)["hsum"],
+                    "hash_type": patched_opts["hash_type"],
+                    "stat": client.hash_and_stat_file(f"salt://{path}", saltenv)[1],
+                }
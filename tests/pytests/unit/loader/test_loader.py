@@ -14,6 +14,7 @@ import pytest
 import salt.exceptions
 import salt.loader
 import salt.loader.lazy
+import salt.payload
 
 
 @pytest.fixture
@@ -55,6 +56,73 @@ def test_custom_grain_with_annotations(minion_opts, grains_dir):
     assert grains.get("example") == "42"
 
 
+@pytest.fixture
+def counting_grains_dir(tmp_path):
+    """
+    Create a directory with grain modules counting their calls.
+    """
+    grains_dir = tmp_path / "grains"
+    grains_dir.mkdir()
+    counter = tmp_path / "counter"
+    contents = textwrap.dedent(
+        """
+        def static_grain():
+            with open({counter!r}, "a") as fp_:
+                fp_.write("x")
+            return {{"static": "42"}}
+
+        def dependent_grain(grains):
+            return {{"dependent": grains.get("saltversion")}}
+        """.format(
+            counter=str(counter)
+        )
+    )
+    (grains_dir / "counting.py").write_text(contents)
+    yield str(grains_dir), counter
+
+
+def test_grains_worker_threads(minion_opts, counting_grains_dir):
+    """
+    Load grains concurrently, the merge order is preserved.
+    """
+    minion_opts["grains_dirs"] = [counting_grains_dir[0]]
+    minion_opts["grains_worker_threads"] = 4
+    grains = salt.loader.grains(minion_opts, force_refresh=True)
+    assert "saltversion" in grains
+    assert grains["static"] == "42"
+    assert grains["dependent"] == grains["saltversion"]
+    timing = salt.loader.grains_timing(minion_opts)
+    assert "counting.static_grain" in timing
+    assert "core.hostname" in timing
+
+
+def test_grains_cache_functions(minion_opts, counting_grains_dir):
+    """
+    Grain functions listed in grains_cache_functions are only run once their
+    cache entry expired.
+    """
+    grains_dir, counter = counting_grains_dir
+    minion_opts["grains_dirs"] = [grains_dir]
+    minion_opts["grains_cache_functions"] = {"counting.static_*": 0}
+    for _ in range(2):
+        grains = salt.loader.grains(minion_opts, force_refresh=True)
+        assert grains["static"] == "42"
+        assert grains["dependent"] == grains["saltversion"]
+    assert counter.read_text() == "x"
+    assert salt.loader.grains_timing(minion_opts)["counting.static_grain"] is None
+
+    # Expire the cache entry
+    minion_opts["grains_cache_functions"] = {"counting.static_*": 60}
+    cache_file = os.path.join(minion_opts["cachedir"], "grains.functions.cache.p")
+    with salt.utils.files.fopen(cache_file, "rb") as fp_:
+        cache = salt.payload.load(fp_)
+    cache["counting.static_grain"]["time"] -= 120
+    with salt.utils.files.fopen(cache_file, "wb") as fp_:
+        salt.payload.dump(cache, fp_)
+    salt.loader.grains(minion_opts, force_refresh=True)
+    assert counter.read_text() == "xx"
+
+
 def test_raw_mod_functions():
     "Ensure functions loaded by raw_mod are LoaderFunc instances"
     opts = {
@@ -13,6 +13,7 @@ import salt.modules.config as configmod
 import salt.modules.file as filemod
 import salt.utils.data
 import salt.utils.files
+import salt.utils.hashutils
 import salt.utils.platform
 import salt.utils.stringutils
 from salt.utils.jinja import SaltCacheLoader
@@ -606,3 +607,43 @@ def test_file_move_disallow_copy_and_unlink():
         mock_os_rename.assert_called_once()
         mock_shutil_move.assert_not_called()
         assert ret is True
+
+
+def test_get_hash_cache(subdir):
+    """
+    Test that the hash sums of the files written by manage_file are recorded
+    in the hash cache, and used by get_hash until the file changes.
+    """
+    name = str(subdir / "managed.txt")
+    opts = {
+        "cachedir": str(subdir / "cache"),
+        "file_hash_cache": True,
+        "hash_type": "sha256",
+    }
+    # Trust the sums recorded right after the files are written
+    with patch.dict(filemod.__opts__, opts), patch.dict(
+        filemod.__salt__, {"config.backup_mode": MagicMock(return_value="")}
+    ), patch.object(salt.utils.hashutils, "HASH_CACHE_RACY_WINDOW", 0):
+        ret = filemod.manage_file(
+            name,
+            "",
+            {},
+            None,
+            {"hash_type": "sha256"},
+            None,
+            None,
+            None,
+            None,
+            "base",
+            None,
+            contents="Salt\n",
+        )
+        assert ret["result"] is True
+        expected = salt.utils.hashutils.get_hash(name, "sha256")
+        with patch("salt.utils.hashutils.get_hash") as get_hash:
+            assert filemod.get_hash(name) == expected
+        get_hash.assert_not_called()
+
+        with salt.utils.files.fopen(name, "a") as fp_:
+            fp_.write("more\n")
+        assert filemod.get_hash(name) == salt.utils.hashutils.get_hash(name, "sha256")
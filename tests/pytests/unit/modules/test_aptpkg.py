@@ -1338,6 +1338,43 @@ def test_list_pkgs():
             assert pkgs[pkg_name] == [pkg_version]
 
 
+def test_list_pkgs_inventory_cache(tmp_path):
+    """
+    Test that the package inventory is shared through the cache until the
+    dpkg database changes.
+    """
+
+    def _add_data(data, key, value):
+        data.setdefault(key, []).append(value)
+
+    dpkg_status = tmp_path / "status"
+    dpkg_status.write_text("Package: at\n")
+    opts = {"cachedir": str(tmp_path), "pkg_inventory_cache": True}
+    run_stdout = MagicMock(return_value="install ok installed at 3.1.23-1ubuntu1 amd64")
+    with patch.object(aptpkg, "DPKG_STATUS_PATH", str(dpkg_status)), patch.dict(
+        aptpkg.__opts__, opts
+    ), patch.dict(
+        aptpkg.__salt__,
+        {
+            "cmd.run_stdout": run_stdout,
+            "pkg_resource.add_pkg": _add_data,
+            "pkg_resource.format_pkg_list": pkg_resource.format_pkg_list,
+            "pkg_resource.sort_pkglist": pkg_resource.sort_pkglist,
+            "pkg_resource.stringify": pkg_resource.stringify,
+        },
+    ):
+        with patch.dict(aptpkg.__context__, {}, clear=True):
+            assert aptpkg.list_pkgs() == {"at": "3.1.23-1ubuntu1"}
+        with patch.dict(aptpkg.__context__, {}, clear=True):
+            assert aptpkg.list_pkgs() == {"at": "3.1.23-1ubuntu1"}
+        assert run_stdout.call_count == 1
+
+        dpkg_status.write_text("Package: at\nPackage: bash\n")
+        with patch.dict(aptpkg.__context__, {}, clear=True):
+            aptpkg.list_pkgs()
+        assert run_stdout.call_count == 2
+
+
 def test_list_pkgs_no_context():
     """
     Test packages listing and ensure __context__ for pkg.list_pkgs is absent.
@@ -11,6 +11,7 @@ import os
 import re
 import sys
 import tempfile
+import time
 
 import pytest
 
@@ -1146,3 +1147,72 @@ def test_prep_powershell_json(text, expected):
     """
     result = cmdmod._prep_powershell_json(text)
     assert result == expected
+
+
+@pytest.mark.skip_on_windows
+def test_run_all_stream():
+    """
+    Test that the output of a streamed command is fired in events and that
+    only its head and tail are returned
+    """
+    fire_master = MagicMock(return_value=True)
+    opts = {
+        "cmd_stream_head_bytes": 10,
+        "cmd_stream_tail_bytes": 10,
+        "cmd_stream_event_bytes": 1,
+        "id": "minion",
+        "local": False,
+        "file_client": "remote",
+    }
+    with patch.dict(cmdmod.__opts__, opts), patch.dict(
+        cmdmod.__salt__,
+        {"config.get": MagicMock(return_value=""), "event.fire_master": fire_master},
+    ):
+        ret = cmdmod.run_all(
+            [sys.executable, "-c", "print('0123456789' * 100)"],
+            python_shell=False,
+            stream=True,
+            __pub_jid="20240101000000000000",
+        )
+    assert ret["retcode"] == 0
+    assert ret["stdout"] == "0123456789\n[... 981 bytes truncated ...]\n123456789"
+    events = [call.args for call in fire_master.call_args_list]
+    assert {tag for _, tag in events} == {
+        "salt/job/20240101000000000000/prog/minion/cmd"
+    }
+    streamed = "".join(data.get("data", "") for data, _ in events)
+    assert streamed == "0123456789" * 100 + "\n"
+    done = events[-1][0]
+    assert done["done"] is True
+    assert done["retcode"] == 0
+    assert done["stdout_bytes"] == 1001
+    assert done["stdout_truncated"] == 981
+    assert [data["seq"] for data, _ in events] == list(range(len(events)))
+
+
+def test_output_streamer_flush_timer():
+    """
+    Test that the chunks pending are fired once the interval is reached, even
+    when the command writes nothing more
+    """
+    fire_master = MagicMock(return_value=True)
+    opts = {
+        "cmd_stream_event_bytes": 65536,
+        "cmd_stream_event_interval": 0.05,
+        "id": "minion",
+        "local": False,
+        "file_client": "remote",
+    }
+    with patch.dict(cmdmod.__opts__, opts), patch.dict(
+        cmdmod.__salt__, {"event.fire_master": fire_master}
+    ):
+        streamer = cmdmod._OutputStreamer("cmd", "20240101000000000000")
+        streamer.write("stdout", b"Salt\n")
+        fire_master.assert_not_called()
+        timeout = time.monotonic() + 5
+        while not fire_master.called and time.monotonic() < timeout:
+            time.sleep(0.01)
+        fire_master.assert_called_once()
+        assert fire_master.call_args.args[0]["data"] == "Salt\n"
+        assert streamer.pending["stdout"] == []
+        assert not streamer.timers
@@ -7,6 +7,7 @@ import pytest
 import salt.channel.client
 import salt.modules.cp as cp
 import salt.utils.files
+import salt.utils.hashutils
 import salt.utils.platform
 import salt.utils.templates as templates
 from salt.exceptions import CommandExecutionError
@@ -164,3 +165,37 @@ def test_push():
                 id="abc",
             )
         )
+
+
+def test_file_manifest_served_from_context(tmp_path):
+    """
+    Test that the hash sum, mode and cached copy of the files of the manifest
+    loaded by file.recurse do not require a request to the master.
+    """
+    cached = tmp_path / "bar.txt"
+    cached.write_text("bar\n")
+    hsum = salt.utils.hashutils.get_hash(str(cached), "sha256")
+    manifest = {
+        "foo/bar.txt": {"hsum": hsum, "hash_type": "sha256", "stat": [33188]},
+    }
+    client = MagicMock()
+    with patch.dict(cp.__context__, {"cp.file_manifest": {"base": manifest}}), patch(
+        "salt.modules.cp._client", MagicMock(return_value=client)
+    ), patch(
+        "salt.modules.cp.is_cached", MagicMock(return_value=str(cached))
+    ), patch.dict(
+        cp.__salt__, {"file.get_hash": salt.utils.hashutils.get_hash}
+    ):
+        assert cp.hash_file("salt://foo/bar.txt", "base") == {
+            "hsum": hsum,
+            "hash_type": "sha256",
+        }
+        assert cp.stat_file("salt://foo/bar.txt", "base") == "0644"
+        assert cp.cache_file("salt://foo/bar.txt", "base") == str(cached)
+        client.__enter__.assert_not_called()
+
+        # The files out of the manifest are requested from the master
+        cp.hash_file("salt://foo/baz.txt", "base")
+        client.__enter__.return_value.hash_file.assert_called_once_with(
+            "salt://foo/baz.txt", "base"
+        )
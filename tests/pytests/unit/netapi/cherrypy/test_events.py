@@ -1,8 +1,10 @@
+import json
 import time
 
 import pytest
 
 import salt.netapi.rest_cherrypy.app as cherrypy_app
+import salt.utils.event
 from tests.support.mock import MagicMock, patch
 
 
@@ -42,3 +44,43 @@ def test__is_valid_token_expired():
                 events.resolver, "get_token", return_value={"expire": time.time() - 60}
             ):
                 assert not events._is_valid_token("ABCDEF")
+
+
+def test_events_stream(tmp_path):
+    mock_cherrypy = MagicMock(
+        config={
+            "saltopts": {"sock_dir": str(tmp_path)},
+            "apiopts": {"events_queue_size": 2},
+        }
+    )
+    mock_cherrypy.request.cookie = {}
+    mock_cherrypy.response.headers = {}
+    with patch("salt.netapi.rest_cherrypy.app.cherrypy", mock_cherrypy):
+        with patch("salt.auth.Resolver", MockResolver):
+            events = cherrypy_app.Events()
+        multiplexer = salt.utils.event.ThreadedEventMultiplexer(
+            {"sock_dir": str(tmp_path)}
+        )
+        with patch.object(events, "_is_valid_token", return_value=True), patch(
+            "salt.utils.event.get_threaded_event_multiplexer",
+            return_value=multiplexer,
+        ), patch.object(multiplexer, "start"):
+            stream = events.GET(token="ABCDEF", tag="salt/job/*")
+            assert next(stream) == "retry: 400\n"
+            assert list(multiplexer.index) == ["salt/job/"]
+            for idx in range(3):
+                multiplexer.dispatch(f"salt/job/{idx}/new", {"jid": idx})
+            multiplexer.dispatch("salt/auth", {})
+
+            # The stream did not read the first event in time
+            assert next(stream) == "tag: salt/netapi/events/dropped\n"
+            assert json.loads(next(stream)[6:]) == {
+                "tag": "salt/netapi/events/dropped",
+                "data": {"dropped": 1, "lag": 1},
+            }
+            assert next(stream) == "tag: salt/job/1/new\n"
+            assert json.loads(next(stream)[6:])["data"] == {"jid": 1}
+            assert next(stream) == "tag: salt/job/2/new\n"
+            next(stream)
+            stream.close()
+            assert multiplexer.index == {}
@@ -0,0 +1,30 @@
+import pytest
+
+import salt.netapi.rest_cherrypy.app as cherrypy_app
+import salt.utils.json
+import salt.utils.yaml
+
+INFO = {"jid": "20121130104633606931", "Minions": ["jerry", "dave"]}
+
+
+@pytest.mark.parametrize(
+    "returns",
+    [
+        {},
+        {
+            "jerry": [0, 1, {"multi": "line\nstring"}],
+            "dave": {"nested": {"list": [1, 2]}, "none": None},
+        },
+    ],
+)
+def test_stream_out(returns):
+    expected = {"info": [INFO], "return": [returns]}
+
+    ret = cherrypy_app.StreamedReturn({"info": [INFO]}, iter(returns.items()))
+    chunks = list(cherrypy_app.json_stream_out(ret))
+    assert len(chunks) == len(returns) + 2
+    assert "".join(chunks) == salt.utils.json.dumps(expected)
+
+    ret = cherrypy_app.StreamedReturn({"info": [INFO]}, iter(returns.items()))
+    chunks = list(cherrypy_app.yaml_stream_out(ret))
+    assert salt.utils.yaml.safe_load("".join(chunks)) == expected
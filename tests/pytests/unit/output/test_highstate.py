@@ -917,3 +917,27 @@ def test_nested_output():
     assert "              Succeeded: 2 (changed=1)" in ret
     assert "              Failed:    0" in ret
     assert "              Total states run:     2" in ret
+
+
+def test_output_iter():
+    def _host(result):
+        return {
+            "test_|-one_|-one_|-succeed_with_changes": {
+                "name": "one",
+                "changes": {"testing": {"new": "one", "old": "none"}},
+                "result": result,
+                "comment": "Success!",
+                "__sls__": "test",
+                "__run_num__": 0,
+                "__id__": "one",
+            },
+        }
+
+    data = {"minion1": _host(True), "minion2": _host(False)}
+    lines = list(highstate.output_iter(copy.deepcopy(data)))
+    assert "\n".join(lines) == highstate.output(copy.deepcopy(data))
+    assert lines[0] == "minion1:"
+    summary = lines.index("\nSummary for minion1\n------------")
+    assert lines[summary + 1] == "Succeeded: 1 (changed=1)"
+    assert lines.index("minion2:") > summary
+    assert "Failed:    1" in lines[lines.index("\nSummary for minion2\n------------") :]
@@ -0,0 +1,92 @@
+"""
+unittests for jsonl outputter
+"""
+
+import pytest
+
+import salt.output
+import salt.output.jsonl_out as jsonl_out
+import salt.utils.json
+from tests.support.mock import patch
+
+
+@pytest.fixture
+def configure_loader_modules():
+    return {jsonl_out: {}}
+
+
+def test_output():
+    data = {"minion1": {"ret": [1, 2]}, "minion2": "two"}
+    assert list(jsonl_out.output_iter(data)) == [
+        '{"minion1": {"ret": [1, 2]}}',
+        '{"minion2": "two"}',
+    ]
+    ret = jsonl_out.output(data)
+    assert [salt.utils.json.loads(line) for line in ret.splitlines()] == [
+        {"minion1": {"ret": [1, 2]}},
+        {"minion2": "two"},
+    ]
+
+
+def test_not_dict_output():
+    assert jsonl_out.output(["one", "two"]) == '["one", "two"]'
+    assert jsonl_out.output(None) == "null"
+
+
+def test_display_output(minion_opts, capsys):
+    data = {"minion1": True, "minion2": {"a": "b"}}
+    salt.output.display_output(data, out="jsonl", opts=minion_opts)
+    assert capsys.readouterr().out == '{"minion1": true}\n{"minion2": {"a": "b"}}\n'
+
+
+def _patch_output_iter(output_iter):
+    get_outputters = salt.output._get_outputters
+
+    def _get_outputters(out, opts=None, **kwargs):
+        outputters, out = get_outputters(out, opts, **kwargs)
+        if out == "jsonl":
+            # Load the outputter before replacing its output_iter function
+            outputters._dict["jsonl.output_iter"]
+            outputters._dict._dict["jsonl.output_iter"] = output_iter
+        return outputters, out
+
+    return patch("salt.output._get_outputters", _get_outputters)
+
+
+def test_display_output_stream_failed(minion_opts, capsys):
+    """
+    The data already printed is not printed again when the outputter fails
+    after it printed some of it
+    """
+    data = {"minion1": True, "minion2": {"a": "b"}, "minion3": False}
+
+    def output_iter(data, **kwargs):
+        yield '{"minion1": true}'
+        yield '{"minion2": {"a": "b"}}'
+        raise TypeError("broken")
+
+    minion_opts["color"] = False
+    with _patch_output_iter(output_iter):
+        salt.output.display_output(data, out="jsonl", opts=minion_opts)
+    assert capsys.readouterr().out.splitlines() == [
+        '{"minion1": true}',
+        '{"minion2": {"a": "b"}}',
+        "The jsonl outputter failed, the output is incomplete",
+    ]
+
+
+def test_display_output_stream_failed_nothing_printed(minion_opts, capsys):
+    """
+    The whole output is printed at once when the streaming fails before
+    anything was printed
+    """
+    data = {"minion1": True, "minion2": {"a": "b"}}
+
+    def output_iter(data, **kwargs):
+        yield '{"minion1": true}'
+        raise TypeError("broken")
+
+    minion_opts["color"] = False
+    with _patch_output_iter(output_iter):
+        salt.output.display_output(data, out="jsonl", opts=minion_opts)
+    assert capsys.readouterr().out == '{"minion1": true}\n{"minion2": {"a": "b"}}\n'
@@ -145,3 +145,11 @@ def test_display_with_integer_keys():
         "      \x1b[0;32mtest text three\x1b[0;0m",
     ]
     assert lines == expected
+
+
+def test_output_iter():
+    data = {"minion2": {"a": 1}, "minion1": [1, "two"]}
+    chunks = list(nested.output_iter(data))
+    assert len(chunks) == 2
+    assert "\n".join(chunks) == nested.output(data)
+    assert chunks[0].startswith("\x1b[0;36mminion1")
@@ -221,3 +221,24 @@ def test_empty_jid_dir(jobs_dir):
 
     # check jid dir is removed
     _check_dir_files("new_jid_dir was not removed", empty_jid_dir, status="removed")
+
+
+def test_get_jid_pages(tmp_cache_dir):
+    """
+    test the returns of a job are read by pages
+    """
+    with patch.dict(local_cache.__opts__, {"hash_type": "sha256"}):
+        jid = local_cache.prep_jid()
+        for idx in range(5):
+            local_cache.returner(
+                {"jid": jid, "id": f"minion{idx}", "fun": "test.arg", "return": idx}
+            )
+
+        pages = list(local_cache.get_jid_pages(jid, page_size=2))
+        assert [len(page) for page in pages] == [2, 2, 1]
+        ret = {}
+        for page in pages:
+            ret.update(page)
+        assert ret == {f"minion{idx}": {"return": idx} for idx in range(5)}
+        assert local_cache.get_jid(jid) == ret
+        assert list(local_cache.get_jid_pages("20160603132323715452")) == []
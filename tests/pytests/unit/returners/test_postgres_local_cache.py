@@ -98,3 +98,34 @@ def test_returner_unicode_exception():
 
         assert return_val is not None, None
         assert return_val == expected
+
+
+def test_get_jid_pages():
+    """
+    Tests that the returns of a job are fetched by pages with a server side
+    cursor
+    """
+    rows = [
+        ("minion1", json.dumps({"return": True, "retcode": 0})),
+        ("minion2", json.dumps(True)),
+        ("minion3", json.dumps({"return": False, "retcode": 1})),
+    ]
+    cursor = MagicMock()
+    cursor.__enter__.return_value = cursor
+    cursor.fetchmany.side_effect = [rows[:2], rows[2:], []]
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+
+    with patch.object(
+        postgres_local_cache, "_get_conn", MagicMock(return_value=conn)
+    ), patch.object(postgres_local_cache, "_close_conn") as close_mock:
+        pages = list(postgres_local_cache.get_jid_pages("20200108221839189167", 2))
+
+    assert pages == [
+        {"minion1": {"return": True, "retcode": 0}, "minion2": {"return": True}},
+        {"minion3": {"return": False, "retcode": 1}},
+    ]
+    conn.cursor.assert_called_once()
+    assert conn.cursor.call_args[1]["name"].startswith("salt_pages_")
+    cursor.fetchmany.assert_called_with(2)
+    close_mock.assert_called_once_with(conn)
@@ -0,0 +1,82 @@
+"""
+Unit tests for the batch runner
+"""
+
+import pytest
+
+import salt.runners.batch as batch_runner
+import salt.utils.batch
+from salt.exceptions import AuthorizationError, CommandExecutionError
+from tests.support.mock import patch
+
+
+@pytest.fixture
+def opts(tmp_path):
+    return {
+        "cachedir": str(tmp_path),
+        "sock_dir": str(tmp_path),
+        "timeout": 5,
+        "gather_job_timeout": 10,
+        "batch_server": True,
+        "user": "root",
+    }
+
+
+@pytest.fixture
+def configure_loader_modules(opts):
+    return {batch_runner: {"__opts__": opts}}
+
+
+def test_submit_disabled(opts):
+    opts["batch_server"] = False
+    with pytest.raises(CommandExecutionError):
+        batch_runner.submit("*", "test.ping")
+
+
+def test_submit(opts):
+    with patch("salt.utils.batch._wake"):
+        bid = batch_runner.submit("*", "test.arg", ["foo"], batch="50%", retries=1)
+    ret = batch_runner.status(bid)
+    assert ret["state"] == "pending"
+    assert ret["fun"] == "test.arg"
+    assert ret["batch"] == "50%"
+    assert ret["user"] == "root"
+    assert list(batch_runner.list_()) == [bid]
+    assert batch_runner.list_(state="running") == {}
+
+    with patch("salt.utils.batch._wake"):
+        assert batch_runner.cancel(bid)
+    with pytest.raises(CommandExecutionError):
+        batch_runner.status("20240101000000000001")
+
+
+def test_wait_finished(opts):
+    with patch("salt.utils.batch._wake"):
+        bid = batch_runner.submit("*", "test.ping")
+    data = salt.utils.batch.read(opts, bid)
+    data["state"] = "done"
+    salt.utils.batch.write(opts, data)
+    with patch("salt.utils.event.get_master_event"):
+        assert batch_runner.wait(bid)["state"] == "done"
+
+
+def test_submit_restricted(opts):
+    with patch.dict(
+        batch_runner.__dict__, {"__user__": "bob", "__auth_list__": ["test.*"]}
+    ):
+        with pytest.raises(AuthorizationError):
+            batch_runner.submit("*", "cmd.run", ["id"])
+        with patch("salt.utils.batch._wake"):
+            bid = batch_runner.submit("*", "test.ping")
+    data = salt.utils.batch.read(opts, bid)
+    assert data["user"] == "bob"
+    assert data["auth_list"] == ["test.*"]
+
+    # The restricted users only cancel their own batches
+    with patch.dict(
+        batch_runner.__dict__, {"__user__": "alice", "__auth_list__": ["test.*"]}
+    ):
+        with pytest.raises(AuthorizationError):
+            batch_runner.cancel(bid)
+    with patch("salt.utils.batch._wake"):
+        assert batch_runner.cancel(bid)
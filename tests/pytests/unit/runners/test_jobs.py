@@ -70,3 +70,94 @@ def test_list_jobs_with_search_target():
         assert jobs.list_jobs(search_target="node-1-2.com") == returns["node-1-2.com"]
 
         assert jobs.list_jobs(search_target="non-existant") == returns["non-existant"]
+
+
+def test_lookup_jid_by_pages():
+    """
+    test jobs.lookup_jid runner reads the returns of the minions by pages
+    """
+    jid = "20160524035503086853"
+    load = {
+        "fun": "state.apply",
+        "arg": [],
+        "tgt": "*",
+        "tgt_type": "glob",
+        "user": "root",
+        "Minions": ["node-1", "node-2", "node-3"],
+    }
+    returns = {
+        "node-1": {"return": {"state": "ok"}, "retcode": 0, "out": "highstate"},
+        "node-2": {"return": {"state": "failed"}, "retcode": 2, "out": "highstate"},
+    }
+    page_sizes = []
+
+    def get_jid_pages(jid, page_size):
+        page_sizes.append(page_size)
+        for minion, ret in returns.items():
+            yield {minion: ret}
+
+    def get_jid(jid):
+        raise AssertionError("The returns should be read by pages")
+
+    class MockMasterMinion:
+
+        returners = {
+            "local_cache.get_load": lambda jid: load,
+            "local_cache.get_jid": get_jid,
+            "local_cache.get_jid_pages": get_jid_pages,
+        }
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+    with patch.object(salt.minion, "MasterMinion", MockMasterMinion):
+        assert jobs.lookup_jid(jid, missing=True, page_size=1) == {
+            "outputter": "highstate",
+            "data": {
+                "node-1": {"state": "ok"},
+                "node-2": {"state": "failed"},
+                "node-3": "Minion did not return",
+            },
+        }
+        assert page_sizes == [1]
+
+        MockMasterMinion.returners.pop("local_cache.get_jid_pages")
+        MockMasterMinion.returners["local_cache.get_jid"] = lambda jid: returns
+        ret = jobs.list_job(jid)
+        assert ret["Result"] == returns
+        assert ret["Minions"] == load["Minions"]
+        assert "Result" not in jobs.list_job(jid, result=False)
+
+
+def test_lookup_jid_returns_error():
+    """
+    test jobs.lookup_jid runner only reports a returner which could not be
+    loaded, the errors reading the returns are raised
+    """
+    jid = "20160524035503086853"
+
+    def get_jid_pages(jid, page_size):
+        raise TypeError("broken")
+        yield  # pylint: disable=unreachable
+
+    def get_load(jid):
+        raise TypeError("not loaded")
+
+    class MockMasterMinion:
+
+        returners = {
+            "local_cache.get_load": lambda jid: {"Minions": ["node-1"]},
+            "local_cache.get_jid_pages": get_jid_pages,
+        }
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+    with patch.object(salt.minion, "MasterMinion", MockMasterMinion):
+        with pytest.raises(TypeError):
+            jobs.lookup_jid(jid)
+
+        MockMasterMinion.returners["local_cache.get_load"] = get_load
+        assert jobs.lookup_jid(jid) == (
+            "Requested returner could not be loaded. No JIDs could be retrieved."
+        )
@@ -0,0 +1,79 @@
+import pytest
+
+import salt.states.file as filestate
+import salt.utils.hashutils
+from tests.support.mock import MagicMock, patch
+
+
+@pytest.fixture
+def configure_loader_modules():
+    return {
+        filestate: {
+            "__env__": "base",
+            "__salt__": {},
+            "__opts__": {"test": False, "cachedir": ""},
+            "__context__": {},
+            "__instance_id__": "",
+            "__low__": {},
+            "__utils__": {},
+        }
+    }
+
+
+def test_recurse_bulk(tmp_path):
+    """
+    Test that the bulk mode of file.recurse loads the manifest of the source
+    directory once and only downloads the files which changed
+    """
+    name = str(tmp_path / "dest")
+    (tmp_path / "dest").mkdir()
+    unchanged = tmp_path / "dest" / "unchanged.txt"
+    unchanged.write_text("unchanged\n")
+    changed = tmp_path / "dest" / "changed.txt"
+    changed.write_text("old\n")
+    manifest = {
+        "src/unchanged.txt": {
+            "hsum": salt.utils.hashutils.get_hash(str(unchanged), "sha256"),
+            "hash_type": "sha256",
+            "stat": None,
+        },
+        "src/changed.txt": {"hsum": "abc", "hash_type": "sha256", "stat": None},
+    }
+    mng_files = {
+        (str(unchanged), "salt://src/unchanged.txt?saltenv=base"),
+        (str(changed), "salt://src/changed.txt?saltenv=base"),
+    }
+    list_master_manifest = MagicMock(return_value=manifest)
+    cache_files = MagicMock()
+    managed_context = []
+
+    def _managed(path, **kwargs):
+        managed_context.append(dict(filestate.__context__.get("cp.file_manifest", {})))
+        changes = {"diff": "changed"} if path == str(changed) else {}
+        return {"name": path, "changes": changes, "result": True, "comment": ""}
+
+    with patch.dict(
+        filestate.__salt__,
+        {
+            "file.source_list": MagicMock(return_value=("salt://src", "")),
+            "cp.list_master_dirs": MagicMock(return_value=["src"]),
+            "cp.list_master_manifest": list_master_manifest,
+            "cp.cache_files": cache_files,
+            "file.get_hash": salt.utils.hashutils.get_hash,
+        },
+    ), patch.object(
+        filestate,
+        "_gen_recurse_managed_files",
+        MagicMock(return_value=(mng_files, set(), set(), set())),
+    ), patch.object(
+        filestate, "managed", MagicMock(side_effect=_managed)
+    ):
+        ret = filestate.recurse(name, "salt://src", bulk=True)
+
+    assert ret["result"] is True
+    assert ret["changes"] == {str(changed): {"diff": "changed"}}
+    list_master_manifest.assert_called_once_with("base", "src/")
+    cache_files.assert_called_once_with(["salt://src/changed.txt?saltenv=base"], "base")
+    # The manifest is served while the files are managed, and dropped after
+    assert managed_context == [{"base": manifest}] * 2
+    assert filestate.__context__["cp.file_manifest"] == {}
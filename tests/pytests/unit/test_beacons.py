@@ -3,6 +3,7 @@ unit tests for the beacon_module parameter
 """
 
 import logging
+import threading
 
 import salt.beacons
 from tests.support.mock import MagicMock, call, patch
@@ -121,3 +122,142 @@ def test_beacon_module(minion_opts):
     with patch.object(beacon, "beacons", mocked) as patched:
         beacon.process(minion_opts["beacons"], minion_opts["grains"])
         patched[name].assert_has_calls(calls)
+
+
+def test_beacon_process_worker_threads(minion_opts):
+    """
+    Test that the beacons run in the thread pool when beacons_worker_threads
+    is set, and that a beacon still running is skipped
+    """
+    minion_opts["id"] = "minion"
+    minion_opts["__role"] = "minion"
+    minion_opts["beacons_worker_threads"] = 2
+    minion_opts["beacons"] = {
+        "watch_apache": [
+            {"processes": {"apache2": "stopped"}},
+            {"beacon_module": "ps"},
+        ]
+    }
+    release = threading.Event()
+
+    def _beacon(config):
+        release.wait(10)
+        return [{"apache2": "Stopped"}]
+
+    beacon_mock = MagicMock(side_effect=_beacon)
+    beacon_mock.__globals__ = {}
+
+    beacon = salt.beacons.Beacon(minion_opts, [])
+    beacon.beacons["ps.beacon"] = beacon_mock
+    try:
+        assert beacon.process(minion_opts["beacons"], minion_opts["grains"]) == []
+        assert "watch_apache" in beacon.running
+        # The previous run is still in progress
+        assert beacon.process(minion_opts["beacons"], minion_opts["grains"]) == []
+        assert beacon.stats["watch_apache"]["skipped"] == 1
+        assert beacon_mock.call_count == 1
+
+        release.set()
+        beacon.running["watch_apache"][0].result(10)
+        ret = beacon.process(minion_opts["beacons"], minion_opts["grains"])
+        assert ret[0] == {
+            "tag": "salt/beacon/minion/watch_apache/",
+            "data": {"id": "minion", "apache2": "Stopped"},
+            "beacon_name": "ps",
+        }
+        assert beacon.stats["watch_apache"]["runs"] == 1
+    finally:
+        release.set()
+        beacon.destroy()
+
+
+def test_beacon_destroy(minion_opts):
+    """
+    Test that the thread pool of the beacons is shut down without waiting for
+    the runs in progress
+    """
+    minion_opts["beacons_worker_threads"] = 2
+    beacon = salt.beacons.Beacon(minion_opts, [])
+    executor = beacon.executor = MagicMock()
+    beacon.running = {"watch_apache": (MagicMock(), "ps", False)}
+    beacon.destroy()
+    executor.shutdown.assert_called_once_with(wait=False)
+    assert beacon.executor is None
+    assert beacon.running == {}
+
+
+def test_beacon_process_stats(minion_opts):
+    """
+    Test that the execution time and overruns of the beacons are recorded
+    """
+    minion_opts["id"] = "minion"
+    minion_opts["__role"] = "minion"
+    minion_opts["loop_interval"] = 1
+    minion_opts["beacons"] = {
+        "watch_apache": [
+            {"processes": {"apache2": "stopped"}},
+            {"beacon_module": "ps"},
+        ]
+    }
+    beacon_mock = MagicMock(return_value=[])
+    beacon_mock.__globals__ = {}
+
+    beacon = salt.beacons.Beacon(minion_opts, [])
+    beacon.beacons["ps.beacon"] = beacon_mock
+    with patch("time.monotonic", side_effect=[10, 12.5]):
+        assert beacon.process(minion_opts["beacons"], minion_opts["grains"]) == []
+    assert beacon.stats["watch_apache"] == {
+        "runs": 1,
+        "last": 2.5,
+        "mean": 2.5,
+        "max": 2.5,
+        "overruns": 1,
+        "skipped": 0,
+    }
+
+
+def test_beacon_process_disabled(minion_opts):
+    """
+    Test that no beacon runs while the beacons are disabled, and that the
+    events of the runs started before are still returned
+    """
+    minion_opts["id"] = "minion"
+    minion_opts["__role"] = "minion"
+    minion_opts["beacons_worker_threads"] = 2
+    minion_opts["beacons"] = {
+        "watch_apache": [
+            {"processes": {"apache2": "stopped"}},
+            {"beacon_module": "ps"},
+        ]
+    }
+    release = threading.Event()
+
+    def _beacon(config):
+        release.wait(10)
+        return [{"apache2": "Stopped"}]
+
+    beacon_mock = MagicMock(side_effect=_beacon)
+    beacon_mock.__globals__ = {}
+
+    beacon = salt.beacons.Beacon(minion_opts, [])
+    beacon.beacons["ps.beacon"] = beacon_mock
+    disabled = dict(minion_opts["beacons"], enabled=False)
+    try:
+        assert beacon.process(minion_opts["beacons"], minion_opts["grains"]) == []
+        release.set()
+        beacon.running["watch_apache"][0].result(10)
+
+        ret = beacon.process(disabled, minion_opts["grains"])
+        assert ret == [
+            {
+                "tag": "salt/beacon/minion/watch_apache/",
+                "data": {"id": "minion", "apache2": "Stopped"},
+                "beacon_name": "ps",
+            }
+        ]
+        assert beacon.process(disabled, minion_opts["grains"]) == []
+        assert beacon_mock.call_count == 1
+        assert beacon.running == {}
+    finally:
+        release.set()
+        beacon.destroy()
@@ -7,6 +7,7 @@ import logging
 
 import pytest
 
+import salt.utils.event
 import salt.utils.platform
 from salt import client
 from salt.exceptions import (
@@ -288,3 +289,182 @@ def test_invalid_event_tag_65727(master_opts, caplog):
             for ret in local_client.get_iter_returns(jid, {"fake-id"}):
                 assert ret == {"fake-id": {"ret": "fpp"}}
             assert "Skipping non return event: salt/job/0815/return/" in caplog.text
+
+
+def test_get_iter_returns_job_heartbeats(master_opts):
+    """
+    LocalClient.get_iter_returns only pings the minions which do not send
+    heartbeats for the job.
+    """
+    jid = "0815"
+
+    def returns_iter():
+        yield {
+            "tag": "salt/job/0815/alive",
+            "data": {"jid": jid, "alive": {"new-minion": 5}},
+        }
+        yield None
+        yield {
+            "tag": "salt/job/0815/ret/new-minion",
+            "data": {"return": True, "id": "new-minion"},
+        }
+
+    with client.LocalClient(mopts=master_opts) as local_client:
+        local_client.returns_for_job = MagicMock(return_value=True)
+        local_client.get_returns_no_block = MagicMock(return_value=returns_iter())
+        local_client.gather_job_info = MagicMock(return_value={})
+        ret = list(
+            local_client.get_iter_returns(
+                jid, {"new-minion", "old-minion"}, timeout=0, gather_job_timeout=0
+            )
+        )
+        assert ret == [{"new-minion": {"ret": True}}]
+        assert local_client.gather_job_info.call_count >= 1
+        for call in local_client.gather_job_info.call_args_list:
+            assert call.args[1] == ["old-minion"]
+
+
+def test_get_iter_returns_job_heartbeats_expired(master_opts):
+    """
+    LocalClient.get_iter_returns pings the minions whose heartbeats stopped.
+    """
+    jid = "0815"
+
+    def returns_iter():
+        # An interval of 0 expires at once
+        yield {
+            "tag": "salt/job/0815/alive",
+            "data": {"jid": jid, "alive": {"new-minion": 0}},
+        }
+        while True:
+            yield None
+
+    with client.LocalClient(mopts=master_opts) as local_client:
+        local_client.returns_for_job = MagicMock(return_value=True)
+        local_client.get_returns_no_block = MagicMock(return_value=returns_iter())
+        local_client.gather_job_info = MagicMock(return_value={})
+        ret = list(
+            local_client.get_iter_returns(
+                jid, {"new-minion"}, timeout=0, gather_job_timeout=0
+            )
+        )
+        assert ret == []
+        local_client.gather_job_info.assert_called()
+        for call in local_client.gather_job_info.call_args_list:
+            assert call.args[1] == ["new-minion"]
+
+
+@pytest.fixture
+def async_local_client(master_opts, io_loop):
+    local_client = client.AsyncLocalClient(mopts=master_opts)
+    mux = salt.utils.event.EventMultiplexer(master_opts, io_loop=io_loop)
+    with patch.object(mux, "_connect"), patch(
+        "salt.utils.event.get_event_multiplexer", return_value=mux
+    ):
+        yield local_client
+    mux.destroy()
+
+
+async def test_async_local_client_cmd(async_local_client, io_loop):
+    """
+    The returns are read from the shared event multiplexer
+    """
+    mux = async_local_client.events
+
+    async def run_job(tgt, fun, arg, tgt_type, ret, timeout, jid, **kwargs):
+        for minion_id in ("m1", "m2"):
+            io_loop.call_later(
+                0.1,
+                mux.dispatch,
+                f"salt/job/{jid}/ret/{minion_id}",
+                {"id": minion_id, "jid": jid, "return": minion_id, "retcode": 0},
+            )
+        return {"jid": jid, "minions": ["m1", "m2"]}
+
+    with patch.object(async_local_client, "run_job", run_job):
+        ret = await async_local_client.cmd("*", "test.ping", jid="1")
+        assert ret == {"m1": "m1", "m2": "m2"}
+        rets = [
+            ret async for ret in async_local_client.cmd_iter("*", "test.ping", jid="2")
+        ]
+        assert sorted(rets, key=str) == [
+            {"m1": {"ret": "m1", "retcode": 0, "jid": "2"}},
+            {"m2": {"ret": "m2", "retcode": 0, "jid": "2"}},
+        ]
+    assert mux.index == {}
+
+
+async def test_async_local_client_full_return(async_local_client, master_opts, io_loop):
+    """
+    The full returns are the ones of LocalClient.cmd
+    """
+    mux = async_local_client.events
+    data = {"id": "m1", "jid": "1", "return": True, "retcode": 0, "fun": "test.ping"}
+
+    async def run_job(tgt, fun, arg, tgt_type, ret, timeout, jid, **kwargs):
+        io_loop.call_later(0.1, mux.dispatch, f"salt/job/{jid}/ret/m1", data)
+        return {"jid": jid, "minions": ["m1"]}
+
+    with patch.object(async_local_client, "run_job", run_job):
+        ret = await async_local_client.cmd("*", "test.ping", jid="1", full_return=True)
+
+    def returns_iter():
+        yield {"tag": "salt/job/1/ret/m1", "data": data}
+
+    with client.LocalClient(mopts=master_opts) as local_client:
+        local_client.run_job = MagicMock(return_value={"jid": "1", "minions": ["m1"]})
+        local_client.returns_for_job = MagicMock(return_value=True)
+        local_client.get_returns_no_block = MagicMock(return_value=returns_iter())
+        expected = local_client.cmd("*", "test.ping", full_return=True)
+    assert expected == {"m1": {"ret": True, "retcode": 0, "jid": "1"}}
+    assert ret == expected
+
+
+async def test_async_local_client_not_connected(async_local_client):
+    """
+    An error is raised when the event bus cannot be reached
+    """
+    with patch.object(
+        async_local_client.events, "connect", return_value=False
+    ), patch.object(async_local_client, "run_job") as run_job:
+        with pytest.raises(SaltClientError):
+            await async_local_client.cmd("*", "test.ping")
+    run_job.assert_not_called()
+
+
+async def test_async_local_client_job_liveness(async_local_client, io_loop):
+    """
+    The minions sending heartbeats are waited for, the other ones are probed
+    with saltutil.find_job
+    """
+    mux = async_local_client.events
+    async_local_client.opts["gather_job_timeout"] = 1
+    probes = []
+
+    async def run_job(
+        tgt, fun, arg, tgt_type="glob", ret="", timeout=None, jid="", **kwargs
+    ):
+        if fun == "saltutil.find_job":
+            probes.append(tgt)
+            return {"jid": jid, "minions": tgt}
+        io_loop.call_later(
+            0.1,
+            mux.dispatch,
+            f"salt/job/{jid}/ret/m1",
+            {"id": "m1", "jid": jid, "return": True},
+        )
+        io_loop.call_later(
+            0.1, mux.dispatch, f"salt/job/{jid}/alive", {"jid": jid, "alive": {"m2": 1}}
+        )
+        io_loop.call_later(
+            2.5,
+            mux.dispatch,
+            f"salt/job/{jid}/ret/m2",
+            {"id": "m2", "jid": jid, "return": True},
+        )
+        return {"jid": jid, "minions": ["m1", "m2", "m3"]}
+
+    with patch.object(async_local_client, "run_job", run_job):
+        ret = await async_local_client.cmd("*", "test.ping", timeout=1)
+    assert ret == {"m1": True, "m2": True, "m3": False}
+    assert probes == [["m3"]]
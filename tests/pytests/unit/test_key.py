@@ -0,0 +1,50 @@
+import pytest
+
+import salt.crypt
+import salt.key
+import salt.utils.keystore
+from tests.support.mock import MagicMock, patch
+
+
+@pytest.fixture(params=["localfs", "indexed"])
+def key(request, master_opts, tmp_path):
+    master_opts["key_store"] = request.param
+    for state in salt.utils.keystore.STATES:
+        (tmp_path / "master" / "pki_dir" / state).mkdir()
+    salt.crypt.gen_keys(str(tmp_path), "minion", 2048)
+    pub = (tmp_path / "minion.pub").read_text()
+    store = salt.utils.keystore.get_key_store(master_opts)
+    for minion_id in ("web1", "web2", "db1"):
+        store.write(salt.utils.keystore.PEND, minion_id, pub)
+    with salt.key.Key(master_opts) as skey:
+        with patch.object(skey, "event", MagicMock()):
+            yield skey
+
+
+def test_accept_reject(key):
+    assert key.accept("web*") == {"minions": ["web1", "web2"]}
+    assert key.list_status("pre") == {"minions_pre": ["db1"]}
+    assert [call.args[0]["id"] for call in key.event.fire_event.call_args_list] == [
+        "web1",
+        "web2",
+    ]
+    assert key.reject(match_dict={"minions_pre": ["db1"]}) == {
+        "minions_rejected": ["db1"]
+    }
+    assert key.name_match("db1,web2") == {
+        "minions": ["web2"],
+        "minions_rejected": ["db1"],
+    }
+    assert key.dict_match({"minions": ["web*"]}) == {"minions": ["web*"]}
+
+
+def test_batch_events(key):
+    key.opts["key_events_batch"] = True
+    key.accept_all()
+    key.event.fire_event.assert_called_once()
+    assert key.event.fire_event.call_args.args[0] == {
+        "result": True,
+        "act": "accept",
+        "ids": ["db1", "web1", "web2"],
+    }
+    assert key.delete_all()["minions"] == []
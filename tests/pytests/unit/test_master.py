@@ -1,3 +1,4 @@
+import asyncio
 import os
 import pathlib
 import stat
@@ -7,6 +8,9 @@ import time
 import pytest
 
 import salt.master
+import salt.payload
+import salt.utils.event
+import salt.utils.gzip_util
 import salt.utils.platform
 from tests.support.mock import MagicMock, patch
 
@@ -219,6 +223,112 @@ def test_when_syndic_return_processes_load_then_correct_values_should_be_returne
         fake_return.assert_called_with(expected_return)
 
 
+def test_return_batch_stores_each_return(encrypted_requests):
+    rets = [
+        {"id": "minion", "jid": "20240101000000000001", "return": True},
+        {"id": "minion", "jid": "20240101000000000002", "return": False},
+    ]
+    payload = {
+        "cmd": "_return_batch",
+        "id": "minion",
+        "compression": "gzip",
+        "load": salt.utils.gzip_util.compress(salt.payload.dumps(rets)),
+    }
+    with patch.object(
+        encrypted_requests, "_return", autospec=True, return_value=None
+    ) as fake_return:
+        ret = encrypted_requests._return_batch(payload)
+    assert ret == {"20240101000000000001": True, "20240101000000000002": True}
+    assert [call.args[0] for call in fake_return.call_args_list] == rets
+
+
+def test_return_batch_reports_errors_per_job(encrypted_requests):
+    rets = [
+        {"id": "minion", "jid": "20240101000000000001", "return": True},
+        {"id": "other", "jid": "20240101000000000002", "return": True},
+        {"id": "minion", "jid": "20240101000000000003", "return": True},
+    ]
+    payload = {"cmd": "_return_batch", "id": "minion", "load": rets}
+    with patch.object(
+        encrypted_requests, "_return", autospec=True, side_effect=[None, False]
+    ) as fake_return:
+        ret = encrypted_requests._return_batch(payload)
+    # The return spoofing another minion id is never stored
+    fake_return.assert_any_call(rets[0])
+    fake_return.assert_any_call(rets[2])
+    assert fake_return.call_count == 2
+    assert ret["20240101000000000001"] is True
+    assert ret["20240101000000000002"] == "return id does not match the sending minion"
+    assert ret["20240101000000000003"] == "return could not be verified or stored"
+
+
+def test_return_batch_invalid_payload(encrypted_requests):
+    assert encrypted_requests._return_batch({"id": "minion"}) is False
+    assert (
+        encrypted_requests._return_batch(
+            {"id": "minion", "compression": "gzip", "load": b"not gzip"}
+        )
+        is False
+    )
+    assert (
+        encrypted_requests._return_batch(
+            {"id": "minion", "compression": "lzma", "load": b""}
+        )
+        is False
+    )
+
+
+def test_job_heartbeats_aggregated(encrypted_requests):
+    encrypted_requests.opts["job_heartbeat_batch_interval"] = 60
+    tag = salt.utils.event.JOB_HEARTBEAT
+    jid = "20240101000000000001"
+    with patch.object(
+        encrypted_requests, "_AESFuncs__verify_load", side_effect=lambda load, _: load
+    ), patch.object(encrypted_requests.event, "fire_event") as fire_event, patch.object(
+        encrypted_requests.masterapi, "_minion_event"
+    ) as minion_event:
+        for id_ in ("minion1", "minion2", "minion3"):
+            encrypted_requests._minion_event(
+                {"id": id_, "tag": tag, "data": {"jids": [jid], "interval": 5}}
+            )
+        # The first heartbeat is fired, the next ones wait for the interval
+        fire_event.assert_called_once_with(
+            {"jid": jid, "alive": {"minion1": 5}}, f"salt/job/{jid}/alive"
+        )
+        fire_event.reset_mock()
+        encrypted_requests._heartbeats_fired -= 60
+        encrypted_requests._minion_event(
+            {"id": "minion1", "tag": tag, "data": {"jids": [jid], "interval": 5}}
+        )
+        fire_event.assert_called_once_with(
+            {"jid": jid, "alive": {"minion1": 5, "minion2": 5, "minion3": 5}},
+            f"salt/job/{jid}/alive",
+        )
+        minion_event.assert_not_called()
+
+
+async def test_job_heartbeats_fired_on_timer(encrypted_requests, io_loop):
+    encrypted_requests.opts["job_heartbeat_batch_interval"] = 0.1
+    encrypted_requests.io_loop = io_loop
+    tag = salt.utils.event.JOB_HEARTBEAT
+    jid = "20240101000000000001"
+    with patch.object(
+        encrypted_requests, "_AESFuncs__verify_load", side_effect=lambda load, _: load
+    ), patch.object(encrypted_requests.event, "fire_event") as fire_event:
+        for id_ in ("minion1", "minion2"):
+            encrypted_requests._minion_event(
+                {"id": id_, "tag": tag, "data": {"jids": [jid], "interval": 5}}
+            )
+        fire_event.assert_called_once()
+        fire_event.reset_mock()
+        # The heartbeat held back is fired without waiting for another one
+        await asyncio.sleep(0.3)
+        fire_event.assert_called_once_with(
+            {"jid": jid, "alive": {"minion2": 5}}, f"salt/job/{jid}/alive"
+        )
+        assert encrypted_requests._heartbeats_handle is None
+
+
 def test_aes_funcs_white(master_opts):
     """
     Validate methods exposed on AESFuncs exist and are callable
@@ -259,6 +369,8 @@ def test_aes_funcs_black(master_opts):
         "_AESFuncs__verify_load",
         "_AESFuncs__verify_minion",
         "_AESFuncs__verify_minion_publish",
+        "_fire_heartbeats",
+        "_job_heartbeat",
         "__class__",
         "__delattr__",
         "__dir__",
@@ -490,6 +602,35 @@ def test_runner_eauth_salt_invocation_error(clear_funcs):
     assert ret == mock_ret
 
 
+@pytest.mark.slow_test
+def test_runner_eauth_auth_list(clear_funcs):
+    """
+    Asserts that the access list of the user is passed to the runner
+    """
+    clear_load = {
+        "eauth": "foo",
+        "username": "test",
+        "fun": "batch.submit",
+        "kwarg": {"tgt": "*", "fun": "test.ping", "__auth_list__": ["*"]},
+    }
+    with patch(
+        "salt.auth.LoadAuth.authenticate_eauth", MagicMock(return_value=True)
+    ), patch(
+        "salt.auth.LoadAuth.get_auth_list",
+        MagicMock(return_value=["@runner", "test.*"]),
+    ), patch(
+        "salt.runner.RunnerClient.asynchronous", MagicMock(return_value={})
+    ) as asynchronous:
+        clear_funcs.runner(clear_load)
+
+    asynchronous.assert_called_once_with(
+        "batch.submit",
+        {"tgt": "*", "fun": "test.ping", "__auth_list__": ["@runner", "test.*"]},
+        "test",
+        local=True,
+    )
+
+
 @pytest.mark.slow_test
 def test_runner_user_not_authenticated(clear_funcs):
     """
@@ -1057,3 +1198,39 @@ def test_syndic_return_cache_dir_creation_traversal(encrypted_requests):
     )
     assert not (cachedir / "syndics").exists()
     assert not (cachedir / "mamajama").exists()
+
+
+def test_syndic_minions_stores_summary(encrypted_requests):
+    load = {
+        "cmd": "_syndic_minions",
+        "id": "syndic",
+        "minions": ["minion1", "minion2"],
+        "grain_names": ["os"],
+        "grains": {"minion1": {"os": "Debian"}},
+    }
+    with patch.object(encrypted_requests.masterapi.cache, "store") as store, patch(
+        "time.time", return_value=1700000000.0
+    ):
+        assert encrypted_requests.masterapi._syndic_minions(load) is True
+    store.assert_called_once_with(
+        "syndic_minions",
+        "syndic",
+        {
+            "minions": ["minion1", "minion2"],
+            "grain_names": ["os"],
+            "grains": {"minion1": {"os": "Debian"}},
+            "stamp": 1700000000.0,
+        },
+    )
+
+
+def test_syndic_minions_invalid_payload(encrypted_requests):
+    with patch.object(encrypted_requests.masterapi.cache, "store") as store:
+        assert encrypted_requests.masterapi._syndic_minions({"id": "syndic"}) is False
+        assert (
+            encrypted_requests.masterapi._syndic_minions(
+                {"id": "syndic", "minions": "minion1"}
+            )
+            is False
+        )
+    store.assert_not_called()
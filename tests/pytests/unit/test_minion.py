@@ -5,19 +5,27 @@ import os
 
 import pytest
 import tornado
+import tornado.concurrent
 import tornado.gen
 import tornado.testing
 
 import salt.minion
 import salt.modules.test as test_mod
+import salt.payload
 import salt.syspaths
 import salt.utils.crypt
 import salt.utils.event as event
+import salt.utils.gzip_util
 import salt.utils.jid
 import salt.utils.platform
 import salt.utils.process
 from salt._compat import ipaddress
-from salt.exceptions import SaltClientError, SaltMasterUnresolvableError, SaltSystemExit
+from salt.exceptions import (
+    SaltClientError,
+    SaltMasterUnresolvableError,
+    SaltReqTimeoutError,
+    SaltSystemExit,
+)
 from tests.support.mock import MagicMock, patch
 
 log = logging.getLogger(__name__)
@@ -181,6 +189,91 @@ async def test_send_req_async_regression_62453(minion_opts):
         assert rtn is False
 
 
+async def test_return_batch_coalesces_returns(minion_opts, io_loop):
+    minion_opts["return_batch_window"] = 60
+    minion_opts["return_batch_size"] = 3
+    with patch("salt.loader.grains"):
+        minion = salt.minion.Minion(minion_opts, io_loop=io_loop)
+    try:
+        minion.req_channel = MagicMock()
+        minion.req_channel.send = MagicMock(
+            side_effect=lambda load, timeout, tries: tornado.gen.maybe_future(
+                {
+                    ret["jid"]: True
+                    for ret in salt.payload.loads(
+                        salt.utils.gzip_util.uncompress(load["load"])
+                    )
+                }
+            )
+        )
+        rets = [
+            {"cmd": "_return", "id": minion_opts["id"], "jid": str(jid)}
+            for jid in range(3)
+        ]
+        for ret in rets[:2]:
+            minion._queue_return(ret)
+        # Nothing is sent until the window elapses or the batch is full
+        assert minion._return_batch_handle is not None
+        minion.req_channel.send.assert_not_called()
+
+        minion._queue_return(rets[2])
+        await minion._flush_return_batch()
+        minion.req_channel.send.assert_called_once()
+        load = minion.req_channel.send.call_args[0][0]
+        assert load["cmd"] == "_return_batch"
+        assert load["id"] == minion_opts["id"]
+        assert load["compression"] == "gzip"
+        assert salt.payload.loads(salt.utils.gzip_util.uncompress(load["load"])) == rets
+        assert minion._return_batch == []
+        assert minion._return_batch_handle is None
+    finally:
+        minion.destroy()
+
+
+async def test_return_batch_falls_back_on_old_master(minion_opts, io_loop):
+    minion_opts["return_batch_window"] = 60
+    with patch("salt.loader.grains"):
+        minion = salt.minion.Minion(minion_opts, io_loop=io_loop)
+    try:
+        minion.req_channel = MagicMock()
+        # Masters without _return_batch answer unknown commands with {}
+        minion.req_channel.send = MagicMock(
+            side_effect=lambda load, timeout, tries: tornado.gen.maybe_future({})
+        )
+        rets = [
+            {"cmd": "_return", "id": minion_opts["id"], "jid": str(jid)}
+            for jid in range(2)
+        ]
+        for ret in rets:
+            minion._queue_return(ret)
+        await minion._flush_return_batch()
+        sent = [call.args[0] for call in minion.req_channel.send.call_args_list]
+        assert sent[0]["cmd"] == "_return_batch"
+        assert sent[1:] == rets
+        assert minion._batch_returns() is False
+    finally:
+        minion.destroy()
+
+
+async def test_return_batch_sent_on_destroy(minion_opts, io_loop):
+    minion_opts["return_batch_window"] = 60
+    with patch("salt.loader.grains"):
+        minion = salt.minion.Minion(minion_opts, io_loop=io_loop)
+    rets = [
+        {"cmd": "_return", "id": minion_opts["id"], "jid": str(jid)} for jid in range(2)
+    ]
+    for ret in rets:
+        minion._queue_return(ret)
+    channel = MagicMock()
+    factory = MagicMock()
+    factory.return_value.__enter__.return_value = channel
+    with patch("salt.channel.client.ReqChannel.factory", factory):
+        minion.destroy()
+    assert [call.args[0] for call in channel.send.call_args_list] == rets
+    assert minion._return_batch == []
+    assert minion._return_batch_handle is None
+
+
 def test_mine_send_tries(minion_opts):
     channel_enter = MagicMock()
     channel_enter.send.side_effect = lambda load, timeout, tries: tries
@@ -336,6 +429,70 @@ def test_source_address(minion_opts):
         }
 
 
+def test_job_heartbeat(minion_opts, io_loop):
+    """
+    Tests that the minion sends a single heartbeat for the jobs it is running
+    """
+    minion = salt.minion.Minion(minion_opts, io_loop=io_loop)
+    try:
+        minion.connected = True
+        minion.running_jobs = {
+            "20240101000000000002": MagicMock(is_alive=MagicMock(return_value=True)),
+            "20240101000000000001": MagicMock(is_alive=MagicMock(return_value=True)),
+            "20240101000000000003": MagicMock(is_alive=MagicMock(return_value=False)),
+        }
+        with patch.object(minion, "_fire_master") as fire_master:
+            minion._job_heartbeat()
+            fire_master.assert_called_once_with(
+                data={
+                    "jids": ["20240101000000000001", "20240101000000000002"],
+                    "interval": minion_opts["job_heartbeat_interval"],
+                },
+                tag=event.JOB_HEARTBEAT,
+                sync=False,
+            )
+            assert "20240101000000000003" not in minion.running_jobs
+
+            # No heartbeat without running jobs
+            fire_master.reset_mock()
+            minion.running_jobs = {}
+            minion._job_heartbeat()
+            fire_master.assert_not_called()
+    finally:
+        minion.destroy()
+
+
+async def test_running_jobs_tracked_for_heartbeats(minion_opts, io_loop):
+    """
+    Tests that the running jobs are only tracked when the minion sends job
+    heartbeats and that they are pruned with the finished subprocesses
+    """
+    with patch("salt.minion.Minion.ctx", MagicMock(return_value={})), patch(
+        "salt.utils.process.SignalHandlingProcess.start",
+        MagicMock(return_value=True),
+    ), patch(
+        "salt.utils.process.SignalHandlingProcess.join",
+        MagicMock(return_value=True),
+    ):
+        minion_opts["job_heartbeat_interval"] = 0
+        minion = salt.minion.Minion(minion_opts, io_loop=io_loop)
+        try:
+            await minion._handle_decoded_payload({"fun": "foo.bar", "jid": 1})
+            assert minion.running_jobs == {}
+
+            minion.opts["job_heartbeat_interval"] = 5
+            await minion._handle_decoded_payload({"fun": "foo.bar", "jid": 2})
+            assert list(minion.running_jobs) == [2]
+            minion.schedule = None
+            with patch.object(
+                minion.running_jobs[2], "is_alive", MagicMock(return_value=False)
+            ):
+                minion.cleanup_subprocesses()
+            assert minion.running_jobs == {}
+        finally:
+            minion.destroy()
+
+
 # Tests for _handle_decoded_payload in the salt.minion.Minion() class: 3
 @pytest.mark.slow_test
 async def test_handle_decoded_payload_jid_match_in_jid_queue(minion_opts, io_loop):
@@ -610,6 +767,12 @@ def test_minion_module_refresh_beacons_refresh(minion_opts):
             assert hasattr(minion, "beacons")
             assert hasattr(minion.beacons, "beacons")
             assert "service.beacon" in minion.beacons.beacons
+            # The beacons replaced by a refresh stop their worker threads
+            beacons = minion.beacons
+            with patch.object(beacons, "destroy") as destroy:
+                minion.beacons_refresh()
+                destroy.assert_called_once_with()
+            assert minion.beacons is not beacons
             minion.destroy()
         finally:
             minion.destroy()
@@ -1167,3 +1330,134 @@ async def test_connect_master_general_exception_error(minion_opts, connect_maste
     # The first call raised an error which caused minion.destroy to get called,
     # the second call is a success.
     assert minion.connect_master.calls == 2
+
+
+@pytest.fixture
+def syndic_manager(syndic_opts):
+    syndic_opts.update(
+        {
+            "syndic_jid_forward_cache_hwm": 2,
+            "syndic_forward_batch_size": 2,
+            "syndic_return_buffer_hwm": 3,
+            "syndic_spool_max_size": 104857600,
+            "master_job_cache": "local_cache",
+            "master_stats": False,
+        }
+    )
+    with patch("salt.minion.MasterMinion"):
+        manager = salt.minion.SyndicManager(syndic_opts)
+    manager.local = MagicMock()
+    manager.local.event.unpack.side_effect = lambda raw: raw
+    manager.mminion.returners = {"local_cache.get_load": lambda jid: {"jid": jid}}
+    manager._return_pub_syndic = MagicMock(return_value=False)
+    return manager
+
+
+def _syndic_ret(jid, minion):
+    return (
+        f"salt/job/{jid}/ret/{minion}",
+        {"jid": jid, "id": minion, "return": True, "fun": "test.ping"},
+    )
+
+
+async def test_syndic_jid_forward_cache_is_lru(syndic_manager):
+    jids = ["20240101000000000001", "20240101000000000002", "20240101000000000003"]
+    await syndic_manager._process_event(_syndic_ret(jids[0], "minion1"))
+    await syndic_manager._process_event(_syndic_ret(jids[1], "minion1"))
+    syndic_manager._reset_event_aggregation()
+    # Using the first jid again makes the second one the least recently used
+    await syndic_manager._process_event(_syndic_ret(jids[0], "minion2"))
+    await syndic_manager._process_event(_syndic_ret(jids[2], "minion2"))
+    assert list(syndic_manager.jid_forward_cache) == [jids[0], jids[2]]
+
+
+async def test_syndic_flushes_full_batches(syndic_manager):
+    syndic_manager._return_pub_syndic.return_value = True
+    jid = "20240101000000000001"
+    await syndic_manager._process_event(_syndic_ret(jid, "minion1"))
+    syndic_manager._return_pub_syndic.assert_not_called()
+    await syndic_manager._process_event(_syndic_ret(jid, "minion2"))
+    syndic_manager._return_pub_syndic.assert_called_once()
+    assert syndic_manager.job_rets == {}
+    assert syndic_manager.pending_rets == {}
+
+
+async def test_syndic_spools_returns_masters_do_not_accept(syndic_manager):
+    jid = "20240101000000000001"
+    for minion in ("minion1", "minion2", "minion3", "minion4"):
+        await syndic_manager._process_event(_syndic_ret(jid, minion))
+    # The buffer high water mark was reached, the returns are on disk
+    assert syndic_manager.job_rets == {}
+    assert syndic_manager.pending_rets == {}
+    assert len(syndic_manager._spool_files()) == 1
+    assert syndic_manager.stats["spooled"] == 4
+
+    syndic_manager._return_pub_syndic.return_value = True
+    syndic_manager._forward_events()
+    values = syndic_manager._return_pub_syndic.call_args[0][0]
+    path = syndic_manager._return_pub_syndic.call_args[1]["spool"]
+    assert syndic_manager._count_returns(values) == 4
+    assert syndic_manager.delayed == []
+    # The spooled file is kept until a master accepted the returns
+    assert len(syndic_manager._spool_files()) == 1
+    syndic_manager.spool_inflight.add(path)
+    assert syndic_manager._read_spool() == (None, [])
+
+    failed = tornado.concurrent.Future()
+    failed.set_exception(SaltReqTimeoutError())
+    syndic_manager._post_forward_spool(failed, path)
+    assert syndic_manager._read_spool() == (path, values)
+
+    sent = tornado.concurrent.Future()
+    sent.set_result(True)
+    syndic_manager._post_forward_spool(sent, path)
+    assert syndic_manager._spool_files() == []
+
+
+def test_syndic_spool_max_size(syndic_manager):
+    syndic_manager._spool_returns([{"__jid__": "1", "minion1": {"return": True}}])
+    (first,) = syndic_manager._spool_files()
+    size = os.path.getsize(os.path.join(syndic_manager.spool_dir, first))
+    syndic_manager.opts["syndic_spool_max_size"] = size * 2
+    syndic_manager._spool_returns([{"__jid__": "2", "minion1": {"return": True}}])
+    syndic_manager._spool_returns([{"__jid__": "3", "minion1": {"return": True}}])
+    # The oldest spooled returns were dropped
+    files = syndic_manager._spool_files()
+    assert len(files) == 2
+    assert first not in files
+
+
+async def test_syndic_advertises_accepted_minions(syndic_manager):
+    syndic_manager.opts["syndic_advertise_minions"] = True
+    syndic_manager._advertised_minions = {"minion1"}
+    syndic_manager.io_loop = MagicMock()
+    await syndic_manager._process_event(
+        ("salt/auth", {"act": "accept", "id": "minion1"})
+    )
+    syndic_manager.io_loop.call_later.assert_not_called()
+    await syndic_manager._process_event(
+        ("salt/auth", {"act": "accept", "id": "minion2"})
+    )
+    await syndic_manager._process_event(("salt/key", {"act": "accept", "ids": []}))
+    # Only one advertisement is scheduled
+    syndic_manager.io_loop.call_later.assert_called_once_with(
+        1, syndic_manager._advertise_minions
+    )
+
+
+async def test_syndic_does_not_advertise_incomplete_summary(syndic_manager):
+    syndic_manager.opts["syndic_advertise_grains"] = []
+    syndic_manager.io_loop = tornado.ioloop.IOLoop.current()
+    syndic_manager._call_syndic = MagicMock()
+    with patch(
+        "salt.utils.minions.CkMinions.syndic_summaries", return_value=None
+    ), patch("salt.utils.minions.CkMinions._pki_minions", return_value=["minion1"]):
+        await syndic_manager._advertise_minions()
+    syndic_manager._call_syndic.assert_not_called()
+
+    with patch("salt.utils.minions.CkMinions.syndic_summaries", return_value={}), patch(
+        "salt.utils.minions.CkMinions._pki_minions", return_value=["minion1"]
+    ):
+        await syndic_manager._advertise_minions()
+    syndic_manager._call_syndic.assert_called_once()
+    assert syndic_manager._advertised_minions == {"minion1"}
@@ -59,6 +59,15 @@ def test_get_token_should_return_token_if_exists(tmp_path, expected_data):
     assert expected_data == actual_data
 
 
+def test_token_exists(tmp_path, expected_data):
+    opts = {"token_dir": str(tmp_path)}
+    tok = salt.tokens.localfs.mk_token(opts=opts, tdata=expected_data)["token"]
+    assert salt.tokens.localfs.token_exists(opts, tok) is True
+    salt.tokens.localfs.rm_token(opts, tok)
+    assert salt.tokens.localfs.token_exists(opts, tok) is False
+    assert salt.tokens.localfs.token_exists(opts, "../tokens") is False
+
+
 def test_get_token_should_raise_SaltDeserializationError_if_token_file_is_empty(
     tmp_path, expected_data
 ):
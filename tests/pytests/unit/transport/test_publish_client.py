@@ -13,6 +13,7 @@ import pytest
 import tornado.ioloop
 
 import salt.crypt
+import salt.transport.frame
 import salt.transport.tcp
 import salt.transport.ws
 import salt.transport.zeromq
@@ -296,3 +297,47 @@ async def test_publish_client_connect_server_comes_up(transport, io_loop):
         raise Exception(f"Unknown transport {transport}")
     client.close()
     await asyncio.sleep(0.03)
+
+
+async def test_ws_publish_server_presence(io_loop):
+    opts = {"master_ip": "127.0.0.1"}
+    host = "127.0.0.1"
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setblocking(0)
+    sock.bind((host, 0))
+    sock.listen(128)
+    port = sock.getsockname()[1]
+
+    pub_server = salt.transport.ws.PublishServer(opts, pub_host=host, pub_port=port)
+    pub_server.presence_callback = MagicMock()
+    pub_server.remove_presence_callback = MagicMock()
+    server = aiohttp.web.Server(pub_server.handle_request)
+    runner = aiohttp.web.ServerRunner(server)
+    await runner.setup()
+    site = aiohttp.web.SockSite(runner, sock)
+    await site.start()
+
+    client = salt.transport.ws.PublishClient(opts, io_loop, host=host, port=port)
+    try:
+        await client.connect()
+        body = {"enc": "aes", "load": "minion"}
+        await client.send(salt.transport.frame.frame_msg(body, header=None))
+        start = time.monotonic()
+        while not pub_server.presence_callback.called:
+            await asyncio.sleep(0.03)
+            assert time.monotonic() - start < 30
+        subscriber, received = pub_server.presence_callback.call_args[0]
+        assert isinstance(subscriber, salt.transport.ws.Subscriber)
+        assert received == body
+        assert len(pub_server.clients) == 1
+    finally:
+        client.close()
+
+    start = time.monotonic()
+    while not pub_server.remove_presence_callback.called:
+        await asyncio.sleep(0.03)
+        assert time.monotonic() - start < 30
+    pub_server.remove_presence_callback.assert_called_once_with(subscriber)
+    assert not pub_server.clients
+    await runner.cleanup()
@@ -9,6 +9,7 @@ import pytest
 import tornado.gen
 import zmq.eventloop.future
 
+import salt.channel.server
 import salt.config
 import salt.transport.base
 import salt.transport.zeromq
@@ -17,7 +18,7 @@ import salt.utils.process
 import salt.utils.stringutils
 from salt.master import SMaster
 from tests.conftest import FIPS_TESTRUN
-from tests.support.mock import AsyncMock, MagicMock
+from tests.support.mock import AsyncMock, MagicMock, patch
 
 log = logging.getLogger(__name__)
 
@@ -465,3 +466,77 @@ async def test_unclosed_publish_client(minion_opts, io_loop):
             client.__del__()  # pylint: disable=unnecessary-dunder-call
     finally:
         client.close()
+
+
+def test_socket_monitor_presence_registry():
+    registry = MagicMock()
+    monitor = salt.transport.zeromq.ZeroMQSocketMonitor(MagicMock(), registry=registry)
+    accepted = {"event": zmq.EVENT_ACCEPTED, "value": 12, "endpoint": b""}
+    disconnected = {"event": zmq.EVENT_DISCONNECTED, "value": 12, "endpoint": b""}
+    with patch(
+        "zmq.utils.monitor.parse_monitor_message",
+        side_effect=[accepted, disconnected],
+    ), patch(
+        "salt.transport.zeromq._peer_address", return_value=("203.0.113.1", 40000)
+    ):
+        monitor.monitor_callback([])
+        registry.add_address.assert_called_once_with(12, ("203.0.113.1", 40000))
+        monitor.monitor_callback([])
+        registry.remove_address.assert_called_once_with(12)
+
+
+def test_pub_server_channel_syndic_routing(temp_salt_master):
+    opts = dict(
+        temp_salt_master.config.copy(),
+        sign_pub_messages=False,
+        transport="zeromq",
+        zmq_filtering=True,
+        order_masters=True,
+        syndic_target_routing=True,
+    )
+    summaries = {
+        "syndic1": {"minions": ["web1"], "stamp": time.time()},
+        "syndic2": {"minions": ["mail1"], "stamp": time.time()},
+    }
+    with patch("salt.master.SMaster.secrets") as secrets, patch(
+        "salt.crypt.Crypticle"
+    ) as crypticle, patch(
+        "salt.utils.minions.CkMinions.check_minions",
+        return_value={"minions": ["web-direct"]},
+    ), patch(
+        "salt.utils.minions.CkMinions.syndic_summaries", return_value=summaries
+    ):
+        secrets.return_value = {"aes": {"secret": None}}
+        crypticle.return_value.dumps.return_value = {"test": "value"}
+        channel = salt.channel.server.PubServerChannel.factory(opts)
+        # The direct minions are matched as usual, syndic2 is left out
+        payload = channel.wrap_payload(
+            {"test": "value", "tgt_type": "glob", "tgt": "web*"}
+        )
+        assert payload["topic_lst"] == ["web-direct", "syndic1"]
+        assert payload["syndic_topics"] is True
+        # No syndic can be left out, they all get it through the syndic topic
+        payload = channel.wrap_payload(
+            {"test": "value", "tgt_type": "glob", "tgt": "*"}
+        )
+        assert payload["topic_lst"] == ["web-direct"]
+        assert "syndic_topics" not in payload
+
+
+async def test_publish_payload_syndic_topic(master_opts):
+    master_opts.update(zmq_filtering=True, order_masters=True)
+    server = salt.transport.zeromq.PublishServer(
+        master_opts,
+        pub_host="127.0.0.1",
+        pub_port=4506,
+        pull_path="/tmp/pull.ipc",
+    )
+    server.dpub_sock = MagicMock(send_multipart=AsyncMock())
+    await server.publish_payload(b"payload", ["minion"])
+    topics = [
+        call.args[0][0] for call in server.dpub_sock.send_multipart.call_args_list
+    ]
+    assert topics[1:] == [b"syndic"]
+    server.dpub_sock.send_multipart.reset_mock()
+    await server.publish_payload(b"payload", ["minion"], False)
+    server.dpub_sock.send_multipart.assert_called_once()
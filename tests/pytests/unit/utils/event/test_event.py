@@ -411,3 +411,115 @@ def test_event_fire_ret_load():
         )
         assert mock_log_error.mock_calls[0].args[1] == "minion_id.example.org"
         assert mock_log_error.mock_calls[0].args[2] == "".join(test_traceback)
+
+
+def test_event_multiplexer_prefixes():
+    assert sorted(salt.utils.event.EventMultiplexer.prefixes("salt/job/1/ret/m")) == [
+        "",
+        "salt",
+        "salt/",
+        "salt/job",
+        "salt/job/",
+        "salt/job/1",
+        "salt/job/1/",
+        "salt/job/1/ret",
+        "salt/job/1/ret/",
+        "salt/job/1/ret/m",
+    ]
+
+
+def test_event_fanout_abstract():
+    with pytest.raises(TypeError):
+        salt.utils.event.EventFanout({})
+
+
+async def test_event_multiplexer_dispatch(sock_dir):
+    opts = {"sock_dir": str(sock_dir)}
+    mux = salt.utils.event.EventMultiplexer(opts)
+    with patch.object(mux, "_connect"):
+        everything = mux.subscribe("")
+        job = mux.subscribe("salt/job/1")
+        ret = mux.subscribe("salt/job/1/ret/m1", "salt/job/2")
+    mux.dispatch("salt/job/1/new", {"jid": "1"})
+    mux.dispatch("salt/job/10/new", {"jid": "10"})
+    mux.dispatch("salt/job/1/ret/m1", {"id": "m1"})
+    assert (await job.get(timeout=0))["tag"] == "salt/job/1/new"
+    assert (await job.get(timeout=0))["tag"] == "salt/job/1/ret/m1"
+    assert await job.get(timeout=0) is None
+    assert (await ret.get(timeout=0))["tag"] == "salt/job/1/ret/m1"
+    assert await ret.get(timeout=0) is None
+    assert everything.queue.qsize() == 3
+
+    ret.close()
+    job.remove("salt/job/1")
+    assert set(mux.index) == {""}
+    mux.dispatch("salt/job/1/ret/m1", {"id": "m1"})
+    assert job.queue.empty()
+    assert ret.queue.empty()
+    mux.destroy()
+
+
+async def test_event_multiplexer_connect_retry(sock_dir):
+    mux = salt.utils.event.EventMultiplexer({"sock_dir": str(sock_dir)})
+    with patch.object(
+        mux, "_connect", side_effect=[OSError("refused"), None]
+    ) as connect:
+        assert await mux.connect(timeout=1) is False
+        # The failed connection is attempted again
+        assert await mux.connect(timeout=1) is True
+        assert connect.call_count == 2
+    mux.destroy()
+
+
+@pytest.mark.slow_test
+async def test_event_multiplexer_publisher(sock_dir):
+    with eventpublisher_process(str(sock_dir)):
+        with salt.utils.event.MasterEvent(str(sock_dir), listen=False) as me:
+            mux = salt.utils.event.get_event_multiplexer({"sock_dir": str(sock_dir)})
+            with mux.subscribe("evt1") as sub:
+                assert await mux.connect(timeout=5)
+                me.fire_event({"data": "foo2"}, "evt2")
+                me.fire_event({"data": "foo1"}, "evt1")
+                evt = await sub.get(timeout=5)
+                _assert_got_event(evt["data"], {"data": "foo1"})
+                assert sub.queue.empty()
+            mux.destroy()
+
+
+async def test_event_subscription_bounded(sock_dir):
+    mux = salt.utils.event.EventMultiplexer({"sock_dir": str(sock_dir)})
+    with patch.object(mux, "_connect"):
+        sub = mux.subscribe_tags(["salt/job/*/ret/*", "salt/key"], maxsize=2)
+    assert set(mux.index) == {"salt/job/", "salt/key"}
+    mux.dispatch("salt/job/1/new", {})
+    mux.dispatch("salt/key", {})
+    for minion_id in ("m1", "m2", "m3"):
+        mux.dispatch(f"salt/job/1/ret/{minion_id}", {"id": minion_id})
+    # The oldest events are dropped
+    assert sub.lag == 2
+    assert sub.dropped == 2
+    assert sub.take_dropped() == 2
+    assert sub.take_dropped() == 0
+    assert (await sub.get(timeout=0))["tag"] == "salt/job/1/ret/m2"
+    assert (await sub.get(timeout=0))["tag"] == "salt/job/1/ret/m3"
+    sub.close()
+    mux.destroy()
+
+
+def test_threaded_event_multiplexer(sock_dir):
+    mux = salt.utils.event.get_threaded_event_multiplexer({"sock_dir": str(sock_dir)})
+    assert (
+        salt.utils.event.get_threaded_event_multiplexer({"sock_dir": str(sock_dir)})
+        is mux
+    )
+    with patch.object(mux, "start"):
+        with mux.subscribe_tags() as sub:
+            mux.dispatch("salt/job/1/new", {"jid": "1"})
+            assert sub.get(timeout=0)["data"] == {"jid": "1"}
+            assert sub.get(timeout=0) is None
+    assert mux.index == {}
+    mux.destroy()
+    assert (
+        salt.utils.event.get_threaded_event_multiplexer({"sock_dir": str(sock_dir)})
+        is not mux
+    )
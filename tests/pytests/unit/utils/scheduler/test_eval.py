@@ -1121,3 +1121,53 @@ def test_eval_when_splay_in_past(schedule):
     ret = schedule.job_status(job_name)
     assert "_last_run" not in ret
     assert ret["_next_fire_time"] is None
+
+
+def test_eval_only_due_jobs(schedule):
+    """
+    verify that the jobs which are not due are not evaluated again
+    """
+    job = {
+        "schedule": {
+            "job_hourly": {"function": "test.ping", "hours": 1},
+            "job_minutely": {"function": "test.ping", "minutes": 1},
+        }
+    }
+    start = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    schedule.opts.update(job)
+    with patch.object(schedule, "_run_job") as run_job:
+        schedule.eval(now=start)
+        assert schedule._deadlines["job_minutely"][1] == start + datetime.timedelta(
+            minutes=1
+        )
+
+        with patch.object(
+            schedule, "_check_max_running", wraps=schedule._check_max_running
+        ) as check_max_running:
+            schedule.eval(now=start + datetime.timedelta(seconds=30))
+            check_max_running.assert_not_called()
+            schedule.eval(now=start + datetime.timedelta(minutes=1))
+            assert [call.args[1]["name"] for call in run_job.call_args_list] == [
+                "job_minutely"
+            ]
+            assert check_max_running.call_count == 1
+
+        assert schedule._deadlines["job_minutely"][1] == start + datetime.timedelta(
+            minutes=2
+        )
+
+
+def test_eval_modified_job(schedule):
+    """
+    verify that a job modified after its deadline was computed is evaluated
+    """
+    start = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    schedule.opts.update({"schedule": {"job1": {"function": "test.ping", "hours": 1}}})
+    with patch.object(schedule, "_run_job") as run_job:
+        schedule.eval(now=start)
+        schedule.modify_job(
+            "job1", {"function": "test.ping", "seconds": 10}, persist=False
+        )
+        schedule.eval(now=start + datetime.timedelta(seconds=5))
+        schedule.eval(now=start + datetime.timedelta(seconds=15))
+        run_job.assert_called_once()
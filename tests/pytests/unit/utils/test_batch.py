@@ -0,0 +1,279 @@
+import itertools
+
+import pytest
+
+import salt.utils.batch
+from salt.exceptions import AuthorizationError, SaltInvocationError
+from tests.support.mock import MagicMock, patch
+
+
+@pytest.fixture
+def opts(tmp_path):
+    return {
+        "cachedir": str(tmp_path),
+        "sock_dir": str(tmp_path),
+        "timeout": 5,
+        "gather_job_timeout": 10,
+        "keep_jobs_seconds": 86400,
+        "master_job_cache": "local_cache",
+        "hash_type": "sha256",
+    }
+
+
+class FakeServer(salt.utils.batch.BatchServer):
+    def __init__(self, opts, targets=()):
+        super().__init__(opts)
+        self.targets = list(targets)
+        self.published = []
+        self.events = []
+        self._jid = itertools.count(1)
+        self.local = MagicMock()
+
+    def publish(self, run, tgt, fun, arg=(), tgt_type="glob", timeout=None, **kwargs):
+        jid = str(next(self._jid))
+        self.published.append((jid, tgt, fun, list(arg)))
+        self.jids[jid] = run
+        minions = self.targets if fun == "test.ping" else list(tgt)
+        return {"jid": jid, "minions": minions}
+
+    def fire(self, data, tag):
+        self.events.append((tag, data))
+
+    def tags(self):
+        return [tag for tag, _ in self.events]
+
+
+def _data(opts, **kwargs):
+    with patch("salt.utils.batch._wake"):
+        bid = salt.utils.batch.submit(
+            opts, "*", "state.apply", ["web"], bid="20240101000000000001", **kwargs
+        )
+    return salt.utils.batch.read(opts, bid)
+
+
+def _ret(server, jid, minion_id, now, retcode=0):
+    server.handle_event(
+        {
+            "tag": f"salt/job/{jid}/ret/{minion_id}",
+            "data": {"id": minion_id, "jid": jid, "return": True, "retcode": retcode},
+        },
+        now,
+    )
+
+
+def _run(opts, server, **kwargs):
+    run = salt.utils.batch.BatchRun(server, _data(opts, **kwargs))
+    server.runs[run.id] = run
+    return run
+
+
+def test_batch_size():
+    assert salt.utils.batch.batch_size("2", 10) == 2
+    assert salt.utils.batch.batch_size(3, 10) == 3
+    assert salt.utils.batch.batch_size("50%", 10) == 5
+    assert salt.utils.batch.batch_size("10%", 3) == 1
+    with pytest.raises(ValueError):
+        salt.utils.batch.batch_size("ten", 10)
+
+
+def test_submit_invalid_batch(opts):
+    with pytest.raises(SaltInvocationError):
+        salt.utils.batch.submit(opts, "*", "test.ping", batch="ten")
+
+
+def test_submit_auth_list(opts):
+    data = _data(opts, user="bob", auth_list=["state.*"])
+    assert data["user"] == "bob"
+    assert data["auth_list"] == ["state.*"]
+    with pytest.raises(AuthorizationError):
+        salt.utils.batch.submit(
+            opts, "*", "cmd.run", ["id"], user="bob", auth_list=["state.*"]
+        )
+
+
+def test_cancel_owner(opts):
+    data = _data(opts, user="bob")
+    with patch("salt.utils.batch._wake"):
+        with pytest.raises(AuthorizationError):
+            salt.utils.batch.cancel(opts, data["id"], user="alice")
+        assert salt.utils.batch.cancel(opts, data["id"], user="bob")
+
+
+def test_server_publish_as_user(opts):
+    server = salt.utils.batch.BatchServer(opts)
+    server.local = MagicMock(salt_user="root")
+    users = []
+
+    def run_job(*args, **kwargs):
+        users.append(server.local.salt_user)
+        return {"jid": "1", "minions": ["m1"]}
+
+    server.local.run_job.side_effect = run_job
+    run = salt.utils.batch.BatchRun(
+        server, _data(opts, user="bob", auth_list=["state.*"])
+    )
+    assert server.publish(run, ["m1"], "state.apply", tgt_type="list")
+    assert users == ["bob"]
+    assert server.local.salt_user == "root"
+    assert server.local.run_job.call_args[1]["auth_list"] == ["state.*"]
+    assert server.jids == {"1": run}
+
+
+def test_batch_run(opts):
+    server = FakeServer(opts, targets=["m1", "m2", "m3", "down"])
+    run = _run(opts, server, batch=2)
+
+    run.step(0)
+    assert server.published[-1] == ("1", "*", "test.ping", [])
+    assert run.data["state"] == "gathering"
+    for minion_id in ("m1", "m2", "m3"):
+        _ret(server, "1", minion_id, 1)
+    run.step(5)
+    assert run.data["state"] == "running"
+    assert run.data["down"] == ["down"]
+    assert ("salt/batch/20240101000000000001/start") in server.tags()
+    # The first wave runs on two minions
+    assert server.published[-1] == ("2", ["m1", "m2"], "state.apply", ["web"])
+
+    _ret(server, "2", "m1", 6)
+    run.step(6)
+    assert server.published[-1] == ("3", ["m3"], "state.apply", ["web"])
+    _ret(server, "2", "m2", 7)
+    _ret(server, "3", "m3", 7, retcode=2)
+    run.step(7)
+    assert run.data["state"] == "done"
+    assert {
+        minion_id: minion["state"] for minion_id, minion in run.data["minions"].items()
+    } == {"m1": "done", "m2": "done", "m3": "failed"}
+    tags = server.tags()
+    assert "salt/batch/20240101000000000001/ret/m3" in tags
+    assert tags[-1] == "salt/batch/20240101000000000001/done"
+    assert server.events[-1][1] == {"state": "done", "counts": {"done": 2, "failed": 1}}
+
+
+def test_batch_wait(opts):
+    server = FakeServer(opts, targets=["m1", "m2"])
+    run = _run(opts, server, batch=1, batch_wait=10)
+    run.step(0)
+    _ret(server, "1", "m1", 0)
+    _ret(server, "1", "m2", 0)
+    run.step(0)
+    assert server.published[-1][1] == ["m1"]
+    _ret(server, "2", "m1", 1)
+    run.step(5)
+    # The slot of m1 is held for batch_wait seconds
+    assert len(server.published) == 2
+    run.step(11.5)
+    assert server.published[-1][1] == ["m2"]
+
+
+def test_batch_retries(opts):
+    server = FakeServer(opts, targets=["m1"])
+    run = _run(opts, server, batch=1, retries=1)
+    run.step(0)
+    _ret(server, "1", "m1", 0)
+    run.step(0)
+    _ret(server, "2", "m1", 1, retcode=1)
+    assert "salt/batch/20240101000000000001/retry/m1" in server.tags()
+    run.step(1)
+    assert server.published[-1][1] == ["m1"]
+    _ret(server, "3", "m1", 2)
+    run.step(2)
+    assert run.data["state"] == "done"
+    assert run.data["minions"]["m1"]["attempts"] == 2
+    assert run.data["minions"]["m1"]["retcode"] == 0
+
+
+def test_batch_failhard(opts):
+    server = FakeServer(opts, targets=["m1", "m2"])
+    run = _run(opts, server, batch=1, failhard=True)
+    run.step(0)
+    _ret(server, "1", "m1", 0)
+    _ret(server, "1", "m2", 0)
+    run.step(0)
+    _ret(server, "2", "m1", 1, retcode=1)
+    assert run.data["state"] == "failed"
+    run.step(1)
+    # The job is not published to the next minions
+    assert len(server.published) == 2
+
+
+def test_batch_job_liveness(opts):
+    server = FakeServer(opts, targets=["m1", "m2"])
+    run = _run(opts, server, batch=2)
+    run.step(0)
+    _ret(server, "1", "m1", 0)
+    _ret(server, "1", "m2", 0)
+    run.step(0)
+    server.handle_event(
+        {"tag": "salt/job/2/alive", "data": {"jid": "2", "alive": {"m1": 5}}}, 4
+    )
+    run.step(6)
+    # m1 sends heartbeats, m2 is asked whether it still runs the job
+    assert server.published[-1] == ("3", ["m2"], "saltutil.find_job", ["2"])
+    assert run.data["minions"]["m1"]["state"] == "running"
+    assert run.data["minions"]["m2"]["state"] == "probing"
+    run.step(17)
+    assert run.data["minions"]["m2"]["state"] == "failed"
+    assert server.events[-1][1]["failed"] is True
+    _ret(server, "2", "m1", 18)
+    run.step(18)
+    assert run.data["state"] == "done"
+
+
+def test_server_scan(opts):
+    data = _data(opts, batch=1)
+    server = FakeServer(opts)
+    server.scan(0)
+    assert salt.utils.batch.server_running(opts)
+    run = server.runs[data["id"]]
+    assert run.data["state"] == "pending"
+
+    with patch("salt.utils.batch._wake"):
+        assert salt.utils.batch.cancel(opts, data["id"])
+    server.scan(1)
+    server.step(1)
+    assert data["id"] not in server.runs
+    assert salt.utils.batch.read(opts, data["id"])["state"] == "cancelled"
+
+
+def test_server_resume(opts):
+    data = _data(opts, batch=2)
+    data["state"] = "running"
+    data["bnum"] = 2
+    data["minions"] = {
+        "m1": {"state": "running", "jid": "7", "attempts": 1},
+        "m2": {"state": "running", "jid": "7", "attempts": 1},
+    }
+    salt.utils.batch.write(opts, data)
+    server = FakeServer(opts)
+    server.local.returners = {
+        "local_cache.get_jid": MagicMock(
+            return_value={"m1": {"return": True, "retcode": 0}}
+        )
+    }
+    server.scan(0)
+    run = server.runs[data["id"]]
+    # The return received while the batch server was stopped is picked up
+    assert run.data["minions"]["m1"]["state"] == "done"
+    assert run.data["minions"]["m2"]["state"] == "running"
+    _ret(server, "7", "m2", 1)
+    server.step(1)
+    assert salt.utils.batch.read(opts, data["id"])["state"] == "done"
+
+
+def test_server_scan_finished(opts):
+    data = _data(opts, batch=1)
+    data["state"] = "done"
+    data["finished"] = 10
+    salt.utils.batch.write(opts, data)
+    server = FakeServer(opts)
+    with patch("salt.utils.batch.read", wraps=salt.utils.batch.read) as read:
+        server.scan(20)
+        # The finished batches are only read once
+        server.scan(30)
+        assert read.call_count == 1
+    assert data["id"] not in server.runs
+    server.scan(10 + opts["keep_jobs_seconds"] + 1)
+    assert salt.utils.batch.read(opts, data["id"]) is None
+    assert not server.finished
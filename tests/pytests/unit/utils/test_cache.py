@@ -47,6 +47,27 @@ def test_ttl():
         cd["foo"]  # pylint: disable=pointless-statement
 
 
+def test_bounded():
+    cd = cache.BoundedCacheDict(5, 2)
+    cd["foo"] = 1
+    cd["bar"] = 2
+    cd["foo"] = 3
+    cd["baz"] = 4
+    # bar is the oldest entry since foo was set again
+    assert "bar" not in cd
+    assert cd["foo"] == 3
+    assert cd["baz"] == 4
+    assert cd.pop("foo") == 3
+    assert cd.pop("foo", None) is None
+    cd.clear()
+    assert not cd
+
+    cd = cache.BoundedCacheDict(0.1, 2)
+    cd["foo"] = "bar"
+    time.sleep(0.2)
+    assert "foo" not in cd
+
+
 @pytest.fixture
 def cache_dir(minion_opts):
     return pathlib.Path(minion_opts["cachedir"])
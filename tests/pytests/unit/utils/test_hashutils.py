@@ -0,0 +1,125 @@
+import os
+import time
+
+import pytest
+
+import salt.utils.files
+import salt.utils.hashutils
+import salt.utils.json
+from tests.support.mock import patch
+
+
+@pytest.fixture
+def cachedir(tmp_path):
+    return str(tmp_path / "file_hashes")
+
+
+@pytest.fixture
+def tfile(tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_text("Salt\n")
+    # Trust the sums recorded right after the file was written
+    with patch.object(salt.utils.hashutils, "HASH_CACHE_RACY_WINDOW", 0):
+        yield str(path)
+
+
+def test_get_cached_hash(cachedir, tfile):
+    expected = salt.utils.hashutils.get_hash(tfile, "sha256")
+    assert salt.utils.hashutils.get_cached_hash(tfile, cachedir=cachedir) == expected
+    with patch("salt.utils.hashutils.get_hash") as get_hash:
+        assert (
+            salt.utils.hashutils.get_cached_hash(tfile, cachedir=cachedir) == expected
+        )
+    get_hash.assert_not_called()
+    # The sums are cached per algorithm
+    assert salt.utils.hashutils.get_cached_hash(
+        tfile, "md5", cachedir=cachedir
+    ) == salt.utils.hashutils.get_hash(tfile, "md5")
+
+
+def test_get_cached_hash_stat_changed(cachedir, tfile):
+    salt.utils.hashutils.get_cached_hash(tfile, cachedir=cachedir)
+    stat = os.stat(tfile)
+    # Same size and mtime, the ctime changes
+    with salt.utils.files.fopen(tfile, "w") as fp_:
+        fp_.write("Tlas\n")
+    os.utime(tfile, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert salt.utils.hashutils.get_cached_hash(
+        tfile, cachedir=cachedir
+    ) == salt.utils.hashutils.get_hash(tfile, "sha256")
+
+
+def test_get_cached_hash_racy(cachedir, tmp_path):
+    path = str(tmp_path / "recent.txt")
+    with salt.utils.files.fopen(path, "w") as fp_:
+        fp_.write("Salt\n")
+    expected = salt.utils.hashutils.get_hash(path, "sha256")
+    assert salt.utils.hashutils.get_cached_hash(path, cachedir=cachedir) == expected
+    assert os.path.exists(salt.utils.hashutils._hash_cache_file(cachedir, path))
+    # The sum was recorded too soon after the file was written to be trusted
+    with patch("salt.utils.hashutils.get_hash", return_value=expected) as get_hash:
+        assert salt.utils.hashutils.get_cached_hash(path, cachedir=cachedir) == expected
+    get_hash.assert_called_once()
+
+
+def test_record_hash(cachedir, tfile):
+    salt.utils.hashutils.record_hash(cachedir, tfile, "sha256", "abc")
+    assert salt.utils.hashutils.get_cached_hash(tfile, cachedir=cachedir) == "abc"
+
+
+def test_record_hash_changed_while_hashing(cachedir, tfile):
+    stat = os.stat(tfile)
+    with salt.utils.files.fopen(tfile, "a") as fp_:
+        fp_.write("more\n")
+    salt.utils.hashutils.record_hash(cachedir, tfile, "sha256", "abc", stat=stat)
+    assert salt.utils.hashutils.get_cached_hash(tfile, cachedir=cachedir) != "abc"
+
+
+def test_record_hash_computed(cachedir, tfile):
+    expected = salt.utils.hashutils.get_hash(tfile, "sha256")
+    salt.utils.hashutils.record_hash(cachedir, tfile, "sha256")
+    with patch("salt.utils.hashutils.get_hash") as get_hash:
+        assert (
+            salt.utils.hashutils.get_cached_hash(tfile, cachedir=cachedir) == expected
+        )
+    get_hash.assert_not_called()
+
+
+def test_record_hash_racy(cachedir, tmp_path):
+    path = str(tmp_path / "recent.txt")
+    with salt.utils.files.fopen(path, "w") as fp_:
+        fp_.write("Salt\n")
+    salt.utils.hashutils.record_hash(cachedir, path, "sha256", "abc")
+    # The sum is recorded, and ignored while it is racy
+    with salt.utils.files.fopen(
+        salt.utils.hashutils._hash_cache_file(cachedir, path), "r"
+    ) as fp_:
+        entry = salt.utils.json.load(fp_)
+    assert entry["sums"] == {"sha256": "abc"}
+    assert entry["recorded"] <= time.time()
+    assert salt.utils.hashutils.get_cached_hash(
+        path, cachedir=cachedir
+    ) == salt.utils.hashutils.get_hash(path, "sha256")
+
+
+def test_prune_hash_cache(cachedir, tmp_path, tfile):
+    other = tmp_path / "other.txt"
+    other.write_text("Salt\n")
+    salt.utils.hashutils.record_hash(cachedir, tfile, "sha256", "abc")
+    salt.utils.hashutils.record_hash(cachedir, str(other), "sha256", "abc")
+    other.unlink()
+    salt.utils.hashutils.prune_hash_cache(cachedir)
+    assert salt.utils.hashutils.get_cached_hash(tfile, cachedir=cachedir) == "abc"
+    assert not os.path.exists(
+        salt.utils.hashutils._hash_cache_file(cachedir, str(other))
+    )
+    # The old entries are removed
+    salt.utils.hashutils.prune_hash_cache(cachedir, max_age=-120)
+    assert salt.utils.hashutils.get_cached_hash(tfile, cachedir=cachedir) != "abc"
+
+
+def test_get_cached_hash_missing_file(cachedir, tmp_path):
+    with pytest.raises(OSError):
+        salt.utils.hashutils.get_cached_hash(
+            str(tmp_path / "missing"), cachedir=cachedir
+        )
@@ -0,0 +1,142 @@
+import os
+import time
+
+import pytest
+
+import salt.crypt
+import salt.utils.keystore
+from tests.support.mock import patch
+
+
+@pytest.fixture(params=["localfs", "indexed"])
+def store(request, tmp_path):
+    for state in salt.utils.keystore.STATES:
+        (tmp_path / state).mkdir()
+    opts = {"pki_dir": str(tmp_path), "key_store": request.param}
+    return salt.utils.keystore.BACKENDS[request.param](opts, str(tmp_path))
+
+
+def _touch_dir(path):
+    # Make sure the modification time of the directory changes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+
+def test_list_and_match(store):
+    for minion_id in ("web1", "Web2", "db1"):
+        store.write(salt.utils.keystore.PEND, minion_id, "pub")
+    assert store.list_state(salt.utils.keystore.PEND) == ["db1", "web1", "Web2"]
+    assert store.list_keys()[salt.utils.keystore.ACC] == []
+    assert store.match("web*") == {salt.utils.keystore.PEND: ["web1"]}
+    assert store.match("db1,Web2") == {salt.utils.keystore.PEND: ["db1", "Web2"]}
+    assert store.match(["nope"]) == {}
+
+
+def test_batch_operations(store):
+    for minion_id in ("web1", "web2"):
+        store.write(salt.utils.keystore.PEND, minion_id, minion_id)
+    store.list_keys()
+    assert store.move(
+        ["web1", "web2", "gone"], salt.utils.keystore.PEND, salt.utils.keystore.ACC
+    ) == ["web1", "web2"]
+    assert store.list_state(salt.utils.keystore.PEND) == []
+    assert store.list_state(salt.utils.keystore.ACC) == ["web1", "web2"]
+    assert store.read(salt.utils.keystore.ACC, "web2") == "web2"
+    assert store.read(salt.utils.keystore.PEND, "web2") is None
+    assert store.delete(salt.utils.keystore.ACC, ["web1", "gone"]) == ["web1"]
+    assert store.list_state(salt.utils.keystore.ACC) == ["web2"]
+    assert not store.exists(salt.utils.keystore.ACC, "web1")
+
+
+def test_external_changes(store, tmp_path):
+    store.write(salt.utils.keystore.ACC, "web1", "pub1")
+    assert store.read(salt.utils.keystore.ACC, "web1") == "pub1"
+    assert store.list_state(salt.utils.keystore.ACC) == ["web1"]
+
+    # Keys added and changed behind the back of the store are seen
+    acc = tmp_path / salt.utils.keystore.ACC
+    (acc / "web2").write_text("pub2")
+    (acc / "web1").write_text("pub1 changed")
+    _touch_dir(acc)
+    assert store.list_state(salt.utils.keystore.ACC) == ["web1", "web2"]
+    assert store.read(salt.utils.keystore.ACC, "web1") == "pub1 changed"
+
+
+def test_indexed_store_cached(tmp_path):
+    for state in salt.utils.keystore.STATES:
+        (tmp_path / state).mkdir()
+    store = salt.utils.keystore.IndexedKeyStore({}, str(tmp_path))
+    store.write(salt.utils.keystore.ACC, "web1", "pub1")
+    # Move the files out of the racy window
+    now = time.time() + 60
+    with patch("time.time", return_value=now):
+        store.list_state(salt.utils.keystore.ACC)
+        store.read(salt.utils.keystore.ACC, "web1")
+        with patch("os.listdir") as listdir, patch(
+            "salt.utils.files.fopen"
+        ) as fopen, patch.object(salt.crypt, "PublicKey") as public_key:
+            assert store.list_state(salt.utils.keystore.ACC) == ["web1"]
+            assert store.read(salt.utils.keystore.ACC, "web1") == "pub1"
+            assert store.public_key(salt.utils.keystore.ACC, "web1") is (
+                store.public_key(salt.utils.keystore.ACC, "web1")
+            )
+            listdir.assert_not_called()
+            fopen.assert_not_called()
+            public_key.assert_called_once()
+        # The listings updated by the store are read again out of the racy
+        # window
+        store.move(["web1"], salt.utils.keystore.ACC, salt.utils.keystore.REJ)
+        with patch("os.listdir", return_value=[]) as listdir:
+            assert store.list_state(salt.utils.keystore.ACC) == []
+            listdir.assert_called_once()
+
+
+def test_indexed_store_updated(tmp_path):
+    for state in salt.utils.keystore.STATES:
+        (tmp_path / state).mkdir()
+    store = salt.utils.keystore.IndexedKeyStore({}, str(tmp_path))
+    store.write(salt.utils.keystore.ACC, "web1", "pub1")
+    with patch("time.time", return_value=time.time() + 60):
+        store.list_state(salt.utils.keystore.ACC)
+
+    # The listings changed by the store are updated in place
+    with patch("os.listdir") as listdir:
+        store.write(salt.utils.keystore.ACC, "Web3", "pub3")
+        store.write(salt.utils.keystore.ACC, "web2", "pub2")
+        store.move(["web1"], salt.utils.keystore.ACC, salt.utils.keystore.REJ)
+        store.delete(salt.utils.keystore.ACC, ["Web3"])
+        assert store.list_state(salt.utils.keystore.ACC) == ["web2"]
+        listdir.assert_not_called()
+    # The listings not kept are read
+    assert store.list_state(salt.utils.keystore.REJ) == ["web1"]
+
+    # The updated listings are read again once out of the racy window
+    with patch("time.time", return_value=time.time() + 60), patch(
+        "os.listdir", return_value=["web2"]
+    ) as listdir:
+        assert store.list_state(salt.utils.keystore.ACC) == ["web2"]
+        assert store.list_state(salt.utils.keystore.ACC) == ["web2"]
+        listdir.assert_called_once()
+
+
+def test_indexed_store_racy(tmp_path):
+    for state in salt.utils.keystore.STATES:
+        (tmp_path / state).mkdir()
+    store = salt.utils.keystore.IndexedKeyStore({}, str(tmp_path))
+    store.write(salt.utils.keystore.ACC, "web1", "pub1")
+    assert store.list_state(salt.utils.keystore.ACC) == ["web1"]
+    assert store.read(salt.utils.keystore.ACC, "web1") == "pub1"
+    # The directories and files just modified are not cached
+    assert not store._index
+    assert not store._keys
+
+
+def test_get_key_store(tmp_path):
+    opts = {"pki_dir": str(tmp_path), "key_store": "indexed"}
+    store = salt.utils.keystore.get_key_store(opts)
+    assert isinstance(store, salt.utils.keystore.IndexedKeyStore)
+    assert salt.utils.keystore.get_key_store(dict(opts)) is store
+    opts["key_store"] = "localfs"
+    assert type(salt.utils.keystore.get_key_store(opts)) is (
+        salt.utils.keystore.LocalFSKeyStore
+    )
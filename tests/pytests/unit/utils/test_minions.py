@@ -1,7 +1,11 @@
+import time
+
 import pytest
 
 import salt.utils.minions
 import salt.utils.network
+import salt.utils.presence
+from salt.exceptions import SaltCacheError
 from tests.support.mock import patch
 
 
@@ -56,6 +60,60 @@ def test_connected_ids_remote_minions():
         assert ret == {minion2, minion}
 
 
+def test_connected_ids_presence_registry(tmp_path):
+    """
+    test ckminion connected_ids when the publish servers
+    maintain a presence registry
+    """
+    opts = {
+        "sock_dir": str(tmp_path),
+        "publish_port": 4505,
+        "detect_remote_minions": False,
+        "minion_data_cache": True,
+    }
+    registry = salt.utils.presence.PresenceRegistry(opts, "tcp")
+    registry.add("minion1", ("203.0.113.1", 40000))
+    registry.add("minion2", ("203.0.113.2", 40000))
+    registry.flush()
+    patch_net = patch("salt.utils.network.local_port_tcp")
+    patch_list = patch("salt.cache.Cache.list")
+    ckminions = salt.utils.minions.CkMinions(opts)
+    with patch_net as local_port_tcp, patch_list as cache_list:
+        assert ckminions.connected_ids() == {"minion1", "minion2"}
+        assert ckminions.connected_ids(subset=["minion2", "minion3"]) == {"minion2"}
+        assert ckminions.connected_ids(show_ip=True) == {
+            ("minion1", "203.0.113.1"),
+            ("minion2", "203.0.113.2"),
+        }
+        local_port_tcp.assert_not_called()
+        cache_list.assert_not_called()
+
+
+def test_connected_ids_presence_registry_addresses(tmp_path):
+    """
+    test ckminion connected_ids when the zeromq publish server
+    registers the addresses of the connected minions
+    """
+    opts = {
+        "sock_dir": str(tmp_path),
+        "publish_port": 4505,
+        "detect_remote_minions": False,
+        "minion_data_cache": True,
+    }
+    registry = salt.utils.presence.PresenceRegistry(opts, "zeromq")
+    registry.add_address(10, ("203.0.113.1", 40000))
+    registry.flush()
+    mdata = {"grains": {"ipv4": ["203.0.113.1"], "ipv6": []}}
+    mdata2 = {"grains": {"ipv4": ["203.0.113.2"], "ipv6": []}}
+    patch_net = patch("salt.utils.network.local_port_tcp")
+    patch_list = patch("salt.cache.Cache.list", return_value=["minion", "minion2"])
+    patch_fetch = patch("salt.cache.Cache.fetch", side_effect=[mdata, mdata2])
+    ckminions = salt.utils.minions.CkMinions(opts)
+    with patch_net as local_port_tcp, patch_list, patch_fetch:
+        assert ckminions.connected_ids() == {"minion"}
+        local_port_tcp.assert_not_called()
+
+
 # These validate_tgt tests make the assumption that CkMinions.check_minions is
 # correct. In other words, these tests are only worthwhile if check_minions is
 # also correct.
@@ -116,3 +174,167 @@ def test_validate_tgt_should_return_true_when_all_minions_are_found_in_valid_min
             "fnord", "fnord", "fnord", minions=target_minions
         )
         assert result is True
+
+
+SYNDIC_SUMMARY = {
+    "minions": ["web1", "web2", "db1"],
+    "grain_names": ["os"],
+    "grains": {"web1": {"os": "Debian"}, "web2": {"os": "Debian"}},
+}
+
+
+@pytest.mark.parametrize(
+    "expr,tgt_type,expected",
+    [
+        ("web*", "glob", True),
+        ("mail*", "glob", False),
+        ("^db[0-9]$", "pcre", True),
+        ("^mail", "pcre", False),
+        ("mail1,db1", "list", True),
+        (["mail1", "mail2"], "list", False),
+        ("os:Debian", "grain", True),
+        # db1 has no cached grains, it could match
+        ("os:Windows", "grain", True),
+        # the syndic does not advertise the kernel grain
+        ("kernel:Linux", "grain", True),
+        ("G@os:Debian and web*", "compound", True),
+    ],
+)
+def test_syndic_summary_match(expr, tgt_type, expected):
+    assert (
+        salt.utils.minions.syndic_summary_match(SYNDIC_SUMMARY, expr, tgt_type)
+        is expected
+    )
+
+
+def test_syndic_summary_match_grains():
+    summary = dict(SYNDIC_SUMMARY, minions=["web1", "web2"])
+    assert not salt.utils.minions.syndic_summary_match(summary, "os:Windows", "grain")
+    assert salt.utils.minions.syndic_summary_match(summary, "os:Deb.*", "grain_pcre")
+
+
+@pytest.fixture
+def syndic_ckminions():
+    now = time.time()
+    summaries = {
+        "syndic1": dict(SYNDIC_SUMMARY, stamp=now),
+        "syndic2": {"minions": ["mail1"], "grain_names": [], "grains": {}},
+        "syndic3": {"minions": ["ftp1"], "stamp": now},
+    }
+    summaries["syndic2"]["stamp"] = now
+    ckminions = salt.utils.minions.CkMinions(
+        {"cachedir": "", "syndic_advertise_interval": 60}
+    )
+    with patch(
+        "salt.cache.Cache.list", side_effect=lambda bank: list(summaries)
+    ), patch(
+        "salt.cache.Cache.updated", side_effect=lambda bank, key: int(now) - 10
+    ), patch(
+        "salt.cache.Cache.fetch", side_effect=lambda bank, key: summaries[key]
+    ) as fetch, patch.object(
+        ckminions,
+        "_pki_minions",
+        return_value=["minion", "syndic1", "syndic2", "syndic3", "syndic4"],
+    ):
+        yield ckminions, summaries, fetch
+
+
+def test_syndic_topics(syndic_ckminions):
+    ckminions, summaries, fetch = syndic_ckminions
+    # The matched minions are kept, syndic4 has no summary and is only sent
+    # the publications sent to every syndic
+    assert ckminions.syndic_topics("web*", minions=["web-direct"]) == [
+        "web-direct",
+        "syndic1",
+    ]
+    assert ckminions.syndic_topics("mail1,web1", "list") == ["syndic1", "syndic2"]
+    # A pruned syndic matched among the accepted keys is left out as well
+    assert ckminions.syndic_topics(
+        "^(web|syndic)", "pcre", minions=["syndic2", "syndic3", "syndic4"]
+    ) == ["syndic4", "syndic1"]
+    # The summaries are only fetched again when they are updated
+    assert fetch.call_count == 3
+
+    # An outdated summary does not prove anything
+    summaries["syndic2"]["stamp"] = time.time() - 3600
+    ckminions._syndic_summaries_read = 0
+    assert ckminions.syndic_topics("web*") == ["syndic1", "syndic2"]
+
+
+def test_syndic_summaries_ttl(syndic_ckminions):
+    ckminions, summaries, fetch = syndic_ckminions
+    with patch("salt.cache.Cache.list", return_value=list(summaries)) as list_:
+        assert ckminions.syndic_summaries() == summaries
+        assert ckminions.syndic_summaries() == summaries
+        list_.assert_called_once()
+        ckminions._syndic_summaries_read -= salt.utils.minions.SYNDIC_SUMMARIES_TTL
+        assert ckminions.syndic_summaries() == summaries
+        assert list_.call_count == 2
+
+
+def test_syndic_topics_publish_to_all(syndic_ckminions):
+    ckminions, summaries, _ = syndic_ckminions
+    # Every syndic may match
+    assert ckminions.syndic_topics("*") is None
+    # new1 may have just been accepted behind a syndic
+    assert ckminions.syndic_topics("web1,new1", "list") is None
+    ckminions._syndic_summaries_read = 0
+    with patch("salt.cache.Cache.list", side_effect=SaltCacheError("unavailable")):
+        assert ckminions.syndic_topics("web*") is None
+
+
+@pytest.mark.parametrize(
+    "regex,fun,expected",
+    [
+        ("test.ping", "test.ping", True),
+        ("test.ping", "test.pingx", True),
+        ("test.ping", "tes.ping", False),
+        ("tests?.ping", "test.ping", True),
+        ("te{0,1}st.*", "tst.arg", True),
+        ("pkg.*|test.*", "test.arg", True),
+        ("(?i)TEST.*", "test.arg", True),
+        (".*", "state.apply", True),
+        ("state.(apply|sls)", "state.sls", True),
+        ("state.(apply|sls)", "state.highstate", False),
+        ("[", "test.ping", False),
+    ],
+)
+def test_function_conditions(regex, fun, expected):
+    conds = salt.utils.minions.FunctionConditions()
+    conds.add(regex)
+    assert conds.check(fun) is expected
+    assert bool(salt.utils.minions.CkMinions({}).match_check(regex, fun)) is expected
+
+
+def test_compiled_acl_cached():
+    ckminions = salt.utils.minions.CkMinions({})
+    auth_list = [
+        "test.*",
+        {"minion1": ["pkg.*", {"cmd.run": {"args": ["ls .*"]}}]},
+        {"minion1": [{"cmd.run": {"kwargs": {"cwd": "/tmp"}}}]},
+    ]
+    acl = ckminions.compile_acl(auth_list)
+    assert ckminions.compile_acl(list(auth_list)) is acl
+    assert ckminions.compile_acl(auth_list[:1]) is not acl
+
+    with patch.object(
+        ckminions, "check_minions", return_value={"minions": ["minion1"]}
+    ) as check_minions:
+        assert ckminions.auth_check(auth_list, "pkg.install", [], "minion1")
+        assert ckminions.auth_check(auth_list, "cmd.run", ["ls -l"], "minion1")
+        assert ckminions.auth_check(
+            auth_list,
+            "cmd.run",
+            ["rm -rf /", {"__kwarg__": True, "cwd": "/tmp"}],
+            "minion1",
+        )
+        assert not ckminions.auth_check(auth_list, "cmd.run", ["rm"], "minion1")
+        assert ckminions.auth_check(
+            auth_list, ["test.ping", "pkg.install"], [[], []], "minion1"
+        )
+        check_minions.reset_mock()
+        assert not ckminions.auth_check(
+            auth_list, ["cmd.run", "cmd.run"], [["rm"], ["rm"]], "minion1"
+        )
+        # The target of the entries is checked once for all the functions
+        assert check_minions.call_count == 2
@@ -28,3 +28,77 @@ CURRENT_PKGS = {
 def test_match_wildcard(current_pkgs, pkg_params, expected):
     result = salt.utils.pkg.match_wildcard(current_pkgs, pkg_params)
     assert result == expected
+
+
+@pytest.fixture
+def inventory_opts(tmp_path):
+    return {"cachedir": str(tmp_path), "pkg_inventory_cache": True}
+
+
+def test_db_fingerprint(tmp_path):
+    dbfile = tmp_path / "status"
+    assert salt.utils.pkg.db_fingerprint([str(dbfile)]) is None
+    dbfile.write_text("Package: bash\n")
+    fingerprint = salt.utils.pkg.db_fingerprint(
+        [str(dbfile), str(tmp_path / "missing")]
+    )
+    assert [entry[0] for entry in fingerprint] == [str(dbfile)]
+    dbfile.write_text("Package: bash\nPackage: zsh\n")
+    assert salt.utils.pkg.db_fingerprint([str(dbfile)]) != fingerprint
+
+
+def test_db_fingerprint_wal(tmp_path):
+    """
+    The changes of a sqlite database in WAL mode only touch the -wal file
+    """
+    dbfile = tmp_path / "rpmdb.sqlite"
+    walfile = tmp_path / "rpmdb.sqlite-wal"
+    paths = [str(dbfile), str(walfile)]
+    dbfile.write_bytes(b"db")
+    walfile.write_bytes(b"")
+    fingerprint = salt.utils.pkg.db_fingerprint(paths)
+    walfile.write_bytes(b"page")
+    assert salt.utils.pkg.db_fingerprint(paths) != fingerprint
+
+
+def test_inventory_cache(inventory_opts):
+    fingerprint = [["/var/lib/dpkg/status", 1, 2, 3]]
+    assert (
+        salt.utils.pkg.read_inventory_cache(inventory_opts, "aptpkg", fingerprint)
+        is None
+    )
+    salt.utils.pkg.write_inventory_cache(
+        inventory_opts, "aptpkg", fingerprint, CURRENT_PKGS
+    )
+    assert (
+        salt.utils.pkg.read_inventory_cache(inventory_opts, "aptpkg", fingerprint)
+        == CURRENT_PKGS
+    )
+    # The cache is not used once the package database changed
+    assert (
+        salt.utils.pkg.read_inventory_cache(
+            inventory_opts, "aptpkg", [["/var/lib/dpkg/status", 1, 2, 4]]
+        )
+        is None
+    )
+    assert salt.utils.pkg.read_inventory_cache(inventory_opts, "aptpkg", None) is None
+    salt.utils.pkg.clear_inventory_cache(inventory_opts, "aptpkg")
+    assert (
+        salt.utils.pkg.read_inventory_cache(inventory_opts, "aptpkg", fingerprint)
+        is None
+    )
+    # Clearing a missing cache is not an error
+    salt.utils.pkg.clear_inventory_cache(inventory_opts, "aptpkg")
+
+
+def test_inventory_cache_disabled(inventory_opts):
+    fingerprint = [["/var/lib/rpm/rpmdb.sqlite", 1, 2, 3]]
+    inventory_opts["pkg_inventory_cache"] = False
+    salt.utils.pkg.write_inventory_cache(
+        inventory_opts, "yumpkg", fingerprint, CURRENT_PKGS
+    )
+    inventory_opts["pkg_inventory_cache"] = True
+    assert (
+        salt.utils.pkg.read_inventory_cache(inventory_opts, "yumpkg", fingerprint)
+        is None
+    )
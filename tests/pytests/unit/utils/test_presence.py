@@ -0,0 +1,117 @@
+import os
+import time
+
+import pytest
+
+import salt.utils.presence
+from tests.support.mock import patch
+
+
+@pytest.fixture
+def opts(tmp_path):
+    return {"sock_dir": str(tmp_path)}
+
+
+@pytest.fixture
+def registry(opts):
+    return salt.utils.presence.PresenceRegistry(opts, "tcp")
+
+
+def test_no_registry(opts):
+    assert salt.utils.presence.load(opts) is None
+    assert salt.utils.presence.load({}) is None
+
+
+def test_registry(opts, registry):
+    registry.add("minion1", ("203.0.113.1", 40000))
+    registry.add("minion2", ("::ffff:203.0.113.2", 40001))
+    registry.flush()
+
+    presence = salt.utils.presence.load(opts)
+    assert "minion1" in presence
+    assert presence.minions["minion1"]["addr"] == "203.0.113.1"
+    assert presence.minions["minion2"]["addr"] == "203.0.113.2"
+    assert presence.addrs == set()
+
+    # A minion connected twice is present until both connections are gone
+    registry.add("minion1", ("203.0.113.1", 40002))
+    registry.remove("minion1")
+    registry.flush()
+    assert "minion1" in salt.utils.presence.load(opts)
+    registry.remove("minion1")
+    registry.flush()
+    assert "minion1" not in salt.utils.presence.load(opts)
+
+    registry.stop()
+    assert salt.utils.presence.load(opts) is None
+
+
+def test_registry_addresses(opts):
+    registry = salt.utils.presence.PresenceRegistry(opts, "zeromq")
+    registry.add_address(10, ("203.0.113.1", 40000))
+    registry.add_address(11, ("203.0.113.1", 40001))
+    registry.add_address(12, ("203.0.113.2", 40002))
+    registry.remove_address(12)
+    registry.flush()
+    presence = salt.utils.presence.load(opts)
+    assert presence.minions == {}
+    assert presence.addrs == {"203.0.113.1"}
+
+
+def test_registries_merged(opts, registry):
+    registry.add("minion1", ("203.0.113.1", 40000))
+    registry.flush()
+    other = salt.utils.presence.PresenceRegistry(opts, "ws")
+    other.add("minion2", ("203.0.113.2", 40000))
+    other.flush()
+    assert set(salt.utils.presence.load(opts).minions) == {"minion1", "minion2"}
+
+
+def test_stale_registry(opts, registry):
+    registry.add("minion1", ("203.0.113.1", 40000))
+    registry.flush()
+    stale = time.time() - salt.utils.presence.STALE_AFTER - 1
+    os.utime(registry.path, (stale, stale))
+    assert salt.utils.presence.load(opts) is None
+
+    # Flushing an unchanged registry touches it
+    registry.flush()
+    assert "minion1" in salt.utils.presence.load(opts)
+
+
+def test_registry_read_once(opts, registry):
+    registry.add("minion1", ("203.0.113.1", 40000))
+    registry.flush()
+    salt.utils.presence.load(opts)
+    with patch("salt.payload.loads") as loads:
+        registry.flush()
+        assert "minion1" in salt.utils.presence.load(opts)
+        loads.assert_not_called()
+
+        registry.seen("minion1")
+        registry.flush()
+        salt.utils.presence.load(opts)
+        loads.assert_called_once()
+
+
+def test_registry_rewritten_same_size(opts, registry):
+    registry.add("minion1", ("203.0.113.1", 40000))
+    registry.flush()
+    assert "minion1" in salt.utils.presence.load(opts)
+
+    # A registry replaced by one of the same size on the same inode is read
+    # again
+    other = salt.utils.presence.PresenceRegistry(opts, "other")
+    other.add("minion2", ("203.0.113.1", 40000))
+    other.flush()
+    with open(other.path, "rb") as fp_:
+        data = fp_.read()
+    other.stop()
+    stat = os.stat(registry.path)
+    assert len(data) == stat.st_size
+    with open(registry.path, "r+b") as fp_:
+        fp_.write(data)
+    os.utime(registry.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+    presence = salt.utils.presence.load(opts)
+    assert "minion1" not in presence
+    assert "minion2" in presence
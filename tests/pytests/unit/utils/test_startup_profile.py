@@ -0,0 +1,176 @@
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+import salt.utils.startup_profile
+from tests.support.mock import patch
+
+# Modules the salt CLIs must not import before their options are parsed
+HEAVY_MODULES = (
+    "asyncio",
+    "cryptography",
+    "jinja2",
+    "msgpack",
+    "requests",
+    "tornado",
+    "zmq",
+    "salt.client",
+    "salt.crypt",
+    "salt.loader",
+    "salt.payload",
+)
+
+# The cold start budget, in seconds, of ``--version`` for the main CLIs
+STARTUP_BUDGET = 1.5
+
+
+@pytest.fixture
+def profile(tmp_path):
+    (tmp_path / "startup_profile_parent.py").write_text(
+        "import startup_profile_child\n"
+    )
+    (tmp_path / "startup_profile_child.py").write_text(
+        "import time\ntime.sleep(0.05)\n"
+    )
+    profile = salt.utils.startup_profile.StartupProfile("salt-test")
+    with patch.object(sys, "path", [str(tmp_path)] + sys.path):
+        profile.enable()
+        try:
+            yield profile
+        finally:
+            profile.disable()
+            for name in ("startup_profile_parent", "startup_profile_child"):
+                sys.modules.pop(name, None)
+
+
+def test_import_times(profile):
+    import startup_profile_parent  # pylint: disable=unused-import
+
+    imports = {
+        name: (self_time, cumulative, depth)
+        for name, self_time, cumulative, depth in profile.timer.imports
+    }
+    child = imports["startup_profile_child"]
+    parent = imports["startup_profile_parent"]
+    assert child[0] >= 0.05
+    assert child[2] == 1
+    assert parent[2] == 0
+    # The import of the child is not counted in the self time of the parent
+    assert parent[1] >= child[1]
+    assert parent[0] < 0.05
+
+
+def test_phases(profile):
+    with profile.phase("load config"):
+        import startup_profile_parent  # pylint: disable=unused-import
+
+    assert [name for name, _, _ in profile.phases] == ["load config"]
+    report = profile.report()
+    assert report.startswith("Startup profile of salt-test")
+    assert "load config" in report
+    assert "startup_profile_child" in report
+    assert "(2 modules)" in report
+
+
+def test_phase_not_profiling():
+    with patch.object(salt.utils.startup_profile, "_PROFILE", None):
+        with salt.utils.startup_profile.phase("noop"):
+            pass
+
+
+def test_start_stop():
+    with patch.object(salt.utils.startup_profile, "_PROFILE", None), patch(
+        "atexit.register"
+    ) as register:
+        profile = salt.utils.startup_profile.start("salt-test")
+        try:
+            assert profile.timer in sys.meta_path
+            assert salt.utils.startup_profile.start() is profile
+            register.assert_called_once()
+        finally:
+            salt.utils.startup_profile.stop()
+        assert profile.timer not in sys.meta_path
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "salt.scripts",
+        "salt.cli.salt",
+        "salt.cli.call",
+        "salt.cli.key",
+        "salt.cli.run",
+        "salt.cli.cp",
+        "salt.cli.ssh",
+        "salt.cli.api",
+        "salt.cli.daemons",
+    ],
+)
+def test_cli_imports(module):
+    ret = _run(
+        f"""
+        import sys
+        import {module}
+        print(",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+        """
+    )
+    assert ret.returncode == 0, ret.stderr
+    assert ret.stdout.strip() == ""
+
+
+def test_profile_startup_option():
+    ret = _run(
+        """
+        import sys
+        sys.argv = ["salt-call", "--profile-startup", "--version"]
+        import salt.scripts
+        salt.scripts.salt_call()
+        """
+    )
+    assert ret.returncode == 0, ret.stderr
+    assert ret.stdout.startswith("salt-call ")
+    assert "Startup profile of salt-call" in ret.stderr
+    assert "Slowest modules (self, cumulative):" in ret.stderr
+
+
+@pytest.mark.slow_test
+@pytest.mark.parametrize(
+    "entry_point,prog",
+    [
+        ("salt_main", "salt"),
+        ("salt_call", "salt-call"),
+        ("salt_key", "salt-key"),
+        ("salt_run", "salt-run"),
+        ("salt_master", "salt-master"),
+    ],
+)
+def test_cold_start_time(entry_point, prog):
+    """
+    Regression benchmark of the cold start of the main CLIs
+    """
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        ret = _run(
+            f"""
+            import sys
+            sys.argv = [{prog!r}, "--version"]
+            import salt.scripts
+            salt.scripts.{entry_point}()
+            """
+        )
+        timings.append(time.perf_counter() - start)
+        assert ret.returncode == 0, ret.stderr
+    assert min(timings) < STARTUP_BUDGET
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import salt.utils.timed_subprocess as timed_subprocess
+
+
+def test_output_buffer():
+    buf = timed_subprocess.OutputBuffer(4, 4)
+    buf.write(b"01")
+    assert buf.getvalue() == b"01"
+    buf.write(b"23456789")
+    assert buf.getvalue() == b"0123456789"[:4] + b"\n[... 2 bytes truncated ...]\n6789"
+    for _ in range(100):
+        buf.write(b"abc")
+    assert buf.total == 310
+    assert buf.truncated == 302
+    assert buf.getvalue() == b"0123\n[... 302 bytes truncated ...]\ncabc"
+    assert len(buf.tail) <= 8
+
+
+def test_output_buffer_no_tail():
+    buf = timed_subprocess.OutputBuffer(3, 0)
+    buf.write(b"0123456")
+    assert buf.getvalue() == b"012\n[... 4 bytes truncated ...]\n"
+
+
+def test_timedproc_stream():
+    chunks = []
+    proc = timed_subprocess.TimedProc(
+        [
+            sys.executable,
+            "-c",
+            "import sys; sys.stdout.write(sys.stdin.read() * 1000);"
+            "sys.stderr.write('err')",
+        ],
+        stdin="0123456789",
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stream_callback=lambda name, chunk: chunks.append((name, chunk)),
+        output_head=10,
+        output_tail=10,
+    )
+    assert proc.run() == 0
+    assert proc.stdout == b"0123456789\n[... 9980 bytes truncated ...]\n0123456789"
+    assert proc.stderr == b"err"
+    assert b"".join(chunk for name, chunk in chunks if name == "stdout") == (
+        b"0123456789" * 1000
+    )
+    assert proc.buffers["stdout"].total == 10000
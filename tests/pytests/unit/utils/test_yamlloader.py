@@ -0,0 +1,186 @@
+"""
+Conformance tests for the LibYAML and pure python variants of
+salt.utils.yamlloader.SaltYamlSafeLoader
+"""
+
+import textwrap
+
+import pytest
+from yaml.constructor import ConstructorError
+
+import salt.utils.yamlloader as yamlloader
+from salt.utils.odict import OrderedDict
+
+LOADERS = [
+    pytest.param(yamlloader.SaltYamlSafePyLoader, id="python"),
+    pytest.param(
+        yamlloader.SaltYamlSafeCLoader,
+        id="libyaml",
+        marks=pytest.mark.skipif(
+            not yamlloader.HAS_LIBYAML, reason="LibYAML is not available"
+        ),
+    ),
+]
+
+DOCUMENTS = [
+    """\
+    p1:
+      - alpha
+      - beta
+    """,
+    """\
+    p1: &p1
+      v1: alpha
+    p2:
+      <<: *p1
+      v1: new_alpha
+      v2: beta
+    """,
+    """\
+    base: &base
+      a: 1
+    extra: &extra
+      b: 2
+    merged:
+      <<: [*base, *extra]
+      c: 3
+    """,
+    """\
+    ints: [0, 00, 010, 0o17, 0x1f, 0b101, -3, 1_000]
+    floats: [1.5, .inf, -.inf]
+    bools: [true, false, yes, no, on, off]
+    nulls: [~, null, ""]
+    """,
+    """\
+    when: 2024-01-02 03:04:05
+    date: 2024-01-02
+    """,
+    """\
+    unicode: "\\u00e9t\\u00e9"
+    raw: été
+    multi: |
+      line one
+      line two
+    folded: >
+      folded
+      text
+    """,
+    """\
+    foo:
+      b: {foo: bar, one: 1, list: [1, two, 3]}
+    """,
+]
+
+
+@pytest.fixture(params=LOADERS)
+def loader(request):
+    return request.param
+
+
+def _load(loader, data, **kwargs):
+    return loader(textwrap.dedent(data), **kwargs).get_data()
+
+
+def test_default_loader_prefers_libyaml():
+    if yamlloader.HAS_LIBYAML:
+        assert yamlloader.SaltYamlSafeLoader is yamlloader.SaltYamlSafeCLoader
+        assert issubclass(yamlloader.SaltYamlSafeLoader, yamlloader.yaml.CSafeLoader)
+    else:
+        assert yamlloader.SaltYamlSafeLoader is yamlloader.SaltYamlSafePyLoader
+    assert yamlloader.safe_load("a: 1") == {"a": 1}
+
+
+@pytest.mark.parametrize("data", DOCUMENTS)
+def test_loaders_agree(data):
+    expected = _load(yamlloader.SaltYamlSafePyLoader, data)
+    assert _load(yamlloader.SaltYamlSafeLoader, data) == expected
+    ordered = _load(yamlloader.SaltYamlSafePyLoader, data, dictclass=OrderedDict)
+    assert _load(yamlloader.SaltYamlSafeLoader, data, dictclass=OrderedDict) == ordered
+
+
+def test_basics(loader):
+    assert _load(loader, DOCUMENTS[0]) == {"p1": ["alpha", "beta"]}
+
+
+def test_merge(loader):
+    assert _load(loader, DOCUMENTS[1]) == {
+        "p1": {"v1": "alpha"},
+        "p2": {"v1": "new_alpha", "v2": "beta"},
+    }
+    assert _load(loader, DOCUMENTS[2])["merged"] == {"a": 1, "b": 2, "c": 3}
+
+
+def test_scalars(loader):
+    ret = _load(loader, DOCUMENTS[3])
+    # Leading zeros are not octal in salt's YAML dialect
+    assert ret["ints"] == [0, 0, 10, "0o17", 31, 5, -3, 1000]
+    assert ret["bools"] == [True, False, True, False, True, False]
+    assert ret["nulls"] == [None, None, ""]
+
+
+def test_timestamps_stay_strings(loader):
+    assert _load(loader, DOCUMENTS[4]) == {
+        "when": "2024-01-02 03:04:05",
+        "date": "2024-01-02",
+    }
+
+
+def test_strings_are_unicode(loader):
+    ret = _load(loader, DOCUMENTS[5])
+    assert ret["unicode"] == "été"
+    assert ret["raw"] == "été"
+    assert ret["multi"] == "line one\nline two\n"
+    assert ret["folded"] == "folded text\n"
+    assert all(isinstance(value, str) for value in ret.values())
+
+
+def test_ordering(loader):
+    data = "\n".join(f"key{idx}: {idx}" for idx in range(50, 0, -1))
+    ret = _load(loader, data, dictclass=OrderedDict)
+    assert isinstance(ret, OrderedDict)
+    assert list(ret) == [f"key{idx}" for idx in range(50, 0, -1)]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        """\
+        p1: alpha
+        p1: beta
+        """,
+        """\
+        p1: &p1
+          v1: alpha
+        p2:
+          <<: *p1
+          v2: beta
+          v2: betabeta
+        """,
+    ],
+)
+def test_duplicates(loader, data):
+    with pytest.raises(ConstructorError) as exc:
+        _load(loader, data)
+    assert "found conflicting ID" in str(exc.value)
+
+
+def test_duplicate_error_marks_match():
+    data = "a: 1\nb:\n  c: 1\n  c: 2\n"
+    errors = []
+    for loader in (yamlloader.SaltYamlSafePyLoader, yamlloader.SaltYamlSafeLoader):
+        with pytest.raises(ConstructorError) as exc:
+            _load(loader, data)
+        errors.append(
+            (
+                exc.value.problem,
+                exc.value.problem_mark.line,
+                exc.value.problem_mark.column,
+            )
+        )
+    assert errors[0] == errors[1]
+    assert errors[0] == ("found conflicting ID 'c'", 3, 2)
+
+
+def test_unhashable_key(loader):
+    with pytest.raises(ConstructorError, match="found unacceptable key"):
+        _load(loader, "? [a, b]\n: value\n")